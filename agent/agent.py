@@ -6,6 +6,7 @@ from langchain_neo4j import Neo4jGraph
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from neo4j import GraphDatabase
 
+from agent.database import AsyncNeo4jGraph
 from agent.retrievers.cypher_examples import (
     Neo4jVectorSearchCypherExampleRetriever,
 )
@@ -23,6 +24,11 @@ neo4j_driver = GraphDatabase.driver(
     uri=os.getenv("NEO4J_URI", ""),
     auth=(os.getenv("NEO4J_USERNAME", ""), os.getenv("NEO4J_PASSWORD", "")),
 )
+async_neo4j_graph = AsyncNeo4jGraph.from_uri(
+    uri=os.getenv("NEO4J_URI", ""),
+    auth=(os.getenv("NEO4J_USERNAME", ""), os.getenv("NEO4J_PASSWORD", "")),
+    schema_graph=neo4j_graph,
+)
 vector_index_name = "cypher_query_vector_index"
 
 cypher_example_retriever = Neo4jVectorSearchCypherExampleRetriever(
@@ -35,4 +41,5 @@ graph = create_advanced_text2cypher_agentic_workflow(
     cypher_example_retriever=cypher_example_retriever,
     llm_cypher_validation=False,
     graph=neo4j_graph,
+    async_graph=async_neo4j_graph,
 )
@@ -0,0 +1,25 @@
+"""Caches used to skip repeated work in the Text2Cypher workflows."""
+
+from .base import BaseCacheBackend, CacheStats
+from .caching_embedder import CachingEmbedder
+from .cypher_generation_cache import CypherGenerationCache
+from .cypher_result_cache import CachedCypherResult, CypherResultCache
+from .cypher_syntax_cache import CypherExplainResult, CypherSyntaxCache
+from .embedding_store import MemoryMappedEmbeddingStore
+from .in_memory import InMemoryCacheBackend
+from .semantic_answer_cache import CachedAnswer, SemanticAnswerCache
+
+__all__ = [
+    "BaseCacheBackend",
+    "CacheStats",
+    "CachedAnswer",
+    "CachedCypherResult",
+    "CachingEmbedder",
+    "CypherExplainResult",
+    "CypherGenerationCache",
+    "CypherResultCache",
+    "CypherSyntaxCache",
+    "InMemoryCacheBackend",
+    "MemoryMappedEmbeddingStore",
+    "SemanticAnswerCache",
+]
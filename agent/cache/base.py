@@ -0,0 +1,93 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+    """Counters describing the effectiveness of a cache."""
+
+    hits: int = Field(
+        default=0, description="The number of lookups that found a live entry."
+    )
+    misses: int = Field(
+        default=0, description="The number of lookups that found no live entry."
+    )
+    evictions: int = Field(
+        default=0,
+        description="The number of entries removed to respect the size limits.",
+    )
+    expirations: int = Field(
+        default=0, description="The number of entries removed because their TTL passed."
+    )
+    invalidations: int = Field(
+        default=0,
+        description="The number of times the cache was cleared because its fingerprint changed.",
+    )
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups that were hits. 0.0 if there were no lookups."""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BaseCacheBackend(ABC):
+    """
+    Abstract base class for a key value cache backend.
+    Subclasses must implement `get`, `set`, `delete`, `clear` and `__len__` and maintain `stats`.
+    """
+
+    stats: CacheStats
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a live value.
+
+        Parameters
+        ----------
+        key : str
+            The key.
+
+        Returns
+        -------
+        Optional[Any]
+            The value, or None if the key is missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(
+        self, key: str, value: Any, size: int = 0, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store a value.
+
+        Parameters
+        ----------
+        key : str
+            The key.
+        value : Any
+            The value.
+        size : int, optional
+            The estimated size of the value in bytes, used to respect memory limits, by default 0
+        ttl : Optional[float], optional
+            The number of seconds the value lives. If None, the backend default is used, by default None
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all values."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
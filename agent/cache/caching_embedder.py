@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Union
+
+import numpy as np
+
+from ..embeddings import BatchEmbedderProtocol, EmbedderProtocol
+from .base import CacheStats
+from .embedding_store import MemoryMappedEmbeddingStore
+from .in_memory import InMemoryCacheBackend
+
+
+class CachingEmbedder:
+    """
+    Wrap an embedder so that each distinct text is embedded once.
+
+    Embeddings are kept as float32 in an in-memory LRU cache and, with `cache_dir`,
+    in a memory-mapped store on disk that survives restarts and is shared between the retrievers and ingest.
+    Entries are keyed on a hash of the model name, the embedding method and the text with its whitespace collapsed,
+    so asymmetric embedders keep query and document embeddings apart.
+    Every returned embedding is rounded to float32, whether it was cached or not.
+    The wrapper follows `BatchEmbedderProtocol`, so it can be passed wherever an embedder is expected.
+
+    Parameters
+    ----------
+    embedder : EmbedderProtocol
+        The embedder to wrap.
+    model : Optional[str], optional
+        The embedding model name used in the cache key. If None, the `model` attribute of `embedder` is used, by default None
+    max_entries : int, optional
+        The max number of embeddings held in memory, by default 4096
+    cache_dir : Optional[Union[str, Path]], optional
+        The directory of the on-disk store. If None, embeddings are only cached in memory, by default None
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderProtocol,
+        model: Optional[str] = None,
+        max_entries: int = 4096,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.embedder = embedder
+        self.model: str = (
+            model if model is not None else str(getattr(embedder, "model", ""))
+        )
+        self.backend = InMemoryCacheBackend(max_entries=max_entries)
+        self.store = (
+            MemoryMappedEmbeddingStore(cache_dir, model=self.model)
+            if cache_dir is not None
+            else None
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counters of the in-memory cache."""
+
+        return self.backend.stats
+
+    def make_key(self, text: str, kind: Literal["query", "document"] = "query") -> str:
+        """
+        Create the cache key for a text.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+        kind : Literal["query", "document"], optional
+            Whether the text is embedded with `embed_query` or `embed_documents`, by default "query"
+
+        Returns
+        -------
+        str
+            A sha256 hex digest of the model name, the kind and the normalized text.
+        """
+
+        payload = f"{self.model}\x00{kind}\x00{' '.join(text.split())}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a text, or return its cached embedding.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+
+        Returns
+        -------
+        List[float]
+            The embedding.
+        """
+
+        key = self.make_key(text)
+        cached = self._get(key)
+        if cached is not None:
+            return [float(x) for x in cached]
+
+        return self._set(key, self.embedder.embed_query(text))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Asynchronously embed a text, or return its cached embedding.
+        The embedding call is awaited natively if the wrapped embedder supports it.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+
+        Returns
+        -------
+        List[float]
+            The embedding.
+        """
+
+        key = self.make_key(text)
+        cached = self._get(key)
+        if cached is not None:
+            return [float(x) for x in cached]
+
+        # LangChain embedders provide a native async method
+        aembed_query = getattr(self.embedder, "aembed_query", None)
+        if aembed_query is not None:
+            embedding: List[float] = await aembed_query(text)
+        else:
+            embedding = await asyncio.to_thread(self.embedder.embed_query, text)
+        return self._set(key, embedding)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts. Only the texts that are not cached are passed to the wrapped embedder,
+        with a single `embed_documents` call if it provides one, and one `embed_query` call per text otherwise.
+
+        Parameters
+        ----------
+        texts : List[str]
+            The texts.
+
+        Returns
+        -------
+        List[List[float]]
+            The embedding of each text, in the order of `texts`.
+
+        Raises
+        ------
+        ValueError
+            If the wrapped embedder returns a different number of embeddings than texts.
+        """
+
+        # embedders without `embed_documents` embed each text as a query
+        batch = isinstance(self.embedder, BatchEmbedderProtocol)
+        keys = [self.make_key(t, "document" if batch else "query") for t in texts]
+        embeddings: List[Optional[List[float]]] = list()
+        misses: Dict[str, str] = dict()
+        for text, key in zip(texts, keys):
+            cached = self._get(key)
+            embeddings.append(
+                [float(x) for x in cached] if cached is not None else None
+            )
+            if cached is None:
+                misses.setdefault(key, text)
+
+        if misses:
+            miss_texts = list(misses.values())
+            if isinstance(self.embedder, BatchEmbedderProtocol):
+                vectors = self.embedder.embed_documents(miss_texts)
+            else:
+                vectors = [self.embedder.embed_query(t) for t in miss_texts]
+            if len(vectors) != len(miss_texts):
+                raise ValueError(
+                    f"The embedder returned {len(vectors)} embeddings for {len(miss_texts)} texts."
+                )
+            embedded = {
+                key: self._set(key, vector)
+                for key, vector in zip(misses.keys(), vectors)
+            }
+            embeddings = [
+                e if e is not None else embedded[k] for e, k in zip(embeddings, keys)
+            ]
+
+        return [e for e in embeddings if e is not None]
+
+    def clear(self) -> None:
+        """Drop the embeddings held in memory. The on-disk store is kept."""
+
+        self.backend.clear()
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        cached: Optional[np.ndarray] = self.backend.get(key)
+        if cached is not None or self.store is None:
+            return cached
+
+        cached = self.store.get(key)
+        if cached is not None:
+            self.backend.set(key, cached, size=cached.nbytes)
+        return cached
+
+    def _set(self, key: str, embedding: List[float]) -> List[float]:
+        """Cache the embedding and return it as stored, rounded to float32."""
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        self.backend.set(key, vector, size=vector.nbytes)
+        if self.store is not None:
+            self.store.put(key, vector)
+        return [float(x) for x in vector]
@@ -0,0 +1,117 @@
+import hashlib
+import json
+from typing import Optional
+
+from .base import BaseCacheBackend, CacheStats
+from .in_memory import InMemoryCacheBackend
+
+
+class CypherGenerationCache:
+    """
+    Cache generated Cypher statements that passed validation.
+
+    Entries are keyed on the normalized task, the schema fingerprint and a hash of the few shot examples in the prompt,
+    so a statement is only reused when the LLM would have seen the same prompt.
+    A schema change produces new keys and the stale entries are evicted as the cache fills.
+
+    Parameters
+    ----------
+    backend : Optional[BaseCacheBackend], optional
+        The storage backend. If None, an `InMemoryCacheBackend` with 512 entries is used, by default None
+    ttl : Optional[float], optional
+        The number of seconds a statement lives. If None, the backend default is used, by default None
+    """
+
+    def __init__(
+        self,
+        backend: Optional[BaseCacheBackend] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        # an empty backend is falsy, so compare with None
+        self.backend = (
+            backend if backend is not None else InMemoryCacheBackend(max_entries=512)
+        )
+        self.ttl = ttl
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counters of the backend."""
+
+        return self.backend.stats
+
+    @staticmethod
+    def normalize_task(task: str) -> str:
+        """
+        Normalize a task so that trivially different phrasings share a key.
+        Case, surrounding whitespace, repeated whitespace and trailing punctuation are ignored.
+
+        Parameters
+        ----------
+        task : str
+            The task.
+
+        Returns
+        -------
+        str
+            The normalized task.
+        """
+
+        return " ".join(task.lower().split()).rstrip("?.!")
+
+    @classmethod
+    def make_key(cls, task: str, examples: str, fingerprint: str = "") -> str:
+        """
+        Create the cache key for a task.
+
+        Parameters
+        ----------
+        task : str
+            The task the Cypher is generated for.
+        examples : str
+            The few shot examples in the generation prompt.
+        fingerprint : str, optional
+            The schema fingerprint, by default ""
+
+        Returns
+        -------
+        str
+            A sha256 hex digest.
+        """
+
+        examples_hash = hashlib.sha256(examples.encode("utf-8")).hexdigest()
+        payload = json.dumps([cls.normalize_task(task), fingerprint, examples_hash])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a validated statement.
+
+        Parameters
+        ----------
+        key : str
+            The key created by `make_key`.
+
+        Returns
+        -------
+        Optional[str]
+            The statement, or None on a miss.
+        """
+
+        statement: Optional[str] = self.backend.get(key)
+        return statement
+
+    def set(self, key: str, statement: str) -> None:
+        """
+        Store a statement. Only statements that passed validation should be stored.
+
+        Parameters
+        ----------
+        key : str
+            The key created by `make_key`.
+        statement : str
+            The validated Cypher statement.
+        """
+
+        self.backend.set(
+            key, statement, size=len(statement.encode("utf-8")), ttl=self.ttl
+        )
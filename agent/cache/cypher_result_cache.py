@@ -0,0 +1,189 @@
+import hashlib
+import json
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from ..database.records import estimate_record_size
+from .base import BaseCacheBackend, CacheStats
+from .in_memory import InMemoryCacheBackend
+
+
+class CachedCypherResult(BaseModel):
+    """The result of an executed Cypher statement, as stored in a `CypherResultCache`."""
+
+    records: List[Dict[str, Any]] = Field(description="The returned records.")
+    truncated: bool = Field(
+        default=False, description="Whether records were dropped by a fetch budget."
+    )
+    truncation_reason: Optional[str] = Field(
+        default=None, description="The budget that was spent, if any."
+    )
+    record_count: int = Field(default=0, description="The number of records kept.")
+
+
+class CypherResultCache:
+    """
+    Cache the results of executed Cypher statements.
+
+    Entries are keyed on the normalized statement, its parameters, the database name and a fingerprint.
+    The fingerprint identifies the state of the database, such as the schema fingerprint or the last committed transaction id.
+    When a different fingerprint is seen, all entries are dropped.
+    Results are deep-copied on `set` and `get`, so callers may mutate the records they receive without corrupting the cache.
+
+    Parameters
+    ----------
+    backend : Optional[BaseCacheBackend], optional
+        The storage backend. If None, an `InMemoryCacheBackend` with 1024 entries and 64 MB is used, by default None
+    ttl : Optional[float], optional
+        The number of seconds a result lives. If None, the backend default is used, by default 300.0
+    fingerprint_provider : Optional[Callable[[], str]], optional
+        A function returning an additional fingerprint of the database state, such as the last committed transaction id.
+        It is combined with the schema fingerprint by the execution node, by default None
+    """
+
+    def __init__(
+        self,
+        backend: Optional[BaseCacheBackend] = None,
+        ttl: Optional[float] = 300.0,
+        fingerprint_provider: Optional[Callable[[], str]] = None,
+    ) -> None:
+        # an empty backend is falsy, so compare with None
+        self.backend = (
+            backend
+            if backend is not None
+            else InMemoryCacheBackend(max_entries=1024, max_bytes=64 * 1024 * 1024)
+        )
+        self.ttl = ttl
+        self.fingerprint_provider = fingerprint_provider
+        self._fingerprint: Optional[str] = None
+        self._lock = Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counters of the backend."""
+
+        return self.backend.stats
+
+    @staticmethod
+    def make_key(
+        cypher_statement: str,
+        params: Optional[Dict[str, Any]] = None,
+        database: str = "neo4j",
+        fingerprint: str = "",
+    ) -> str:
+        """
+        Create the cache key for a statement.
+
+        Parameters
+        ----------
+        cypher_statement : str
+            The Cypher statement.
+        params : Optional[Dict[str, Any]], optional
+            The query parameters, by default None
+        database : str, optional
+            The Neo4j database name, by default "neo4j"
+        fingerprint : str, optional
+            The fingerprint of the database state, by default ""
+
+        Returns
+        -------
+        str
+            A sha256 hex digest.
+        """
+
+        # imported here because the components import this package
+        from ..components.text2cypher.validation.utils.cypher_parser import (
+            normalize_cypher_statement,
+        )
+
+        payload = json.dumps(
+            [
+                normalize_cypher_statement(cypher_statement),
+                params or dict(),
+                database,
+                fingerprint,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        cypher_statement: str,
+        params: Optional[Dict[str, Any]] = None,
+        database: str = "neo4j",
+        fingerprint: str = "",
+    ) -> Optional[CachedCypherResult]:
+        """
+        Look up the result of a statement.
+
+        Parameters
+        ----------
+        cypher_statement : str
+            The Cypher statement.
+        params : Optional[Dict[str, Any]], optional
+            The query parameters, by default None
+        database : str, optional
+            The Neo4j database name, by default "neo4j"
+        fingerprint : str, optional
+            The fingerprint of the database state, by default ""
+
+        Returns
+        -------
+        Optional[CachedCypherResult]
+            A copy of the cached result, or None on a miss.
+        """
+
+        self._check_fingerprint(fingerprint)
+        cached: Optional[CachedCypherResult] = self.backend.get(
+            self.make_key(cypher_statement, params, database, fingerprint)
+        )
+        return cached.model_copy(deep=True) if cached is not None else None
+
+    def set(
+        self,
+        cypher_statement: str,
+        result: CachedCypherResult,
+        params: Optional[Dict[str, Any]] = None,
+        database: str = "neo4j",
+        fingerprint: str = "",
+    ) -> None:
+        """
+        Store the result of a statement.
+
+        Parameters
+        ----------
+        cypher_statement : str
+            The Cypher statement.
+        result : CachedCypherResult
+            The result. A copy is stored.
+        params : Optional[Dict[str, Any]], optional
+            The query parameters, by default None
+        database : str, optional
+            The Neo4j database name, by default "neo4j"
+        fingerprint : str, optional
+            The fingerprint of the database state, by default ""
+        """
+
+        self._check_fingerprint(fingerprint)
+        self.backend.set(
+            self.make_key(cypher_statement, params, database, fingerprint),
+            result.model_copy(deep=True),
+            size=sum(estimate_record_size(r) for r in result.records),
+            ttl=self.ttl,
+        )
+
+    def invalidate(self) -> None:
+        """Drop all entries."""
+
+        self.backend.clear()
+        self.stats.invalidations += 1
+
+    def _check_fingerprint(self, fingerprint: str) -> None:
+        with self._lock:
+            if self._fingerprint is not None and self._fingerprint != fingerprint:
+                self.invalidate()
+            self._fingerprint = fingerprint
@@ -0,0 +1,135 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from ..database.records import estimate_record_size
+from .base import BaseCacheBackend, CacheStats
+from .in_memory import InMemoryCacheBackend
+
+
+class CypherExplainResult(BaseModel):
+    """The outcome of an EXPLAIN of a Cypher statement, as stored in a `CypherSyntaxCache`."""
+
+    errors: List[str] = Field(
+        default_factory=list, description="The syntax errors reported by Neo4j."
+    )
+    plan: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="The EXPLAIN plan tree returned by the driver, if the statement is valid.",
+    )
+
+
+class CypherSyntaxCache:
+    """
+    Cache the outcome of EXPLAIN queries, so a statement is only sent to Neo4j once per schema.
+
+    Entries are keyed on the normalized statement and the schema fingerprint.
+    Both valid and invalid outcomes are stored, and the EXPLAIN plan of a valid statement is kept for cost checks.
+    Plans carry row estimates that drift as the data changes, so entries expire after `ttl` seconds.
+
+    Parameters
+    ----------
+    backend : Optional[BaseCacheBackend], optional
+        The storage backend. If None, an `InMemoryCacheBackend` with 1024 entries and 16 MB is used, by default None
+    ttl : Optional[float], optional
+        The number of seconds an outcome lives. If None, the backend default is used, by default 600.0
+    """
+
+    def __init__(
+        self,
+        backend: Optional[BaseCacheBackend] = None,
+        ttl: Optional[float] = 600.0,
+    ) -> None:
+        # an empty backend is falsy, so compare with None
+        self.backend = (
+            backend
+            if backend is not None
+            else InMemoryCacheBackend(max_entries=1024, max_bytes=16 * 1024 * 1024)
+        )
+        self.ttl = ttl
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counters of the backend."""
+
+        return self.backend.stats
+
+    @staticmethod
+    def make_key(cypher_statement: str, fingerprint: str = "") -> str:
+        """
+        Create the cache key for a statement.
+
+        Parameters
+        ----------
+        cypher_statement : str
+            The Cypher statement.
+        fingerprint : str, optional
+            The schema fingerprint, by default ""
+
+        Returns
+        -------
+        str
+            A sha256 hex digest.
+        """
+
+        # imported here because the components import this package
+        from ..components.text2cypher.validation.utils.cypher_parser import (
+            normalize_cypher_statement,
+        )
+
+        payload = json.dumps(
+            [normalize_cypher_statement(cypher_statement), fingerprint]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(
+        self, cypher_statement: str, fingerprint: str = ""
+    ) -> Optional[CypherExplainResult]:
+        """
+        Look up the EXPLAIN outcome of a statement.
+
+        Parameters
+        ----------
+        cypher_statement : str
+            The Cypher statement.
+        fingerprint : str, optional
+            The schema fingerprint, by default ""
+
+        Returns
+        -------
+        Optional[CypherExplainResult]
+            The cached outcome, or None on a miss.
+        """
+
+        cached: Optional[CypherExplainResult] = self.backend.get(
+            self.make_key(cypher_statement, fingerprint)
+        )
+        return cached
+
+    def set(
+        self,
+        cypher_statement: str,
+        result: CypherExplainResult,
+        fingerprint: str = "",
+    ) -> None:
+        """
+        Store the EXPLAIN outcome of a statement.
+
+        Parameters
+        ----------
+        cypher_statement : str
+            The Cypher statement.
+        result : CypherExplainResult
+            The outcome.
+        fingerprint : str, optional
+            The schema fingerprint, by default ""
+        """
+
+        self.backend.set(
+            self.make_key(cypher_statement, fingerprint),
+            result,
+            size=estimate_record_size(result.model_dump()),
+            ttl=self.ttl,
+        )
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class MemoryMappedEmbeddingStore:
+    """
+    An append only on-disk store of float32 embeddings, read through a memory map.
+
+    The embeddings of each model are kept in their own set of files in `directory`, named by a hash of the model:
+    `.f32` holds one row of float32 values per embedding, `.keys` holds the key of each row
+    and `.json` holds the number of dimensions. A row is written before its key,
+    so an interrupted write leaves at most an unreferenced row behind.
+    Reads map the vector file into memory, so the store is not loaded into RAM.
+
+    Appends and the recovery of an interrupted write hold an exclusive lock on the `.lock` file,
+    and the row of an appended embedding is taken from the size of the vector file under that lock,
+    so several processes may share a store. Keys appended by other processes are picked up on a miss.
+    File locks need `fcntl`. Where it is not available, such as on Windows, a store must have a single writer process.
+
+    Parameters
+    ----------
+    directory : Union[str, Path]
+        The directory holding the store. Created if it does not exist.
+    model : str
+        The embedding model the store holds embeddings of.
+    """
+
+    def __init__(self, directory: Union[str, Path], model: str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model = model
+
+        name = hashlib.sha256(model.encode("utf-8")).hexdigest()[:16]
+        self._vectors_path = self.directory / f"{name}.f32"
+        self._keys_path = self.directory / f"{name}.keys"
+        self._meta_path = self.directory / f"{name}.json"
+        self._lock_path = self.directory / f"{name}.lock"
+
+        self._dims: Optional[int] = None
+        self._rows: Dict[str, int] = dict()
+        # the number of bytes of the keys file read so far
+        self._keys_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    @property
+    def dims(self) -> Optional[int]:
+        """The number of dimensions of the stored embeddings, or None if the store is empty."""
+
+        return self._dims
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Read an embedding.
+
+        Parameters
+        ----------
+        key : str
+            The key.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            A float32 copy of the embedding, or None if the key is missing.
+        """
+
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                # the key may have been appended by another process
+                self._sync()
+                row = self._rows.get(key)
+                if row is None:
+                    return None
+            mmap = self._get_mmap(row)
+            return np.array(mmap[row], dtype=np.float32)
+
+    def put(self, key: str, embedding: np.ndarray) -> None:
+        """
+        Append an embedding. Keys that are already stored are ignored.
+
+        Parameters
+        ----------
+        key : str
+            The key.
+        embedding : np.ndarray
+            The embedding. It is stored as float32.
+        """
+
+        vector = np.ascontiguousarray(embedding, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if key in self._rows:
+                return
+            with self._file_lock():
+                self._sync()
+                if key in self._rows:
+                    return
+                if self._dims is None:
+                    self._dims = len(vector)
+                    self._meta_path.write_text(json.dumps({"dims": self._dims}))
+                elif len(vector) != self._dims:
+                    raise ValueError(
+                        f"Expected an embedding with {self._dims} dimensions, got {len(vector)}."
+                    )
+
+                # other processes may have appended rows, so the row is taken from the file size
+                row_bytes = 4 * self._dims
+                size = (
+                    os.path.getsize(self._vectors_path)
+                    if self._vectors_path.exists()
+                    else 0
+                )
+                if size % row_bytes:
+                    # drops a row left partially written by a crashed writer
+                    os.truncate(self._vectors_path, size - size % row_bytes)
+                row = size // row_bytes
+                with open(self._vectors_path, "ab") as f:
+                    f.write(vector.tobytes())
+                with open(self._keys_path, "a", encoding="utf-8") as f:
+                    f.write(f"{key} {row}\n")
+
+            self._rows[key] = row
+
+    def _get_mmap(self, row: int) -> np.memmap:
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            # the map is recreated once it does not cover the row
+            assert self._dims is not None
+            rows = os.path.getsize(self._vectors_path) // (4 * self._dims)
+            self._mmap = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self._dims),
+            )
+        return self._mmap
+
+    def _sync(self) -> None:
+        # reads the dims and the keys written since the last sync, such as by other processes
+        if self._dims is None:
+            if not self._meta_path.exists():
+                return
+            self._dims = int(json.loads(self._meta_path.read_text())["dims"])
+        if not self._keys_path.exists():
+            return
+
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # a line without a newline is still being written
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").split("\n")[:-1]:
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                self._rows[parts[0]] = int(parts[1])
+        self._keys_offset += end
+
+    def _load(self) -> None:
+        if not self._meta_path.exists():
+            return
+
+        with self._file_lock():
+            self._dims = int(json.loads(self._meta_path.read_text())["dims"])
+            if not self._vectors_path.exists() or not self._keys_path.exists():
+                return
+
+            # no other process is writing while the lock is held, so a partial row or key line is left by a crash
+            rows = os.path.getsize(self._vectors_path) // (4 * self._dims)
+            # drops a partially written row, so appended rows stay aligned
+            os.truncate(self._vectors_path, rows * 4 * self._dims)
+            with open(self._keys_path, "rb") as f:
+                data = f.read()
+            # drops an interrupted key line, whose row number may be cut short
+            os.truncate(self._keys_path, data.rfind(b"\n") + 1)
+            self._sync()
+
+        # rows cut off by the truncation are not referenced
+        self._rows = {k: r for k, r in self._rows.items() if r < rows}
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
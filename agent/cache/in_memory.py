@@ -0,0 +1,135 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from .base import BaseCacheBackend, CacheStats
+
+
+class InMemoryCacheBackend(BaseCacheBackend):
+    """
+    An in-process LRU cache with per entry TTL and a memory cap.
+    Entries are evicted least recently used first once `max_entries` or `max_bytes` is exceeded.
+    Expired entries are removed when they are looked up or when space is needed.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The max number of entries, by default 1024
+    max_bytes : Optional[int], optional
+        The max total estimated size of the entries. If None, only `max_entries` applies, by default None
+    ttl : Optional[float], optional
+        The default number of seconds an entry lives. If None, entries do not expire, by default None
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        assert max_entries > 0, "`max_entries` must be greater than 0."
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        # key -> (value, size, expires_at)
+        self._entries: OrderedDict[str, Tuple[Any, int, Optional[float]]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """The total estimated size of the entries."""
+
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(
+        self, key: str, value: Any, size: int = 0, ttl: Optional[float] = None
+    ) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            # never fits, so caching it would only flush everything else
+            return
+
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            self._enforce_limits()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> Dict[str, Any]:
+        """A snapshot of the live entries, from least to most recently used."""
+
+        now = time.monotonic()
+        with self._lock:
+            return {
+                k: v
+                for k, (v, _, expires_at) in self._entries.items()
+                if expires_at is None or expires_at > now
+            }
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _enforce_limits(self) -> None:
+        if not self._over_limits():
+            return
+
+        # drop expired entries before evicting live ones
+        now = time.monotonic()
+        for key in [
+            k
+            for k, (_, _, expires_at) in self._entries.items()
+            if expires_at is not None and expires_at <= now
+        ]:
+            self._remove(key)
+            self.stats.expirations += 1
+
+        while self._over_limits():
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats.evictions += 1
+
+    def _over_limits(self) -> bool:
+        return len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        )
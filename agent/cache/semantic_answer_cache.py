@@ -0,0 +1,173 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ..embeddings import EmbedderProtocol
+from .base import CacheStats
+from .in_memory import InMemoryCacheBackend
+
+# the number of question embeddings kept so that `store` does not embed a question `lookup` just embedded
+EMBEDDING_MEMO_SIZE = 128
+
+
+class CachedAnswer(BaseModel):
+    """A previously returned answer, as stored in a `SemanticAnswerCache`."""
+
+    question: str = Field(description="The question that was answered.")
+    answer: str = Field(description="The final answer.")
+    cyphers: List[Dict[str, Any]] = Field(
+        default_factory=list, description="The Cypher outputs the answer is based on."
+    )
+    similarity: float = Field(
+        default=1.0,
+        description="The cosine similarity between the cached question and the looked up question.",
+    )
+
+
+class SemanticAnswerCache:
+    """
+    Cache final answers by the meaning of the question.
+
+    A question is a hit if the cosine similarity between its embedding and the embedding of a cached question
+    is at least `similarity_threshold`. Entries expire after `ttl` seconds and all entries are dropped
+    when a different schema fingerprint is seen.
+
+    Parameters
+    ----------
+    embedder : EmbedderProtocol
+        The embedder used to embed questions.
+    similarity_threshold : float, optional
+        The min cosine similarity for a hit, by default 0.95
+    ttl : Optional[float], optional
+        The number of seconds an answer lives. If None, answers only expire on schema change, by default 3600.0
+    max_entries : int, optional
+        The max number of answers. The least recently used answer is evicted first, by default 1024
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderProtocol,
+        similarity_threshold: float = 0.95,
+        ttl: Optional[float] = 3600.0,
+        max_entries: int = 1024,
+    ) -> None:
+        assert (
+            0.0 < similarity_threshold <= 1.0
+        ), "`similarity_threshold` must be in (0, 1]."
+
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.backend = InMemoryCacheBackend(max_entries=max_entries, ttl=ttl)
+        self._fingerprint: Optional[str] = None
+        self._embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counters."""
+
+        return self.backend.stats
+
+    def lookup(self, question: str, fingerprint: str = "") -> Optional[CachedAnswer]:
+        """
+        Find the answer to the most similar cached question.
+
+        Parameters
+        ----------
+        question : str
+            The question.
+        fingerprint : str, optional
+            The schema fingerprint. If it differs from the last one seen, the cache is cleared, by default ""
+
+        Returns
+        -------
+        Optional[CachedAnswer]
+            The cached answer, or None if no cached question is similar enough.
+        """
+
+        self._check_fingerprint(fingerprint)
+        entries: Dict[str, Tuple[np.ndarray, CachedAnswer]] = self.backend.items()
+        if not entries:
+            self.stats.misses += 1
+            return None
+
+        keys = list(entries.keys())
+        matrix = np.stack([entries[k][0] for k in keys])
+        similarities = matrix @ self._embed(question)
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            self.stats.misses += 1
+            return None
+
+        # marks the entry as recently used and counts the hit
+        cached: Optional[Tuple[np.ndarray, CachedAnswer]] = self.backend.get(keys[best])
+        if cached is None:
+            return None
+        return cached[1].model_copy(update={"similarity": similarity})
+
+    def store(
+        self,
+        question: str,
+        answer: str,
+        fingerprint: str,
+        cyphers: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Store the answer to a question.
+
+        Parameters
+        ----------
+        question : str
+            The question.
+        answer : str
+            The final answer.
+        fingerprint : str
+            The schema fingerprint the answer is based on, as passed to the `lookup` of the same request.
+            If it differs from the last one seen, the cache is cleared.
+        cyphers : Optional[List[Dict[str, Any]]], optional
+            The Cypher outputs the answer is based on, by default None
+        """
+
+        self._check_fingerprint(fingerprint)
+        self.backend.set(
+            hashlib.sha256(question.encode("utf-8")).hexdigest(),
+            (
+                self._embed(question),
+                CachedAnswer(question=question, answer=answer, cyphers=cyphers or []),
+            ),
+        )
+
+    def invalidate(self) -> None:
+        """Drop all answers."""
+
+        self.backend.clear()
+        self.stats.invalidations += 1
+
+    def _embed(self, question: str) -> np.ndarray:
+        with self._lock:
+            embedding = self._embeddings.get(question)
+            if embedding is not None:
+                self._embeddings.move_to_end(question)
+                return embedding
+
+        embedding = np.asarray(self.embedder.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+
+        with self._lock:
+            self._embeddings[question] = embedding
+            if len(self._embeddings) > EMBEDDING_MEMO_SIZE:
+                self._embeddings.popitem(last=False)
+        return embedding
+
+    def _check_fingerprint(self, fingerprint: str) -> None:
+        with self._lock:
+            if self._fingerprint is not None and self._fingerprint != fingerprint:
+                self.invalidate()
+            self._fingerprint = fingerprint
@@ -1,18 +1,23 @@
-from typing import Any, Callable, Coroutine
+import asyncio
+from typing import Any, Callable, Coroutine, Optional
 
+from ...cache import SemanticAnswerCache
 from ...components.state import OverallState
+from ...components.text2cypher.state import CypherOutputState
+from ...constants import NO_CYPHER_RESULTS
 
 
-def create_final_answer_node() -> (
-    Callable[[OverallState], Coroutine[Any, Any, dict[str, Any]]]
-):
+def create_final_answer_node(
+    answer_cache: Optional[SemanticAnswerCache] = None,
+) -> Callable[[OverallState], Coroutine[Any, Any, dict[str, Any]]]:
     """
     Create a final_answer node for a LangGraph workflow.
 
     Parameters
     ----------
-    llm : BaseChatModel
-        The LLM do perform processing.
+    answer_cache : Optional[SemanticAnswerCache], optional
+        The cache of past answers. If provided, answers based on Cypher that executed without errors
+        and returned records are added to it, by default None
 
     Returns
     -------
@@ -42,6 +47,22 @@ def create_final_answer_node() -> (
             ],
         }
 
+        fingerprint = state.get("answer_cache_fingerprint")
+        if (
+            answer_cache is not None
+            and fingerprint is not None
+            and state.get("cyphers")
+            and all(_is_answerable(c) for c in state.get("cyphers", list()))
+            and "semantic_cache_hit" not in state.get("steps", list())
+        ):
+            await asyncio.to_thread(
+                answer_cache.store,
+                state.get("question", ""),
+                answer,
+                fingerprint,
+                [dict(c) for c in state.get("cyphers", list())],
+            )
+
         return {
             "answer": answer,
             "steps": ["final_answer"],
@@ -49,3 +70,9 @@ def create_final_answer_node() -> (
         }
 
     return final_answer
+
+
+def _is_answerable(cypher: CypherOutputState) -> bool:
+    # failed or empty results must not be served to similar questions
+    records = cypher.get("records", list())
+    return not cypher.get("errors") and bool(records) and records != NO_CYPHER_RESULTS
@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 
 from .text2cypher.state import CypherOutputState
 
@@ -10,6 +11,11 @@ class Task(BaseModel):
     parent_task: str = Field(
         ..., description="The parent task this task is derived from."
     )
+    # hidden from the planner LLM, which must not write examples itself
+    examples: SkipJsonSchema[Optional[str]] = Field(
+        default=None,
+        description="The few shot Cypher examples for the question, if retrieved ahead of generation.",
+    )
     data: Optional[CypherOutputState] = Field(
         default=None, description="The Cypher query result details."
     )
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Coroutine, Dict
+from typing import Any, Callable, Coroutine, Dict, List, Optional
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.runnables.base import Runnable
@@ -7,12 +7,18 @@ from ...components.models import Task
 from ...components.planner.models import PlannerOutput
 from ...components.planner.prompts import create_planner_prompt_template
 from ...components.state import InputState
+from ...constants import NUM_CYPHER_EXAMPLES
+from ...retrievers.cypher_examples.base import BaseCypherExampleRetriever
 
 planner_prompt = create_planner_prompt_template()
 
 
 def create_planner_node(
-    llm: BaseChatModel, ignore_node: bool = False, next_action: str = "tool_selection"
+    llm: BaseChatModel,
+    ignore_node: bool = False,
+    next_action: str = "tool_selection",
+    cypher_example_retriever: Optional[BaseCypherExampleRetriever] = None,
+    select_tasks: Optional[Callable[[List[Task]], List[Task]]] = None,
 ) -> Callable[[InputState], Coroutine[Any, Any, Dict[str, Any]]]:
     """
     Create a planner node to be used in a LangGraph workflow.
@@ -23,6 +29,12 @@ def create_planner_node(
         The LLM used to process data.
     ignore_node : bool, optional
         Whether to ignore this node in the workflow, by default False
+    cypher_example_retriever : Optional[BaseCypherExampleRetriever], optional
+        If provided, the few shot examples for all tasks are retrieved in one batch and passed to the generation node,
+        by default None
+    select_tasks : Optional[Callable[[List[Task]], List[Task]]], optional
+        A function returning the tasks that will be run, such as `FanOutScheduler.schedule`.
+        Examples are only retrieved for these tasks. If None, examples are retrieved for all tasks, by default None
 
     Returns
     -------
@@ -45,15 +57,30 @@ def create_planner_node(
             )
         else:
             planner_output = PlannerOutput(tasks=[])
+
+        tasks = planner_output.tasks or [
+            Task(
+                question=state.get("question", ""),
+                parent_task=state.get("question", ""),
+            )
+        ]
+        if cypher_example_retriever is not None:
+            selected = select_tasks(tasks) if select_tasks is not None else tasks
+            examples = await cypher_example_retriever.aget_examples_batch(
+                [t.question for t in selected], k=NUM_CYPHER_EXAMPLES
+            )
+            # tasks are matched by identity, so duplicate questions that were not selected get no examples
+            examples_by_task = {id(t): e for t, e in zip(selected, examples)}
+            tasks = [
+                t.model_copy(update={"examples": examples_by_task[id(t)]})
+                if id(t) in examples_by_task
+                else t
+                for t in tasks
+            ]
+
         return {
             "next_action": next_action,
-            "tasks": planner_output.tasks
-            or [
-                Task(
-                    question=state.get("question", ""),
-                    parent_task=state.get("question", ""),
-                )
-            ],
+            "tasks": tasks,
             "steps": ["planner"],
         }
 
@@ -0,0 +1,3 @@
+from .node import create_semantic_cache_node
+
+__all__ = ["create_semantic_cache_node"]
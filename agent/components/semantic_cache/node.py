@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+from langchain_neo4j import Neo4jGraph
+
+from ...cache import SemanticAnswerCache
+from ...components.state import InputState
+from ..text2cypher.validation.utils.schema_cache import (
+    CompiledSchemaCache,
+    get_compiled_schema,
+)
+
+
+def create_semantic_cache_node(
+    answer_cache: SemanticAnswerCache,
+    graph: Optional[Neo4jGraph] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
+) -> Callable[[InputState], Coroutine[Any, Any, Dict[str, Any]]]:
+    """
+    Create a semantic cache node to be used in a LangGraph workflow.
+    If a similar question has been answered recently, its answer is returned and the workflow skips to `final_answer`.
+    Otherwise the workflow continues with `guardrails`.
+
+    Parameters
+    ----------
+    answer_cache : SemanticAnswerCache
+        The cache of past answers. Answers are added by the final_answer node.
+    graph : Optional[Neo4jGraph], optional
+        The Neo4j graph wrapper. If provided, cached answers are dropped when the schema changes, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache of compiled schema snapshots. Share one instance between the nodes of a workflow,
+        so the schema is compiled once. If None, the node creates its own, by default None
+
+    Returns
+    -------
+    Callable[[InputState], OverallState]
+        The LangGraph node.
+    """
+
+    if schema_cache is None:
+        schema_cache = CompiledSchemaCache()
+
+    async def semantic_cache(state: InputState) -> Dict[str, Any]:
+        """
+        Looks up the answer to a similar question.
+        """
+
+        fingerprint = (
+            get_compiled_schema(graph=graph, schema_cache=schema_cache).fingerprint
+            if graph is not None
+            else ""
+        )
+        # embedding the question is a blocking call
+        cached = await asyncio.to_thread(
+            answer_cache.lookup, state.get("question", ""), fingerprint
+        )
+        if cached is None:
+            return {
+                "next_action": "guardrails",
+                "answer_cache_fingerprint": fingerprint,
+                "steps": ["semantic_cache"],
+            }
+
+        return {
+            "next_action": "final_answer",
+            "summary": cached.answer,
+            "cyphers": cached.cyphers,
+            "steps": ["semantic_cache_hit"],
+        }
+
+    return semantic_cache
@@ -2,7 +2,7 @@ from operator import add
 from typing import Annotated, Any, Dict, List
 
 from langchain_core.messages import BaseMessage
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 
 from ..components.models import Task
 from .text2cypher.state import CypherOutputState
@@ -26,6 +26,8 @@ class OverallState(TypedDict):
     summary: str
     steps: Annotated[List[Any], add]
     messages: Annotated[List[BaseMessage], add]
+    # the schema fingerprint seen by the semantic_cache node, used to store the final answer
+    answer_cache_fingerprint: NotRequired[str]
 
 
 class OutputState(TypedDict):
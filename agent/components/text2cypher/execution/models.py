@@ -0,0 +1,94 @@
+from typing import Literal, Optional
+
+from neo4j.exceptions import Neo4jError
+from pydantic import BaseModel, Field
+
+TIMEOUT_ERROR_CODES = {
+    "Neo.ClientError.Transaction.TransactionTimedOut",
+    "Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration",
+}
+
+MEMORY_ERROR_CODES = {
+    "Neo.TransientError.General.MemoryPoolOutOfMemoryError",
+    "Neo.TransientError.General.TransactionMemoryLimit",
+    "Neo.TransientError.General.OutOfMemoryError",
+}
+
+CORRECTION_HINTS = {
+    "timeout": (
+        "The query did not finish within {timeout}. "
+        "Add a LIMIT, filter on indexed properties earlier in the MATCH clause "
+        "and avoid unbounded variable length paths or cartesian products."
+    ),
+    "memory": (
+        "The query exceeded the transaction memory limit. "
+        "Add a LIMIT, aggregate earlier with WITH and avoid collecting large lists."
+    ),
+    "database": "The database rejected the query. Correct the Cypher statement.",
+}
+
+
+class CypherExecutionError(BaseModel):
+    """A structured description of a failed Cypher execution, used by the correction loop."""
+
+    kind: Literal["timeout", "memory", "database"] = Field(
+        description="The failure category."
+    )
+    code: Optional[str] = Field(
+        description="The Neo4j status code, if the server reported one.", default=None
+    )
+    message: str = Field(description="The error message.")
+    timeout: Optional[float] = Field(
+        description="The timeout in seconds that was applied, if any.", default=None
+    )
+
+    @classmethod
+    def from_neo4j_error(
+        cls, error: Neo4jError, timeout: Optional[float] = None
+    ) -> "CypherExecutionError":
+        """
+        Classify an error raised by the Neo4j driver.
+
+        Parameters
+        ----------
+        error : Neo4jError
+            The error.
+        timeout : Optional[float], optional
+            The timeout in seconds that was applied, by default None
+
+        Returns
+        -------
+        CypherExecutionError
+            The structured error.
+        """
+
+        code = error.code
+        if code in TIMEOUT_ERROR_CODES:
+            kind: Literal["timeout", "memory", "database"] = "timeout"
+        elif code in MEMORY_ERROR_CODES:
+            kind = "memory"
+        else:
+            kind = "database"
+
+        return cls(
+            kind=kind, code=code, message=str(error.message or error), timeout=timeout
+        )
+
+    @classmethod
+    def from_client_timeout(cls, timeout: float) -> "CypherExecutionError":
+        """The error for a query cancelled by the client because it ran past its timeout."""
+
+        return cls(
+            kind="timeout",
+            message=f"Query cancelled by the client after {timeout} seconds.",
+            timeout=timeout,
+        )
+
+    def to_correction_message(self) -> str:
+        """A message for the `errors` list that tells the correction LLM how to fix the statement."""
+
+        timeout = (
+            f"{self.timeout} seconds" if self.timeout is not None else "the timeout"
+        )
+        hint = CORRECTION_HINTS[self.kind].format(timeout=timeout)
+        return f"Cypher execution failed ({self.kind}): {self.message} {hint}"
@@ -2,56 +2,227 @@
 This code is based on content found in the LangGraph documentation: https://python.langchain.com/docs/tutorials/graph/#advanced-implementation-with-langgraph
 """
 
-from typing import Any, Callable, Coroutine, Dict, List
+import asyncio
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 
 from langchain_neo4j import Neo4jGraph
+from neo4j.exceptions import Neo4jError
 
+from ....cache import CachedCypherResult, CypherResultCache
 from ....constants import NO_CYPHER_RESULTS
+from ....database import AsyncNeo4jGraph, RecordBudget
 from ..state import CypherOutputState, CypherState
+from ..validation.utils.schema_cache import CompiledSchemaCache, get_compiled_schema
+from .models import CypherExecutionError
+
+# extra seconds the client waits for the server to enforce the timeout before cancelling
+CLIENT_TIMEOUT_GRACE_PERIOD = 2.0
 
 
 def create_text2cypher_execution_node(
     graph: Neo4jGraph,
-) -> Callable[
-    [CypherState], Coroutine[Any, Any, Dict[str, List[CypherOutputState] | List[str]]]
-]:
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    timeout: Optional[float] = None,
+    max_attempts: int = 3,
+    result_cache: Optional[CypherResultCache] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
+) -> Callable[[CypherState], Coroutine[Any, Any, Dict[str, Any]]]:
     """
     Create a Text2Cypher execution node for a LangGraph workflow.
+    If `max_rows` or `max_bytes` is set, records beyond the budget are dropped and the output is marked as truncated.
+    With `async_graph`, records are streamed from the driver and fetching stops once the budget is spent.
+
+    If the database rejects the statement, for example because it timed out or ran out of memory,
+    the error is returned as a correction hint and the workflow is routed back to the Correction node,
+    unless max attempts have been reached.
 
     Parameters
     ----------
     graph : Neo4jGraph
         The Neo4j graph wrapper.
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used to execute the Cypher. If None, `graph` is queried in a worker thread, by default None
+    max_rows : Optional[int], optional
+        The max number of records to keep. If None, there is no row limit, by default None
+    max_bytes : Optional[int], optional
+        The max total size of the kept records, estimated from their JSON serialization.
+        If None, there is no size limit, by default None
+    timeout : Optional[float], optional
+        The transaction timeout in seconds. Only applied with `async_graph`, where it is passed in the transaction config
+        and enforced on the client as well. Without `async_graph`, the timeout of `graph` is used. By default None
+    max_attempts: int, optional
+        The max number of allowed attempts to generate valid Cypher, by default 3
+    result_cache : Optional[CypherResultCache], optional
+        The cache of executed Cypher results. Entries are invalidated when the schema fingerprint changes.
+        If None, every statement is executed, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache of compiled schema snapshots. Share one instance between the nodes of a workflow,
+        so the schema is compiled once. If None, the node creates its own, by default None
 
     Returns
     -------
-    Callable[[CypherState], Dict[str, List[CypherOutputState] | List[str]]]
+    Callable[[CypherState], Dict[str, Any]]
         The LangGraph node.
     """
 
-    async def execute_cypher(
-        state: CypherState,
-    ) -> Dict[str, List[CypherOutputState] | List[Any]]:
+    if schema_cache is None:
+        schema_cache = CompiledSchemaCache()
+    # Neo4jGraph does not expose the database name publicly
+    database: str = (
+        async_graph.database
+        if async_graph is not None
+        else getattr(graph, "_database", "neo4j")
+    )
+
+    async def execute_cypher(state: CypherState) -> Dict[str, Any]:
         """
         Executes the given Cypher statement.
         """
-        records = graph.query(state.get("statement", ""))
-        steps = state.get("cypher_steps", list())
-        steps.append("execute_cypher")
+
+        steps = state.get("cypher_steps", list()) + ["execute_cypher"]
+        statement = state.get("statement", "")
+
+        fingerprint = ""
+        if result_cache is not None:
+            fingerprint = _get_fingerprint(result_cache)
+            cached = result_cache.get(
+                statement, database=database, fingerprint=fingerprint
+            )
+            if cached is not None:
+                return {
+                    "next_action_cypher": "__end__",
+                    "cyphers": [
+                        _create_output(
+                            state,
+                            steps + ["cypher_result_cache_hit"],
+                            errors=state.get("errors", list()),
+                            records=cached.records or NO_CYPHER_RESULTS,
+                            truncated=cached.truncated,
+                            truncation_reason=cached.truncation_reason,
+                            record_count=cached.record_count,
+                        )
+                    ],
+                    "steps": [steps],
+                }
+
+        try:
+            records, budget = await _fetch_records(statement)
+        except Neo4jError as e:
+            error = CypherExecutionError.from_neo4j_error(e, timeout=timeout)
+        except asyncio.TimeoutError:
+            # the server did not enforce the timeout, so the client cancelled the query
+            error = CypherExecutionError.from_client_timeout(timeout or 0.0)
+        else:
+            if result_cache is not None:
+                result_cache.set(
+                    statement,
+                    CachedCypherResult(
+                        records=records,
+                        truncated=budget.truncated,
+                        truncation_reason=budget.truncation_reason,
+                        record_count=budget.row_count,
+                    ),
+                    database=database,
+                    fingerprint=fingerprint,
+                )
+            return {
+                "next_action_cypher": "__end__",
+                "cyphers": [
+                    _create_output(
+                        state,
+                        steps,
+                        errors=state.get("errors", list()),
+                        records=records if records else NO_CYPHER_RESULTS,
+                        truncated=budget.truncated,
+                        truncation_reason=budget.truncation_reason,
+                        record_count=budget.row_count,
+                    )
+                ],
+                "steps": [steps],
+            }
+
+        errors = [error.to_correction_message()]
+        if state.get("attempts", 0) < max_attempts:
+            return {
+                "next_action_cypher": "correct_cypher",
+                "errors": errors,
+                "cypher_steps": ["execute_cypher"],
+            }
+
         return {
+            "next_action_cypher": "__end__",
             "cyphers": [
-                CypherOutputState(
-                    **{
-                        "task": state.get("task", ""),
-                        "statement": state.get("statement", ""),
-                        "parameters": None,
-                        "errors": state.get("errors", list()),
-                        "records": records if records else NO_CYPHER_RESULTS,
-                        "cypher_steps": steps,
-                    }
+                _create_output(
+                    state,
+                    steps,
+                    errors=state.get("errors", list()) + errors,
+                    records=NO_CYPHER_RESULTS,
                 )
             ],
             "steps": [steps],
         }
 
+    def _get_fingerprint(cache: CypherResultCache) -> str:
+        fingerprint = get_compiled_schema(
+            graph=graph, schema_cache=schema_cache
+        ).fingerprint
+        if cache.fingerprint_provider is not None:
+            fingerprint = f"{fingerprint}:{cache.fingerprint_provider()}"
+        return fingerprint
+
+    async def _fetch_records(
+        statement: str,
+    ) -> Tuple[List[Dict[str, Any]], RecordBudget]:
+        if async_graph is not None:
+            stream = async_graph.stream(
+                statement,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+                timeout=timeout,
+                metadata={"app": "text2cypher", "node": "execute_cypher"},
+            )
+            if timeout is None:
+                records = await stream.to_list()
+            else:
+                # cancelling the fetch kills the connection, which stops the transaction
+                records = await asyncio.wait_for(
+                    stream.to_list(), timeout=timeout + CLIENT_TIMEOUT_GRACE_PERIOD
+                )
+            return records, stream.budget
+
+        budget = RecordBudget(max_rows=max_rows, max_bytes=max_bytes)
+        all_records = await asyncio.to_thread(graph.query, statement)
+        records = list()
+        for record in all_records:
+            if not budget.admit(record):
+                break
+            records.append(record)
+        return records, budget
+
     return execute_cypher
+
+
+def _create_output(
+    state: CypherState,
+    steps: List[str],
+    errors: List[str],
+    records: List[Dict[str, Any]],
+    truncated: bool = False,
+    truncation_reason: Optional[str] = None,
+    record_count: int = 0,
+) -> CypherOutputState:
+    return CypherOutputState(
+        **{
+            "task": state.get("task", ""),
+            "statement": state.get("statement", ""),
+            "parameters": None,
+            "errors": errors,
+            "records": records,
+            "cypher_steps": steps,
+            "truncated": truncated,
+            "truncation_reason": truncation_reason,
+            "record_count": record_count,
+        }
+    )
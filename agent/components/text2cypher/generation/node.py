@@ -2,47 +2,245 @@
 This code is based on content found in the LangGraph documentation: https://python.langchain.com/docs/tutorials/graph/#advanced-implementation-with-langgraph
 """
 
-from typing import Any, Callable, Coroutine, Dict
+import asyncio
+import re
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Sequence, Tuple
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_neo4j import Neo4jGraph
 
+from ....cache import CypherGenerationCache, CypherSyntaxCache
 from ....components.text2cypher.generation.prompts import (
     create_text2cypher_generation_prompt_template,
 )
+from ....constants import NUM_CYPHER_EXAMPLES
+from ....database import AsyncNeo4jGraph
 from ....retrievers.cypher_examples.base import BaseCypherExampleRetriever
 from ..state import CypherInputState
+from ..validation.models import CypherCostGuard
+from ..validation.utils.schema_cache import CompiledSchemaCache, get_compiled_schema
+from ..validation.validators import arun_local_validators
 
 generation_prompt = create_text2cypher_generation_prompt_template()
 
+# the blank lines that start a new few shot example. A Cypher statement may contain blank lines itself
+EXAMPLE_SEPARATOR_PATTERN = re.compile(r"\n[ \t]*\n(?=Question:)")
+
 
 def create_text2cypher_generation_node(
     llm: BaseChatModel,
     graph: Neo4jGraph,
     cypher_example_retriever: BaseCypherExampleRetriever,
+    generation_cache: Optional[CypherGenerationCache] = None,
+    num_candidates: int = 1,
+    candidate_temperatures: Optional[Sequence[float]] = None,
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    syntax_cache: Optional[CypherSyntaxCache] = None,
+    cost_guard: Optional[CypherCostGuard] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
 ) -> Callable[[CypherInputState], Coroutine[Any, Any, dict[str, Any]]]:
-    text2cypher_chain = generation_prompt | llm | StrOutputParser()
+    """
+    Create a Text2Cypher generation node for a LangGraph workflow.
+    If a `generation_cache` holds a validated statement for the same task, schema and few shot examples,
+    the LLM is not called and the workflow continues directly with the Execution node.
 
-    async def generate_cypher(state: CypherInputState) -> Dict[str, Any]:
-        """
-        Generates a cypher statement based on the provided schema and user input
-        """
+    With `num_candidates` greater than 1, the node generates candidates speculatively.
+    The candidates are generated and checked with the validators that do not use an LLM concurrently.
+    The first candidate without errors is kept and the others are cancelled.
+    If no candidate passes, the candidate with the fewest errors is kept.
+    Either way the Validation node checks the kept statement as usual.
+    Candidates are varied by dropping a different subset of the few shot examples from each prompt,
+    and by `candidate_temperatures` if provided. The first candidate always sees every example.
+
+    Parameters
+    ----------
+    llm : BaseChatModel
+        The LLM to use for processing.
+    graph : Neo4jGraph
+        The Neo4j graph wrapper.
+    cypher_example_retriever : BaseCypherExampleRetriever
+        The retriever used to collect Cypher examples for few shot prompting.
+    generation_cache : Optional[CypherGenerationCache], optional
+        The cache of validated Cypher statements. Statements are added by the Validation node, by default None
+    num_candidates : int, optional
+        The number of candidates generated concurrently. If 1, a single statement is generated, by default 1
+    candidate_temperatures : Optional[Sequence[float]], optional
+        The sampling temperature of each candidate, bound to `llm`. Candidates beyond its length use the LLM's own temperature.
+        If None, the temperature is not changed, by default None
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used to check the syntax of candidates. If None, `graph` is queried in a worker thread, by default None
+    syntax_cache : Optional[CypherSyntaxCache], optional
+        The cache of EXPLAIN outcomes of candidates. Share it with the Validation node, so the kept candidate
+        is not explained twice, by default None
+    cost_guard : Optional[CypherCostGuard], optional
+        The thresholds the EXPLAIN plan of a candidate must respect to pass. Requires `async_graph`. If None, the plan cost is not checked, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache of compiled schema snapshots. Share one instance between the nodes of a workflow,
+        so the schema is compiled once. If None, the node creates its own, by default None
+
+    Returns
+    -------
+    Callable[[CypherInputState], CypherState]
+        The LangGraph node.
+    """
 
-        examples: str = cypher_example_retriever.get_examples(
-            **{"query": state.get("task", ""), "k": 8}
+    assert num_candidates > 0, "`num_candidates` must be greater than 0."
+
+    if schema_cache is None:
+        schema_cache = CompiledSchemaCache()
+    text2cypher_chain = generation_prompt | llm | StrOutputParser()
+
+    temperatures = list(candidate_temperatures or list())
+    candidate_chains = [
+        (
+            generation_prompt
+            | llm.bind(temperature=temperatures[i])
+            | StrOutputParser()
+            if i < len(temperatures)
+            else text2cypher_chain
         )
+        for i in range(num_candidates)
+    ]
 
-        # print("\n\nExamples: ", examples, "\n\n")
-        generated_cypher = await text2cypher_chain.ainvoke(
+    async def generate_and_validate_candidate(
+        idx: int, task: str, examples: str
+    ) -> Tuple[int, str, List[str]]:
+        statement = await candidate_chains[idx].ainvoke(
             {
-                "question": state.get("task", ""),
-                "fewshot_examples": examples,
+                "question": task,
+                "fewshot_examples": select_candidate_examples(
+                    examples, idx, num_candidates
+                ),
                 "schema": graph.schema,
             }
         )
-        # print("GENERATED CYPHER: ", generated_cypher, "\n\n")
+        _, errors = await arun_local_validators(
+            graph=graph,
+            cypher_statement=statement,
+            async_graph=async_graph,
+            schema_cache=schema_cache,
+            syntax_cache=syntax_cache,
+            cost_guard=cost_guard,
+        )
+        return idx, statement, errors
+
+    async def generate_speculatively(task: str, examples: str) -> Tuple[str, int]:
+        tasks = [
+            asyncio.create_task(generate_and_validate_candidate(i, task, examples))
+            for i in range(num_candidates)
+        ]
+        best: Optional[Tuple[int, str, int]] = None
+        error: Optional[BaseException] = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    idx, statement, errors = await next_done
+                except Exception as e:
+                    # a failed candidate does not stop the others
+                    error = error or e
+                    continue
+                if not errors:
+                    return statement, idx
+                if best is None or len(errors) < best[0]:
+                    best = (len(errors), statement, idx)
+        finally:
+            for t in tasks:
+                t.cancel()
+            # collects the outcome of the cancelled candidates, so their errors are not reported as unhandled
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if best is None:
+            assert error is not None
+            raise error
+        return best[1], best[2]
+
+    async def generate_cypher(state: CypherInputState) -> Dict[str, Any]:
+        """
+        Generates a cypher statement based on the provided schema and user input
+        """
+
+        examples = state.get("examples")
+        if examples is None:
+            examples = await cypher_example_retriever.aget_examples(
+                query=state.get("task", ""), k=NUM_CYPHER_EXAMPLES
+            )
+
         steps = state.get("prev_steps", list()) + ["generate_cypher"]
-        return {"statement": generated_cypher, "cypher_steps": steps}
+
+        cache_key = None
+        if generation_cache is not None:
+            cache_key = generation_cache.make_key(
+                task=state.get("task", ""),
+                examples=examples,
+                fingerprint=get_compiled_schema(
+                    graph=graph, schema_cache=schema_cache
+                ).fingerprint,
+            )
+            cached_cypher = generation_cache.get(cache_key)
+            if cached_cypher is not None:
+                # the statement passed validation before, so skip to execution
+                return {
+                    "statement": cached_cypher,
+                    "next_action_cypher": "execute_cypher",
+                    "generation_cache_key": cache_key,
+                    "cypher_steps": steps + ["generation_cache_hit"],
+                }
+
+        if num_candidates > 1:
+            generated_cypher, candidate = await generate_speculatively(
+                state.get("task", ""), examples
+            )
+            steps = steps + [f"speculative_candidate_{candidate}"]
+        else:
+            # print("\n\nExamples: ", examples, "\n\n")
+            generated_cypher = await text2cypher_chain.ainvoke(
+                {
+                    "question": state.get("task", ""),
+                    "fewshot_examples": examples,
+                    "schema": graph.schema,
+                }
+            )
+        # print("GENERATED CYPHER: ", generated_cypher, "\n\n")
+        output: Dict[str, Any] = {
+            "statement": generated_cypher,
+            "next_action_cypher": "validate_cypher",
+            "cypher_steps": steps,
+        }
+        if cache_key is not None:
+            output["generation_cache_key"] = cache_key
+        return output
 
     return generate_cypher
+
+
+def select_candidate_examples(
+    examples: str, candidate: int, num_candidates: int
+) -> str:
+    """
+    Select the few shot examples shown to a speculative candidate.
+    The first candidate sees every example. Each other candidate drops a different, evenly spread
+    subset of the examples, so the candidates are prompted differently.
+
+    Parameters
+    ----------
+    examples : str
+        The formatted few shot examples, each starting with `Question:` and separated by blank lines.
+    candidate : int
+        The index of the candidate.
+    num_candidates : int
+        The number of candidates.
+
+    Returns
+    -------
+    str
+        The formatted few shot examples of the candidate.
+    """
+
+    blocks = [b for b in EXAMPLE_SEPARATOR_PATTERN.split(examples) if b.strip()]
+    if candidate == 0 or num_candidates < 2 or len(blocks) < 2:
+        return examples
+
+    dropped = (candidate - 1) % num_candidates
+    kept = [b for i, b in enumerate(blocks) if i % num_candidates != dropped]
+    return "\n\n".join(kept or blocks)
@@ -5,12 +5,14 @@ This file contains classes that manage the state of a Text2Cypher Agent or subgr
 from operator import add
 from typing import Annotated, Any, Dict, List, Optional
 
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 
 
 class CypherInputState(TypedDict):
     task: str
     prev_steps: List[str]
+    # few shot examples retrieved ahead of generation, such as by the planner for all tasks at once
+    examples: NotRequired[str]
 
 
 class CypherState(TypedDict):
@@ -22,6 +24,8 @@ class CypherState(TypedDict):
     next_action_cypher: str
     attempts: int
     cypher_steps: Annotated[List[str], add]
+    # the generation cache key of the task, set when a generation cache is used
+    generation_cache_key: NotRequired[str]
 
 
 class CypherOutputState(TypedDict):
@@ -31,3 +35,7 @@ class CypherOutputState(TypedDict):
     errors: List[str]
     records: List[Dict[str, Any]]
     cypher_steps: List[str]
+    # execution metadata, set when the record fetch is bounded
+    truncated: NotRequired[bool]
+    truncation_reason: NotRequired[Optional[str]]
+    record_count: NotRequired[int]
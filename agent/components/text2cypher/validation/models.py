@@ -2,9 +2,10 @@
 This code is based on content found in the LangGraph documentation: https://python.langchain.com/docs/tutorials/graph/#advanced-implementation-with-langgraph
 """
 
-from typing import Any, Dict, List, Optional, Set
+import time
+from typing import Any, Dict, FrozenSet, List, Literal, NamedTuple, Optional, Set, Tuple
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 NUMBER_ENUM = {"INTEGER", "FLOAT"}
 
@@ -272,7 +273,7 @@ class Neo4jStructuredSchema(BaseModel):
                 for p in prop_list
                 if isinstance(p, Neo4jStructuredSchemaPropertyString) and p.is_enum
             }
-            for rel_type, prop_list in self.node_props.items()
+            for rel_type, prop_list in self.rel_props.items()
         }
 
     def get_node_property_values_range(
@@ -326,9 +327,137 @@ class Neo4jStructuredSchema(BaseModel):
                 for p in prop_list
                 if isinstance(p, Neo4jStructuredSchemaPropertyNumber)
             }
-            for rel_type, prop_list in self.node_props.items()
+            for rel_type, prop_list in self.rel_props.items()
         }
 
+    def get_node_property_types(self) -> Dict[str, Dict[str, str]]:
+        """
+        A Python dictionary with node labels as parent keys, property names as child keys and the Neo4j property type as the values.
+
+        Returns
+        -------
+        Dict[str, Dict[str, str]]
+            The Python dictionary.
+        """
+        return {
+            label: {p.property: p.type for p in prop_list}
+            for label, prop_list in self.node_props.items()
+        }
+
+    def get_relationship_property_types(self) -> Dict[str, Dict[str, str]]:
+        """
+        A Python dictionary with relationship types as parent keys, property names as child keys and the Neo4j property type as the values.
+
+        Returns
+        -------
+        Dict[str, Dict[str, str]]
+            The Python dictionary.
+        """
+        return {
+            rel_type: {p.property: p.type for p in prop_list}
+            for rel_type, prop_list in self.rel_props.items()
+        }
+
+
+class CompiledNeo4jSchema(BaseModel):
+    """
+    An immutable snapshot of a `Neo4jStructuredSchema` with every lookup table prebuilt.
+    Validation against a compiled schema only performs dictionary lookups.
+    A snapshot should be created once per schema version, identified by `fingerprint`.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    fingerprint: str = Field(
+        description="A hash of the structured schema this snapshot was compiled from."
+    )
+    compiled_at: float = Field(
+        description="The time the snapshot was compiled, as returned by `time.monotonic`."
+    )
+    node_properties: Dict[str, FrozenSet[str]] = Field(
+        description="Node labels mapped to their property names."
+    )
+    relationship_properties: Dict[str, FrozenSet[str]] = Field(
+        description="Relationship types mapped to their property names."
+    )
+    node_property_types: Dict[str, Dict[str, str]] = Field(
+        description="Node labels mapped to property names and their Neo4j types."
+    )
+    relationship_property_types: Dict[str, Dict[str, str]] = Field(
+        description="Relationship types mapped to property names and their Neo4j types."
+    )
+    node_property_values: Dict[str, Dict[str, FrozenSet[str]]] = Field(
+        description="Node labels mapped to property names and their enum of values."
+    )
+    relationship_property_values: Dict[str, Dict[str, FrozenSet[str]]] = Field(
+        description="Relationship types mapped to property names and their enum of values."
+    )
+    node_property_ranges: Dict[str, Dict[str, Neo4jStructuredSchemaPropertyNumber]] = (
+        Field(description="Node labels mapped to numeric property names and ranges.")
+    )
+    relationship_property_ranges: Dict[
+        str, Dict[str, Neo4jStructuredSchemaPropertyNumber]
+    ] = Field(
+        description="Relationship types mapped to numeric property names and ranges."
+    )
+    relationship_triples: FrozenSet[Tuple[str, str, str]] = Field(
+        description="The (start label, relationship type, end label) triples found in the schema."
+    )
+
+    @classmethod
+    def from_structured_schema(
+        cls, structured_schema: Neo4jStructuredSchema, fingerprint: str = ""
+    ) -> "CompiledNeo4jSchema":
+        """
+        Compile a `Neo4jStructuredSchema` into a snapshot.
+
+        Parameters
+        ----------
+        structured_schema : Neo4jStructuredSchema
+            The validated structured schema.
+        fingerprint : str, optional
+            A hash identifying the schema version, by default ""
+
+        Returns
+        -------
+        CompiledNeo4jSchema
+            The compiled snapshot.
+        """
+
+        def _freeze_values(
+            values: Dict[str, Dict[str, Set[str]]],
+        ) -> Dict[str, Dict[str, FrozenSet[str]]]:
+            return {
+                k: {prop: frozenset(vals) for prop, vals in props.items()}
+                for k, props in values.items()
+            }
+
+        return cls(
+            fingerprint=fingerprint,
+            compiled_at=time.monotonic(),
+            node_properties={
+                k: frozenset(v)
+                for k, v in structured_schema.get_node_properties_enum().items()
+            },
+            relationship_properties={
+                k: frozenset(v)
+                for k, v in structured_schema.get_relationship_properties_enum().items()
+            },
+            node_property_types=structured_schema.get_node_property_types(),
+            relationship_property_types=structured_schema.get_relationship_property_types(),
+            node_property_values=_freeze_values(
+                structured_schema.get_node_property_values_enum()
+            ),
+            relationship_property_values=_freeze_values(
+                structured_schema.get_relationship_property_values_enum()
+            ),
+            node_property_ranges=structured_schema.get_node_property_values_range(),
+            relationship_property_ranges=structured_schema.get_relationship_property_values_range(),
+            relationship_triples=frozenset(
+                (r.start, r.type, r.end) for r in structured_schema.relationships
+            ),
+        )
+
 
 class CypherValidationTask(BaseModel):
     labels_or_types: Optional[str] = Field(
@@ -367,3 +496,270 @@ class CypherValidationTask(BaseModel):
         parsed_final = [lbl for lbl in parsed if not lbl.startswith("!")]
 
         return parsed_final
+
+    @property
+    def parsed_and_or(self) -> Optional[Literal["and", "or"]]:
+        """
+        How the parsed labels or types are combined. `:` and `&` require all of them, `|` any of them.
+        None if there is a single label or type.
+        """
+
+        if self.labels_or_types is None or len(self.parsed_labels_or_types) < 2:
+            return None
+        return "or" if "|" in self.labels_or_types else "and"
+
+
+class CypherToken(NamedTuple):
+    """A single lexical token of a Cypher statement. `start` and `end` are character offsets."""
+
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class CypherValue(BaseModel):
+    """A value found in a property map or on the right hand side of a predicate."""
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: Literal[
+        "string", "number", "boolean", "null", "parameter", "list", "expression"
+    ] = Field(description="The kind of value.")
+    value: Optional[str] = Field(
+        description="The literal value as a string. None for parameters, lists and expressions.",
+        default=None,
+    )
+    items: Tuple["CypherValue", ...] = Field(
+        description="The items of a list literal.", default=tuple()
+    )
+
+    @property
+    def is_literal(self) -> bool:
+        """Whether the value is a string, number or boolean literal."""
+        return self.value is not None
+
+
+class CypherNodePattern(BaseModel):
+    """A Node pattern such as `(n:Label {prop: 'value'})`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    variable: Optional[str] = Field(description="The variable, if declared.")
+    labels: Optional[str] = Field(
+        description="The label expression, if declared.",
+        examples=["NodeA", "NodeA&!NodeB", "NodeA|NodeB", "NodeA:NodeB"],
+    )
+    properties: Dict[str, CypherValue] = Field(
+        description="The inline property map.", default=dict()
+    )
+    clause: Optional[str] = Field(
+        description="The clause the pattern belongs to.", default=None
+    )
+    start: int = Field(description="The character offset of the opening parenthesis.")
+    end: int = Field(description="The character offset after the closing parenthesis.")
+
+
+class CypherRelationshipPattern(BaseModel):
+    """A Relationship pattern such as `-[r:TYPE {prop: 'value'}]->` and the Nodes it connects."""
+
+    model_config = ConfigDict(frozen=True)
+
+    variable: Optional[str] = Field(description="The variable, if declared.")
+    types: Optional[str] = Field(
+        description="The relationship type expression, if declared.",
+        examples=["REL_A", "REL_A|REL_B"],
+    )
+    properties: Dict[str, CypherValue] = Field(
+        description="The inline property map.", default=dict()
+    )
+    direction: Literal["left", "right", "none"] = Field(
+        description="`right` for `-->`, `left` for `<--` and `none` for `--`."
+    )
+    left_node: int = Field(description="The index of the left Node pattern.")
+    right_node: int = Field(description="The index of the right Node pattern.")
+    clause: Optional[str] = Field(
+        description="The clause the pattern belongs to.", default=None
+    )
+    start: int = Field(description="The character offset of the left connector.")
+    end: int = Field(description="The character offset after the right connector.")
+    body_start: int = Field(
+        description="The character offset after the left connector."
+    )
+    body_end: int = Field(description="The character offset of the right connector.")
+
+
+class CypherPredicate(BaseModel):
+    """A property predicate such as `n.prop = 'value'` or `n.prop IN [1, 2]`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    variable: str = Field(description="The variable the property belongs to.")
+    property_name: str = Field(description="The property name.")
+    operator: str = Field(
+        description="The operator. Keywords are upper case.",
+        examples=["=", "<>", "CONTAINS", "STARTS WITH", "IN", "IS NULL"],
+    )
+    value: Optional[CypherValue] = Field(
+        description="The compared value. None for `IS NULL` and `IS NOT NULL`.",
+        default=None,
+    )
+    clause: Optional[str] = Field(
+        description="The clause the predicate belongs to.", default=None
+    )
+
+
+class CypherPropertyReference(BaseModel):
+    """A property access such as `n.prop`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    variable: str = Field(description="The variable the property belongs to.")
+    property_name: str = Field(description="The property name.")
+    clause: Optional[str] = Field(
+        description="The clause the reference belongs to.", default=None
+    )
+
+
+class CypherClause(BaseModel):
+    """A clause keyword found in the statement, such as `MATCH` or `DETACH DELETE`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    keyword: str = Field(description="The upper case clause keyword.")
+    start: int = Field(description="The character offset of the keyword.")
+    token_index: int = Field(description="The index of the keyword token.")
+
+
+class CypherProcedureCall(BaseModel):
+    """A procedure invoked with `CALL`, such as `CALL db.labels() YIELD label`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str = Field(description="The fully qualified procedure name.")
+    start: int = Field(description="The character offset of the `CALL` keyword.")
+    yields: bool = Field(description="Whether the call is followed by `YIELD`.")
+
+
+class ParsedCypherStatement(BaseModel):
+    """
+    The partial syntax tree of a Cypher statement.
+    Covers clauses, Node and Relationship patterns, property predicates, RETURN projections and procedure calls.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    statement: str = Field(description="The parsed statement.")
+    tokens: Tuple[CypherToken, ...] = Field(
+        description="The tokens of the statement, excluding whitespace and comments."
+    )
+    clauses: Tuple[CypherClause, ...] = Field(description="The clauses, in order.")
+    nodes: Tuple[CypherNodePattern, ...] = Field(
+        description="The Node patterns, in order."
+    )
+    relationships: Tuple[CypherRelationshipPattern, ...] = Field(
+        description="The Relationship patterns, in order."
+    )
+    predicates: Tuple[CypherPredicate, ...] = Field(
+        description="The property predicates, in order."
+    )
+    projections: Tuple[CypherPropertyReference, ...] = Field(
+        description="The properties referenced in RETURN clauses, in order."
+    )
+    procedures: Tuple[CypherProcedureCall, ...] = Field(
+        description="The procedures invoked with CALL, in order.", default=tuple()
+    )
+
+    def get_node_variable_labels(self) -> Dict[str, Optional[str]]:
+        """
+        A Python dictionary with Node variables as keys and the first label expression declared for them as values.
+
+        Returns
+        -------
+        Dict[str, Optional[str]]
+            The Python dictionary.
+        """
+        return _first_declared(
+            [(n.variable, n.labels) for n in self.nodes if n.variable is not None]
+        )
+
+    def get_relationship_variable_types(self) -> Dict[str, Optional[str]]:
+        """
+        A Python dictionary with Relationship variables as keys and the first type expression declared for them as values.
+
+        Returns
+        -------
+        Dict[str, Optional[str]]
+            The Python dictionary.
+        """
+        return _first_declared(
+            [
+                (r.variable, r.types)
+                for r in self.relationships
+                if r.variable is not None
+            ]
+        )
+
+    def get_node_labels(self, node: CypherNodePattern) -> Optional[str]:
+        """The label expression of a Node pattern, falling back to the labels declared elsewhere for its variable."""
+        if node.labels is not None or node.variable is None:
+            return node.labels
+        return self.get_node_variable_labels().get(node.variable)
+
+
+def _first_declared(
+    pairs: List[Tuple[str, Optional[str]]],
+) -> Dict[str, Optional[str]]:
+    result: Dict[str, Optional[str]] = dict()
+    for variable, labels_or_types in pairs:
+        if result.get(variable) is None:
+            result[variable] = labels_or_types
+    return result
+
+
+class CypherCostGuard(BaseModel):
+    """
+    The thresholds a Cypher EXPLAIN plan must respect before the statement may be executed.
+    A threshold set to None is not checked.
+    """
+
+    max_estimated_rows: Optional[float] = Field(
+        default=1_000_000,
+        description="The max number of rows any operator of the plan is estimated to produce.",
+    )
+    max_all_nodes_scan_rows: Optional[float] = Field(
+        default=0,
+        description="The max estimated rows of an AllNodesScan. 0 rejects every scan of all nodes.",
+    )
+    max_label_scan_rows: Optional[float] = Field(
+        default=100_000,
+        description="The max estimated rows of a NodeByLabelScan whose nodes are then filtered by a property, which an index seek could avoid.",
+    )
+    reject_cartesian_product: bool = Field(
+        default=True,
+        description="Whether plans with a CartesianProduct of disconnected patterns are rejected.",
+    )
+
+
+class CypherPlanIssue(BaseModel):
+    """An operator of a Cypher EXPLAIN plan that exceeds a `CypherCostGuard` threshold."""
+
+    operator: str = Field(
+        description="The operator type, such as AllNodesScan, without the runtime suffix."
+    )
+    estimated_rows: float = Field(
+        description="The number of rows the operator is estimated to produce."
+    )
+    identifiers: List[str] = Field(
+        default_factory=list, description="The variables the operator introduces."
+    )
+    reason: str = Field(description="Why the operator is too costly.")
+    hint: str = Field(description="How the Cypher statement may be corrected.")
+
+    def to_error(self) -> str:
+        """Format the issue as an error for the Correction node."""
+
+        return (
+            f"Cost guard: {self.operator} estimated to produce {self.estimated_rows:,.0f} rows. "
+            f"{self.reason} Hint: {self.hint}"
+        )
@@ -7,17 +7,18 @@ from typing import Any, Callable, Coroutine, Dict, Optional
 from langchain_core.language_models import BaseChatModel
 from langchain_neo4j import Neo4jGraph
 
-from ....components.text2cypher.validation.models import ValidateCypherOutput
+from ....cache import CypherGenerationCache, CypherSyntaxCache
+from ....components.text2cypher.validation.models import (
+    CypherCostGuard,
+    ValidateCypherOutput,
+)
 from ....components.text2cypher.validation.prompts import (
     create_text2cypher_validation_prompt_template,
 )
+from ....database import AsyncNeo4jGraph
 from ..state import CypherState
-from .validators import (
-    correct_cypher_query_relationship_direction,
-    validate_cypher_query_syntax,
-    validate_cypher_query_with_schema,
-    validate_no_writes_in_cypher_query,
-)
+from .utils.schema_cache import CompiledSchemaCache
+from .validators import arun_local_validators
 
 validation_prompt_template = create_text2cypher_validation_prompt_template()
 
@@ -28,6 +29,12 @@ def create_text2cypher_validation_node(
     llm_validation: bool = False,
     max_attempts: int = 3,
     attempt_cypher_execution_on_final_attempt: bool = False,
+    schema_cache_ttl: Optional[float] = None,
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    generation_cache: Optional[CypherGenerationCache] = None,
+    syntax_cache: Optional[CypherSyntaxCache] = None,
+    cost_guard: Optional[CypherCostGuard] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
 ) -> Callable[[CypherState], Coroutine[Any, Any, dict[str, Any]]]:
     """
     Create a Text2Cypher query validation node for a LangGraph workflow.
@@ -47,6 +54,22 @@ def create_text2cypher_validation_node(
     attempt_cypher_execution_on_final_attempt, bool, optional
         THIS MAY BE DANGEROUS.
         Whether to attempt Cypher execution on the last attempt, regardless of if the Cypher contains errors, by default False
+    schema_cache_ttl : Optional[float], optional
+        The number of seconds a compiled schema snapshot is trusted before the schema fingerprint is checked again.
+        If None, the snapshot is rebuilt only when the graph schema is refreshed. Ignored if `schema_cache` is provided, by default None
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used to check syntax. If None, `graph` is queried in a worker thread, by default None
+    generation_cache : Optional[CypherGenerationCache], optional
+        The cache of validated Cypher statements. Statements without errors are stored under the key set by the
+        Generation node, by default None
+    syntax_cache : Optional[CypherSyntaxCache], optional
+        The cache of EXPLAIN outcomes. A statement that was explained before is not sent to the database again, by default None
+    cost_guard : Optional[CypherCostGuard], optional
+        The thresholds the EXPLAIN plan must respect. Costly plans, such as full scans or cartesian products,
+        are sent to the Correction node with hints instead of being executed. Requires `async_graph`. If None, the plan cost is not checked, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache of compiled schema snapshots. Share one instance between the nodes of a workflow,
+        so the schema is compiled once. If None, the node creates its own with `schema_cache_ttl`, by default None
 
     Returns
     -------
@@ -54,6 +77,9 @@ def create_text2cypher_validation_node(
         The LangGraph node.
     """
 
+    if schema_cache is None:
+        schema_cache = CompiledSchemaCache(ttl=schema_cache_ttl)
+
     if llm is not None and llm_validation:
         validate_cypher_chain = validation_prompt_template | llm.with_structured_output(
             ValidateCypherOutput
@@ -68,32 +94,15 @@ def create_text2cypher_validation_node(
         errors = []
         mapping_errors = []
 
-        # print("syntax error check")
-        # Check for syntax errors
-        syntax_error = validate_cypher_query_syntax(
-            graph=graph, cypher_statement=state.get("statement", "")
+        corrected_cypher, local_errors = await arun_local_validators(
+            graph=graph,
+            cypher_statement=state.get("statement", ""),
+            async_graph=async_graph,
+            schema_cache=schema_cache,
+            syntax_cache=syntax_cache,
+            cost_guard=cost_guard,
         )
-
-        errors.extend(syntax_error)
-
-        # print("write clause check")
-        # check for write clauses
-        write_errors = validate_no_writes_in_cypher_query(state.get("statement", ""))
-        errors.extend(write_errors)
-
-        # print("correct cypher check")
-        # Experimental feature for correcting relationship directions
-        corrected_cypher = correct_cypher_query_relationship_direction(
-            graph=graph, cypher_statement=state.get("statement", "")
-        )
-
-       
-        # if not llm_validation:
-        # print("schema check")
-        cypher_errors = validate_cypher_query_with_schema(
-            graph=graph, cypher_statement=state.get("statement", "")
-        )
-        errors.extend(cypher_errors)
+        errors.extend(local_errors)
 
         # determine next node in workflow
         if (errors or mapping_errors) and GENERATION_ATTEMPT < max_attempts:
@@ -108,6 +117,15 @@ def create_text2cypher_validation_node(
         else:
             next_action = "__end__"
 
+        cache_key = state.get("generation_cache_key")
+        if (
+            generation_cache is not None
+            and cache_key is not None
+            and next_action == "execute_cypher"
+            and not (errors or mapping_errors)
+        ):
+            generation_cache.set(cache_key, corrected_cypher)
+
         return {
             "next_action_cypher": next_action,
             "statement": corrected_cypher,
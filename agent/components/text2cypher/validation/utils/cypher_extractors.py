@@ -1,27 +1,38 @@
-from typing import Any, Dict, List, Optional, Tuple
-
-import regex as re
-
-from ..models import CypherValidationTask
-from .regex_patterns import (
-    get_node_label_pattern,
-    get_node_pattern,
-    get_node_variable_pattern,
-    get_property_pattern,
-    get_relationship_pattern,
-    get_relationship_type_pattern,
-    get_relationship_variable_pattern,
-    get_variable_operator_property_pattern,
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..models import (
+    CypherPredicate,
+    CypherValidationTask,
+    CypherValue,
+    ParsedCypherStatement,
 )
+from .cypher_parser import parse_cypher_statement
 
 
 def extract_entities_for_validation(
     cypher_statement: str,
 ) -> Dict[str, List[CypherValidationTask]]:
-    nodes = _extract_nodes_and_properties_from_cypher_statement(cypher_statement)
-    rels = _extract_relationships_and_properties_from_cypher_statement(cypher_statement)
+    """
+    Extract Node and Relationship property tasks from the Cypher statement.
+    The statement is parsed a single time and the parse is shared with the other validators.
 
-    return {"nodes": nodes, "relationships": rels}
+    Parameters
+    ----------
+    cypher_statement : str
+        The statement.
+
+    Returns
+    -------
+    Dict[str, List[CypherValidationTask]]
+        A dictionary with keys `nodes` and `relationships`.
+    """
+
+    parsed = parse_cypher_statement(cypher_statement)
+
+    return {
+        "nodes": _build_node_tasks(parsed),
+        "relationships": _build_relationship_tasks(parsed),
+    }
 
 
 def _extract_nodes_and_properties_from_cypher_statement(
@@ -40,43 +51,8 @@ def _extract_nodes_and_properties_from_cypher_statement(
     List[CypherValidationTask]
         A List of CypherValidationTasks with keys `labels`, `operator`, `property_name` and `property_value`.
     """
-    tasks = list()
 
-    nodes = re.findall(get_node_pattern(), cypher_statement)
-    used_variables = set()
-    # find all variable assignments and process match clauses
-    for n in nodes:
-        variables = re.findall(get_node_variable_pattern(), n)
-        labels = _find_all_node_labels(n)
-
-        k = _parse_element_from_regex_result(regex_result=variables)
-        label = labels[0].strip() if len(labels) > 0 else None
-        match_props = re.findall(get_property_pattern(), n)
-        match_props = _parse_element_from_regex_result(regex_result=match_props)
-        # process ids in the MATCH clause
-        if match_props is not None:
-            match_props_parsed: List[Dict[str, Any]] = (
-                process_match_clause_property_ids(match_props)
-            )
-            [
-                e.update({"labels_or_types": label, "operator": "="})
-                for e in match_props_parsed
-            ]
-            tasks.extend(match_props_parsed)
-
-        # find and process property filters based on variables
-        if k is not None and k not in used_variables:
-            filters: List[Dict[str, Any]] = _find_all_filters(
-                variable=k, cypher_statement=cypher_statement
-            )
-            [e.update({"labels_or_types": label}) for e in filters]
-            tasks.extend(filters)
-
-        used_variables.add(k)
-
-    # validate all found tasks
-    validated_tasks = [CypherValidationTask.model_validate(task) for task in tasks]
-    return validated_tasks
+    return _build_node_tasks(parse_cypher_statement(cypher_statement))
 
 
 def _extract_relationships_and_properties_from_cypher_statement(
@@ -95,45 +71,94 @@ def _extract_relationships_and_properties_from_cypher_statement(
     List[CypherValidationTask]
         A List of CypherValidationTasks with keys `rel_types`, `operator`, `property_name` and `property_value`.
     """
-    tasks = list()
 
-    rels = re.findall(get_relationship_pattern(), cypher_statement)
+    return _build_relationship_tasks(parse_cypher_statement(cypher_statement))
+
+
+def _build_node_tasks(parsed: ParsedCypherStatement) -> List[CypherValidationTask]:
+    node_labels = parsed.get_node_variable_labels()
+
+    return _build_tasks(
+        elements=[
+            (n.variable, n.labels or node_labels.get(n.variable or ""))
+            for n in parsed.nodes
+        ],
+        properties=[n.properties for n in parsed.nodes],
+        predicates=parsed.predicates,
+    )
+
+
+def _build_relationship_tasks(
+    parsed: ParsedCypherStatement,
+) -> List[CypherValidationTask]:
+    rel_types = parsed.get_relationship_variable_types()
+
+    return _build_tasks(
+        elements=[
+            (r.variable, r.types or rel_types.get(r.variable or ""))
+            for r in parsed.relationships
+        ],
+        properties=[r.properties for r in parsed.relationships],
+        predicates=parsed.predicates,
+    )
+
+
+def _build_tasks(
+    elements: Sequence[Tuple[Optional[str], Optional[str]]],
+    properties: Sequence[Dict[str, CypherValue]],
+    predicates: Iterable[CypherPredicate],
+) -> List[CypherValidationTask]:
+    """
+    Create tasks for the properties declared in each pattern, followed by the predicates on its variable.
+    Predicates are attached to the first pattern that declares their variable.
+    """
+
+    filters: Dict[str, List[CypherPredicate]] = dict()
+    for p in predicates:
+        filters.setdefault(p.variable, list()).append(p)
+
+    tasks: List[Dict[str, Any]] = list()
     used_variables = set()
 
-    # find all variable assignments and process match clauses
-    for n in rels:
-        variables = re.findall(get_relationship_variable_pattern(), n)
-        rel_types = _find_all_relationship_types(n)
-
-        rel_type = rel_types[0].strip() if len(rel_types) > 0 else None
-        k = _parse_element_from_regex_result(regex_result=variables)
-
-        match_props = re.findall(get_property_pattern(), n)
-        match_props = _parse_element_from_regex_result(regex_result=match_props)
-        # process ids in the MATCH clause
-        if match_props is not None:
-            match_props_parsed: List[Dict[str, Any]] = (
-                process_match_clause_property_ids(match_props)
-            )
-            [
-                e.update({"labels_or_types": rel_type, "operator": "="})
-                for e in match_props_parsed
-            ]
-            tasks.extend(match_props_parsed)
-
-        # find and process property filters based on variables
-        if k is not None and k not in used_variables:
-            filters: List[Dict[str, Any]] = _find_all_filters(
-                variable=k, cypher_statement=cypher_statement
-            )
-            [e.update({"labels_or_types": rel_type}) for e in filters]
-            tasks.extend(filters)
-        used_variables.add(k)
+    for (variable, label_or_type), props in zip(elements, properties):
+        for property_name, value in props.items():
+            tasks.extend(_to_tasks(label_or_type, property_name, "=", value))
+
+        if variable is not None and variable not in used_variables:
+            for f in filters.get(variable, list()):
+                tasks.extend(
+                    _to_tasks(label_or_type, f.property_name, f.operator, f.value)
+                )
+            used_variables.add(variable)
 
     # validate all found tasks
-    validated_tasks = [CypherValidationTask.model_validate(task) for task in tasks]
+    return [CypherValidationTask.model_validate(task) for task in tasks]
+
 
-    return validated_tasks
+def _to_tasks(
+    label_or_type: Optional[str],
+    property_name: str,
+    operator: str,
+    value: Optional[CypherValue],
+) -> List[Dict[str, Any]]:
+    """
+    Convert a single property comparison into tasks.
+    List literals yield a task per item. Values that can not be known before execution are None.
+    """
+
+    values = (
+        list(value.items) if value is not None and value.kind == "list" else [value]
+    )
+
+    return [
+        {
+            "labels_or_types": label_or_type,
+            "operator": operator,
+            "property_name": property_name,
+            "property_value": v.value if v is not None and v.is_literal else None,
+        }
+        for v in values
+    ]
 
 
 def process_match_clause_property_ids(
@@ -186,38 +211,3 @@ def _process_prop_val(prop: str) -> str:
 #     labels = [lbl for lbl in labels if not lbl.startswith("!")]
 
 #     return labels
-
-
-def _find_all_filters(variable: str, cypher_statement: str) -> List[Dict[str, Any]]:
-    res: List[Tuple[str, str, Any]] = re.findall(
-        get_variable_operator_property_pattern(variable=variable), cypher_statement
-    )
-
-    return [
-        {
-            "property_name": _process_prop_key(n[0]),
-            "operator": n[1].strip(),
-            "property_value": _process_prop_val(n[2]),
-        }
-        for n in res
-    ]
-
-
-def _find_all_node_labels(node: str) -> List[str]:
-    return [n.strip() for n in re.findall(get_node_label_pattern(), node)]
-
-
-def _find_all_relationship_types(relationship: str) -> List[str]:
-    return [
-        r.strip() for r in re.findall(get_relationship_type_pattern(), relationship)
-    ]
-
-
-def _parse_element_from_regex_result(regex_result: List[str]) -> Optional[str]:
-    """The `regex_result` should be a single element list."""
-
-    parsed = regex_result[0] if len(regex_result) > 0 else None
-    if not parsed:
-        return None
-    else:
-        return parsed
@@ -0,0 +1,669 @@
+"""
+This file contains a lightweight Cypher lexer and partial parser.
+The parser does not validate syntax. It collects the pieces of a statement the Text2Cypher validators need:
+clauses, Node and Relationship patterns, property predicates and RETURN projections.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional, Set, Tuple
+
+from ..models import (
+    CypherClause,
+    CypherNodePattern,
+    CypherPredicate,
+    CypherProcedureCall,
+    CypherPropertyReference,
+    CypherRelationshipPattern,
+    CypherToken,
+    CypherValue,
+    ParsedCypherStatement,
+)
+from .regex_patterns import get_cypher_token_pattern, get_cypher_token_split_pattern
+
+CLAUSE_KEYWORDS = {
+    "MATCH",
+    "OPTIONAL",
+    "WHERE",
+    "WITH",
+    "RETURN",
+    "UNWIND",
+    "CALL",
+    "YIELD",
+    "UNION",
+    "ORDER",
+    "SKIP",
+    "LIMIT",
+    "CREATE",
+    "MERGE",
+    "SET",
+    "DELETE",
+    "DETACH",
+    "REMOVE",
+    "FOREACH",
+    "LOAD",
+    "USE",
+}
+
+# multi word clauses are reported as a single keyword
+COMPOUND_CLAUSE_KEYWORDS = {
+    ("OPTIONAL", "MATCH"): "OPTIONAL MATCH",
+    ("DETACH", "DELETE"): "DETACH DELETE",
+    ("ORDER", "BY"): "ORDER BY",
+    ("LOAD", "CSV"): "LOAD CSV",
+}
+
+# keywords that may directly precede a parenthesized Node pattern
+# any other identifier before `(` is treated as a function call
+PATTERN_PRECEDING_KEYWORDS = CLAUSE_KEYWORDS | {"AND", "OR", "XOR", "NOT", "BY"}
+
+PATTERN_CLAUSES = {"MATCH", "OPTIONAL MATCH", "MERGE", "CREATE"}
+
+COMPARISON_OPERATORS = {"=", "<>", "<", ">", "<=", ">=", "=~"}
+
+EXPRESSION_CONTINUATION_SYMBOLS = {"+", "-", "*", "/", "%", "^", ".", "(", "["}
+
+_IGNORED_TOKEN_KINDS = {"whitespace", "comment"}
+
+_NAME_TOKEN_KINDS = {"identifier", "quoted_identifier"}
+
+
+def _classify_token(text: str) -> str:
+    match = get_cypher_token_pattern().fullmatch(text)
+    return (match.lastgroup if match is not None else None) or "unknown"
+
+
+# the kind of an ASCII token follows from its first character
+# `/` starts a comment or a symbol and `$` a parameter or an unknown token, so those are classified whole
+_FIRST_CHARACTER_KINDS = {
+    c: _classify_token(c) for c in map(chr, range(128)) if c not in {"/", "$"}
+}
+
+
+def tokenize_cypher_statement(cypher_statement: str) -> List[CypherToken]:
+    """
+    Split a Cypher statement into tokens. Whitespace and comments are dropped.
+
+    Parameters
+    ----------
+    cypher_statement : str
+        The statement.
+
+    Returns
+    -------
+    List[CypherToken]
+        The tokens, in order.
+    """
+
+    # `findall` returns the token texts without creating a match object per token
+    # tokens are built with `tuple.__new__`, which skips the generated `__new__` of the named tuple
+    tokens: List[CypherToken] = list()
+    new_token = tuple.__new__
+    start = 0
+    for text in get_cypher_token_split_pattern().findall(cypher_statement):
+        end = start + len(text)
+        kind = _FIRST_CHARACTER_KINDS.get(text[0]) or _classify_token(text)
+        if kind not in _IGNORED_TOKEN_KINDS:
+            tokens.append(new_token(CypherToken, (kind, text, start, end)))
+        start = end
+    return tokens
+
+
+def normalize_cypher_statement(cypher_statement: str) -> str:
+    """
+    Normalize a Cypher statement for use as a cache key.
+    Comments, a trailing semicolon and formatting whitespace are removed. String literals are left untouched.
+
+    Parameters
+    ----------
+    cypher_statement : str
+        The statement.
+
+    Returns
+    -------
+    str
+        The normalized statement.
+    """
+
+    tokens = [t.text for t in tokenize_cypher_statement(cypher_statement)]
+    if tokens and tokens[-1] == ";":
+        tokens.pop()
+    return " ".join(tokens)
+
+
+@lru_cache(maxsize=512)
+def parse_cypher_statement(cypher_statement: str) -> ParsedCypherStatement:
+    """
+    Parse a Cypher statement into a `ParsedCypherStatement`.
+    Results are cached by statement, so the validators may share a single parse.
+
+    Parameters
+    ----------
+    cypher_statement : str
+        The statement.
+
+    Returns
+    -------
+    ParsedCypherStatement
+        The partial syntax tree.
+    """
+
+    return _CypherParser(cypher_statement).parse()
+
+
+def unquote_identifier(token: CypherToken) -> str:
+    """The name of an identifier token, with any backticks removed."""
+
+    if token.kind == "quoted_identifier":
+        return token.text[1:-1].replace("``", "`")
+    return token.text
+
+
+def unquote_string(token: CypherToken) -> str:
+    """The contents of a string token, with quotes and escapes removed."""
+
+    body = token.text[1:-1]
+    if "\\" not in body:
+        return body
+    return body.encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+class _CypherParser:
+    def __init__(self, cypher_statement: str) -> None:
+        self.statement = cypher_statement
+        self.tokens = tokenize_cypher_statement(cypher_statement)
+        self._size = len(self.tokens)
+        self.clauses: List[CypherClause] = list()
+        self.nodes: List[CypherNodePattern] = list()
+        self.relationships: List[CypherRelationshipPattern] = list()
+        self.predicates: List[CypherPredicate] = list()
+        self.projections: List[CypherPropertyReference] = list()
+        self.procedures: List[CypherProcedureCall] = list()
+        self._consumed_nodes: Set[int] = set()
+        self._clause: Optional[str] = None
+        self._clause_stack: List[Optional[str]] = list()
+
+    def parse(self) -> ParsedCypherStatement:
+        tokens = self.tokens
+        last = self._size - 1
+        for idx, token in enumerate(tokens):
+            kind = token.kind
+            if kind == "identifier":
+                if token.text.upper() in CLAUSE_KEYWORDS:
+                    self._read_clause(idx)
+                # only a variable followed by `.` starts a property reference
+                if idx < last and tokens[idx + 1].text == ".":
+                    self._read_predicate(idx)
+            elif kind == "symbol":
+                if token.text == "(" and idx not in self._consumed_nodes:
+                    self._read_path(idx)
+                elif token.text == "{":
+                    self._clause_stack.append(self._clause)
+                elif token.text == "}" and self._clause_stack:
+                    self._clause = self._clause_stack.pop()
+
+        # the parts are built by the parser, so validation is skipped
+        return ParsedCypherStatement.model_construct(
+            statement=self.statement,
+            tokens=tuple(self.tokens),
+            clauses=tuple(self.clauses),
+            nodes=tuple(self.nodes),
+            relationships=tuple(self.relationships),
+            predicates=tuple(self.predicates),
+            projections=tuple(self.projections),
+            procedures=tuple(self.procedures),
+        )
+
+    # ------------------------------------------------------------------
+    # token helpers
+    # ------------------------------------------------------------------
+
+    # the helpers below run for most tokens, so they index `self.tokens` directly
+
+    def _token(self, idx: int) -> Optional[CypherToken]:
+        return self.tokens[idx] if 0 <= idx < self._size else None
+
+    def _is_symbol(self, idx: int, *symbols: str) -> bool:
+        if not 0 <= idx < self._size:
+            return False
+        token = self.tokens[idx]
+        return token.kind == "symbol" and token.text in symbols
+
+    def _is_keyword(self, idx: int, *keywords: str) -> bool:
+        if not 0 <= idx < self._size:
+            return False
+        token = self.tokens[idx]
+        return token.kind == "identifier" and token.text.upper() in keywords
+
+    def _is_kind(self, idx: int, *kinds: str) -> bool:
+        return 0 <= idx < self._size and self.tokens[idx].kind in kinds
+
+    def _is_name(self, idx: int) -> bool:
+        return 0 <= idx < self._size and self.tokens[idx].kind in _NAME_TOKEN_KINDS
+
+    def _is_property_access(self, idx: int) -> bool:
+        """Whether the token at `idx` is a variable followed by `.property`."""
+
+        return (
+            self._is_name(idx)
+            and self._is_symbol(idx + 1, ".")
+            and self._is_name(idx + 2)
+            and not self._is_symbol(idx - 1, ".", ":")
+            and not self._is_kind(idx - 1, "parameter")
+        )
+
+    def _skip_balanced(self, idx: int) -> int:
+        """Return the index after the bracket group that opens at `idx`."""
+
+        pairs = {"(": ")", "[": "]", "{": "}"}
+        depth = 0
+        closing: List[str] = list()
+        while idx < len(self.tokens):
+            token = self.tokens[idx]
+            if token.kind == "symbol" and token.text in pairs:
+                closing.append(pairs[token.text])
+                depth += 1
+            elif token.kind == "symbol" and closing and token.text == closing[-1]:
+                closing.pop()
+                depth -= 1
+                if depth == 0:
+                    return idx + 1
+            idx += 1
+        return idx
+
+    # ------------------------------------------------------------------
+    # clauses
+    # ------------------------------------------------------------------
+
+    def _read_clause(self, idx: int) -> None:
+        token = self.tokens[idx]
+        keyword = token.text.upper()
+
+        if keyword not in CLAUSE_KEYWORDS:
+            return
+        # property keys, labels, map keys, aliases and variables are not clauses
+        if self._is_symbol(idx - 1, ".", ":", "(", "[") or self._is_symbol(
+            idx + 1, ":", "."
+        ):
+            return
+        if self._is_keyword(idx - 1, "AS"):
+            return
+        if keyword in {"MATCH", "DELETE"} and self._is_keyword(
+            idx - 1, "OPTIONAL", "DETACH"
+        ):
+            return
+
+        next_token = self._token(idx + 1)
+        if next_token is not None and next_token.kind == "identifier":
+            keyword = COMPOUND_CLAUSE_KEYWORDS.get(
+                (keyword, next_token.text.upper()), keyword
+            )
+
+        self.clauses.append(
+            CypherClause(keyword=keyword, start=token.start, token_index=idx)
+        )
+        self._clause = keyword
+
+        if keyword == "CALL":
+            self._read_procedure_call(idx)
+
+    def _read_procedure_call(self, idx: int) -> None:
+        """Read the procedure name after the `CALL` keyword at `idx`. `CALL { ... }` subqueries are skipped."""
+
+        end = idx + 1
+        parts: List[str] = list()
+        while self._is_name(end):
+            parts.append(unquote_identifier(self.tokens[end]))
+            if not self._is_symbol(end + 1, "."):
+                break
+            end += 2
+        if not parts:
+            return
+
+        # skip the arguments to find YIELD
+        end += 1
+        if self._is_symbol(end, "("):
+            end = self._skip_balanced(end)
+
+        self.procedures.append(
+            CypherProcedureCall(
+                name=".".join(parts),
+                start=self.tokens[idx].start,
+                yields=self._is_keyword(end, "YIELD"),
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # predicates and projections
+    # ------------------------------------------------------------------
+
+    def _read_predicate(self, idx: int) -> None:
+        if not self._is_property_access(idx) or self._is_symbol(idx + 3, "."):
+            return
+
+        variable = unquote_identifier(self.tokens[idx])
+        property_name = unquote_identifier(self.tokens[idx + 2])
+
+        if self._clause == "RETURN":
+            self.projections.append(
+                CypherPropertyReference(
+                    variable=variable, property_name=property_name, clause=self._clause
+                )
+            )
+
+        operator, value_idx = self._read_operator(idx + 3)
+        if operator is None:
+            return
+
+        value = None
+        if value_idx is not None:
+            value, _ = self._read_value(value_idx, terminators={")", "]", "}", ","})
+
+        self.predicates.append(
+            CypherPredicate(
+                variable=variable,
+                property_name=property_name,
+                operator=operator,
+                value=value,
+                clause=self._clause,
+            )
+        )
+
+    def _read_operator(self, idx: int) -> Tuple[Optional[str], Optional[int]]:
+        """Return the operator at `idx` and the index of the value it is compared to."""
+
+        token = self._token(idx)
+        if token is None:
+            return None, None
+
+        if token.kind == "symbol" and token.text in COMPARISON_OPERATORS:
+            return token.text, idx + 1
+
+        keyword = token.text.upper() if token.kind == "identifier" else ""
+        if keyword in {"CONTAINS", "IN"}:
+            return keyword, idx + 1
+        if keyword in {"STARTS", "ENDS"} and self._is_keyword(idx + 1, "WITH"):
+            return f"{keyword} WITH", idx + 2
+        if keyword == "IS":
+            if self._is_keyword(idx + 1, "NULL"):
+                return "IS NULL", None
+            if self._is_keyword(idx + 1, "NOT") and self._is_keyword(idx + 2, "NULL"):
+                return "IS NOT NULL", None
+
+        return None, None
+
+    def _read_value(self, idx: int, terminators: Set[str]) -> Tuple[CypherValue, int]:
+        """
+        Read the value starting at `idx`.
+        Returns the value and the index of the first token after it.
+        Anything other than a literal, parameter or list of those is an `expression`.
+        """
+
+        token = self._token(idx)
+        if token is None:
+            return CypherValue(kind="expression"), idx
+
+        value: Optional[CypherValue] = None
+        end = idx + 1
+
+        if token.kind == "string":
+            value = CypherValue(kind="string", value=unquote_string(token))
+        elif token.kind == "number":
+            value = CypherValue(kind="number", value=token.text)
+        elif (
+            token.kind == "symbol"
+            and token.text == "-"
+            and self._is_kind(idx + 1, "number")
+        ):
+            value = CypherValue(kind="number", value=f"-{self.tokens[idx + 1].text}")
+            end = idx + 2
+        elif token.kind == "parameter":
+            value = CypherValue(kind="parameter")
+        elif self._is_keyword(idx, "TRUE", "FALSE"):
+            value = CypherValue(kind="boolean", value=token.text.lower())
+        elif self._is_keyword(idx, "NULL"):
+            value = CypherValue(kind="null")
+        elif self._is_symbol(idx, "["):
+            value, end = self._read_list(idx)
+
+        if value is not None and not self._is_symbol(
+            end, *EXPRESSION_CONTINUATION_SYMBOLS
+        ):
+            return value, end
+
+        # an expression: skip to the next terminator at this depth
+        while end < len(self.tokens):
+            if self._is_symbol(end, "(", "[", "{"):
+                end = self._skip_balanced(end)
+                continue
+            if self._is_symbol(end, *terminators):
+                break
+            end += 1
+        return CypherValue(kind="expression"), end
+
+    def _read_list(self, idx: int) -> Tuple[Optional[CypherValue], int]:
+        """Read a list literal that opens at `idx`. Returns None if it contains expressions."""
+
+        items: List[CypherValue] = list()
+        end = idx + 1
+        if self._is_symbol(end, "]"):
+            return CypherValue(kind="list"), end + 1
+
+        while end < len(self.tokens):
+            item, end = self._read_value(end, terminators={",", "]"})
+            items.append(item)
+            if self._is_symbol(end, ","):
+                end += 1
+                continue
+            if self._is_symbol(end, "]"):
+                end += 1
+                break
+            return None, self._skip_balanced(idx)
+
+        if any(item.kind in {"expression", "list"} for item in items):
+            return None, end
+        return CypherValue(kind="list", items=tuple(items)), end
+
+    # ------------------------------------------------------------------
+    # patterns
+    # ------------------------------------------------------------------
+
+    def _read_path(self, idx: int) -> None:
+        """Read a Node pattern at `idx` and any Relationship chain that follows it."""
+
+        read = self._read_node(idx, standalone=True)
+        if read is None:
+            return
+        left, end = read
+        left_idx = self._add_node(left)
+
+        # the right Node of each Relationship is the left Node of the next one in the chain
+        while True:
+            chain = self._read_relationship(end, left_idx)
+            if chain is None:
+                return
+            end, left_idx = chain
+
+    def _add_node(self, node: CypherNodePattern) -> int:
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    def _read_node(
+        self, idx: int, standalone: bool
+    ) -> Optional[Tuple[CypherNodePattern, int]]:
+        """
+        Read a Node pattern that opens at `idx`. Returns the Node and the index after `)`.
+        When `standalone` is True a bare `(n)` is only accepted in a pattern clause or before a relationship.
+        """
+
+        if not self._is_symbol(idx, "("):
+            return None
+        previous = self._token(idx - 1)
+        if (
+            previous is not None
+            and previous.kind in {"identifier", "quoted_identifier"}
+            and previous.text.upper() not in PATTERN_PRECEDING_KEYWORDS
+        ):
+            # function call
+            return None
+
+        end = idx + 1
+        variable = None
+        labels = None
+        properties: Dict[str, CypherValue] = dict()
+
+        if self._is_name(end) and not self._is_keyword(end, "WHERE"):
+            variable = unquote_identifier(self.tokens[end])
+            end += 1
+        if self._is_symbol(end, ":"):
+            labels, end = self._read_label_expression(end + 1)
+        if self._is_symbol(end, "{"):
+            parsed = self._read_map(end)
+            if parsed is None:
+                return None
+            properties, end = parsed
+        elif self._is_kind(end, "parameter"):
+            end += 1
+        if self._is_keyword(end, "WHERE"):
+            end = self._skip_balanced(idx) - 1
+        if not self._is_symbol(end, ")"):
+            return None
+
+        is_bare = labels is None and not properties
+        if (
+            standalone
+            and is_bare
+            and self._clause not in PATTERN_CLAUSES
+            and not self._is_symbol(end + 1, "-", "<-")
+        ):
+            return None
+
+        node = CypherNodePattern(
+            variable=variable,
+            labels=labels,
+            properties=properties,
+            clause=self._clause,
+            start=self.tokens[idx].start,
+            end=self.tokens[end].end,
+        )
+        self._consumed_nodes.add(idx)
+        return node, end + 1
+
+    def _read_label_expression(self, idx: int) -> Tuple[Optional[str], int]:
+        """Read a label or type expression that starts after the first `:`."""
+
+        parts: List[str] = list()
+        end = idx
+        expect_name = True
+        while end < len(self.tokens):
+            token = self.tokens[end]
+            if expect_name and self._is_name(end):
+                parts.append(unquote_identifier(token))
+                expect_name = False
+            elif expect_name and self._is_symbol(end, "!"):
+                parts.append("!")
+            elif not expect_name and self._is_symbol(end, ":", "&", "|"):
+                parts.append(token.text)
+                expect_name = True
+            else:
+                break
+            end += 1
+
+        labels = "".join(parts).strip(":&|")
+        return labels or None, end
+
+    def _read_map(self, idx: int) -> Optional[Tuple[Dict[str, CypherValue], int]]:
+        """Read a property map that opens at `idx`. Returns the map and the index after `}`."""
+
+        properties: Dict[str, CypherValue] = dict()
+        end = idx + 1
+        while end < len(self.tokens):
+            if self._is_symbol(end, "}"):
+                return properties, end + 1
+            if not (self._is_name(end) and self._is_symbol(end + 1, ":")):
+                return None
+            key = unquote_identifier(self.tokens[end])
+            value, end = self._read_value(end + 2, terminators={",", "}"})
+            properties[key] = value
+            if self._is_symbol(end, ","):
+                end += 1
+        return None
+
+    def _read_relationship(self, idx: int, left_idx: int) -> Optional[Tuple[int, int]]:
+        """
+        Read a Relationship pattern that starts at `idx` and the Node to its right.
+        Returns the index after the right Node and the position of the right Node in `self.nodes`.
+        """
+
+        if not self._is_symbol(idx, "-", "<-"):
+            return None
+        left_arrow = self.tokens[idx].text == "<-"
+        end = idx + 1
+
+        variable = None
+        types = None
+        properties: Dict[str, CypherValue] = dict()
+
+        if self._is_symbol(end, "["):
+            end += 1
+            if self._is_name(end) and not self._is_keyword(end, "WHERE"):
+                variable = unquote_identifier(self.tokens[end])
+                end += 1
+            if self._is_symbol(end, ":"):
+                types, end = self._read_label_expression(end + 1)
+            if self._is_symbol(end, "*"):
+                end += 1
+                while self._is_symbol(end, "..") or (self._is_kind(end, "number")):
+                    end += 1
+            if self._is_symbol(end, "{"):
+                parsed = self._read_map(end)
+                if parsed is None:
+                    return None
+                properties, end = parsed
+            elif self._is_kind(end, "parameter"):
+                end += 1
+            if self._is_keyword(end, "WHERE"):
+                while end < len(self.tokens) and not self._is_symbol(end, "]"):
+                    end = (
+                        self._skip_balanced(end)
+                        if self._is_symbol(end, "(", "[", "{")
+                        else end + 1
+                    )
+            if not self._is_symbol(end, "]"):
+                return None
+            end += 1
+
+        if not self._is_symbol(end, "-", "->"):
+            return None
+        right_arrow = self.tokens[end].text == "->"
+        right_connector = end
+
+        read = self._read_node(end + 1, standalone=False)
+        if read is None:
+            return None
+        right, after = read
+        right_idx = self._add_node(right)
+
+        direction: Literal["left", "right", "none"]
+        if left_arrow and not right_arrow:
+            direction = "left"
+        elif right_arrow and not left_arrow:
+            direction = "right"
+        else:
+            direction = "none"
+
+        self.relationships.append(
+            CypherRelationshipPattern(
+                variable=variable,
+                types=types,
+                properties=properties,
+                direction=direction,
+                left_node=left_idx,
+                right_node=right_idx,
+                clause=self._clause,
+                start=self.tokens[idx].start,
+                end=self.tokens[right_connector].end,
+                body_start=self.tokens[idx].end,
+                body_end=self.tokens[right_connector].start,
+            )
+        )
+        return after, right_idx
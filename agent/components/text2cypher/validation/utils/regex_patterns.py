@@ -1,40 +1,89 @@
 """
 This code is sourced from https://github.com/langchain-ai/langchain-neo4j/blob/main/libs/neo4j/langchain_neo4j/chains/graph_qa/cypher_utils.py
+
+All patterns are compiled once at import time. The `get_*` functions return the shared compiled objects.
 """
 
+import re as stdlib_re
+from functools import lru_cache
+
 import regex as re
 
+_OPERATOR_PROPERTY_VALUE = r"\.(?P<property_name>[^\s]*)\s(?P<operator>contains|CONTAINS|[><=]{0,2}|starts with|STARTS WITH|ends with|ENDS WITH)\s\"?\'?(?P<property_value>[\w\s]+\"|[\d]+)\"?\'?"
+_NODE = r"\([\w\:\{\s\"\'\}\,\|\&]+\)"
+_RELATIONSHIP = r"-\[([\w\:\{\s\"\'\}\,\|\&]+)\]-"
+
+PROPERTY_PATTERN = re.compile(r"\{.+?\}")
+NODE_VARIABLE_PATTERN = re.compile(r"^\(([a-zA-Z\_\d]*)(?:[\s]{0,1}[:\{])")
+RELATIONSHIP_VARIABLE_PATTERN = re.compile(r"^([\w\d]*):?")
+RELATIONSHIP_PATTERN = re.compile(_RELATIONSHIP)
+NODE_PATTERN = re.compile(rf"({_NODE})")
+NODE_LABEL_PATTERN = re.compile(r"\([^:\{]*:\`?([a-zA-Z\_\d\s\|\&]*)\`?[\s\_\{\)]")
+ANY_VARIABLE_OPERATOR_PROPERTY_PATTERN = re.compile(
+    r"(?P<variable>[a-zA-Z\_][\w]*)" + _OPERATOR_PROPERTY_VALUE
+)
+CYPHER_ENTITY_PATTERN = re.compile(
+    rf"(?P<node>{_NODE})"
+    rf"|-\[(?P<relationship>[\w\:\{{\s\"\'\}}\,\|\&]+)\]-"
+    rf"|(?P<filter>(?P<variable>[a-zA-Z\_][\w]*){_OPERATOR_PROPERTY_VALUE})"
+)
+PATH_PATTERN = re.compile(
+    r"(\([^\,\(\)]*?(\{.+\})?[^\,\(\)]*?\))(<?-)(\[.*?\])?(->?)(\([^\,\(\)]*?(\{.+\})?[^\,\(\)]*?\))"
+)
+NODE_RELATIONSHIP_NODE_PATTERN = re.compile(
+    r"(\()+(?P<left_node>[^()]*?)\)(?P<relation>.*?)\((?P<right_node>[^()]*?)(\))+"
+)
+RELATIONSHIP_TYPE_PATTERN = re.compile(r":([\w\|\&\:]+?)[\]\s\{]+")
+# the token patterns use no `regex` features, and the standard library engine scans them faster
+CYPHER_TOKEN_PATTERN = stdlib_re.compile(
+    r"(?P<whitespace>\s+)"
+    r"|(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"
+    r"|(?P<string>'(?:[^'\\]|\\.)*(?:'|\Z)|\"(?:[^\"\\]|\\.)*(?:\"|\Z))"
+    r"|(?P<quoted_identifier>`(?:[^`]|``)*(?:`|\Z))"
+    r"|(?P<parameter>\$(?:[^\W\d]\w*|\d+|`(?:[^`]|``)*`))"
+    r"|(?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<identifier>[^\W\d]\w*)"
+    r"|(?P<symbol><>|<=|>=|=~|->|<-|\.\.|\+=|[()\[\]{}:,.|&!*+\-/%^=<>;])"
+    r"|(?P<unknown>.)",
+    stdlib_re.DOTALL,
+)
+# the same alternatives without named groups, so `findall` returns the token texts
+CYPHER_TOKEN_SPLIT_PATTERN = stdlib_re.compile(
+    stdlib_re.sub(r"\(\?P<\w+>", "(?:", CYPHER_TOKEN_PATTERN.pattern), stdlib_re.DOTALL
+)
+
 
 def get_property_pattern() -> re.Pattern:
     """Should be run on an entire captured Node or Relationship pattern."""
-    return re.compile(r"\{.+?\}")
+    return PROPERTY_PATTERN
 
 
 def get_node_variable_pattern() -> re.Pattern:
     """Should be run on an entire captured Node pattern."""
-    return re.compile(r"^\(([a-zA-Z\_\d]*)(?:[\s]{0,1}[:\{])")
+    return NODE_VARIABLE_PATTERN
 
 
 def get_relationship_variable_pattern() -> re.Pattern:
     """Should be run on an entire captured Relationship pattern."""
-    return re.compile(r"^([\w\d]*):?")
+    return RELATIONSHIP_VARIABLE_PATTERN
 
 
 def get_relationship_pattern() -> re.Pattern:
     """Capture a Relationship without direction."""
-    return re.compile(r"-\[([\w\:\{\s\"\'\}\,\|\&]+)\]-")
+    return RELATIONSHIP_PATTERN
 
 
 def get_node_pattern() -> re.Pattern:
     """Capture a Node."""
-    return re.compile(r"(\([\w\:\{\s\"\'\}\,\|\&]+\))")
+    return NODE_PATTERN
 
 
 def get_node_label_pattern() -> re.Pattern:
     """Should be run on an entire captured Node pattern."""
-    return re.compile(r"\([^:\{]*:\`?([a-zA-Z\_\d\s\|\&]*)\`?[\s\_\{\)]")
+    return NODE_LABEL_PATTERN
 
 
+@lru_cache(maxsize=256)
 def get_variable_operator_property_pattern(variable: str) -> re.Pattern:
     """
     Should be run on an entire Cypher Statement. The variable parameter must be gathered in a prior step.
@@ -49,23 +98,49 @@ def get_variable_operator_property_pattern(variable: str) -> re.Pattern:
     re.Pattern
         The regex pattern.
     """
-    return (
-        re.escape(variable)
-        + r"\.(?P<property_name>[^\s]*)\s(?P<operator>contains|CONTAINS|[><=]{0,2}|starts with|STARTS WITH|ends with|ENDS WITH)\s\"?\'?(?P<property_value>[\w\s]+\"|[\d]+)\"?\'?"
-    )
+    return re.compile(re.escape(variable) + _OPERATOR_PROPERTY_VALUE)
+
+
+def get_any_variable_operator_property_pattern() -> re.Pattern:
+    """
+    Should be run on an entire Cypher Statement.
+    Captures the variable alongside the property name, operator and property value of every filter.
+    """
+    return ANY_VARIABLE_OPERATOR_PROPERTY_PATTERN
+
+
+def get_cypher_entity_pattern() -> re.Pattern:
+    """
+    Should be run on an entire Cypher Statement.
+    Captures Nodes (`node` group), Relationships without direction (`relationship` group)
+    and property filters (`filter` group) in a single scan.
+    """
+    return CYPHER_ENTITY_PATTERN
+
+
+def get_cypher_token_pattern() -> stdlib_re.Pattern[str]:
+    """
+    Should be run on an entire Cypher Statement with `finditer`, or on a single token with `fullmatch`.
+    Each match sets exactly one named group, which is the token kind.
+    """
+    return CYPHER_TOKEN_PATTERN
+
+
+def get_cypher_token_split_pattern() -> stdlib_re.Pattern[str]:
+    """
+    Should be run on an entire Cypher Statement with `findall`.
+    The matches cover the statement without gaps, whitespace and comments included.
+    """
+    return CYPHER_TOKEN_SPLIT_PATTERN
 
 
 def get_path_pattern() -> re.Pattern:
-    return re.compile(
-        r"(\([^\,\(\)]*?(\{.+\})?[^\,\(\)]*?\))(<?-)(\[.*?\])?(->?)(\([^\,\(\)]*?(\{.+\})?[^\,\(\)]*?\))"
-    )
+    return PATH_PATTERN
 
 
 def get_node_relationship_node_pattern() -> re.Pattern:
-    return re.compile(
-        r"(\()+(?P<left_node>[^()]*?)\)(?P<relation>.*?)\((?P<right_node>[^()]*?)(\))+"
-    )
+    return NODE_RELATIONSHIP_NODE_PATTERN
 
 
 def get_relationship_type_pattern() -> re.Pattern:
-    return re.compile(r":([\w\|\&\:]+?)[\]\s\{]+")
+    return RELATIONSHIP_TYPE_PATTERN
@@ -0,0 +1,124 @@
+"""
+This file contains a cache of compiled schema snapshots used by the Cypher validators.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from langchain_neo4j import Neo4jGraph
+
+from ....utils.utils import compute_schema_fingerprint
+from ..models import CompiledNeo4jSchema, Neo4jStructuredSchema
+
+
+class CompiledSchemaCache:
+    """
+    Cache `CompiledNeo4jSchema` snapshots by schema fingerprint.
+
+    The structured schema is only re-validated and compiled when its fingerprint changes.
+    If the same schema object is requested again before `ttl` seconds have passed, the fingerprint is not recomputed.
+    Once `ttl` has passed the fingerprint is recomputed and a new snapshot is compiled only if the contents have changed.
+
+    Parameters
+    ----------
+    ttl : Optional[float], optional
+        The number of seconds a snapshot is trusted before its fingerprint is checked again.
+        If None, a snapshot is trusted until a different schema object is provided, by default None
+    max_size : int, optional
+        The max number of schema versions to hold, by default 8
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 8) -> None:
+        assert max_size > 0, "`max_size` must be greater than 0."
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self._snapshots: OrderedDict[str, CompiledNeo4jSchema] = OrderedDict()
+        self._last_source: Optional[Dict[str, Any]] = None
+        self._last_snapshot: Optional[CompiledNeo4jSchema] = None
+        self._last_checked: float = 0.0
+        self._lock = Lock()
+
+    def get(self, structured_schema: Dict[str, Any]) -> CompiledNeo4jSchema:
+        """
+        Get the compiled snapshot for a structured schema, compiling it if necessary.
+
+        Parameters
+        ----------
+        structured_schema : Dict[str, Any]
+            The structured schema, such as `Neo4jGraph.get_structured_schema`.
+
+        Returns
+        -------
+        CompiledNeo4jSchema
+            The compiled snapshot.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._last_snapshot is not None
+                and structured_schema is self._last_source
+                and not self._is_expired(now)
+            ):
+                return self._last_snapshot
+
+            fingerprint = compute_schema_fingerprint(structured_schema)
+            snapshot = self._snapshots.get(fingerprint)
+
+            if snapshot is None:
+                snapshot = CompiledNeo4jSchema.from_structured_schema(
+                    Neo4jStructuredSchema.model_validate(structured_schema),
+                    fingerprint=fingerprint,
+                )
+                self._snapshots[fingerprint] = snapshot
+                while len(self._snapshots) > self.max_size:
+                    self._snapshots.popitem(last=False)
+            else:
+                self._snapshots.move_to_end(fingerprint)
+
+            self._last_source = structured_schema
+            self._last_snapshot = snapshot
+            self._last_checked = now
+
+            return snapshot
+
+    def clear(self) -> None:
+        """Remove all snapshots from the cache."""
+
+        with self._lock:
+            self._snapshots.clear()
+            self._last_source = None
+            self._last_snapshot = None
+            self._last_checked = 0.0
+
+    def _is_expired(self, now: float) -> bool:
+        return self.ttl is not None and now - self._last_checked > self.ttl
+
+
+_default_schema_cache = CompiledSchemaCache()
+
+
+def get_compiled_schema(
+    graph: Neo4jGraph, schema_cache: Optional[CompiledSchemaCache] = None
+) -> CompiledNeo4jSchema:
+    """
+    Get the compiled schema snapshot for the provided graph.
+
+    Parameters
+    ----------
+    graph : Neo4jGraph
+        The Neo4j graph wrapper.
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache to use. If None, a process wide cache is used, by default None
+
+    Returns
+    -------
+    CompiledNeo4jSchema
+        The compiled snapshot.
+    """
+
+    cache = schema_cache if schema_cache is not None else _default_schema_cache
+    return cache.get(graph.get_structured_schema)
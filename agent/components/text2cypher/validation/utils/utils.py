@@ -1,35 +1,33 @@
-from typing import List, Literal
+from typing import List, Literal, Union
 
-from ..models import CypherValidationTask, Neo4jStructuredSchema
+from ..models import CompiledNeo4jSchema, CypherValidationTask, Neo4jStructuredSchema
 
 # from .cypher_extractors import parse_labels_or_types
 
 
 def update_task_list_with_property_type(
     tasks: List[CypherValidationTask],
-    structure_graph_schema: Neo4jStructuredSchema,
+    structure_graph_schema: Union[Neo4jStructuredSchema, CompiledNeo4jSchema],
     node_or_rel: Literal["node", "rel"],
 ) -> List[CypherValidationTask]:
     """Assign property types to each entry in the task list."""
 
+    if isinstance(structure_graph_schema, Neo4jStructuredSchema):
+        structure_graph_schema = CompiledNeo4jSchema.from_structured_schema(
+            structure_graph_schema
+        )
+
     if node_or_rel == "node":
-        schema = structure_graph_schema.node_props
+        schema = structure_graph_schema.node_property_types
     else:
-        schema = structure_graph_schema.rel_props
-
-    # if node_or_rel == "node":
-    #     label_or_type = "labels"
-    # else:
-    #     label_or_type = "rel_types"
+        schema = structure_graph_schema.relationship_property_types
 
     for task in tasks:
-        # labels_or_types = parse_labels_or_types(task.get(label_or_type, None))
         labels_or_types = task.parsed_labels_or_types
         found_types = set()
 
         for lt in labels_or_types:
-            name_type_map = {d.property: d.type for d in schema.get(lt, list())}
-            found_types.add(name_type_map.get(task.property_name))
+            found_types.add(schema.get(lt, dict()).get(task.property_name))
 
         if len(found_types) > 1:
             print(
@@ -2,25 +2,59 @@
 This file contains Cypher validators that may be used in the Text2Cypher validation node.
 """
 
-from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
+import asyncio
+import re
+from fnmatch import fnmatchcase
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from langchain_neo4j import Neo4jGraph
-from langchain_neo4j.chains.graph_qa.cypher_utils import CypherQueryCorrector, Schema
 from neo4j.exceptions import CypherSyntaxError
 
-from ....constants import WRITE_CLAUSES
+from ....cache import CypherExplainResult, CypherSyntaxCache
+from ....constants import (
+    READ_ONLY_PROCEDURES,
+    STATEMENT_START_KEYWORDS,
+    WRITE_CLAUSES,
+    WRITE_PROCEDURES,
+)
+from ....database import AsyncNeo4jGraph
 from .models import (
+    CompiledNeo4jSchema,
+    CypherCostGuard,
+    CypherPlanIssue,
+    CypherRelationshipPattern,
     CypherValidationTask,
-    Neo4jStructuredSchema,
     Neo4jStructuredSchemaPropertyNumber,
+    ParsedCypherStatement,
 )
 from .utils.cypher_extractors import (
     extract_entities_for_validation,
 )
+from .utils.cypher_parser import parse_cypher_statement, tokenize_cypher_statement
+from .utils.schema_cache import CompiledSchemaCache, get_compiled_schema
 
 # parse_labels_or_types,
 from .utils.utils import update_task_list_with_property_type
 
+MARKDOWN_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)", re.MULTILINE)
+
+BRACKET_PAIRS = {"(": ")", "[": "]", "{": "}"}
+
+# the variable and label of a NodeByLabelScan, such as `m:Movie`
+LABEL_SCAN_DETAILS_PATTERN = re.compile(
+    r"^`?(?P<variable>\w+)`?\s*:\s*`?(?P<label>\w+)`?"
+)
+
 
 def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> List[str]:
     """
@@ -46,11 +80,355 @@ def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> Li
     return errors
 
 
-def correct_cypher_query_relationship_direction(
+async def avalidate_cypher_query_syntax(
+    graph: AsyncNeo4jGraph, cypher_statement: str
+) -> List[str]:
+    """
+    Validate the Cypher statement syntax by running an EXPLAIN query without blocking the event loop.
+
+    Parameters
+    ----------
+    graph : AsyncNeo4jGraph
+        The async Neo4j graph wrapper.
+    cypher_statement : str
+        The Cypher statement to validate.
+
+    Returns
+    -------
+    List[str]
+        If the statement contains invalid syntax, return an error message in a list
+    """
+    errors = list()
+    try:
+        await graph.query(f"EXPLAIN {cypher_statement}")
+    except CypherSyntaxError as e:
+        errors.append(str(e.message))
+    return errors
+
+
+def precheck_cypher_statement(cypher_statement: str) -> List[str]:
+    """
+    Reject text that can not be a Cypher statement without querying the database.
+    Catches empty output, markdown code fences, prose and unbalanced brackets or quotes.
+    Brackets inside string literals and comments are ignored.
+
+    Parameters
+    ----------
+    cypher_statement : str
+        The Cypher statement to check.
+
+    Returns
+    -------
+    List[str]
+        A list of any found errors. If not empty, the statement would fail EXPLAIN.
+    """
+
+    if not cypher_statement.strip():
+        return ["The Cypher statement is empty."]
+
+    if MARKDOWN_FENCE_PATTERN.search(cypher_statement):
+        return [
+            "The Cypher statement contains markdown code fences. Return only the Cypher statement."
+        ]
+
+    tokens = tokenize_cypher_statement(cypher_statement)
+    if not tokens:
+        return ["The Cypher statement only contains comments."]
+
+    first = tokens[0]
+    if first.kind != "identifier" or first.text.upper() not in STATEMENT_START_KEYWORDS:
+        return [
+            f"The Cypher statement does not start with a Cypher clause: `{first.text}`. "
+            "Return only the Cypher statement, without any explanation."
+        ]
+
+    errors: List[str] = list()
+    stack: List[Tuple[str, int]] = list()
+    for token in tokens:
+        if token.kind in ("string", "quoted_identifier"):
+            if len(token.text) < 2 or token.text[-1] != token.text[0]:
+                errors.append(
+                    f"Unterminated {'string literal' if token.kind == 'string' else 'quoted identifier'} "
+                    f"at position {token.start}."
+                )
+                # the literal runs to the end of the statement, so there is nothing left to check
+                break
+            continue
+        if token.kind != "symbol":
+            continue
+        if token.text in BRACKET_PAIRS:
+            stack.append((token.text, token.start))
+        elif token.text in BRACKET_PAIRS.values():
+            if not stack or BRACKET_PAIRS[stack[-1][0]] != token.text:
+                errors.append(f"Unbalanced `{token.text}` at position {token.start}.")
+                break
+            stack.pop()
+    else:
+        errors.extend(
+            f"Unclosed `{bracket}` at position {start}." for bracket, start in stack
+        )
+
+    return errors
+
+
+def explain_cypher_query(
     graph: Neo4jGraph, cypher_statement: str
+) -> CypherExplainResult:
+    """
+    Run EXPLAIN on the Cypher statement with `Neo4jGraph.query`.
+    That method does not return the result summary, so no plan is collected. Use `AsyncNeo4jGraph.explain` for the plan.
+
+    Parameters
+    ----------
+    graph : Neo4jGraph
+        The Neo4j graph wrapper.
+    cypher_statement : str
+        The Cypher statement to explain.
+
+    Returns
+    -------
+    CypherExplainResult
+        The syntax errors, if any. The plan is always None.
+    """
+
+    try:
+        graph.query(f"EXPLAIN {cypher_statement}")
+    except CypherSyntaxError as e:
+        return CypherExplainResult(errors=[str(e.message)])
+    return CypherExplainResult()
+
+
+async def aexplain_cypher_query(
+    graph: Neo4jGraph,
+    cypher_statement: str,
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    syntax_cache: Optional[CypherSyntaxCache] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
+) -> CypherExplainResult:
+    """
+    Check the Cypher statement syntax without blocking the event loop.
+    Malformed text is rejected by `precheck_cypher_statement` without querying the database.
+    Otherwise the outcome is read from `syntax_cache`, or EXPLAIN is run and its outcome stored.
+
+    Parameters
+    ----------
+    graph : Neo4jGraph
+        The Neo4j graph wrapper.
+    cypher_statement : str
+        The Cypher statement to check.
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used to run EXPLAIN and collect the plan.
+        If None, `graph` is queried in a worker thread and no plan is collected, by default None
+    syntax_cache : Optional[CypherSyntaxCache], optional
+        The cache of EXPLAIN outcomes. If None, EXPLAIN is run every time, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache holding compiled schema snapshots, used for the schema fingerprint.
+        If None, a process wide cache is used, by default None
+
+    Returns
+    -------
+    CypherExplainResult
+        The syntax errors, or the EXPLAIN plan if the statement is valid.
+    """
+
+    precheck_errors = precheck_cypher_statement(cypher_statement)
+    if precheck_errors:
+        return CypherExplainResult(errors=precheck_errors)
+
+    fingerprint = ""
+    if syntax_cache is not None:
+        fingerprint = get_compiled_schema(
+            graph=graph, schema_cache=schema_cache
+        ).fingerprint
+        cached = syntax_cache.get(cypher_statement, fingerprint=fingerprint)
+        if cached is not None:
+            return cached
+
+    if async_graph is not None:
+        try:
+            result = CypherExplainResult(
+                plan=await async_graph.explain(cypher_statement)
+            )
+        except CypherSyntaxError as e:
+            result = CypherExplainResult(errors=[str(e.message)])
+    else:
+        result = await asyncio.to_thread(
+            explain_cypher_query, graph=graph, cypher_statement=cypher_statement
+        )
+
+    if syntax_cache is not None:
+        syntax_cache.set(cypher_statement, result, fingerprint=fingerprint)
+    return result
+
+
+def validate_cypher_plan_cost(
+    plan: Dict[str, Any], cost_guard: CypherCostGuard
+) -> List[str]:
+    """
+    Validate the EXPLAIN plan of a Cypher statement against the thresholds of a cost guard.
+    Errors name the costly operator and hint at a correction, such as adding a label or using an index.
+
+    Parameters
+    ----------
+    plan : Dict[str, Any]
+        The EXPLAIN plan tree returned by the driver.
+    cost_guard : CypherCostGuard
+        The thresholds.
+
+    Returns
+    -------
+    List[str]
+        A list of any found errors.
+    """
+
+    errors: List[str] = list()
+    for issue in find_costly_plan_operators(plan, cost_guard):
+        error = issue.to_error()
+        if error not in errors:
+            errors.append(error)
+    return errors
+
+
+def find_costly_plan_operators(
+    plan: Dict[str, Any], cost_guard: CypherCostGuard
+) -> List[CypherPlanIssue]:
+    """
+    Find the operators of an EXPLAIN plan that exceed the thresholds of a cost guard.
+    The operators checked are AllNodesScan, CartesianProduct and NodeByLabelScan followed by a property Filter,
+    in addition to the operator with the most estimated rows.
+
+    Parameters
+    ----------
+    plan : Dict[str, Any]
+        The EXPLAIN plan tree returned by the driver.
+    cost_guard : CypherCostGuard
+        The thresholds.
+
+    Returns
+    -------
+    List[CypherPlanIssue]
+        The costly operators, in plan order.
+    """
+
+    issues: List[CypherPlanIssue] = list()
+    largest: Optional[Tuple[float, Dict[str, Any]]] = None
+
+    # (operator, parent operator)
+    stack: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = [(plan, None)]
+    while stack:
+        operator, parent = stack.pop()
+        stack.extend((c, operator) for c in reversed(operator.get("children") or []))
+
+        operator_type = _get_operator_type(operator)
+        rows = _get_estimated_rows(operator)
+        identifiers = [str(i) for i in operator.get("identifiers") or []]
+        if largest is None or rows > largest[0]:
+            largest = (rows, operator)
+
+        if (
+            operator_type == "AllNodesScan"
+            and cost_guard.max_all_nodes_scan_rows is not None
+            and rows > cost_guard.max_all_nodes_scan_rows
+        ):
+            variable = identifiers[0] if identifiers else "n"
+            issues.append(
+                CypherPlanIssue(
+                    operator=operator_type,
+                    estimated_rows=rows,
+                    identifiers=identifiers,
+                    reason="Every node of the database is scanned.",
+                    hint=f"add a label to the node `{variable}` so it can be found with a label scan or an index.",
+                )
+            )
+
+        elif (
+            operator_type == "CartesianProduct" and cost_guard.reject_cartesian_product
+        ):
+            sides = [
+                ", ".join(f"`{i}`" for i in c.get("identifiers") or [])
+                for c in operator.get("children") or []
+            ]
+            issues.append(
+                CypherPlanIssue(
+                    operator=operator_type,
+                    estimated_rows=rows,
+                    identifiers=identifiers,
+                    reason="Disconnected patterns are matched, so every row of one pattern is combined with every row of the other.",
+                    hint=f"connect the patterns of {' and '.join(sides)} with a relationship, "
+                    "or aggregate one pattern with WITH before matching the other.",
+                )
+            )
+
+        elif (
+            operator_type == "NodeByLabelScan"
+            and cost_guard.max_label_scan_rows is not None
+            and rows > cost_guard.max_label_scan_rows
+            and parent is not None
+            and _get_operator_type(parent) == "Filter"
+        ):
+            match = LABEL_SCAN_DETAILS_PATTERN.match(
+                str((operator.get("args") or dict()).get("Details", ""))
+            )
+            if match is None:
+                continue
+            variable, label = match.group("variable"), match.group("label")
+            filter_details = str((parent.get("args") or dict()).get("Details", ""))
+            properties = sorted(
+                set(re.findall(rf"\b{re.escape(variable)}\.`?(\w+)`?", filter_details))
+            )
+            if not properties:
+                continue
+            issues.append(
+                CypherPlanIssue(
+                    operator=operator_type,
+                    estimated_rows=rows,
+                    identifiers=identifiers,
+                    reason=f"All :{label} nodes are scanned and then filtered by {', '.join(properties)}.",
+                    hint=f"use an index on :{label}({properties[0]}) by filtering `{variable}` with an equality "
+                    "or range predicate on an indexed property, or ask for an index to be created.",
+                )
+            )
+
+    if (
+        largest is not None
+        and cost_guard.max_estimated_rows is not None
+        and largest[0] > cost_guard.max_estimated_rows
+    ):
+        rows, operator = largest
+        issues.append(
+            CypherPlanIssue(
+                operator=_get_operator_type(operator),
+                estimated_rows=rows,
+                identifiers=[str(i) for i in operator.get("identifiers") or []],
+                reason=f"This is more than the limit of {cost_guard.max_estimated_rows:,.0f} rows.",
+                hint="add more selective filters, aggregate earlier with WITH or add a LIMIT.",
+            )
+        )
+
+    return issues
+
+
+def _get_operator_type(operator: Dict[str, Any]) -> str:
+    # operator types carry the runtime as a suffix, such as `AllNodesScan@neo4j`
+    return str(operator.get("operatorType", "")).split("@")[0]
+
+
+def _get_estimated_rows(operator: Dict[str, Any]) -> float:
+    try:
+        return float((operator.get("args") or dict()).get("EstimatedRows", 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def correct_cypher_query_relationship_direction(
+    graph: Neo4jGraph,
+    cypher_statement: str,
+    schema_cache: Optional[CompiledSchemaCache] = None,
 ) -> str:
     """
-    Correct Relationship directions in the Cypher statement with LangChain's `CypherQueryCorrector`.
+    Correct Relationship directions in the Cypher statement using the Relationship patterns in the graph schema.
+    A direction is only reversed if it is invalid as written and valid when reversed.
+    Patterns with unknown labels or types, or without a direction, are left untouched.
 
     Parameters
     ----------
@@ -58,26 +436,80 @@ def correct_cypher_query_relationship_direction(
         The Neo4j graph wrapper.
     cypher_statement : str
         The Cypher statement to validate.
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache holding compiled schema snapshots. If None, a process wide cache is used, by default None
 
     Returns
     -------
     str
         The Cypher statement with corrected Relationship directions.
     """
-    # Cypher query corrector is experimental
-    corrector_schema = [
-        Schema(el["start"], el["type"], el["end"])
-        for el in graph.structured_schema.get("relationships", list())
-    ]
-    cypher_query_corrector = CypherQueryCorrector(corrector_schema)
 
-    corrected_cypher: str = cypher_query_corrector(cypher_statement)
+    schema = get_compiled_schema(graph=graph, schema_cache=schema_cache)
+    parsed = parse_cypher_statement(cypher_statement)
+
+    corrected_cypher = cypher_statement
+
+    # edit from the end of the statement so earlier offsets remain valid
+    for rel in reversed(parsed.relationships):
+        if not _should_reverse_relationship(parsed, rel, schema.relationship_triples):
+            continue
+        body = cypher_statement[rel.body_start : rel.body_end]
+        reversed_rel = f"-{body}->" if rel.direction == "left" else f"<-{body}-"
+        corrected_cypher = (
+            corrected_cypher[: rel.start] + reversed_rel + corrected_cypher[rel.end :]
+        )
 
     return corrected_cypher
 
 
+def _should_reverse_relationship(
+    parsed: ParsedCypherStatement,
+    rel: CypherRelationshipPattern,
+    relationship_triples: AbstractSet[Tuple[str, str, str]],
+) -> bool:
+    if rel.direction == "none" or rel.types is None:
+        return False
+
+    rel_types = _split_labels_or_types(rel.types)
+    left = _split_labels_or_types(parsed.get_node_labels(parsed.nodes[rel.left_node]))
+    right = _split_labels_or_types(parsed.get_node_labels(parsed.nodes[rel.right_node]))
+    if not left and not right:
+        return False
+
+    known_types = {t for _, t, _ in relationship_triples}
+    if not rel_types or not set(rel_types).issubset(known_types):
+        return False
+
+    start, end = (left, right) if rel.direction == "right" else (right, left)
+
+    def is_valid(start_labels: List[str], end_labels: List[str]) -> bool:
+        return any(
+            t in rel_types
+            and (not start_labels or s in start_labels)
+            and (not end_labels or e in end_labels)
+            for s, t, e in relationship_triples
+        )
+
+    return not is_valid(start, end) and is_valid(end, start)
+
+
+def _split_labels_or_types(labels_or_types: Optional[str]) -> List[str]:
+    """Split a label or type expression, dropping negated names."""
+
+    if labels_or_types is None:
+        return list()
+    return [
+        lt.strip()
+        for lt in re.split(r"[:&|]", labels_or_types)
+        if lt.strip() and not lt.strip().startswith("!")
+    ]
+
+
 def validate_cypher_query_with_schema(
-    graph: Neo4jGraph, cypher_statement: str
+    graph: Neo4jGraph,
+    cypher_statement: str,
+    schema_cache: Optional[CompiledSchemaCache] = None,
 ) -> List[str]:
     """
     Validate the provided Cypher statement using the schema retrieved from the graph.
@@ -91,6 +523,8 @@ def validate_cypher_query_with_schema(
         The Neo4j graph wrapper.
     cypher_statement : str
         The Cypher to be validated.
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache holding compiled schema snapshots. If None, a process wide cache is used, by default None
 
     Returns
     -------
@@ -98,9 +532,7 @@ def validate_cypher_query_with_schema(
         A list of any found errors.
     """
 
-    schema: Neo4jStructuredSchema = Neo4jStructuredSchema.model_validate(
-        graph.get_structured_schema
-    )
+    schema = get_compiled_schema(graph=graph, schema_cache=schema_cache)
     nodes_and_rels = extract_entities_for_validation(cypher_statement=cypher_statement)
 
     node_tasks = update_task_list_with_property_type(
@@ -113,19 +545,25 @@ def validate_cypher_query_with_schema(
     errors: List[str] = list()
 
     node_prop_name_enum_tasks = node_tasks
-    node_prop_val_enum_tasks = [n for n in node_tasks if n.property_type == "STRING"]
+    node_prop_val_enum_tasks = [
+        n for n in node_tasks if n.property_type == "STRING" and _is_enum_check(n)
+    ]
     node_prop_val_range_tasks = [
         n
         for n in node_tasks
         if (n.property_type == "INTEGER" or n.property_type == "FLOAT")
+        and _is_range_check(n)
     ]
 
     rel_prop_name_enum_tasks = rel_tasks
-    rel_prop_val_enum_tasks = [n for n in rel_tasks if n.property_type == "STRING"]
+    rel_prop_val_enum_tasks = [
+        n for n in rel_tasks if n.property_type == "STRING" and _is_enum_check(n)
+    ]
     rel_prop_val_range_tasks = [
         n
         for n in rel_tasks
         if (n.property_type == "INTEGER" or n.property_type == "FLOAT")
+        and _is_range_check(n)
     ]
 
     errors.extend(
@@ -157,10 +595,33 @@ def validate_cypher_query_with_schema(
     return errors
 
 
+def _is_enum_check(task: CypherValidationTask) -> bool:
+    """Only exact matches against a literal value can be checked against an enum."""
+    return task.property_value is not None and task.operator in {"=", "IN"}
+
+
+def _is_range_check(task: CypherValidationTask) -> bool:
+    """Only comparisons against a numeric literal can be checked against a range."""
+    if task.property_value is None or task.operator not in {
+        "=",
+        "IN",
+        "<",
+        ">",
+        "<=",
+        ">=",
+    }:
+        return False
+    try:
+        float(task.property_value)
+    except ValueError:
+        return False
+    return True
+
+
 def _validate_node_property_values_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: CompiledNeo4jSchema, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_values_enum = structure_graph_schema.get_node_property_values_enum()
+    prop_values_enum = structure_graph_schema.node_property_values
 
     errors = list()
 
@@ -173,6 +634,7 @@ def _validate_node_property_values_with_enum(
             node_or_rel="Node",
             property_name=t.property_name,
             property_value=t.property_value,
+            and_or=t.parsed_and_or,
         )
         if prop_val_validation_error:
             errors.append(prop_val_validation_error)
@@ -181,9 +643,9 @@ def _validate_node_property_values_with_enum(
 
 
 def _validate_node_property_names_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: CompiledNeo4jSchema, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_enum = structure_graph_schema.get_node_properties_enum()
+    prop_enum = structure_graph_schema.node_properties
 
     errors = list()
 
@@ -195,6 +657,7 @@ def _validate_node_property_names_with_enum(
             labels_or_types=labels,
             node_or_rel="Node",
             property_name=t.property_name,
+            and_or=t.parsed_and_or,
         )
 
         if prop_validation_error:
@@ -203,9 +666,9 @@ def _validate_node_property_names_with_enum(
 
 
 def _validate_relationship_property_names_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: CompiledNeo4jSchema, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_enum = structure_graph_schema.get_relationship_properties_enum()
+    prop_enum = structure_graph_schema.relationship_properties
 
     errors = list()
 
@@ -217,6 +680,7 @@ def _validate_relationship_property_names_with_enum(
             labels_or_types=rel_types,
             node_or_rel="Relationship",
             property_name=t.property_name,
+            and_or=t.parsed_and_or,
         )
 
         if prop_validation_error:
@@ -225,9 +689,9 @@ def _validate_relationship_property_names_with_enum(
 
 
 def _validate_relationship_property_values_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: CompiledNeo4jSchema, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_values_enum = structure_graph_schema.get_relationship_property_values_enum()
+    prop_values_enum = structure_graph_schema.relationship_property_values
 
     errors = list()
 
@@ -239,6 +703,7 @@ def _validate_relationship_property_values_with_enum(
             node_or_rel="Relationship",
             property_name=t.property_name,
             property_value=t.property_value,
+            and_or=t.parsed_and_or,
         )
         if prop_val_validation_error:
             errors.append(prop_val_validation_error)
@@ -247,10 +712,10 @@ def _validate_relationship_property_values_with_enum(
 
 
 def _validate_node_property_values_with_range(
-    structure_graph_schema: Neo4jStructuredSchema,
+    structure_graph_schema: CompiledNeo4jSchema,
     tasks: List[CypherValidationTask],
 ) -> List[str]:
-    prop_values_range = structure_graph_schema.get_node_property_values_range()
+    prop_values_range = structure_graph_schema.node_property_ranges
 
     errors = list()
 
@@ -262,6 +727,7 @@ def _validate_node_property_values_with_range(
             node_or_rel="Node",
             property_name=t.property_name,
             property_value=t.property_value,
+            and_or=t.parsed_and_or,
         )
         if prop_val_validation_error:
             errors.append(prop_val_validation_error)
@@ -270,10 +736,10 @@ def _validate_node_property_values_with_range(
 
 
 def _validate_relationship_property_values_with_range(
-    structure_graph_schema: Neo4jStructuredSchema,
+    structure_graph_schema: CompiledNeo4jSchema,
     tasks: List[CypherValidationTask],
 ) -> List[str]:
-    prop_values_range = structure_graph_schema.get_relationship_property_values_range()
+    prop_values_range = structure_graph_schema.relationship_property_ranges
 
     errors = list()
 
@@ -285,6 +751,7 @@ def _validate_relationship_property_values_with_range(
             node_or_rel="Relationship",
             property_name=t.property_name,
             property_value=t.property_value,
+            and_or=t.parsed_and_or,
         )
         if prop_val_validation_error:
             errors.append(prop_val_validation_error)
@@ -293,7 +760,7 @@ def _validate_relationship_property_values_with_range(
 
 
 def _validate_property_value_with_enum(
-    enum_dict: Dict[str, Dict[str, Set[str]]],
+    enum_dict: Mapping[str, Mapping[str, AbstractSet[str]]],
     labels_or_types: List[str],
     property_name: str,
     node_or_rel: str,
@@ -344,7 +811,7 @@ def _validate_property_value_with_enum(
 
 
 def _validate_property_value_with_range(
-    enum_dict: Dict[str, Dict[str, Neo4jStructuredSchemaPropertyNumber]],
+    enum_dict: Mapping[str, Mapping[str, Neo4jStructuredSchemaPropertyNumber]],
     labels_or_types: List[str],
     property_name: str,
     node_or_rel: Literal["Node", "Relationship"],
@@ -403,7 +870,7 @@ def _validate_property_value_with_range(
 
 
 def _validate_property_with_enum(
-    enum_dict: Dict[str, Set[str]],
+    enum_dict: Mapping[str, AbstractSet[str]],
     labels_or_types: List[str],
     property_name: str,
     node_or_rel: Literal["Node", "Relationship"],
@@ -448,14 +915,20 @@ def _validate_property_with_enum(
         return None
 
 
-def validate_no_writes_in_cypher_query(cypher_statement: str) -> List[str]:
+def validate_no_writes_in_cypher_query(
+    cypher_statement: str, allow_unknown_procedures: bool = True
+) -> List[str]:
     """
-    Validate whether the provided Cypher contains any write clauses.
+    Validate whether the provided Cypher contains any write clauses or calls any write procedures.
+    Keywords inside string literals, comments, property keys and labels are ignored.
+    Procedures are checked against `WRITE_PROCEDURES` and `READ_ONLY_PROCEDURES`.
 
     Parameters
     ----------
     cypher_statement : str
         The Cypher statement to validate.
+    allow_unknown_procedures : bool, optional
+        Whether procedures found in neither table are allowed, by default True
 
     Returns
     -------
@@ -463,9 +936,111 @@ def validate_no_writes_in_cypher_query(cypher_statement: str) -> List[str]:
         A list of any found errors.
     """
     errors: List[str] = list()
-
-    for wc in WRITE_CLAUSES:
-        if wc in cypher_statement.upper():
-            errors.append(f"Cypher contains write clause: {wc}")
+    parsed = parse_cypher_statement(cypher_statement)
+
+    for clause in parsed.clauses:
+        error = f"Cypher contains write clause: {clause.keyword}"
+        if clause.keyword in WRITE_CLAUSES and error not in errors:
+            errors.append(error)
+
+    for procedure in parsed.procedures:
+        access_mode = get_procedure_access_mode(procedure.name)
+        if access_mode == "WRITE":
+            error = f"Cypher calls write procedure: {procedure.name}"
+        elif access_mode is None and not allow_unknown_procedures:
+            error = (
+                f"Cypher calls procedure not known to be read only: {procedure.name}"
+            )
+        else:
+            continue
+        if error not in errors:
+            errors.append(error)
 
     return errors
+
+
+def get_procedure_access_mode(
+    procedure_name: str,
+) -> Optional[Literal["READ", "WRITE"]]:
+    """
+    Look up a procedure in the write and read only procedure tables.
+
+    Parameters
+    ----------
+    procedure_name : str
+        The fully qualified procedure name, such as `db.labels`.
+
+    Returns
+    -------
+    Optional[Literal["READ", "WRITE"]]
+        The access mode, or None if the procedure is in neither table.
+    """
+    if any(fnmatchcase(procedure_name, p) for p in WRITE_PROCEDURES):
+        return "WRITE"
+    if any(fnmatchcase(procedure_name, p) for p in READ_ONLY_PROCEDURES):
+        return "READ"
+    return None
+
+
+async def arun_local_validators(
+    graph: Neo4jGraph,
+    cypher_statement: str,
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
+    syntax_cache: Optional[CypherSyntaxCache] = None,
+    cost_guard: Optional[CypherCostGuard] = None,
+) -> Tuple[str, List[str]]:
+    """
+    Run the validators that do not use an LLM: syntax, write clauses and the graph schema.
+    Syntax is checked with `aexplain_cypher_query`, so malformed text and cached statements do not reach the database.
+    With a `cost_guard`, the EXPLAIN plan is checked for costly operators as well.
+    Relationship directions are corrected as well.
+
+    Parameters
+    ----------
+    graph : Neo4jGraph
+        The Neo4j graph wrapper.
+    cypher_statement : str
+        The Cypher statement to validate.
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used to check syntax. If None, `graph` is queried in a worker thread, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache holding compiled schema snapshots. If None, a process wide cache is used, by default None
+    syntax_cache : Optional[CypherSyntaxCache], optional
+        The cache of EXPLAIN outcomes. If None, EXPLAIN is run for every statement that passes the local checks, by default None
+    cost_guard : Optional[CypherCostGuard], optional
+        The thresholds the EXPLAIN plan must respect. Requires `async_graph`. If None, the plan cost is not checked, by default None
+
+    Returns
+    -------
+    Tuple[str, List[str]]
+        The Cypher statement with corrected Relationship directions and a list of any found errors.
+    """
+
+    errors: List[str] = list()
+
+    explain_result = await aexplain_cypher_query(
+        graph=graph,
+        cypher_statement=cypher_statement,
+        async_graph=async_graph,
+        syntax_cache=syntax_cache,
+        schema_cache=schema_cache,
+    )
+    errors.extend(explain_result.errors)
+    if cost_guard is not None and explain_result.plan is not None:
+        errors.extend(validate_cypher_plan_cost(explain_result.plan, cost_guard))
+
+    errors.extend(validate_no_writes_in_cypher_query(cypher_statement))
+
+    # Experimental feature for correcting relationship directions
+    corrected_cypher = correct_cypher_query_relationship_direction(
+        graph=graph, cypher_statement=cypher_statement, schema_cache=schema_cache
+    )
+
+    errors.extend(
+        validate_cypher_query_with_schema(
+            graph=graph, cypher_statement=cypher_statement, schema_cache=schema_cache
+        )
+    )
+
+    return corrected_cypher, errors
@@ -1,3 +1,7 @@
+import hashlib
+import json
+from typing import Any, Dict
+
 import regex as re
 from langchain_neo4j import Neo4jGraph
 
@@ -14,3 +18,23 @@ def retrieve_and_parse_schema_from_graph_for_prompts(graph: Neo4jGraph) -> str:
         )
 
     return schema
+
+
+def compute_schema_fingerprint(structured_schema: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of a structured graph schema.
+    Two schemas with the same contents will always have the same fingerprint, regardless of key order.
+
+    Parameters
+    ----------
+    structured_schema : Dict[str, Any]
+        The structured schema, such as `Neo4jGraph.get_structured_schema`.
+
+    Returns
+    -------
+    str
+        The hex digest of the schema.
+    """
+
+    serialized = json.dumps(structured_schema, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
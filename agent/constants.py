@@ -8,6 +8,87 @@ WRITE_CLAUSES = {
     "MERGE",
 }
 
+# the keywords a Cypher statement may start with. Anything else, such as prose, is rejected before EXPLAIN
+STATEMENT_START_KEYWORDS = {
+    "MATCH",
+    "OPTIONAL",
+    "WITH",
+    "RETURN",
+    "UNWIND",
+    "CALL",
+    "USE",
+    "CYPHER",
+    "EXPLAIN",
+    "PROFILE",
+    "SHOW",
+    "CREATE",
+    "MERGE",
+    "FOREACH",
+    "LOAD",
+}
+
+# procedures are matched with `fnmatch` style patterns, case sensitive
+# write procedures are checked first, so a procedure matching both tables is rejected
+WRITE_PROCEDURES = {
+    "apoc.create.*",
+    "apoc.merge.*",
+    "apoc.refactor.*",
+    "apoc.periodic.*",
+    "apoc.atomic.*",
+    "apoc.lock.*",
+    "apoc.trigger.*",
+    "apoc.schema.assert",
+    "apoc.cypher.doIt",
+    "apoc.cypher.runWrite",
+    "apoc.cypher.runSchema",
+    "apoc.cypher.runMany",
+    "apoc.cypher.runFile*",
+    "apoc.nodes.delete",
+    "apoc.nodes.link",
+    "apoc.graph.fromCypher",
+    "apoc.do.*",
+    "db.create.*",
+    "db.index.fulltext.create*",
+    "db.index.fulltext.drop",
+    "db.index.vector.createNodeIndex",
+    "gds.*.write",
+    "gds.*.mutate",
+    "gds.graph.drop",
+    "dbms.*",
+}
+
+READ_ONLY_PROCEDURES = {
+    "db.labels",
+    "db.relationshipTypes",
+    "db.propertyKeys",
+    "db.schema.*",
+    "db.indexes",
+    "db.constraints",
+    "db.info",
+    "db.ping",
+    "db.index.fulltext.queryNodes",
+    "db.index.fulltext.queryRelationships",
+    "db.index.vector.queryNodes",
+    "db.index.vector.queryRelationships",
+    "apoc.meta.*",
+    "apoc.path.*",
+    "apoc.neighbors.*",
+    "apoc.algo.*",
+    "apoc.coll.*",
+    "apoc.text.*",
+    "apoc.map.*",
+    "apoc.date.*",
+    "apoc.convert.*",
+    "apoc.help",
+    "apoc.cypher.run",
+    "gds.*.stream",
+    "gds.*.stats",
+    "gds.*.estimate",
+}
+
+
+# the number of few shot examples retrieved for each Cypher generation
+NUM_CYPHER_EXAMPLES = 8
 
 NO_CYPHER_RESULTS = [
     {"error": "I couldn't find any relevant information in the database."}
@@ -0,0 +1,6 @@
+"""Async access to the Neo4j database."""
+
+from .async_neo4j_graph import AsyncNeo4jGraph, RecordStream
+from .records import RecordBudget, estimate_record_size
+
+__all__ = ["AsyncNeo4jGraph", "RecordBudget", "RecordStream", "estimate_record_size"]
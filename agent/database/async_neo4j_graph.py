@@ -0,0 +1,334 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langchain_neo4j import Neo4jGraph
+from neo4j import READ_ACCESS, AsyncDriver, AsyncGraphDatabase, Query
+
+from .records import RecordBudget, TruncationReason
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_FETCH_SIZE = 1000
+
+
+class AsyncNeo4jGraph:
+    """
+    A Neo4j graph wrapper built on `neo4j.AsyncDriver`.
+    Queries are awaited instead of blocking the event loop, so parallel LangGraph subtasks overlap their database I/O.
+    The number of queries in flight is bounded to avoid waiting on the driver's connection pool.
+
+    Schema access is delegated to the synchronous `Neo4jGraph`, which holds the schema in memory.
+    """
+
+    def __init__(
+        self,
+        driver: AsyncDriver,
+        database: str = "neo4j",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Optional[float] = None,
+        schema_graph: Optional[Neo4jGraph] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        driver : AsyncDriver
+            The async Neo4j Python Driver.
+        database : str, optional
+            The Neo4j database name, by default "neo4j"
+        max_concurrency : int, optional
+            The max number of queries in flight. Should not exceed the driver's `max_connection_pool_size`, by default 10
+        timeout : Optional[float], optional
+            The transaction timeout in seconds. If None, the server default is used, by default None
+        schema_graph : Optional[Neo4jGraph], optional
+            The synchronous graph wrapper that provides the schema, by default None
+        """
+
+        if max_concurrency < 1:
+            raise ValueError(f"`max_concurrency` must be at least 1: {max_concurrency}")
+
+        self.driver = driver
+        self.database = database
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.schema_graph = schema_graph
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    def from_uri(
+        cls,
+        uri: str,
+        auth: Tuple[str, str],
+        database: str = "neo4j",
+        max_connection_pool_size: int = DEFAULT_MAX_CONCURRENCY,
+        connection_acquisition_timeout: float = 60.0,
+        timeout: Optional[float] = None,
+        schema_graph: Optional[Neo4jGraph] = None,
+    ) -> "AsyncNeo4jGraph":
+        """
+        Create an `AsyncNeo4jGraph` with a new driver whose connection pool matches the concurrency limit.
+
+        Parameters
+        ----------
+        uri : str
+            The Neo4j URI.
+        auth : Tuple[str, str]
+            The username and password.
+        database : str, optional
+            The Neo4j database name, by default "neo4j"
+        max_connection_pool_size : int, optional
+            The max number of connections, and so the max number of queries in flight, by default 10
+        connection_acquisition_timeout : float, optional
+            The number of seconds to wait for a connection from the pool, by default 60.0
+        timeout : Optional[float], optional
+            The transaction timeout in seconds. If None, the server default is used, by default None
+        schema_graph : Optional[Neo4jGraph], optional
+            The synchronous graph wrapper that provides the schema, by default None
+
+        Returns
+        -------
+        AsyncNeo4jGraph
+            The graph wrapper.
+        """
+
+        driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=auth,
+            max_connection_pool_size=max_connection_pool_size,
+            connection_acquisition_timeout=connection_acquisition_timeout,
+        )
+        return cls(
+            driver=driver,
+            database=database,
+            max_concurrency=max_connection_pool_size,
+            timeout=timeout,
+            schema_graph=schema_graph,
+        )
+
+    @property
+    def schema(self) -> str:
+        """The schema of the graph, as provided by `schema_graph`."""
+
+        if self.schema_graph is None:
+            raise ValueError("`schema_graph` must be provided to access the schema.")
+        return self.schema_graph.schema
+
+    @property
+    def get_structured_schema(self) -> Dict[str, Any]:
+        """The structured schema of the graph, as provided by `schema_graph`."""
+
+        if self.schema_graph is None:
+            raise ValueError("`schema_graph` must be provided to access the schema.")
+        return self.schema_graph.get_structured_schema
+
+    async def query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a read query and return the records as Python dictionaries.
+        If the calling task is cancelled, the connection is killed so the server stops the transaction.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query.
+        params : Optional[Dict[str, Any]], optional
+            The query parameters, by default None
+        timeout : Optional[float], optional
+            The transaction timeout in seconds, enforced by the server. If None, `self.timeout` is used, by default None
+        metadata : Optional[Dict[str, Any]], optional
+            Transaction metadata, visible in `SHOW TRANSACTIONS` and the query log, by default None
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The records.
+        """
+
+        async with self._semaphore:
+            async with self.driver.session(
+                database=self.database, default_access_mode=READ_ACCESS
+            ) as session:
+                try:
+                    result = await session.run(
+                        self._build_query(query, timeout, metadata), params or dict()
+                    )
+                    records: List[Dict[str, Any]] = await result.data()
+                except asyncio.CancelledError:
+                    session.cancel()
+                    raise
+                return records
+
+    async def explain(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run EXPLAIN on a query and return the plan. The query is planned but not executed.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query, without the EXPLAIN keyword.
+        params : Optional[Dict[str, Any]], optional
+            The query parameters, by default None
+        timeout : Optional[float], optional
+            The transaction timeout in seconds, enforced by the server. If None, `self.timeout` is used, by default None
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The plan tree as returned by the driver, or None if the server returned no plan.
+        """
+
+        async with self._semaphore:
+            async with self.driver.session(
+                database=self.database, default_access_mode=READ_ACCESS
+            ) as session:
+                result = await session.run(
+                    self._build_query(f"EXPLAIN {query}", timeout, None),
+                    params or dict(),
+                )
+                summary = await result.consume()
+                plan: Optional[Dict[str, Any]] = summary.plan
+                return plan
+
+    def stream(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> "RecordStream":
+        """
+        Run a read query and iterate over the records as they arrive from the driver.
+        Fetching stops once `max_rows` or `max_bytes` is spent and the rest of the result is discarded on the server.
+
+        Parameters
+        ----------
+        query : str
+            The Cypher query.
+        params : Optional[Dict[str, Any]], optional
+            The query parameters, by default None
+        max_rows : Optional[int], optional
+            The max number of records to return. If None, there is no row limit, by default None
+        max_bytes : Optional[int], optional
+            The max total size of the returned records, estimated from their JSON serialization.
+            If None, there is no size limit, by default None
+        timeout : Optional[float], optional
+            The transaction timeout in seconds, enforced by the server. If None, `self.timeout` is used, by default None
+        metadata : Optional[Dict[str, Any]], optional
+            Transaction metadata, visible in `SHOW TRANSACTIONS` and the query log, by default None
+
+        Returns
+        -------
+        RecordStream
+            An async iterator over the records. Truncation metadata is available once iteration ends.
+        """
+
+        return RecordStream(
+            graph=self,
+            query=self._build_query(query, timeout, metadata),
+            params=params,
+            budget=RecordBudget(max_rows=max_rows, max_bytes=max_bytes),
+        )
+
+    def _build_query(
+        self,
+        query: str,
+        timeout: Optional[float],
+        metadata: Optional[Dict[str, Any]],
+    ) -> Query:
+        return Query(
+            text=query,
+            timeout=timeout if timeout is not None else self.timeout,
+            metadata=metadata,
+        )
+
+    async def close(self) -> None:
+        """Close the driver and its connection pool."""
+
+        await self.driver.close()
+
+    async def __aenter__(self) -> "AsyncNeo4jGraph":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+
+class RecordStream:
+    """
+    An async iterator over the records of a query run by `AsyncNeo4jGraph.stream`.
+    Records are pulled lazily from the driver cursor in batches of at most `DEFAULT_FETCH_SIZE`.
+    """
+
+    def __init__(
+        self,
+        graph: AsyncNeo4jGraph,
+        query: Query,
+        params: Optional[Dict[str, Any]],
+        budget: RecordBudget,
+    ) -> None:
+        self.graph = graph
+        self.query = query
+        self.params = params
+        self.budget = budget
+
+    @property
+    def truncated(self) -> bool:
+        """Whether records were dropped because a budget was spent."""
+
+        return self.budget.truncated
+
+    @property
+    def truncation_reason(self) -> Optional[TruncationReason]:
+        """The budget that was spent, if any."""
+
+        return self.budget.truncation_reason
+
+    @property
+    def record_count(self) -> int:
+        """The number of records returned so far."""
+
+        return self.budget.row_count
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterate()
+
+    async def to_list(self) -> List[Dict[str, Any]]:
+        """Collect the records that fit in the budget."""
+
+        return [record async for record in self]
+
+    async def _iterate(self) -> AsyncIterator[Dict[str, Any]]:
+        fetch_size = DEFAULT_FETCH_SIZE
+        if self.budget.max_rows is not None:
+            # one record past the limit is enough to detect truncation
+            fetch_size = min(fetch_size, self.budget.max_rows + 1)
+
+        async with self.graph._semaphore:
+            async with self.graph.driver.session(
+                database=self.graph.database,
+                default_access_mode=READ_ACCESS,
+                fetch_size=fetch_size,
+            ) as session:
+                try:
+                    result = await session.run(self.query, self.params or dict())
+                    async for record in result:
+                        data = record.data()
+                        if not self.budget.admit(data):
+                            break
+                        yield data
+                    # discard anything left on the server
+                    await result.consume()
+                except asyncio.CancelledError:
+                    # kill the connection so the server stops the transaction
+                    session.cancel()
+                    raise
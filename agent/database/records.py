@@ -0,0 +1,78 @@
+import json
+from typing import Any, Dict, Literal, Optional
+
+TruncationReason = Literal["max_rows", "max_bytes"]
+
+
+def estimate_record_size(record: Dict[str, Any]) -> int:
+    """
+    Estimate the size of a record in bytes by its JSON serialization.
+    This is the form the record takes once it is placed in a prompt.
+
+    Parameters
+    ----------
+    record : Dict[str, Any]
+        The record.
+
+    Returns
+    -------
+    int
+        The estimated size in bytes.
+    """
+
+    return len(json.dumps(record, default=str).encode("utf-8"))
+
+
+class RecordBudget:
+    """
+    Track the number of rows and bytes fetched for a query and decide when to stop fetching.
+    A budget of None is unlimited.
+    """
+
+    def __init__(
+        self, max_rows: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        if max_rows is not None and max_rows < 0:
+            raise ValueError(f"`max_rows` must not be negative: {max_rows}")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"`max_bytes` must not be negative: {max_bytes}")
+
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.row_count = 0
+        self.byte_count = 0
+        self.truncation_reason: Optional[TruncationReason] = None
+
+    @property
+    def truncated(self) -> bool:
+        """Whether a record was rejected because the budget was spent."""
+
+        return self.truncation_reason is not None
+
+    def admit(self, record: Dict[str, Any]) -> bool:
+        """
+        Count the record against the budget.
+
+        Parameters
+        ----------
+        record : Dict[str, Any]
+            The record.
+
+        Returns
+        -------
+        bool
+            True if the record fits in the budget. False if fetching should stop.
+        """
+
+        if self.max_rows is not None and self.row_count >= self.max_rows:
+            self.truncation_reason = "max_rows"
+            return False
+
+        size = estimate_record_size(record) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and self.byte_count + size > self.max_bytes:
+            self.truncation_reason = "max_bytes"
+            return False
+
+        self.row_count += 1
+        self.byte_count += size
+        return True
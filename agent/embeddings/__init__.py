@@ -1,3 +1,3 @@
-from .embedder_protocol import EmbedderProtocol
+from .embedder_protocol import BatchEmbedderProtocol, EmbedderProtocol
 
-__all__ = ["EmbedderProtocol"]
+__all__ = ["BatchEmbedderProtocol", "EmbedderProtocol"]
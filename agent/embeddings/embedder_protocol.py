@@ -6,3 +6,13 @@ class EmbedderProtocol(Protocol):
     """An Embedder must follow this protocol to be used by the package."""
 
     def embed_query(self, text: str) -> List[float]: ...
+
+
+@runtime_checkable
+class BatchEmbedderProtocol(EmbedderProtocol, Protocol):
+    """
+    An Embedder that can also embed many texts in one call, such as LangChain embedders.
+    Ingest uses `embed_documents` when the embedder provides it, and `embed_query` otherwise.
+    """
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]: ...
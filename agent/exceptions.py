@@ -14,3 +14,9 @@ class CypherQueryNodesReadError(PSGenAIAgentsError):
     """Exception raised when an error occurs while retrieving all existing Cypher query node ids."""
 
     ...
+
+
+class CypherExampleVectorIndexError(PSGenAIAgentsError):
+    """Exception raised when the Cypher example vector index can not be created or does not come online."""
+
+    ...
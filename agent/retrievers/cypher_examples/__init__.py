@@ -1,8 +1,19 @@
 """Custom Cypher example retrievers for use with Text2Cypher."""
 
+from .in_memory.in_memory_vector_example_retriever import (
+    InMemoryVectorCypherExampleRetriever,
+)
+from .vector_store.neo4j_hybrid_example_retriever import (
+    Neo4jHybridSearchCypherExampleRetriever,
+)
 from .vector_store.neo4j_vector_example_retriever import (
     Neo4jVectorSearchCypherExampleRetriever,
 )
 from .yaml.yaml_example_retriever import YAMLCypherExampleRetriever
 
-__all__ = ["YAMLCypherExampleRetriever", "Neo4jVectorSearchCypherExampleRetriever"]
+__all__ = [
+    "InMemoryVectorCypherExampleRetriever",
+    "Neo4jHybridSearchCypherExampleRetriever",
+    "YAMLCypherExampleRetriever",
+    "Neo4jVectorSearchCypherExampleRetriever",
+]
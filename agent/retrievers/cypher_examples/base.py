@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List
 
 from pydantic import BaseModel, ConfigDict
 
@@ -8,6 +9,9 @@ class BaseCypherExampleRetriever(BaseModel, ABC):
     """
     Abstract base class for an example retriever.
     Subclasses must implement the `get_examples` method.
+
+    The async methods `aget_examples` and `aget_examples_batch` run `get_examples` in a worker thread by default,
+    so the event loop is never blocked. Subclasses may override them with native implementations.
     """
 
     model_config: ConfigDict = ConfigDict(**{"arbitrary_types_allowed": True})  # type: ignore[misc]
@@ -23,3 +27,44 @@ class BaseCypherExampleRetriever(BaseModel, ABC):
             A list of examples as a string.
         """
         pass
+
+    async def aget_examples(self, query: str, k: int = 5) -> str:
+        """
+        Asynchronously retrieve relevant examples for a query.
+
+        Parameters
+        ----------
+        query : str
+            The query to match against.
+        k : int, optional
+            The number of examples to return, by default 5
+
+        Returns
+        -------
+        str
+            A list of examples as a string.
+        """
+
+        return await asyncio.to_thread(self.get_examples, query=query, k=k)
+
+    async def aget_examples_batch(self, queries: List[str], k: int = 5) -> List[str]:
+        """
+        Asynchronously retrieve relevant examples for several queries, such as all planner subtasks.
+        By default the queries are retrieved concurrently with `aget_examples`.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The queries to match against.
+        k : int, optional
+            The number of examples to return per query, by default 5
+
+        Returns
+        -------
+        List[str]
+            A list of examples as a string for each query, in the order of `queries`.
+        """
+
+        return list(
+            await asyncio.gather(*[self.aget_examples(query=q, k=k) for q in queries])
+        )
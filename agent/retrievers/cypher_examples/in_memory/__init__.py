@@ -0,0 +1,3 @@
+from .in_memory_vector_example_retriever import InMemoryVectorCypherExampleRetriever
+
+__all__ = ["InMemoryVectorCypherExampleRetriever"]
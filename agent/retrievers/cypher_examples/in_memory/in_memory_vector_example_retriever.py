@@ -0,0 +1,420 @@
+import asyncio
+import time
+from threading import Lock, Thread
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+from neo4j import Driver, RoutingControl
+from pydantic import Field, PrivateAttr
+
+from ....embeddings import EmbedderProtocol
+from ....exceptions import CypherExampleRetrieverError
+from ..base import BaseCypherExampleRetriever
+from ..utils.mmr import MMRConfig, normalize_vectors, select_examples_by_mmr
+
+# the hnswlib construction and search parameters, see https://github.com/nmslib/hnswlib/blob/master/ALGO_PARAMS.md
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+class InMemoryVectorCypherExampleRetriever(BaseCypherExampleRetriever):
+    """
+    Retrieve Cypher examples by vector similarity from an in-process copy of the `CypherQuery` nodes.
+
+    The example embeddings are loaded once into a contiguous, L2 normalized float32 matrix,
+    so a search is one embedding call and one matrix vector product instead of a database round trip.
+    With `index="hnsw"`, an approximate HNSW index from the optional `hnswlib` package is searched instead.
+
+    The copy is refreshed incrementally: only the ids, text, content hash and embedding model of all nodes are read,
+    and embeddings are fetched only for nodes that are new or have changed. A node re-embedded in place,
+    such as after a change of embedding model, has a new content hash or model and is fetched again.
+    Deleted nodes are dropped.
+    The first search loads the examples and waits for them. After that, `refresh()` refreshes in the calling thread,
+    and a search made after `refresh_interval` seconds starts a refresh in a background thread and searches the current examples,
+    so it is not blocked by the database reads. A failed background refresh is kept in `last_refresh_error` and retried by the next search.
+    All example embeddings must have the same dimension, otherwise the refresh fails.
+    The HNSW index is not updated in place: it is rebuilt from the whole matrix by every refresh that finds a change.
+
+    Parameters
+    ----------
+    neo4j_driver : Driver
+        The Neo4j Python Driver to read the example nodes with.
+    neo4j_database : str, optional
+        The Neo4j database name, by default "neo4j"
+    embedder : EmbedderProtocol
+        The embedder used to embed the query. Must be the model the examples were embedded with.
+    node_label : str, optional
+        The label of the example nodes, by default "CypherQuery"
+    embedding_property : str, optional
+        The node property holding the question embedding, by default "questionEmbedding"
+    refresh_interval : Optional[float], optional
+        The number of seconds after which a search starts a background refresh. If None, only `refresh()` refreshes, by default None
+    index : Literal["exact", "hnsw"], optional
+        The search index. "exact" scans the whole matrix, "hnsw" requires `hnswlib`, by default "exact"
+    mmr : Optional[MMRConfig], optional
+        If set, the examples are selected by maximal marginal relevance from the `fetch_k` most similar examples,
+        within the token budget of the config, instead of taking the top `k`, by default None
+    """
+
+    neo4j_driver: Driver = Field(
+        description="The Neo4j Python Driver to perform database operations with.",
+    )
+    neo4j_database: str = Field(
+        default="neo4j", description="The Neo4j database name to connect to."
+    )
+    embedder: EmbedderProtocol = Field(
+        description="The embedder to generate an embedding from an input query."
+    )
+    node_label: str = Field(
+        default="CypherQuery", description="The label of the example nodes."
+    )
+    embedding_property: str = Field(
+        default="questionEmbedding",
+        description="The node property holding the question embedding.",
+    )
+    refresh_interval: Optional[float] = Field(
+        default=None,
+        description="The number of seconds after which a search starts a background refresh.",
+    )
+    index: Literal["exact", "hnsw"] = Field(
+        default="exact", description="The search index to use."
+    )
+    mmr: Optional[MMRConfig] = Field(
+        default=None,
+        description="The options for selecting diverse examples by maximal marginal relevance.",
+    )
+
+    # (ids, examples, versions, normalized embedding matrix, hnsw index), replaced as a whole on refresh
+    _snapshot: Tuple[
+        List[str], List[Dict[str, str]], List[Tuple[Any, ...]], np.ndarray, Any
+    ] = PrivateAttr(
+        default_factory=lambda: (
+            list(),
+            list(),
+            list(),
+            np.empty((0, 0), dtype=np.float32),
+            None,
+        )
+    )
+    _last_refresh: Optional[float] = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=Lock)
+    _refresh_thread: Optional[Thread] = PrivateAttr(default=None)
+    _refresh_thread_lock: Any = PrivateAttr(default_factory=Lock)
+    _last_refresh_error: Optional[CypherExampleRetrieverError] = PrivateAttr(
+        default=None
+    )
+
+    def get_examples(self, query: str, k: int = 5, *args: Any, **kwargs: Any) -> str:
+        """
+        Perform vector similarity search between the provided query and the in-memory examples.
+        Returns Cypher queries associated with the top K most similar questions.
+
+        Parameters
+        ----------
+        query : str
+            The query to match against.
+        k: int, optional
+            The number of Cypher statements to return.
+        Returns
+        -------
+        str
+            A list of examples as a string.
+        """
+
+        examples = self._retrieve_examples(query, k)
+        return self._format_examples_list(examples)
+
+    @property
+    def size(self) -> int:
+        """The number of examples held in memory."""
+
+        return len(self._snapshot[0])
+
+    @property
+    def last_refresh_error(self) -> Optional[CypherExampleRetrieverError]:
+        """The error of the last background refresh, or None if it succeeded."""
+
+        return self._last_refresh_error
+
+    def refresh(self) -> None:
+        """Synchronize the in-memory examples with the database."""
+
+        try:
+            with self._lock:
+                self._refresh()
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while refreshing Cypher examples: {e}"
+            )
+
+    async def aget_examples_batch(self, queries: List[str], k: int = 5) -> List[str]:
+        """
+        Asynchronously perform vector similarity search for several queries.
+        The queries are embedded concurrently and scored against the examples with a single matrix product.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The queries to match against.
+        k: int, optional
+            The number of Cypher statements to return per query.
+
+        Returns
+        -------
+        List[str]
+            A list of examples as a string for each query, in the order of `queries`.
+        """
+
+        if not queries:
+            return list()
+        if self._last_refresh is None:
+            await asyncio.to_thread(self.refresh)
+        elif self._is_stale():
+            self._refresh_in_background()
+
+        try:
+            embeddings = await asyncio.gather(*[self._aembed_query(q) for q in queries])
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+        examples = self._search(embeddings, k)
+        return [self._format_examples_list(x) for x in examples]
+
+    def _retrieve_examples(self, query: str, k: int) -> List[Dict[str, str]]:
+        if self._last_refresh is None:
+            self.refresh()
+        elif self._is_stale():
+            self._refresh_in_background()
+
+        try:
+            embedding = self.embedder.embed_query(query)
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+        return self._search([embedding], k)[0]
+
+    def _search(
+        self, embeddings: List[List[float]], k: int
+    ) -> List[List[Dict[str, str]]]:
+        """Find the top `k` examples for each query embedding."""
+
+        # a refresh replaces the snapshot as a whole, so this is consistent without a lock
+        ids, examples, _, matrix, hnsw_index = self._snapshot
+        if not ids or k < 1:
+            return [list() for _ in embeddings]
+
+        # with MMR, the diverse selection is made from a larger candidate list
+        num_candidates = max(k, self.mmr.fetch_k) if self.mmr is not None else k
+        try:
+            queries = normalize_vectors(np.asarray(embeddings, dtype=np.float32))
+            if hnsw_index is not None:
+                # the candidate list must be at least as long as the result
+                hnsw_index.set_ef(max(HNSW_EF_SEARCH, num_candidates))
+                labels, _ = hnsw_index.knn_query(
+                    queries, k=min(num_candidates, len(ids))
+                )
+                candidates = [[int(i) for i in row] for row in labels]
+            else:
+                # (examples x dims) @ (dims x queries) scores every query at once
+                scores = matrix @ queries.T
+                candidates = [
+                    _top_k(scores[:, j], num_candidates) for j in range(len(embeddings))
+                ]
+
+            if self.mmr is None:
+                return [[examples[i] for i in row] for row in candidates]
+
+            mmr = self.mmr
+            return [
+                [
+                    examples[i]
+                    for i in select_examples_by_mmr(
+                        query_embedding=query,
+                        examples=row,
+                        embeddings=matrix[row],
+                        k=k,
+                        config=mmr,
+                        format_example=lambda i: self._format_examples_list(
+                            [examples[i]]
+                        ),
+                    )
+                ]
+                for query, row in zip(queries, candidates)
+            ]
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+    async def _aembed_query(self, query: str) -> List[float]:
+        # LangChain embedders provide a native async method
+        aembed_query = getattr(self.embedder, "aembed_query", None)
+        if aembed_query is not None:
+            embedding: List[float] = await aembed_query(query)
+            return embedding
+        return await asyncio.to_thread(self.embedder.embed_query, query)
+
+    def _is_stale(self) -> bool:
+        if self._last_refresh is None:
+            return True
+        if self.refresh_interval is None:
+            return False
+        return time.monotonic() - self._last_refresh >= self.refresh_interval
+
+    def _refresh_in_background(self) -> None:
+        with self._refresh_thread_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = Thread(
+                target=self._background_refresh,
+                name="cypher-example-refresh",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+            self._last_refresh_error = None
+        except CypherExampleRetrieverError as e:
+            # searches keep using the current examples, and the next stale search tries again
+            self._last_refresh_error = e
+
+    def _refresh(self) -> None:
+        # the ids and versions of all examples, without the embeddings
+        current = {
+            r["id"]: _get_version(r)
+            for r in self._read(
+                f"""
+MATCH (n:{self.node_label})
+WHERE n.{self.embedding_property} IS NOT NULL
+RETURN elementId(n) AS id, n.question AS question, n.cypherStatement AS cypherStatement,
+    n.contentHash AS contentHash, n.embeddingModel AS embeddingModel
+"""
+            )
+        }
+
+        old_ids, old_examples, old_versions, old_matrix, _ = self._snapshot
+        keep = [
+            i
+            for i, (id_, version) in enumerate(zip(old_ids, old_versions))
+            if current.get(id_) == version
+        ]
+        kept_ids = {old_ids[i] for i in keep}
+        to_fetch = [id_ for id_ in current if id_ not in kept_ids]
+
+        if not to_fetch and len(keep) == len(old_ids):
+            # nothing changed, so the matrix and the HNSW index are kept as they are
+            self._last_refresh = time.monotonic()
+            return
+
+        ids = [old_ids[i] for i in keep]
+        examples = [old_examples[i] for i in keep]
+        versions = [old_versions[i] for i in keep]
+        rows = [old_matrix[keep]] if keep else list()
+
+        if to_fetch:
+            fetched = self._read(
+                f"""
+MATCH (n:{self.node_label})
+WHERE elementId(n) IN $ids
+RETURN elementId(n) AS id, n.question AS question, n.cypherStatement AS cypherStatement,
+    n.contentHash AS contentHash, n.embeddingModel AS embeddingModel,
+    n.{self.embedding_property} AS embedding
+""",
+                {"ids": to_fetch},
+            )
+            if fetched:
+                dimensions = {len(r["embedding"]) for r in fetched}
+                if keep:
+                    dimensions.add(old_matrix.shape[1])
+                if len(dimensions) > 1:
+                    raise ValueError(
+                        f"The `{self.embedding_property}` embeddings of the `{self.node_label}` nodes have different dimensions: "
+                        f"{sorted(dimensions)}. Embed all examples with the same model."
+                    )
+                ids.extend(r["id"] for r in fetched)
+                examples.extend(
+                    {"question": r["question"], "cypherStatement": r["cypherStatement"]}
+                    for r in fetched
+                )
+                versions.extend(_get_version(r) for r in fetched)
+                rows.append(
+                    normalize_vectors(
+                        np.asarray([r["embedding"] for r in fetched], dtype=np.float32)
+                    )
+                )
+
+        # one contiguous block, so a search is a single matmul
+        matrix = (
+            np.ascontiguousarray(np.vstack(rows))
+            if rows
+            else np.empty((0, 0), dtype=np.float32)
+        )
+        hnsw_index = (
+            self._build_hnsw_index(matrix)
+            if self.index == "hnsw" and len(ids)
+            else None
+        )
+
+        self._snapshot = (ids, examples, versions, matrix, hnsw_index)
+        self._last_refresh = time.monotonic()
+
+    def _build_hnsw_index(self, matrix: np.ndarray) -> Any:
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError(
+                "Could not import hnswlib. Install it with `pip install hnswlib` to use `index='hnsw'`."
+            )
+
+        hnsw_index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+        hnsw_index.init_index(
+            max_elements=matrix.shape[0], ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M
+        )
+        hnsw_index.add_items(matrix, np.arange(matrix.shape[0]))
+        return hnsw_index
+
+    def _read(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        records, _, _ = self.neo4j_driver.execute_query(
+            query,
+            parameters_=parameters,
+            database_=self.neo4j_database,
+            routing_=RoutingControl.READ,
+        )
+        return [r.data() for r in records]
+
+    def _format_examples_list(self, unformatted_examples: List[Dict[str, str]]) -> str:
+        return ("\n" * 2).join(
+            [
+                f"Question: {el['question']}\nCypher:\n{el['cypherStatement']}"
+                for el in unformatted_examples
+            ]
+        )
+
+
+def _get_version(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    """The fields of an example node whose change requires its embedding to be fetched again."""
+
+    return (
+        record["question"],
+        record["cypherStatement"],
+        record.get("contentHash"),
+        record.get("embeddingModel"),
+    )
+
+
+def _top_k(scores: np.ndarray, k: int) -> List[int]:
+    """The indices of the `k` highest scores, highest first."""
+
+    if k >= len(scores):
+        return [int(i) for i in np.argsort(-scores)]
+    candidates = np.argpartition(-scores, k)[:k]
+    return [int(i) for i in candidates[np.argsort(-scores[candidates])]]
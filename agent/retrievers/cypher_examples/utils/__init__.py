@@ -0,0 +1,20 @@
+from .bm25 import BM25Index, tokenize_text
+from .mmr import (
+    MMRConfig,
+    estimate_tokens,
+    maximal_marginal_relevance,
+    normalize_vectors,
+    select_examples_by_mmr,
+)
+from .rank_fusion import reciprocal_rank_fusion
+
+__all__ = [
+    "BM25Index",
+    "MMRConfig",
+    "estimate_tokens",
+    "maximal_marginal_relevance",
+    "normalize_vectors",
+    "reciprocal_rank_fusion",
+    "select_examples_by_mmr",
+    "tokenize_text",
+]
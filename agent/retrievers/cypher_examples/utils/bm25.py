@@ -0,0 +1,114 @@
+"""
+This file contains a small BM25 index used for lexical example retrieval.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize_text(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Parameters
+    ----------
+    text : str
+        The text.
+
+    Returns
+    -------
+    List[str]
+        The tokens.
+    """
+
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    An Okapi BM25 index over a fixed list of documents.
+    Postings are precomputed, so scoring a query only touches the documents that share a term with it.
+
+    Parameters
+    ----------
+    documents : List[str]
+        The documents to index.
+    k1 : float, optional
+        The term frequency saturation, by default 1.5
+    b : float, optional
+        The document length normalization, by default 0.75
+    """
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.size = len(documents)
+
+        tokenized = [tokenize_text(d) for d in documents]
+        lengths = np.asarray([len(t) for t in tokenized], dtype=np.float32)
+        avg_length = float(lengths.mean()) if self.size and lengths.sum() else 1.0
+
+        # term -> (document indices, BM25 term weight in each document)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = dict()
+        term_docs: Dict[str, List[Tuple[int, int]]] = dict()
+        for idx, tokens in enumerate(tokenized):
+            for term, tf in Counter(tokens).items():
+                term_docs.setdefault(term, list()).append((idx, tf))
+
+        for term, docs in term_docs.items():
+            idf = math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            indices = np.asarray([d for d, _ in docs], dtype=np.int64)
+            tfs = np.asarray([tf for _, tf in docs], dtype=np.float32)
+            norm = k1 * (1 - b + b * lengths[indices] / avg_length)
+            self._postings[term] = (indices, idf * tfs * (k1 + 1) / (tfs + norm))
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Score every document against a query.
+
+        Parameters
+        ----------
+        query : str
+            The query.
+
+        Returns
+        -------
+        np.ndarray
+            The BM25 score of each document, in document order.
+        """
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize_text(query)):
+            posting = self._postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """
+        Find the best matching documents for a query.
+        Ties, including documents that share no term with the query, keep document order.
+
+        Parameters
+        ----------
+        query : str
+            The query.
+        k : int
+            The number of documents to return.
+
+        Returns
+        -------
+        List[int]
+            The indices of up to `k` documents, best first.
+        """
+
+        if k < 1 or not self.size:
+            return list()
+        order = np.argsort(-self.scores(query), kind="stable")
+        return [int(i) for i in order[:k]]
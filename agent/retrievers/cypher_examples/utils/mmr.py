@@ -0,0 +1,202 @@
+"""
+This file contains maximal marginal relevance selection of Cypher examples under a prompt token budget.
+"""
+
+from typing import Callable, List, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+# a common rule of thumb for English text and code with BPE tokenizers
+CHARACTERS_PER_TOKEN = 4
+
+
+class MMRConfig(BaseModel):
+    """
+    Options for selecting examples by maximal marginal relevance.
+
+    Parameters
+    ----------
+    lambda_mult : float, optional
+        The trade off between relevance and diversity. 1.0 ranks by relevance only, 0.0 by diversity only, by default 0.5
+    fetch_k : int, optional
+        The number of most relevant candidates to select from, by default 20
+    token_budget : Optional[int], optional
+        The max estimated number of prompt tokens the selected examples may use.
+        If set, it replaces the requested number of examples and up to `fetch_k` examples are selected while they fit.
+        If None, the requested number of examples applies, by default None
+    """
+
+    lambda_mult: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="The trade off between relevance and diversity.",
+    )
+    fetch_k: int = Field(
+        default=20, ge=1, description="The number of candidates to select from."
+    )
+    token_budget: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="The max estimated number of prompt tokens for the selected examples.",
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without running a tokenizer.
+
+    Parameters
+    ----------
+    text : str
+        The text.
+
+    Returns
+    -------
+    int
+        The estimated number of tokens.
+    """
+
+    return -(-len(text) // CHARACTERS_PER_TOKEN)
+
+
+def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2 normalize a vector or the rows of a matrix, so the dot product is the cosine similarity.
+    Zero vectors are left unchanged.
+
+    Parameters
+    ----------
+    vectors : np.ndarray
+        A vector or a matrix with one vector per row.
+
+    Returns
+    -------
+    np.ndarray
+        The normalized vectors.
+    """
+
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def maximal_marginal_relevance(
+    query_embedding: np.ndarray,
+    candidate_embeddings: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+    token_costs: Optional[Sequence[int]] = None,
+    token_budget: Optional[int] = None,
+) -> List[int]:
+    """
+    Greedily select candidates that are relevant to the query and dissimilar to the candidates already selected.
+    Candidates that no longer fit in the token budget are skipped.
+
+    Parameters
+    ----------
+    query_embedding : np.ndarray
+        The query embedding.
+    candidate_embeddings : np.ndarray
+        The candidate embeddings, one per row.
+    k : int
+        The max number of candidates to select.
+    lambda_mult : float, optional
+        The trade off between relevance and diversity, by default 0.5
+    token_costs : Optional[Sequence[int]], optional
+        The estimated number of tokens of each candidate. Required with `token_budget`, by default None
+    token_budget : Optional[int], optional
+        The max total cost of the selected candidates. If None, only `k` applies, by default None
+
+    Returns
+    -------
+    List[int]
+        The indices of the selected candidates, in selection order.
+    """
+
+    num_candidates = len(candidate_embeddings)
+    if num_candidates == 0 or k < 1:
+        return list()
+
+    candidates = normalize_vectors(np.asarray(candidate_embeddings, dtype=np.float32))
+    relevance = candidates @ normalize_vectors(
+        np.asarray(query_embedding, dtype=np.float32)
+    )
+    costs = (
+        np.asarray(token_costs, dtype=np.int64)
+        if token_costs is not None
+        else np.zeros(num_candidates, dtype=np.int64)
+    )
+    remaining = token_budget if token_budget is not None else np.iinfo(np.int64).max
+
+    # the highest similarity of each candidate to any selected candidate
+    redundancy = np.zeros(num_candidates, dtype=np.float32)
+    available = np.ones(num_candidates, dtype=bool)
+    selected: List[int] = list()
+    while len(selected) < k:
+        eligible = available & (costs <= remaining)
+        if not eligible.any():
+            break
+
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        idx = int(np.argmax(np.where(eligible, scores, -np.inf)))
+
+        selected.append(idx)
+        available[idx] = False
+        remaining -= int(costs[idx])
+        similarity = candidates @ candidates[idx]
+        redundancy = (
+            similarity if len(selected) == 1 else np.maximum(redundancy, similarity)
+        )
+
+    return selected
+
+
+def select_examples_by_mmr(
+    query_embedding: Union[np.ndarray, Sequence[float]],
+    examples: List[T],
+    embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+    k: int,
+    config: MMRConfig,
+    format_example: Callable[[T], str],
+) -> List[T]:
+    """
+    Select examples by maximal marginal relevance within the token budget of `config`.
+    With a token budget the budget governs how many examples are selected, and `fetch_k` is the only upper bound.
+
+    Parameters
+    ----------
+    query_embedding : Union[np.ndarray, Sequence[float]]
+        The query embedding.
+    examples : List[T]
+        The candidate examples, most relevant first.
+    embeddings : Union[np.ndarray, Sequence[Sequence[float]]]
+        The embedding of each candidate example.
+    k : int
+        The max number of examples to select. Ignored if `config` has a token budget.
+    config : MMRConfig
+        The selection options.
+    format_example : Callable[[T], str]
+        The function that formats an example for the prompt, used to estimate its tokens.
+
+    Returns
+    -------
+    List[T]
+        The selected examples, in selection order.
+    """
+
+    examples = examples[: config.fetch_k]
+    if not examples:
+        return list()
+
+    selected = maximal_marginal_relevance(
+        query_embedding=np.asarray(query_embedding, dtype=np.float32),
+        candidate_embeddings=np.asarray(embeddings[: len(examples)], dtype=np.float32),
+        k=k if config.token_budget is None else len(examples),
+        lambda_mult=config.lambda_mult,
+        token_costs=[estimate_tokens(format_example(e)) for e in examples],
+        token_budget=config.token_budget,
+    )
+    return [examples[i] for i in selected]
@@ -0,0 +1,36 @@
+"""
+This file contains rank fusion functions used to combine the results of several retrievers.
+"""
+
+from typing import Dict, Hashable, List, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+# the constant from the original paper, which damps the weight of the top ranks
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: List[List[T]], k: int = DEFAULT_RRF_K) -> List[T]:
+    """
+    Fuse ranked lists by reciprocal rank fusion.
+    Each item scores the sum of 1 / (k + rank) over the lists it appears in, with ranks starting at 1.
+
+    Parameters
+    ----------
+    rankings : List[List[T]]
+        The ranked lists, best first.
+    k : int, optional
+        The rank constant, by default 60
+
+    Returns
+    -------
+    List[T]
+        All items, best first. Ties keep the order in which items were first seen.
+    """
+
+    scores: Dict[T, float] = dict()
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores, key=lambda item: -scores[item])
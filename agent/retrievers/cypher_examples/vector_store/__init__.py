@@ -1,3 +1,7 @@
+from .neo4j_hybrid_example_retriever import Neo4jHybridSearchCypherExampleRetriever
 from .neo4j_vector_example_retriever import Neo4jVectorSearchCypherExampleRetriever
 
-__all__ = ["Neo4jVectorSearchCypherExampleRetriever"]
+__all__ = [
+    "Neo4jHybridSearchCypherExampleRetriever",
+    "Neo4jVectorSearchCypherExampleRetriever",
+]
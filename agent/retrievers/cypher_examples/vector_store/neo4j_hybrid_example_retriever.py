@@ -0,0 +1,237 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from neo4j import RoutingControl
+from pydantic import Field
+
+from ....exceptions import CypherExampleRetrieverError
+from ..utils.bm25 import tokenize_text
+from ..utils.rank_fusion import DEFAULT_RRF_K, reciprocal_rank_fusion
+from .neo4j_vector_example_retriever import Neo4jVectorSearchCypherExampleRetriever
+
+# one full text search per query, in a single round trip
+BATCH_FULLTEXT_SEARCH_QUERY = """
+UNWIND range(0, size($query_texts) - 1) AS idx
+CALL db.index.fulltext.queryNodes($fulltext_index_name, $query_texts[idx], {limit: $top_k})
+YIELD node, score
+RETURN idx, node.question AS question, node.cypherStatement AS cypherStatement, score,
+    CASE WHEN $return_embedding THEN node[$embedding_property] END AS embedding
+ORDER BY idx, score DESC
+"""
+
+# shared by all instances, so the worker threads are bounded per process and not tied to a retriever's lifetime
+_FULLTEXT_SEARCH_EXECUTOR = ThreadPoolExecutor(
+    thread_name_prefix="fulltext_example_search"
+)
+
+
+class Neo4jHybridSearchCypherExampleRetriever(Neo4jVectorSearchCypherExampleRetriever):
+    """
+    Retrieve Cypher examples by combining vector search with full text search over the example questions.
+
+    Vector search finds paraphrases, while full text search finds examples that share rare terms with the query,
+    such as entity names or product codes. The two rankings are fused by reciprocal rank.
+    The full text search runs concurrently with the embedding call and the vector search, so it adds little latency.
+
+    A full text index on the `question` property of the example nodes is required, for example:
+    `CREATE FULLTEXT INDEX cypher_query_fulltext_index FOR (n:CypherQuery) ON EACH [n.question]`
+
+    Parameters
+    ----------
+    neo4j_driver : Driver
+        The Neo4j Python Driver to perform database operations with.
+    neo4j_database : str, optional
+        The Neo4j database name, by default "neo4j"
+    vector_index_name : str
+        The name of the vector index to use.
+    fulltext_index_name : str
+        The name of the full text index to use.
+    embedder : EmbedderProtocol
+        The embedder to generate an embedding from an input query.
+    num_candidates : Optional[int], optional
+        The number of candidates each search returns before fusion. If None, twice the requested k, by default None
+    rrf_k : int, optional
+        The reciprocal rank fusion constant, by default 60
+    embedding_property : str, optional
+        The node property holding the question embedding. Only read with `mmr`, by default "questionEmbedding"
+    mmr : Optional[MMRConfig], optional
+        If set, the examples are selected by maximal marginal relevance from the fused candidates,
+        within the token budget of the config, instead of taking the top `k`, by default None
+    """
+
+    fulltext_index_name: str = Field(
+        description="The name of the full text index to use."
+    )
+    num_candidates: Optional[int] = Field(
+        default=None,
+        description="The number of candidates each search returns before fusion.",
+    )
+    rrf_k: int = Field(
+        default=DEFAULT_RRF_K, description="The reciprocal rank fusion constant."
+    )
+
+    def get_examples(self, query: str, k: int = 5, *args: Any, **kwargs: Any) -> str:
+        """
+        Perform hybrid search between the provided query and queries that exist in the Neo4j database.
+        Returns Cypher queries associated with the top K results after rank fusion.
+
+        Parameters
+        ----------
+        query : str
+            The query to match against.
+        k: int, optional
+            The number of Cypher statements to return.
+        Returns
+        -------
+        str
+            A list of examples as a string.
+        """
+
+        return self.get_examples_many([query], k)[0]
+
+    def get_examples_many(self, queries: List[str], k: int = 5) -> List[str]:
+        """
+        Perform hybrid search for several queries, with one vector and one full text database query.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The queries to match against.
+        k: int, optional
+            The number of Cypher statements to return per query.
+
+        Returns
+        -------
+        List[str]
+            A list of examples as a string for each query, in the order of `queries`.
+        """
+
+        if not queries:
+            return list()
+
+        num_candidates = self._get_num_candidates(k)
+        fulltext_future = _FULLTEXT_SEARCH_EXECUTOR.submit(
+            self._fulltext_search_many, queries, num_candidates
+        )
+        try:
+            embeddings = self._embed_queries(queries)
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+        vector_examples = self._search_many(embeddings, num_candidates)
+
+        fused = self._fuse(vector_examples, fulltext_future.result())
+        return self._select_examples(embeddings, fused, k)
+
+    async def aget_examples_batch(self, queries: List[str], k: int = 5) -> List[str]:
+        """
+        Asynchronously perform hybrid search for several queries.
+        The queries are embedded concurrently with `aembed_query`.
+        The full text search runs concurrently with the embedding calls and the vector search.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The queries to match against.
+        k: int, optional
+            The number of Cypher statements to return per query.
+
+        Returns
+        -------
+        List[str]
+            A list of examples as a string for each query, in the order of `queries`.
+        """
+
+        if not queries:
+            return list()
+
+        num_candidates = self._get_num_candidates(k)
+        fulltext_examples, (embeddings, vector_examples) = await asyncio.gather(
+            asyncio.to_thread(self._fulltext_search_many, queries, num_candidates),
+            self._avector_search_many(queries, num_candidates),
+        )
+
+        fused = self._fuse(vector_examples, fulltext_examples)
+        return self._select_examples(embeddings, fused, k)
+
+    async def _avector_search_many(
+        self, queries: List[str], k: int
+    ) -> Tuple[List[List[float]], List[List[Dict[str, Any]]]]:
+        try:
+            embeddings = await self._aembed_queries(queries)
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+        return embeddings, await asyncio.to_thread(self._search_many, embeddings, k)
+
+    def _fulltext_search_many(
+        self, queries: List[str], k: int
+    ) -> List[List[Dict[str, Any]]]:
+        # plain terms only, so Lucene operators in a question can not break the query
+        query_texts = [" ".join(tokenize_text(q)) for q in queries]
+        examples: List[List[Dict[str, Any]]] = [list() for _ in queries]
+        if not any(query_texts):
+            return examples
+
+        try:
+            records, _, _ = self.neo4j_driver.execute_query(
+                BATCH_FULLTEXT_SEARCH_QUERY,
+                parameters_={
+                    "query_texts": query_texts,
+                    "fulltext_index_name": self.fulltext_index_name,
+                    "top_k": k,
+                    "return_embedding": self.mmr is not None,
+                    "embedding_property": self.embedding_property,
+                },
+                database_=self.neo4j_database,
+                routing_=RoutingControl.READ,
+            )
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+        for record in records:
+            data = record.data()
+            example = {
+                "question": data["question"],
+                "cypherStatement": data["cypherStatement"],
+            }
+            if data.get("embedding") is not None:
+                example["embedding"] = data["embedding"]
+            examples[data["idx"]].append(example)
+        return examples
+
+    def _fuse(
+        self,
+        vector_examples: List[List[Dict[str, Any]]],
+        fulltext_examples: List[List[Dict[str, Any]]],
+    ) -> List[List[Dict[str, Any]]]:
+        """Fuse the candidates of each query, best first."""
+
+        result = list()
+        for vector, fulltext in zip(vector_examples, fulltext_examples):
+            # examples are merged on their question, which is unique per node
+            by_question = {el["question"]: el for el in vector + fulltext}
+            fused = reciprocal_rank_fusion(
+                [
+                    [el["question"] for el in vector],
+                    [el["question"] for el in fulltext],
+                ],
+                k=self.rrf_k,
+            )
+            result.append([by_question[q] for q in fused])
+        return result
+
+    def _get_num_candidates(self, k: int) -> int:
+        num_candidates = (
+            self.num_candidates if self.num_candidates is not None else 2 * k
+        )
+        return (
+            max(num_candidates, self.mmr.fetch_k)
+            if self.mmr is not None
+            else num_candidates
+        )
@@ -3,19 +3,52 @@ LangChain Embedder Base: https://github.com/langchain-ai/langchain/blob/master/l
 Neo4j GraphRAG Embedder Base: https://github.com/neo4j/neo4j-graphrag-python/blob/main/src/neo4j_graphrag/embeddings/base.py
 """
 
-from typing import Any, Dict, List
+import asyncio
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 
-from neo4j import Driver, Record
+from neo4j import Driver, Record, RoutingControl
 from neo4j_graphrag.retrievers import VectorRetriever
 from neo4j_graphrag.types import RetrieverResultItem
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from ....embeddings import EmbedderProtocol
 from ....exceptions import CypherExampleRetrieverError
 from ..base import BaseCypherExampleRetriever
+from ..utils.mmr import MMRConfig, select_examples_by_mmr
+
+# one vector search per query vector, in a single round trip. The embeddings are only returned for MMR selection
+BATCH_VECTOR_SEARCH_QUERY = """
+UNWIND range(0, size($query_vectors) - 1) AS idx
+CALL db.index.vector.queryNodes($vector_index_name, $top_k, $query_vectors[idx])
+YIELD node, score
+RETURN idx, node.question AS question, node.cypherStatement AS cypherStatement, score,
+    CASE WHEN $return_embedding THEN node[$embedding_property] END AS embedding
+ORDER BY idx, score DESC
+"""
 
 
 class Neo4jVectorSearchCypherExampleRetriever(BaseCypherExampleRetriever):
+    """
+    Retrieve Cypher examples by vector similarity search over the example questions in Neo4j.
+
+    Parameters
+    ----------
+    neo4j_driver : Driver
+        The Neo4j Python Driver to perform database operations with.
+    neo4j_database : str, optional
+        The Neo4j database name, by default "neo4j"
+    vector_index_name : str
+        The name of the vector index to use.
+    embedder : EmbedderProtocol
+        The embedder to generate an embedding from an input query.
+    embedding_property : str, optional
+        The node property holding the question embedding. Only read with `mmr`, by default "questionEmbedding"
+    mmr : Optional[MMRConfig], optional
+        If set, the examples are selected by maximal marginal relevance from the `fetch_k` most similar examples,
+        within the token budget of the config, instead of taking the top `k`, by default None
+    """
+
     neo4j_driver: Driver = Field(
         description="The Neo4j Python Driver to perform database operations with.",
     )
@@ -26,6 +59,20 @@ class Neo4jVectorSearchCypherExampleRetriever(BaseCypherExampleRetriever):
     embedder: EmbedderProtocol = Field(
         description="The embedder to generate an embedding from an input query."
     )
+    embedding_property: str = Field(
+        default="questionEmbedding",
+        description="The node property holding the question embedding.",
+    )
+    mmr: Optional[MMRConfig] = Field(
+        default=None,
+        description="The options for selecting diverse examples by maximal marginal relevance.",
+    )
+
+    # `VectorRetriever` reads the index metadata on construction, so build it once per index and database
+    _vector_retrievers: Dict[Tuple[str, str], VectorRetriever] = PrivateAttr(
+        default_factory=dict
+    )
+    _lock: Any = PrivateAttr(default_factory=Lock)
 
     def get_examples(self, query: str, k: int = 5, *args: Any, **kwargs: Any) -> str:
         """
@@ -44,23 +91,106 @@ class Neo4jVectorSearchCypherExampleRetriever(BaseCypherExampleRetriever):
             A list of examples as a string.
         """
 
+        if self.mmr is not None:
+            # MMR needs the candidate embeddings, which only the batch query returns
+            return self.get_examples_many([query], k)[0]
+
         examples = self._retrieve_examples(query, k)
         if len(examples) > 0:
             return self._format_examples_list(examples)
         else:
             return ""
 
+    def get_examples_many(self, queries: List[str], k: int = 5) -> List[str]:
+        """
+        Perform vector similarity search for several queries in a single database round trip.
+        Each query is embedded with `embed_query`, so asymmetric embedders return query embeddings.
+        Use this to collect examples for all planner subtasks at once.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The queries to match against.
+        k: int, optional
+            The number of Cypher statements to return per query.
+
+        Returns
+        -------
+        List[str]
+            A list of examples as a string for each query, in the order of `queries`.
+        """
+
+        if not queries:
+            return list()
+
+        try:
+            embeddings = self._embed_queries(queries)
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+        examples = self._search_many(embeddings, self._get_num_candidates(k))
+        return self._select_examples(embeddings, examples, k)
+
+    async def aget_examples(self, query: str, k: int = 5) -> str:
+        """
+        Asynchronously perform vector similarity search for a query.
+        The embedding call is awaited natively if the embedder supports it.
+
+        Parameters
+        ----------
+        query : str
+            The query to match against.
+        k: int, optional
+            The number of Cypher statements to return.
+
+        Returns
+        -------
+        str
+            A list of examples as a string.
+        """
+
+        return (await self.aget_examples_batch([query], k))[0]
+
+    async def aget_examples_batch(self, queries: List[str], k: int = 5) -> List[str]:
+        """
+        Asynchronously perform vector similarity search for several queries.
+        The queries are embedded concurrently with `aembed_query` and searched with a single vector search query.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The queries to match against.
+        k: int, optional
+            The number of Cypher statements to return per query.
+
+        Returns
+        -------
+        List[str]
+            A list of examples as a string for each query, in the order of `queries`.
+        """
+
+        if not queries:
+            return list()
+
+        try:
+            embeddings = await self._aembed_queries(queries)
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+        examples = await asyncio.to_thread(
+            self._search_many, embeddings, self._get_num_candidates(k)
+        )
+        return self._select_examples(embeddings, examples, k)
+
     def _retrieve_examples(self, query: str, k: int) -> List[Dict[str, Any]]:
         try:
             embedding = self._embed_query(query)
 
-            retriever = VectorRetriever(
-                driver=self.neo4j_driver,
-                index_name=self.vector_index_name,
-                neo4j_database=self.neo4j_database,
-                result_formatter=self._result_formatter,
-                return_properties=["question", "cypherStatement"],
-            )
+            retriever = self._get_vector_retriever()
 
             result = retriever.search(query_vector=embedding, top_k=k)
 
@@ -70,9 +200,102 @@ class Neo4jVectorSearchCypherExampleRetriever(BaseCypherExampleRetriever):
                 f"Error occurred while retrieving Cypher examples: {e}"
             )
 
+    def _search_many(
+        self, embeddings: List[List[float]], k: int
+    ) -> List[List[Dict[str, Any]]]:
+        try:
+            records, _, _ = self.neo4j_driver.execute_query(
+                BATCH_VECTOR_SEARCH_QUERY,
+                parameters_={
+                    "query_vectors": embeddings,
+                    "vector_index_name": self.vector_index_name,
+                    "top_k": k,
+                    "return_embedding": self.mmr is not None,
+                    "embedding_property": self.embedding_property,
+                },
+                database_=self.neo4j_database,
+                routing_=RoutingControl.READ,
+            )
+        except Exception as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while retrieving Cypher examples: {e}"
+            )
+
+        examples: List[List[Dict[str, Any]]] = [list() for _ in embeddings]
+        for record in records:
+            data = record.data()
+            example = {
+                "question": data["question"],
+                "cypherStatement": data["cypherStatement"],
+            }
+            if data.get("embedding") is not None:
+                example["embedding"] = data["embedding"]
+            examples[data["idx"]].append(example)
+        return examples
+
+    def _select_examples(
+        self,
+        embeddings: List[List[float]],
+        candidates: List[List[Dict[str, Any]]],
+        k: int,
+    ) -> List[str]:
+        """Format the top `k` candidates of each query, or the candidates selected by MMR if it is enabled."""
+
+        if self.mmr is None:
+            return [self._format_examples_list(x[:k]) for x in candidates]
+
+        result = list()
+        for embedding, examples in zip(embeddings, candidates):
+            # examples without an embedding can not be compared, so they are not selected
+            examples = [el for el in examples if "embedding" in el]
+            selected = select_examples_by_mmr(
+                query_embedding=embedding,
+                examples=examples,
+                embeddings=[el["embedding"] for el in examples],
+                k=k,
+                config=self.mmr,
+                format_example=lambda el: self._format_examples_list([el]),
+            )
+            result.append(self._format_examples_list(selected))
+        return result
+
+    def _get_num_candidates(self, k: int) -> int:
+        return max(k, self.mmr.fetch_k) if self.mmr is not None else k
+
+    def _get_vector_retriever(self) -> VectorRetriever:
+        key = (self.vector_index_name, self.neo4j_database)
+        with self._lock:
+            retriever = self._vector_retrievers.get(key)
+            if retriever is None:
+                retriever = VectorRetriever(
+                    driver=self.neo4j_driver,
+                    index_name=self.vector_index_name,
+                    neo4j_database=self.neo4j_database,
+                    result_formatter=self._result_formatter,
+                    return_properties=["question", "cypherStatement"],
+                )
+                self._vector_retrievers[key] = retriever
+            return retriever
+
     def _embed_query(self, query: str) -> List[float]:
         return self.embedder.embed_query(query)
 
+    async def _aembed_query(self, query: str) -> List[float]:
+        # LangChain embedders provide a native async method
+        aembed_query = getattr(self.embedder, "aembed_query", None)
+        if aembed_query is not None:
+            embedding: List[float] = await aembed_query(query)
+            return embedding
+        return await asyncio.to_thread(self.embedder.embed_query, query)
+
+    # queries are not embedded with `embed_documents`,
+    # asymmetric embedders place documents in a different space than queries
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        return [self._embed_query(q) for q in queries]
+
+    async def _aembed_queries(self, queries: List[str]) -> List[List[float]]:
+        return list(await asyncio.gather(*[self._aembed_query(q) for q in queries]))
+
     def _result_formatter(self, record: Record) -> RetrieverResultItem:
         """Format the returned result from the vector search."""
 
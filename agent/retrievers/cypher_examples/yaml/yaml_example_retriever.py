@@ -1,39 +1,127 @@
-from typing import Any, Dict, List
+import asyncio
+import os
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
+from ....exceptions import CypherExampleRetrieverError
 from ..base import BaseCypherExampleRetriever
+from ..utils.bm25 import BM25Index
+
+# the libyaml loader is several times faster than the pure Python one, if PyYAML was built with it
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class YAMLCypherExampleRetriever(BaseCypherExampleRetriever):
+    """
+    Retrieve Cypher examples from a local YAML file.
+
+    The file is parsed once and its formatted examples are cached until the file's modification time or size changes.
+    All examples are returned by default.
+    With `select_top_k`, only the `k` examples whose questions best match the query by BM25 are returned.
+
+    Parameters
+    ----------
+    cypher_query_yaml_file_path : str
+        The local file path to a YAML file containing question and Cypher query pairs under a `queries` key.
+    select_top_k : bool, optional
+        Whether to return only the `k` examples that best match the query. If False, `k` is ignored, by default False
+    """
+
     cypher_query_yaml_file_path: str = Field(
         description="The local file path to a YAML file containing question and Cypher query pairs."
     )
+    select_top_k: bool = Field(
+        default=False,
+        description="Whether to return only the `k` examples that best match the query by BM25.",
+    )
 
-    def get_examples(self, *args: Any, **kwargs: Any) -> str:
-        unformatted_examples = self._get_example_queries_from_yaml()
+    # ((mtime_ns, size), formatted examples, BM25 index over the questions)
+    _cache: Optional[Tuple[Tuple[int, int], List[str], BM25Index]] = PrivateAttr(
+        default=None
+    )
+    _lock: Any = PrivateAttr(default_factory=Lock)
+
+    def get_examples(
+        self,
+        query: Optional[str] = None,
+        k: Optional[int] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Retrieve examples from the YAML file.
 
-        return self._format_examples_list(unformatted_examples)
+        Parameters
+        ----------
+        query : Optional[str], optional
+            The query to match against. If None, all examples are returned, by default None
+        k : Optional[int], optional
+            The number of examples to return if `select_top_k` is True. If None, all examples are returned, by default None
+
+        Returns
+        -------
+        str
+            A list of examples as a string.
+        """
 
-    def _format_examples_list(self, unformatted_examples: List[Dict[str, str]]) -> str:
-        return ("\n" * 2).join(
-            [
-                f"Question: {el['question']}\nCypher:{el['cql']}"
-                for el in unformatted_examples
-            ]
+        _, examples, index = self._load()
+        if not self.select_top_k or query is None or k is None or k >= len(examples):
+            return ("\n" * 2).join(examples)
+
+        return ("\n" * 2).join([examples[i] for i in index.top_k(query, k)])
+
+    async def aget_examples_batch(self, queries: List[str], k: int = 5) -> List[str]:
+        # lexical search is cheap, so one worker thread serves the whole batch
+        return await asyncio.to_thread(
+            lambda: [self.get_examples(query=q, k=k) for q in queries]
         )
 
+    def _load(self) -> Tuple[Tuple[int, int], List[str], BM25Index]:
+        """Get the cached examples, parsing the file again if it has changed."""
+
+        try:
+            stat = os.stat(self.cypher_query_yaml_file_path)
+        except OSError as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while reading Cypher examples: {e}"
+            )
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cache = self._cache
+        if cache is not None and cache[0] == version:
+            return cache
+
+        with self._lock:
+            if self._cache is None or self._cache[0] != version:
+                unformatted_examples = self._get_example_queries_from_yaml()
+                self._cache = (
+                    version,
+                    self._format_examples(unformatted_examples),
+                    BM25Index([el["question"] for el in unformatted_examples]),
+                )
+            return self._cache
+
+    def _format_examples(self, unformatted_examples: List[Dict[str, str]]) -> List[str]:
+        return [
+            f"Question: {el['question']}\nCypher:{el['cql']}"
+            for el in unformatted_examples
+        ]
+
     def _get_example_queries_from_yaml(self) -> List[Dict[str, str]]:
         """
         Format the queries to be used in text2cypher.
         """
 
-        with open(self.cypher_query_yaml_file_path) as f:
-            try:
-                queries = yaml.safe_load(f)["queries"]
-            except yaml.YAMLError as exc:
-                print(exc)
+        try:
+            with open(self.cypher_query_yaml_file_path) as f:
+                queries = yaml.load(f, Loader=_YAMLLoader)["queries"]
+        except (OSError, yaml.YAMLError, KeyError, TypeError) as e:
+            raise CypherExampleRetrieverError(
+                f"Error occurred while reading Cypher examples: {e}"
+            )
         return [
             {
                 "question": q["question"],
@@ -5,23 +5,30 @@ from langchain_neo4j import Neo4jGraph
 from langgraph.constants import END, START
 from langgraph.graph.state import CompiledStateGraph, StateGraph
 
+from ..cache import CypherGenerationCache, CypherResultCache, SemanticAnswerCache
 from ..components.final_answer import create_final_answer_node
 from ..components.gather_cypher import create_gather_cypher_node
 from ..components.guardrails import create_guardrails_node
 from ..components.planner import create_planner_node
+from ..components.semantic_cache import create_semantic_cache_node
 from ..components.state import (
     InputState,
     OutputState,
     OverallState,
 )
 from ..components.summarize import create_summarization_node
+from ..components.text2cypher.validation.models import CypherCostGuard
+from ..components.text2cypher.validation.utils.schema_cache import CompiledSchemaCache
 from ..components.validate_final_answer import create_validate_final_answer_node
+from ..database import AsyncNeo4jGraph
 from ..retrievers.cypher_examples.base import BaseCypherExampleRetriever
 from .edges import (
     guardrails_conditional_edge,
     query_mapper_edge,
+    semantic_cache_conditional_edge,
     validate_final_answer_router,
 )
+from .fan_out_scheduler import FanOutScheduler
 from .simple_text2cypher import create_simple_text2cypher_agentic_workflow
 
 
@@ -33,6 +40,16 @@ def create_advanced_text2cypher_agentic_workflow(
     llm_cypher_validation: bool = True,
     max_attempts: int = 3,
     attempt_cypher_execution_on_final_attempt: bool = False,
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    timeout: Optional[float] = None,
+    result_cache: Optional[CypherResultCache] = None,
+    answer_cache: Optional[SemanticAnswerCache] = None,
+    generation_cache: Optional[CypherGenerationCache] = None,
+    fan_out_scheduler: Optional[FanOutScheduler] = None,
+    cost_guard: Optional[CypherCostGuard] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
 ) -> CompiledStateGraph:
     """
     Create a Text2Cypher Agentic workflow using LangGraph.
@@ -55,6 +72,32 @@ def create_advanced_text2cypher_agentic_workflow(
     attempt_cypher_execution_on_final_attempt, bool, optional
         THIS MAY BE DANGEROUS.
         Whether to attempt Cypher execution on the last attempt, regardless of if the Cypher contains errors, by default False
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used for Cypher validation and execution.
+        If None, `graph` is queried in a worker thread, by default None
+    max_rows : Optional[int], optional
+        The max number of records kept per executed Cypher statement. If None, there is no row limit, by default None
+    max_bytes : Optional[int], optional
+        The max total size of records kept per executed Cypher statement. If None, there is no size limit, by default None
+    timeout : Optional[float], optional
+        The transaction timeout in seconds for executed Cypher. Requires `async_graph`. By default None
+    result_cache : Optional[CypherResultCache], optional
+        The cache of executed Cypher results. If None, every statement is executed, by default None
+    answer_cache : Optional[SemanticAnswerCache], optional
+        The cache of past answers. If provided, a semantic_cache node before guardrails returns the answer
+        to a similar question without running the workflow, by default None
+    generation_cache : Optional[CypherGenerationCache], optional
+        The cache of validated Cypher statements. On a hit, generation, validation and correction are skipped, by default None
+    fan_out_scheduler : Optional[FanOutScheduler], optional
+        The scheduler of the planner subtasks. It de-duplicates, orders and caps the subtasks and bounds how many run at once.
+        Share one scheduler between workflows to bound the subtasks of the whole process.
+        If None, every subtask runs at once, by default None
+    cost_guard : Optional[CypherCostGuard], optional
+        The thresholds the EXPLAIN plan must respect before a statement is executed.
+        Costly plans are sent back to the Correction node with hints. Requires `async_graph`. If None, the plan cost is not checked, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache of compiled schema snapshots shared by the semantic_cache node and the Text2Cypher subgraph.
+        If None, one is created for the workflow, by default None
 
     Returns
     -------
@@ -62,10 +105,20 @@ def create_advanced_text2cypher_agentic_workflow(
         The workflow.
     """
 
+    # the semantic cache and the Text2Cypher nodes compile the schema once per workflow
+    if schema_cache is None:
+        schema_cache = CompiledSchemaCache()
+
     guardrails = create_guardrails_node(
         llm=llm, graph=graph, scope_description=scope_description
     )
-    planner = create_planner_node(llm=llm)
+    planner = create_planner_node(
+        llm=llm,
+        cypher_example_retriever=cypher_example_retriever,
+        select_tasks=fan_out_scheduler.schedule
+        if fan_out_scheduler is not None
+        else None,
+    )
     text2cypher = create_simple_text2cypher_agentic_workflow(
         llm=llm,
         graph=graph,
@@ -73,31 +126,57 @@ def create_advanced_text2cypher_agentic_workflow(
         llm_cypher_validation=llm_cypher_validation,
         max_attempts=max_attempts,
         attempt_cypher_execution_on_final_attempt=attempt_cypher_execution_on_final_attempt,
+        async_graph=async_graph,
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        timeout=timeout,
+        result_cache=result_cache,
+        generation_cache=generation_cache,
+        cost_guard=cost_guard,
+        schema_cache=schema_cache,
     )
     gather_cypher = create_gather_cypher_node()
     summarize = create_summarization_node(llm=llm)
     validate_final_answer = create_validate_final_answer_node(
         llm=llm, graph=graph, loop_back_node="text2cypher"
     )
-    final_answer = create_final_answer_node()
+    final_answer = create_final_answer_node(answer_cache=answer_cache)
 
     main_graph_builder = StateGraph(OverallState, input=InputState, output=OutputState)
 
     main_graph_builder.add_node(guardrails)
     main_graph_builder.add_node(planner)
-    main_graph_builder.add_node("text2cypher", text2cypher)
+    main_graph_builder.add_node(
+        "text2cypher",
+        fan_out_scheduler.wrap(text2cypher)
+        if fan_out_scheduler is not None
+        else text2cypher,
+    )
     main_graph_builder.add_node(gather_cypher)
     main_graph_builder.add_node(summarize)
     main_graph_builder.add_node(final_answer)
 
-    main_graph_builder.add_edge(START, "guardrails")
+    if answer_cache is not None:
+        semantic_cache = create_semantic_cache_node(
+            answer_cache=answer_cache, graph=graph, schema_cache=schema_cache
+        )
+        main_graph_builder.add_node(semantic_cache)
+        main_graph_builder.add_edge(START, "semantic_cache")
+        main_graph_builder.add_conditional_edges(
+            "semantic_cache",
+            semantic_cache_conditional_edge,
+        )
+    else:
+        main_graph_builder.add_edge(START, "guardrails")
     main_graph_builder.add_conditional_edges(
         "guardrails",
         guardrails_conditional_edge,
     )
     main_graph_builder.add_conditional_edges(
         "planner",
-        query_mapper_edge,  # type: ignore[arg-type, unused-ignore]
+        fan_out_scheduler.query_mapper_edge  # type: ignore[arg-type, unused-ignore]
+        if fan_out_scheduler is not None
+        else query_mapper_edge,
         ["text2cypher"],
     )
     main_graph_builder.add_edge("text2cypher", "gather_cypher")
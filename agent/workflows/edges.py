@@ -22,6 +22,16 @@ def guardrails_conditional_edge(
             return "final_answer"
 
 
+def semantic_cache_conditional_edge(
+    state: OverallState,
+) -> Literal["guardrails", "final_answer"]:
+    match state.get("next_action"):
+        case "final_answer":
+            return "final_answer"
+        case _:
+            return "guardrails"
+
+
 def validate_final_answer_router(
     state: OverallState,
 ) -> Send:
@@ -41,11 +51,26 @@ def query_mapper_edge(state: OverallState) -> List[Send]:
     """Map each task question to a Text2Cypher subgraph."""
 
     return [
-        Send("text2cypher", {"task": task.question})
+        Send(
+            "text2cypher",
+            {"task": task.question}
+            if task.examples is None
+            else {"task": task.question, "examples": task.examples},
+        )
         for task in state.get("tasks", list())
     ]
 
 
+def generate_cypher_conditional_edge(
+    state: CypherState,
+) -> Literal["validate_cypher", "execute_cypher"]:
+    match state.get("next_action_cypher"):
+        case "execute_cypher":
+            return "execute_cypher"
+        case _:
+            return "validate_cypher"
+
+
 def validate_cypher_conditional_edge(
     state: CypherState,
 ) -> Literal["correct_cypher", "execute_cypher", "__end__"]:
@@ -58,3 +83,13 @@ def validate_cypher_conditional_edge(
             return "__end__"
         case _:
             return "__end__"
+
+
+def execute_cypher_conditional_edge(
+    state: CypherState,
+) -> Literal["correct_cypher", "__end__"]:
+    match state.get("next_action_cypher"):
+        case "correct_cypher":
+            return "correct_cypher"
+        case _:
+            return "__end__"
@@ -0,0 +1,347 @@
+"""
+This file contains a scheduler that bounds the concurrency of the Text2Cypher subtasks a planner fans out.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+import weakref
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langgraph.types import Send
+
+from ..components.models import Task
+from ..components.state import OverallState
+
+# the Send payload keys used by the scheduler, removed before the subgraph is invoked
+FAN_OUT_ID_KEY = "__fan_out_id"
+PRIORITY_KEY = "__fan_out_priority"
+
+
+class PriorityLimiter:
+    """
+    An asyncio semaphore that hands free slots to the waiter with the lowest priority value first.
+    Waiters with the same priority are served in arrival order.
+
+    Parameters
+    ----------
+    limit : int
+        The max number of concurrent holders.
+    """
+
+    def __init__(self, limit: int) -> None:
+        assert limit > 0, "`limit` must be greater than 0."
+
+        self.limit = limit
+        self._holders = 0
+        self._waiters: List[Tuple[float, int, asyncio.Future[None]]] = list()
+        self._counter = itertools.count()
+
+    @property
+    def holders(self) -> int:
+        """The number of slots in use."""
+
+        return self._holders
+
+    async def acquire(self, priority: float = 0.0) -> None:
+        """Wait for a free slot."""
+
+        if self._holders < self.limit and not self._waiters:
+            self._holders += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed over right before the cancellation, so pass it on
+                self.release()
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not future]
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiter if there is one."""
+
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # the slot passes to the waiter, so the number of holders stays the same
+                future.set_result(None)
+                return
+        self._holders -= 1
+
+
+class FanOutScheduler:
+    """
+    Schedule the Text2Cypher subtasks a planner fans out.
+
+    Subtasks with the same question are only run once, subtasks are ordered by priority,
+    and at most `max_subtasks` are run per request. Running subtasks are bounded by a per request limit
+    and a process wide limit, so one scheduler should be shared by all workflows of a process.
+
+    When a subtask fails with a rate limit error, every subtask of every request waits out the backoff
+    before it starts or retries, so the provider is not hit by the other concurrent requests in the meantime.
+
+    Parameters
+    ----------
+    max_concurrency_per_request : int, optional
+        The max number of subtasks of one request that run at the same time, by default 3
+    max_concurrency : int, optional
+        The max number of subtasks of all requests that run at the same time, by default 8
+    max_subtasks : Optional[int], optional
+        The max number of subtasks per request. Lower priority subtasks are dropped. If None, there is no cap, by default None
+    priority : Optional[Callable[[Task], float]], optional
+        A function returning the priority of a task, lower runs first. If None, the planner order is kept, by default None
+    max_retries : int, optional
+        The max number of retries of a subtask after a rate limit error, by default 3
+    backoff_base : float, optional
+        The backoff in seconds after the first rate limit error. It doubles with every retry of a subtask, by default 1.0
+    backoff_max : float, optional
+        The max backoff in seconds, by default 30.0
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_request: int = 3,
+        max_concurrency: int = 8,
+        max_subtasks: Optional[int] = None,
+        priority: Optional[Callable[[Task], float]] = None,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+    ) -> None:
+        assert (
+            max_concurrency_per_request > 0
+        ), "`max_concurrency_per_request` must be greater than 0."
+        assert max_concurrency > 0, "`max_concurrency` must be greater than 0."
+        assert (
+            max_subtasks is None or max_subtasks > 0
+        ), "`max_subtasks` must be greater than 0."
+
+        self.max_concurrency_per_request = max_concurrency_per_request
+        self.max_concurrency = max_concurrency
+        self.max_subtasks = max_subtasks
+        self.priority = priority
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # asyncio primitives belong to one event loop, so there is a process wide limiter per loop
+        self._limiters: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, PriorityLimiter
+        ] = weakref.WeakKeyDictionary()
+        # fan out id -> per request limiter. The running subtasks of a request hold its limiter,
+        # so the entry is dropped once they finish or are cancelled, such as by an interrupted graph
+        self._requests: weakref.WeakValueDictionary[str, PriorityLimiter] = (
+            weakref.WeakValueDictionary()
+        )
+        self._backoff_until = 0.0
+
+    def query_mapper_edge(self, state: OverallState) -> List[Send]:
+        """
+        Map each distinct task question to a Text2Cypher subgraph, in priority order and up to `max_subtasks`.
+        Use in place of `query_mapper_edge` together with a subgraph wrapped by `wrap`.
+        """
+
+        scheduled = self._schedule(state.get("tasks", list()))
+        if not scheduled:
+            return list()
+
+        # the per request limiter is created by the first subtask that runs
+        fan_out_id = uuid.uuid4().hex
+
+        sends = list()
+        for priority, task in scheduled:
+            payload: Dict[str, Any] = {
+                "task": task.question,
+                FAN_OUT_ID_KEY: fan_out_id,
+                PRIORITY_KEY: priority,
+            }
+            if task.examples is not None:
+                payload["examples"] = task.examples
+            sends.append(Send("text2cypher", payload))
+        return sends
+
+    def schedule(self, tasks: List[Task]) -> List[Task]:
+        """
+        Select the tasks `query_mapper_edge` runs, in the order they are scheduled.
+        Pass to the planner node as `select_tasks`, so few shot examples are only retrieved for these tasks.
+
+        Parameters
+        ----------
+        tasks : List[Task]
+            The planned tasks.
+
+        Returns
+        -------
+        List[Task]
+            The distinct tasks in priority order, up to `max_subtasks`.
+        """
+
+        return [task for _, task in self._schedule(tasks)]
+
+    def wrap(self, subgraph: Runnable[Any, Any]) -> Runnable[Dict[str, Any], Any]:
+        """
+        Wrap the Text2Cypher subgraph so it runs within the concurrency limits and the shared backoff.
+
+        Parameters
+        ----------
+        subgraph : Runnable[Any, Any]
+            The compiled Text2Cypher subgraph.
+
+        Returns
+        -------
+        Runnable[Dict[str, Any], Any]
+            The LangGraph node.
+        """
+
+        async def text2cypher(state: Dict[str, Any], config: RunnableConfig) -> Any:
+            """
+            Run a Text2Cypher subtask once a slot is free.
+            """
+
+            payload = dict(state)
+            fan_out_id = payload.pop(FAN_OUT_ID_KEY, None)
+            priority = float(payload.pop(PRIORITY_KEY, 0.0))
+
+            return await self.run(
+                lambda: subgraph.ainvoke(payload, config),
+                fan_out_id=fan_out_id,
+                priority=priority,
+            )
+
+        return RunnableLambda(text2cypher, name="text2cypher")
+
+    async def run(
+        self,
+        subtask: Callable[[], Coroutine[Any, Any, Any]],
+        fan_out_id: Optional[str] = None,
+        priority: float = 0.0,
+    ) -> Any:
+        """
+        Run a subtask within the concurrency limits, retrying it after rate limit errors.
+
+        Parameters
+        ----------
+        subtask : Callable[[], Coroutine[Any, Any, Any]]
+            A function returning a new coroutine of the subtask on every call.
+        fan_out_id : Optional[str], optional
+            The id of the request the subtask belongs to. If None, only the process wide limit applies, by default None
+        priority : float, optional
+            The priority of the subtask, lower runs first, by default 0.0
+
+        Returns
+        -------
+        Any
+            The result of the subtask.
+        """
+
+        limiters = [self._get_limiter()]
+        if fan_out_id is not None:
+            limiters.insert(0, self._get_request_limiter(fan_out_id))
+
+        acquired: List[PriorityLimiter] = list()
+        try:
+            for limiter in limiters:
+                await limiter.acquire(priority)
+                acquired.append(limiter)
+
+            attempt = 0
+            while True:
+                await self._wait_for_backoff()
+                try:
+                    return await subtask()
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        raise
+                    self._extend_backoff(attempt)
+                    attempt += 1
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+
+    @property
+    def backoff_remaining(self) -> float:
+        """The number of seconds until subtasks may start again after a rate limit error."""
+
+        return max(0.0, self._backoff_until - time.monotonic())
+
+    def _schedule(self, tasks: List[Task]) -> List[Tuple[float, Task]]:
+        ordered = list(enumerate(tasks))
+        ordered.sort(
+            key=lambda x: self.priority(x[1]) if self.priority is not None else x[0]
+        )
+
+        seen = set()
+        scheduled: List[Tuple[float, Task]] = list()
+        for idx, task in ordered:
+            question = " ".join(task.question.lower().split())
+            if question in seen:
+                continue
+            seen.add(question)
+            scheduled.append(
+                (self.priority(task) if self.priority is not None else idx, task)
+            )
+        if self.max_subtasks is not None:
+            scheduled = scheduled[: self.max_subtasks]
+        return scheduled
+
+    def _get_limiter(self) -> PriorityLimiter:
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = PriorityLimiter(self.max_concurrency)
+            self._limiters[loop] = limiter
+        return limiter
+
+    def _get_request_limiter(self, fan_out_id: str) -> PriorityLimiter:
+        limiter = self._requests.get(fan_out_id)
+        if limiter is None:
+            limiter = PriorityLimiter(self.max_concurrency_per_request)
+            self._requests[fan_out_id] = limiter
+        return limiter
+
+    async def _wait_for_backoff(self) -> None:
+        # the backoff may be extended by another subtask while waiting
+        while (remaining := self.backoff_remaining) > 0:
+            await asyncio.sleep(remaining)
+
+    def _extend_backoff(self, attempt: int) -> None:
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+        self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an error is a rate limit error of an LLM or embedding provider.
+    Checks for an HTTP 429 status code and for rate limit or throttling in the error type and message.
+
+    Parameters
+    ----------
+    error : BaseException
+        The error.
+
+    Returns
+    -------
+    bool
+        Whether the error is a rate limit error.
+    """
+
+    status_code = getattr(error, "status_code", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+    if status_code == 429:
+        return True
+
+    text = f"{type(error).__name__} {error}".lower()
+    return any(
+        marker in text
+        for marker in ("ratelimit", "rate limit", "rate_limit", "throttl")
+    )
@@ -1,10 +1,11 @@
-from typing import Literal
+from typing import Literal, Optional, Sequence
 
 from langchain_core.language_models import BaseChatModel
 from langchain_neo4j import Neo4jGraph
-from langgraph.constants import END, START
+from langgraph.constants import START
 from langgraph.graph.state import CompiledStateGraph, StateGraph
 
+from ..cache import CypherGenerationCache, CypherResultCache, CypherSyntaxCache
 from ..components.state import (
     OverallState,
 )
@@ -15,8 +16,15 @@ from ..components.text2cypher import (
     create_text2cypher_validation_node,
 )
 from ..components.text2cypher.state import CypherInputState, CypherState
+from ..components.text2cypher.validation.models import CypherCostGuard
+from ..components.text2cypher.validation.utils.schema_cache import CompiledSchemaCache
+from ..database import AsyncNeo4jGraph
 from ..retrievers.cypher_examples.base import BaseCypherExampleRetriever
-from .edges import validate_cypher_conditional_edge
+from .edges import (
+    execute_cypher_conditional_edge,
+    generate_cypher_conditional_edge,
+    validate_cypher_conditional_edge,
+)
 
 
 def create_simple_text2cypher_agentic_workflow(
@@ -26,6 +34,17 @@ def create_simple_text2cypher_agentic_workflow(
     llm_cypher_validation: bool = True,
     max_attempts: int = 3,
     attempt_cypher_execution_on_final_attempt: bool = False,
+    async_graph: Optional[AsyncNeo4jGraph] = None,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    timeout: Optional[float] = None,
+    result_cache: Optional[CypherResultCache] = None,
+    generation_cache: Optional[CypherGenerationCache] = None,
+    speculative_candidates: int = 1,
+    speculative_temperatures: Optional[Sequence[float]] = None,
+    syntax_cache: Optional[CypherSyntaxCache] = None,
+    cost_guard: Optional[CypherCostGuard] = None,
+    schema_cache: Optional[CompiledSchemaCache] = None,
 ) -> CompiledStateGraph:
     """
     Create a Text2Cypher agent using LangGraph.
@@ -47,6 +66,33 @@ def create_simple_text2cypher_agentic_workflow(
     attempt_cypher_execution_on_final_attempt, bool, optional
         THIS MAY BE DANGEROUS.
         Whether to attempt Cypher execution on the last attempt, regardless of if the Cypher contains errors, by default False
+    async_graph : Optional[AsyncNeo4jGraph], optional
+        The async Neo4j graph wrapper used for Cypher validation and execution.
+        If None, `graph` is queried in a worker thread, by default None
+    max_rows : Optional[int], optional
+        The max number of records kept per executed Cypher statement. If None, there is no row limit, by default None
+    max_bytes : Optional[int], optional
+        The max total size of records kept per executed Cypher statement. If None, there is no size limit, by default None
+    timeout : Optional[float], optional
+        The transaction timeout in seconds for executed Cypher. Requires `async_graph`. By default None
+    result_cache : Optional[CypherResultCache], optional
+        The cache of executed Cypher results. If None, every statement is executed, by default None
+    generation_cache : Optional[CypherGenerationCache], optional
+        The cache of validated Cypher statements. On a hit, generation, validation and correction are skipped, by default None
+    speculative_candidates : int, optional
+        The number of Cypher candidates generated and locally validated concurrently. The first valid candidate is kept
+        and the others are cancelled. If 1, a single statement is generated, by default 1
+    speculative_temperatures : Optional[Sequence[float]], optional
+        The sampling temperature of each speculative candidate. If None, candidates only differ by their few shot examples, by default None
+    syntax_cache : Optional[CypherSyntaxCache], optional
+        The cache of EXPLAIN outcomes. Share one instance between workflows to reuse outcomes across requests.
+        If None, EXPLAIN is run for every statement that passes the local checks, by default None
+    cost_guard : Optional[CypherCostGuard], optional
+        The thresholds the EXPLAIN plan must respect before a statement is executed.
+        Costly plans are sent back to the Correction node with hints. Requires `async_graph`. If None, the plan cost is not checked, by default None
+    schema_cache : Optional[CompiledSchemaCache], optional
+        The cache of compiled schema snapshots shared by the nodes of the workflow.
+        If None, one is created for the workflow, by default None
 
     Returns
     -------
@@ -54,8 +100,21 @@ def create_simple_text2cypher_agentic_workflow(
         The workflow.
     """
 
+    # the generation, validation and execution nodes compile the schema once per workflow
+    if schema_cache is None:
+        schema_cache = CompiledSchemaCache()
+
     generate_cypher = create_text2cypher_generation_node(
-        llm=llm, graph=graph, cypher_example_retriever=cypher_example_retriever
+        llm=llm,
+        graph=graph,
+        cypher_example_retriever=cypher_example_retriever,
+        generation_cache=generation_cache,
+        num_candidates=speculative_candidates,
+        candidate_temperatures=speculative_temperatures,
+        async_graph=async_graph,
+        syntax_cache=syntax_cache,
+        cost_guard=cost_guard,
+        schema_cache=schema_cache,
     )
     validate_cypher = create_text2cypher_validation_node(
         llm=llm,
@@ -63,9 +122,23 @@ def create_simple_text2cypher_agentic_workflow(
         llm_validation=llm_cypher_validation,
         max_attempts=max_attempts,
         attempt_cypher_execution_on_final_attempt=attempt_cypher_execution_on_final_attempt,
+        async_graph=async_graph,
+        generation_cache=generation_cache,
+        syntax_cache=syntax_cache,
+        cost_guard=cost_guard,
+        schema_cache=schema_cache,
     )
     correct_cypher = create_text2cypher_correction_node(llm=llm, graph=graph)
-    execute_cypher = create_text2cypher_execution_node(graph=graph)
+    execute_cypher = create_text2cypher_execution_node(
+        graph=graph,
+        async_graph=async_graph,
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        timeout=timeout,
+        result_cache=result_cache,
+        max_attempts=max_attempts,
+        schema_cache=schema_cache,
+    )
 
     text2cypher_graph_builder = StateGraph(
         CypherState, input=CypherInputState, output=OverallState
@@ -76,12 +149,18 @@ def create_simple_text2cypher_agentic_workflow(
     text2cypher_graph_builder.add_node(execute_cypher)
 
     text2cypher_graph_builder.add_edge(START, "generate_cypher")
-    text2cypher_graph_builder.add_edge("generate_cypher", "validate_cypher")
+    text2cypher_graph_builder.add_conditional_edges(
+        "generate_cypher",
+        generate_cypher_conditional_edge,
+    )
     text2cypher_graph_builder.add_conditional_edges(
         "validate_cypher",
         validate_cypher_conditional_edge,
     )
     text2cypher_graph_builder.add_edge("correct_cypher", "validate_cypher")
-    text2cypher_graph_builder.add_edge("execute_cypher", END)
+    text2cypher_graph_builder.add_conditional_edges(
+        "execute_cypher",
+        execute_cypher_conditional_edge,
+    )
 
     return text2cypher_graph_builder.compile()
@@ -1,17 +1,40 @@
 from .ingest_neo4j import (
+    delete_cypher_query_nodes,
+    diff_cypher_examples,
     embed_cypher_query_nodes,
+    get_embedding_model_name,
     get_existing_questions,
     load_cypher_query_nodes,
+    stream_existing_content_hashes,
 )
+from .models import IngestDiff
+from .pipeline import CypherExampleIngestPipeline, IngestReport
 from .utils import (
+    compute_content_hash,
     read_cypher_examples_from_yaml_file,
     remove_preexisting_nodes_from_ingest_tasks,
 )
+from .vector_index import (
+    VectorIndexReport,
+    bootstrap_cypher_query_vector_index,
+    get_embedding_dimensions,
+)
 
 __all__ = [
+    "CypherExampleIngestPipeline",
+    "IngestDiff",
+    "IngestReport",
+    "VectorIndexReport",
+    "bootstrap_cypher_query_vector_index",
+    "compute_content_hash",
+    "delete_cypher_query_nodes",
+    "diff_cypher_examples",
     "embed_cypher_query_nodes",
+    "get_embedding_dimensions",
+    "get_embedding_model_name",
     "get_existing_questions",
     "load_cypher_query_nodes",
+    "stream_existing_content_hashes",
     "remove_preexisting_nodes_from_ingest_tasks",
     "read_cypher_examples_from_yaml_file",
 ]
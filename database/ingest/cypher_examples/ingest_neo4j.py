@@ -1,65 +1,225 @@
-from typing import Dict, List, Optional, Set
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Generator, List, Optional, Set, Tuple
 
 import neo4j
 
-from ...embeddings import EmbedderProtocol
-from ...exceptions import CypherQueryNodesReadError
-from .models import CypherIngestRecord, EmbedderResult
-from .utils import batch_data
+from agent.embeddings import BatchEmbedderProtocol, EmbedderProtocol
+from agent.exceptions import CypherQueryNodesReadError
+
+from .models import CypherIngestRecord, EmbedderResult, IngestDiff
+from .utils import batch_data, compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes of errors that every call would hit again, such as bad credentials or a malformed request
+NON_TRANSIENT_STATUS_CODES = {400, 401, 403, 404, 422}
+NON_TRANSIENT_ERROR_NAMES = (
+    "authentication",
+    "permissiondenied",
+    "badrequest",
+    "invalidrequest",
+    "notfound",
+)
 
 
 def embed_cypher_query_nodes(
     embedder: EmbedderProtocol,
     nodes_to_embed: List[Dict[str, str]],
     embedding_model_name: Optional[str] = None,
+    batch_size: int = 64,
+    max_concurrency: int = 4,
 ) -> EmbedderResult:
+    """
+    Embed the questions of Cypher examples.
+
+    If the embedder provides `embed_documents`, each batch of questions is embedded with a single call.
+    Otherwise, or if a batch call fails, the questions of the batch are embedded one at a time.
+    Up to `max_concurrency` batches are embedded at once.
+    Errors that would fail every call, such as authentication errors and bad requests, are raised
+    instead of marking each example as failed.
+
+    Parameters
+    ----------
+    embedder : EmbedderProtocol
+        The embedder.
+    nodes_to_embed : List[Dict[str, str]]
+        The examples, with `question` and `cql` keys.
+    embedding_model_name : Optional[str], optional
+        The embedding model name stored on the nodes. If None, the `model` attribute of `embedder` is used, by default None
+    batch_size : int, optional
+        The number of questions embedded per call, by default 64
+    max_concurrency : int, optional
+        The max number of batches embedded at the same time, by default 4
+
+    Returns
+    -------
+    EmbedderResult
+        The embedded nodes and the examples that could not be embedded.
+
+    Raises
+    ------
+    Exception
+        The error of the embedder, if it is not transient.
+    """
+
+    assert batch_size > 0, "`batch_size` must be greater than 0."
+    assert max_concurrency > 0, "`max_concurrency` must be greater than 0."
+
     result = list()
     errored = list()
 
-    if embedding_model_name is None:
-        try:
-            model = embedder.model  # type: ignore[attr-defined]
-        except Exception as _:
-            model = None
-    else:
-        model = embedding_model_name
-
-    for batch in batch_data(nodes_to_embed, 10):
-        for task in batch:
-            q = task.get("question")
-            cql = task.get("cql")
-            if q is not None and cql is not None:
-                vector = embedder.embed_query(q)
+    model = get_embedding_model_name(embedder, embedding_model_name)
+
+    tasks = list()
+    for task in nodes_to_embed:
+        if task.get("question") is not None and task.get("cql") is not None:
+            tasks.append(task)
+        else:
+            errored.append(task)
+
+    def embed_batch(
+        batch: List[Dict[str, str]],
+    ) -> List[Tuple[Dict[str, str], Optional[List[float]]]]:
+        return list(
+            zip(batch, _embed_questions(embedder, [t["question"] for t in batch]))
+        )
+
+    # `map` keeps the order of the batches and runs at most `max_concurrency` at once
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for embedded_batch in executor.map(embed_batch, batch_data(tasks, batch_size)):
+            for task, vector in embedded_batch:
+                if vector is None:
+                    errored.append(task)
+                    continue
                 result.append(
                     CypherIngestRecord(
-                        cypher_statement=cql,
-                        question=q,
+                        cypher_statement=task["cql"],
+                        question=task["question"],
                         question_embedding=vector,
                         embedding_model=model,
+                        content_hash=compute_content_hash(
+                            task["question"], task["cql"], model
+                        ),
                     )
                 )
-            else:
-                errored.append(task)
 
     return {"nodes": result, "failed": errored}
 
 
+def get_embedding_model_name(
+    embedder: EmbedderProtocol, embedding_model_name: Optional[str] = None
+) -> Optional[str]:
+    """The given embedding model name, else the `model` attribute of the embedder if it has one."""
+
+    if embedding_model_name is not None:
+        return embedding_model_name
+    try:
+        model: Optional[str] = embedder.model  # type: ignore[attr-defined]
+        return model
+    except Exception as _:
+        return None
+
+
+def _embed_questions(
+    embedder: EmbedderProtocol, questions: List[str]
+) -> List[Optional[List[float]]]:
+    """
+    Embed questions with one batch call if possible. A question that fails to embed gets None.
+    Non transient errors are raised, since embedding the questions one at a time would fail the same way.
+    """
+
+    if isinstance(embedder, BatchEmbedderProtocol):
+        try:
+            vectors = embedder.embed_documents(questions)
+            if len(vectors) == len(questions):
+                return list(vectors)
+            logger.warning(
+                "Batch embedding returned %d embeddings for %d questions. Embedding the questions one at a time.",
+                len(vectors),
+                len(questions),
+            )
+        except Exception as e:
+            if _is_non_transient_error(e):
+                raise
+            logger.warning(
+                "Batch embedding of %d questions failed. Embedding the questions one at a time.",
+                len(questions),
+                exc_info=e,
+            )
+
+    embedded: List[Optional[List[float]]] = list()
+    for q in questions:
+        try:
+            embedded.append(embedder.embed_query(q))
+        except Exception as e:
+            if _is_non_transient_error(e):
+                raise
+            logger.warning("Embedding the question %r failed.", q, exc_info=e)
+            embedded.append(None)
+    return embedded
+
+
+def _is_non_transient_error(error: BaseException) -> bool:
+    """
+    Whether an error of an embedding provider would fail every call alike, such as an authentication error or a bad request.
+    Checks the HTTP status code and the error type.
+
+    Parameters
+    ----------
+    error : BaseException
+        The error.
+
+    Returns
+    -------
+    bool
+        Whether the error is not transient.
+    """
+
+    status_code = getattr(error, "status_code", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+    if status_code in NON_TRANSIENT_STATUS_CODES:
+        return True
+
+    name = type(error).__name__.lower()
+    return any(marker in name for marker in NON_TRANSIENT_ERROR_NAMES)
+
+
 def load_cypher_query_nodes(
-    driver: neo4j.Driver, nodes: List[CypherIngestRecord], database: str = "neo4j"
+    driver: neo4j.Driver,
+    nodes: List[CypherIngestRecord],
+    database: str = "neo4j",
+    batch_size: int = 1000,
 ) -> None:
+    """
+    Merge `CypherQuery` nodes and set their question embeddings, with one UNWIND query per batch.
+
+    Parameters
+    ----------
+    driver : neo4j.Driver
+        The Neo4j Python Driver.
+    nodes : List[CypherIngestRecord]
+        The embedded examples.
+    database : str, optional
+        The Neo4j database name, by default "neo4j"
+    batch_size : int, optional
+        The number of nodes written per query, by default 1000
+    """
+
     query = """
 UNWIND $tasks as task
 MERGE (n:CypherQuery {question: task.question})
 SET
     n.cypherStatement = task.cypher_statement,
-    n.embeddingModel = task.embedding_model
+    n.embeddingModel = task.embedding_model,
+    n.contentHash = task.content_hash
 WITH task, n
 CALL db.create.setNodeVectorProperty(n, 'questionEmbedding', task.question_embedding)
 """
 
     with driver.session(database=database) as session:
-        for idx, batch in enumerate(batch_data(nodes, 10)):
-            # print("batch: ", batch)
+        for batch in batch_data(nodes, batch_size):
             session.run(
                 query=query, parameters={"tasks": [node.model_dump() for node in batch]}
             )
@@ -89,3 +249,136 @@ def get_existing_questions(
         return questions
     except Exception as e:
         raise CypherQueryNodesReadError(e)
+
+
+def stream_existing_content_hashes(
+    driver: neo4j.Driver,
+    node_label: str = "CypherQuery",
+    database: str = "neo4j",
+) -> Generator[Tuple[str, Optional[str]], None, None]:
+    """
+    Stream the question and content hash of each example node.
+    Records are pulled from the result cursor as they are consumed, so the nodes are never held in memory at once.
+
+    Parameters
+    ----------
+    driver : neo4j.Driver
+        The Neo4j Python Driver.
+    node_label : str, optional
+        The label of the example nodes, by default "CypherQuery"
+    database : str, optional
+        The Neo4j database name, by default "neo4j"
+
+    Yields
+    ------
+    Tuple[str, Optional[str]]
+        The question and the content hash. The hash is None for nodes written before hashes were stored.
+    """
+
+    query = f"""
+MATCH (n:{node_label})
+WHERE n.question IS NOT NULL
+RETURN n.question AS question, n.contentHash AS contentHash
+"""
+    try:
+        with driver.session(database=database) as session:
+            for record in session.run(query=query):
+                yield str(record["question"]), record["contentHash"]
+    except Exception as e:
+        raise CypherQueryNodesReadError(e)
+
+
+def diff_cypher_examples(
+    driver: neo4j.Driver,
+    tasks: List[Dict[str, str]],
+    embedding_model_name: Optional[str],
+    node_label: str = "CypherQuery",
+    database: str = "neo4j",
+) -> IngestDiff:
+    """
+    Compare the examples to ingest with the example nodes by their content hash.
+
+    An example is an insert if no node has its question, an update if the node has a different
+    question, Cypher or embedding model, and unchanged otherwise. Nodes whose question is not among the examples are deletes.
+    Changing the embedding model therefore re-embeds every example.
+
+    Parameters
+    ----------
+    driver : neo4j.Driver
+        The Neo4j Python Driver.
+    tasks : List[Dict[str, str]]
+        The examples, with `question` and `cql` keys.
+    embedding_model_name : Optional[str]
+        The embedding model the examples will be embedded with.
+    node_label : str, optional
+        The label of the example nodes, by default "CypherQuery"
+    database : str, optional
+        The Neo4j database name, by default "neo4j"
+
+    Returns
+    -------
+    IngestDiff
+        The examples to insert and update, the questions to delete and the number of unchanged examples.
+    """
+
+    # the later of two examples with the same question wins, as it would on write
+    by_question = {
+        t["question"]: t
+        for t in tasks
+        if t.get("question") is not None and t.get("cql") is not None
+    }
+    diff = IngestDiff()
+    seen: Set[str] = set()
+    for question, content_hash in stream_existing_content_hashes(
+        driver, node_label=node_label, database=database
+    ):
+        task = by_question.get(question)
+        if task is None:
+            diff.deletes.append(question)
+            continue
+
+        seen.add(question)
+        if content_hash == compute_content_hash(
+            question, task["cql"], embedding_model_name
+        ):
+            diff.unchanged += 1
+        else:
+            diff.updates.append(task)
+
+    diff.inserts = [t for q, t in by_question.items() if q not in seen]
+    return diff
+
+
+def delete_cypher_query_nodes(
+    driver: neo4j.Driver,
+    questions: List[str],
+    node_label: str = "CypherQuery",
+    database: str = "neo4j",
+    batch_size: int = 1000,
+) -> None:
+    """
+    Delete example nodes by their question.
+
+    Parameters
+    ----------
+    driver : neo4j.Driver
+        The Neo4j Python Driver.
+    questions : List[str]
+        The questions of the nodes to delete.
+    node_label : str, optional
+        The label of the example nodes, by default "CypherQuery"
+    database : str, optional
+        The Neo4j database name, by default "neo4j"
+    batch_size : int, optional
+        The number of nodes deleted per query, by default 1000
+    """
+
+    query = f"""
+UNWIND $questions AS question
+MATCH (n:{node_label} {{question: question}})
+DETACH DELETE n
+"""
+
+    with driver.session(database=database) as session:
+        for batch in batch_data(questions, batch_size):
+            session.run(query=query, parameters={"questions": batch})
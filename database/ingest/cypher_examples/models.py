@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional, TypedDict
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CypherIngestRecord(BaseModel):
@@ -8,8 +8,28 @@ class CypherIngestRecord(BaseModel):
     question: str
     question_embedding: List[float]
     embedding_model: Optional[str]
+    content_hash: Optional[str] = None
 
 
 class EmbedderResult(TypedDict):
     nodes: List[CypherIngestRecord]
     failed: List[Dict[str, str]]
+
+
+class IngestDiff(BaseModel):
+    """The changes needed to bring the example nodes in line with the examples to ingest."""
+
+    inserts: List[Dict[str, str]] = Field(
+        default_factory=list, description="The examples without a node."
+    )
+    updates: List[Dict[str, str]] = Field(
+        default_factory=list,
+        description="The examples whose node has a different content hash.",
+    )
+    deletes: List[str] = Field(
+        default_factory=list,
+        description="The questions of the nodes without an example.",
+    )
+    unchanged: int = Field(
+        default=0, description="The number of examples whose node is up to date."
+    )
@@ -0,0 +1,263 @@
+import json
+import time
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Dict, List, Optional, Set, Union
+
+import neo4j
+from pydantic import BaseModel, Field
+
+from agent.embeddings import EmbedderProtocol
+
+from .ingest_neo4j import (
+    embed_cypher_query_nodes,
+    get_embedding_model_name,
+    load_cypher_query_nodes,
+)
+from .models import CypherIngestRecord, EmbedderResult
+from .utils import compute_content_hash
+
+# the seconds a blocked worker waits before checking whether the pipeline stopped
+QUEUE_POLL_INTERVAL = 0.1
+
+
+class IngestReport(BaseModel):
+    """The outcome of a `CypherExampleIngestPipeline` run."""
+
+    loaded: int = Field(
+        default=0, description="The number of examples embedded and written."
+    )
+    skipped: int = Field(
+        default=0,
+        description="The number of examples skipped because the checkpoint lists them.",
+    )
+    failed: List[Dict[str, str]] = Field(
+        default_factory=list, description="The examples that could not be embedded."
+    )
+    seconds: float = Field(default=0.0, description="The duration of the run.")
+
+    @property
+    def questions_per_second(self) -> float:
+        """The number of loaded examples per second. 0.0 if nothing was loaded."""
+
+        return self.loaded / self.seconds if self.seconds > 0 else 0.0
+
+
+class CypherExampleIngestPipeline:
+    """
+    Embed Cypher examples and load them into Neo4j as a streaming producer consumer pipeline.
+
+    Embedding worker threads put embedded batches on a bounded queue, while the calling thread
+    writes them to Neo4j with large UNWIND batches. Embedding and loading overlap,
+    and the bounded queue keeps the embeddings held in memory small.
+
+    After each write, the content hashes of the loaded examples are appended to `checkpoint_path`.
+    A rerun with the same checkpoint skips them, so an interrupted ingest resumes where it stopped.
+    An example whose question, Cypher or embedding model changed has a new hash and is loaded again.
+
+    Parameters
+    ----------
+    driver : neo4j.Driver
+        The Neo4j Python Driver.
+    embedder : EmbedderProtocol
+        The embedder.
+    embedding_model_name : Optional[str], optional
+        The embedding model name stored on the nodes. If None, the `model` attribute of `embedder` is used, by default None
+    database : str, optional
+        The Neo4j database name, by default "neo4j"
+    checkpoint_path : Optional[Union[str, Path]], optional
+        The file listing the content hashes of the loaded examples. If None, progress is not saved, by default None
+    embed_batch_size : int, optional
+        The number of questions embedded per call, by default 64
+    max_concurrency : int, optional
+        The number of embedding worker threads, by default 4
+    write_batch_size : int, optional
+        The number of nodes written per query, by default 1000
+    queue_size : int, optional
+        The max number of embedded batches waiting to be written, by default 16
+    """
+
+    def __init__(
+        self,
+        driver: neo4j.Driver,
+        embedder: EmbedderProtocol,
+        embedding_model_name: Optional[str] = None,
+        database: str = "neo4j",
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        embed_batch_size: int = 64,
+        max_concurrency: int = 4,
+        write_batch_size: int = 1000,
+        queue_size: int = 16,
+    ) -> None:
+        assert embed_batch_size > 0, "`embed_batch_size` must be greater than 0."
+        assert max_concurrency > 0, "`max_concurrency` must be greater than 0."
+        assert write_batch_size > 0, "`write_batch_size` must be greater than 0."
+        assert queue_size > 0, "`queue_size` must be greater than 0."
+
+        self.driver = driver
+        self.embedder = embedder
+        self.embedding_model_name = embedding_model_name
+        self.database = database
+        self.checkpoint_path = (
+            Path(checkpoint_path) if checkpoint_path is not None else None
+        )
+        self.embed_batch_size = embed_batch_size
+        self.max_concurrency = max_concurrency
+        self.write_batch_size = write_batch_size
+        self.queue_size = queue_size
+
+    def read_checkpoint(self) -> Set[str]:
+        """
+        Read the content hashes of the examples loaded by previous runs.
+
+        Returns
+        -------
+        Set[str]
+            The content hashes. Empty if there is no checkpoint.
+        """
+
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return set()
+
+        content_hashes = set()
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                # a line cut off by an interrupted write is ignored
+                try:
+                    content_hashes.add(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return content_hashes
+
+    def run(self, tasks: List[Dict[str, str]]) -> IngestReport:
+        """
+        Embed and load the examples that are not in the checkpoint.
+
+        Parameters
+        ----------
+        tasks : List[Dict[str, str]]
+            The examples, with `question` and `cql` keys.
+
+        Returns
+        -------
+        IngestReport
+            The number of loaded, skipped and failed examples and the duration of the run.
+
+        Raises
+        ------
+        Exception
+            The first error raised while embedding, such as an authentication error of the embedder.
+        """
+
+        start = time.perf_counter()
+        report = IngestReport()
+
+        done = self.read_checkpoint()
+        model = get_embedding_model_name(self.embedder, self.embedding_model_name)
+        pending = [
+            t
+            for t in tasks
+            if t.get("question") is None
+            or t.get("cql") is None
+            or compute_content_hash(t["question"], t["cql"], model) not in done
+        ]
+        report.skipped = len(tasks) - len(pending)
+
+        batches: Queue[List[Dict[str, str]]] = Queue()
+        for i in range(0, len(pending), self.embed_batch_size):
+            batches.put(pending[i : i + self.embed_batch_size])
+
+        embedded: Queue[Optional[EmbedderResult]] = Queue(maxsize=self.queue_size)
+        stop = Event()
+        # the errors raised in the workers, which are raised again in this thread
+        errors: List[Exception] = list()
+        workers = [
+            Thread(
+                target=self._embed_worker,
+                args=(batches, embedded, stop, model, errors),
+                name=f"cypher_example_embedder_{i}",
+                daemon=True,
+            )
+            for i in range(min(self.max_concurrency, batches.qsize()))
+        ]
+        for worker in workers:
+            worker.start()
+
+        buffer: List[CypherIngestRecord] = list()
+        running = len(workers)
+        try:
+            while running:
+                result = embedded.get()
+                # each worker puts None once it runs out of batches
+                if result is None:
+                    if errors:
+                        raise errors[0]
+                    running -= 1
+                    continue
+
+                buffer.extend(result["nodes"])
+                report.failed.extend(result["failed"])
+                if len(buffer) >= self.write_batch_size:
+                    report.loaded += self._load(buffer)
+                    buffer = list()
+
+            if buffer:
+                report.loaded += self._load(buffer)
+        finally:
+            # unblocks the workers if a write failed
+            stop.set()
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _embed_worker(
+        self,
+        batches: Queue[List[Dict[str, str]]],
+        embedded: Queue[Optional[EmbedderResult]],
+        stop: Event,
+        model: Optional[str],
+        errors: List[Exception],
+    ) -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    batch = batches.get_nowait()
+                except Empty:
+                    break
+
+                result = embed_cypher_query_nodes(
+                    self.embedder,
+                    batch,
+                    model,
+                    batch_size=len(batch),
+                    max_concurrency=1,
+                )
+                self._put(embedded, result, stop)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            self._put(embedded, None, stop)
+
+    def _put(
+        self,
+        embedded: Queue[Optional[EmbedderResult]],
+        result: Optional[EmbedderResult],
+        stop: Event,
+    ) -> None:
+        # blocks while the queue is full, unless the pipeline stopped
+        while not stop.is_set():
+            try:
+                embedded.put(result, timeout=QUEUE_POLL_INTERVAL)
+                return
+            except Full:
+                continue
+
+    def _load(self, nodes: List[CypherIngestRecord]) -> int:
+        load_cypher_query_nodes(
+            self.driver, nodes, database=self.database, batch_size=self.write_batch_size
+        )
+        if self.checkpoint_path is not None:
+            with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(node.content_hash) + "\n" for node in nodes)
+        return len(nodes)
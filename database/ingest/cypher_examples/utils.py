@@ -1,4 +1,6 @@
-from typing import Any, Dict, Generator, List, Set
+import hashlib
+import json
+from typing import Any, Dict, Generator, List, Optional, Set
 
 import yaml
 from tqdm import tqdm
@@ -37,3 +39,12 @@ def batch_data(data: List[Any], batch_size: int = 10) -> Generator[Any, Any, Any
             yield data[i : i + batch_size]
         else:
             yield data[i:]
+
+
+def compute_content_hash(
+    question: str, cypher_statement: str, embedding_model: Optional[str]
+) -> str:
+    """The sha256 hex digest of an example and the model its question is embedded with."""
+
+    payload = json.dumps([question, cypher_statement, embedding_model or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
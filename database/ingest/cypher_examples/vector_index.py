@@ -0,0 +1,243 @@
+import time
+from typing import Any, Dict, Literal, Optional
+
+import neo4j
+from pydantic import BaseModel, Field
+
+from agent.embeddings import EmbedderProtocol
+from agent.exceptions import CypherExampleVectorIndexError
+
+# the bytes per stored vector element. Vector properties are float32, int8 applies to the quantized index
+BYTES_PER_ELEMENT = {"float32": 4, "int8": 1}
+
+# the text embedded to find the number of dimensions of an embedder
+DIMENSIONS_PROBE_TEXT = "How many dimensions does this embedding have?"
+
+
+class VectorIndexReport(BaseModel):
+    """The state, build time and estimated footprint of a vector index."""
+
+    index_name: str = Field(description="The name of the vector index.")
+    dimensions: int = Field(description="The number of dimensions of the index.")
+    embedding_dtype: Literal["float32", "int8"] = Field(
+        description="The element type of the indexed vectors."
+    )
+    state: str = Field(description="The state of the index, such as ONLINE.")
+    created: bool = Field(description="Whether the index was created by this call.")
+    build_seconds: float = Field(
+        description="The seconds spent waiting for the index to come online."
+    )
+    node_count: int = Field(description="The number of nodes with an embedding.")
+    property_bytes: int = Field(
+        description="The estimated size of the float32 embedding properties."
+    )
+    index_bytes: int = Field(
+        description="The estimated size of the vectors held by the index, without the graph structure."
+    )
+
+
+def get_embedding_dimensions(embedder: EmbedderProtocol) -> int:
+    """
+    Find the number of dimensions of an embedder by embedding a short text.
+
+    Parameters
+    ----------
+    embedder : EmbedderProtocol
+        The embedder.
+
+    Returns
+    -------
+    int
+        The number of dimensions.
+    """
+
+    return len(embedder.embed_query(DIMENSIONS_PROBE_TEXT))
+
+
+def bootstrap_cypher_query_vector_index(
+    driver: neo4j.Driver,
+    embedder: EmbedderProtocol,
+    index_name: str = "cypher_query_vector_index",
+    node_label: str = "CypherQuery",
+    embedding_property: str = "questionEmbedding",
+    similarity_function: Literal["cosine", "euclidean"] = "cosine",
+    embedding_dtype: Literal["float32", "int8"] = "float32",
+    database: str = "neo4j",
+    timeout: float = 300.0,
+    poll_interval: float = 0.5,
+) -> VectorIndexReport:
+    """
+    Create the vector index of the Cypher example nodes if it does not exist and wait for it to come online.
+
+    The number of dimensions is taken from the embedder, so the index always matches the embedding model.
+    Embeddings are stored as float32 properties by `load_cypher_query_nodes`.
+    With `embedding_dtype="int8"`, the index quantizes the vectors to int8.
+    Neo4j only indexes float vector properties, so the properties themselves stay float32.
+    Quantization is enabled or disabled explicitly, which needs Neo4j 5.23 or later.
+    An existing index is checked against the dimensions, similarity function and element type.
+
+    Parameters
+    ----------
+    driver : neo4j.Driver
+        The Neo4j Python Driver.
+    embedder : EmbedderProtocol
+        The embedder the examples are embedded with.
+    index_name : str, optional
+        The name of the vector index, by default "cypher_query_vector_index"
+    node_label : str, optional
+        The label of the example nodes, by default "CypherQuery"
+    embedding_property : str, optional
+        The node property holding the question embedding, by default "questionEmbedding"
+    similarity_function : Literal["cosine", "euclidean"], optional
+        The vector similarity function, by default "cosine"
+    embedding_dtype : Literal["float32", "int8"], optional
+        The element type of the indexed vectors, by default "float32"
+    database : str, optional
+        The Neo4j database name, by default "neo4j"
+    timeout : float, optional
+        The max number of seconds to wait for the index to come online, by default 300.0
+    poll_interval : float, optional
+        The number of seconds between index state checks, by default 0.5
+
+    Returns
+    -------
+    VectorIndexReport
+        The state, build time and estimated footprint of the index.
+
+    Raises
+    ------
+    CypherExampleVectorIndexError
+        If an index with the same name has different dimensions, similarity function or quantization,
+        fails or does not come online in time.
+    """
+
+    dimensions = get_embedding_dimensions(embedder)
+
+    existing = _get_vector_index(driver, index_name, database)
+    created = existing is None
+    if existing is not None:
+        _check_vector_index_config(
+            existing, dimensions, similarity_function, embedding_dtype
+        )
+    else:
+        # index options can not be parameterized, the values are an int and literals.
+        # Quantization is set in both cases, since Neo4j enables it by default from 5.23
+        index_config = (
+            f"`vector.dimensions`: {int(dimensions)}, "
+            f"`vector.similarity_function`: '{similarity_function}', "
+            f"`vector.quantization.enabled`: {'true' if embedding_dtype == 'int8' else 'false'}"
+        )
+        with driver.session(database=database) as session:
+            session.run(
+                f"""
+CREATE VECTOR INDEX {index_name} IF NOT EXISTS
+FOR (n:{node_label})
+ON n.{embedding_property}
+OPTIONS {{indexConfig: {{{index_config}}}}}
+"""
+            ).consume()
+
+    start = time.perf_counter()
+    state = _wait_for_online(driver, index_name, database, timeout, poll_interval)
+    build_seconds = time.perf_counter() - start
+
+    with driver.session(database=database) as session:
+        record = session.run(
+            f"""
+MATCH (n:{node_label})
+WHERE n.{embedding_property} IS NOT NULL
+RETURN count(n) AS nodeCount
+"""
+        ).single()
+    node_count = int(record["nodeCount"]) if record is not None else 0
+
+    return VectorIndexReport(
+        index_name=index_name,
+        dimensions=dimensions,
+        embedding_dtype=embedding_dtype,
+        state=state,
+        created=created,
+        build_seconds=build_seconds,
+        node_count=node_count,
+        property_bytes=node_count * dimensions * BYTES_PER_ELEMENT["float32"],
+        index_bytes=node_count * dimensions * BYTES_PER_ELEMENT[embedding_dtype],
+    )
+
+
+def _check_vector_index_config(
+    index: Dict[str, Any],
+    dimensions: int,
+    similarity_function: str,
+    embedding_dtype: str,
+) -> None:
+    index_config = (index.get("options") or dict()).get("indexConfig") or dict()
+    existing_dimensions = index_config.get("vector.dimensions")
+    if existing_dimensions is not None and existing_dimensions != dimensions:
+        raise CypherExampleVectorIndexError(
+            f"The vector index `{index['name']}` has {existing_dimensions} dimensions, "
+            f"but the embedder returns {dimensions}. Drop the index and re-embed the examples."
+        )
+
+    mismatches = list()
+    existing_similarity_function = index_config.get("vector.similarity_function")
+    # Neo4j reports the similarity function in upper case
+    if (
+        existing_similarity_function is not None
+        and str(existing_similarity_function).lower() != similarity_function
+    ):
+        mismatches.append(
+            f"the similarity function {str(existing_similarity_function).lower()} instead of {similarity_function}"
+        )
+    # indexes created before Neo4j 5.23 have no quantization setting and are not quantized
+    quantized = bool(index_config.get("vector.quantization.enabled", False))
+    if quantized != (embedding_dtype == "int8"):
+        existing_dtype = "int8" if quantized else "float32"
+        mismatches.append(
+            f"{existing_dtype} vectors instead of {embedding_dtype} vectors"
+        )
+    if mismatches:
+        raise CypherExampleVectorIndexError(
+            f"The vector index `{index['name']}` has {' and '.join(mismatches)}. "
+            "Drop the index or bootstrap it with its options."
+        )
+
+
+def _get_vector_index(
+    driver: neo4j.Driver, index_name: str, database: str
+) -> Optional[Dict[str, Any]]:
+    with driver.session(database=database) as session:
+        record = session.run(
+            """
+SHOW VECTOR INDEXES YIELD name, state, populationPercent, options
+WHERE name = $index_name
+RETURN name, state, populationPercent, options
+""",
+            parameters={"index_name": index_name},
+        ).single()
+    return record.data() if record is not None else None
+
+
+def _wait_for_online(
+    driver: neo4j.Driver,
+    index_name: str,
+    database: str,
+    timeout: float,
+    poll_interval: float,
+) -> str:
+    deadline = time.monotonic() + timeout
+    while True:
+        index = _get_vector_index(driver, index_name, database)
+        state = str(index["state"]) if index is not None else "MISSING"
+        if state == "ONLINE":
+            return state
+        if state == "FAILED":
+            raise CypherExampleVectorIndexError(
+                f"The vector index `{index_name}` failed to populate."
+            )
+        if time.monotonic() >= deadline:
+            percent = index.get("populationPercent") if index is not None else None
+            raise CypherExampleVectorIndexError(
+                f"The vector index `{index_name}` is not online after {timeout} seconds. "
+                f"State: {state}, population: {percent}%"
+            )
+        time.sleep(poll_interval)
@@ -2,6 +2,11 @@
 This script will create or update a Cypher query vector store in the specified Neo4j database.
 The contents will be the YAML file specified.
 Questions will be embedded using OpenAI's text-embedding-ada-002 model.
+Only examples that are new or whose question, Cypher or embedding model changed are embedded and written.
+The vector index is created with the dimensions of the embedder if it does not exist.
+Pass `--prune` to also delete nodes whose question is no longer in the YAML file.
+Progress is saved to the checkpoint file in `CYPHER_EXAMPLE_INGEST_CHECKPOINT`, or next to the YAML file,
+so an interrupted run resumes where it stopped.
 """
 
 import os
@@ -12,11 +17,11 @@ from neo4j import Driver, GraphDatabase
 from neo4j_graphrag.embeddings import OpenAIEmbeddings
 
 from ..ingest.cypher_examples import (
-    embed_cypher_query_nodes,
-    get_existing_questions,
-    load_cypher_query_nodes,
+    CypherExampleIngestPipeline,
+    bootstrap_cypher_query_vector_index,
+    delete_cypher_query_nodes,
+    diff_cypher_examples,
     read_cypher_examples_from_yaml_file,
-    remove_preexisting_nodes_from_ingest_tasks,
 )
 
 if load_dotenv():
@@ -40,60 +45,79 @@ def main() -> None:
     MODEL_NAME = "text-embedding-ada-002"
     embedder = OpenAIEmbeddings(model=MODEL_NAME)
 
-    # Create a vector index if it doesn't exist
-    with driver.session() as session:
-        session.run("""
-CREATE VECTOR INDEX cypher_query_vector_index IF NOT EXISTS
-FOR (m:CypherQuery)
-ON m.questionEmbedding
-OPTIONS {
-    indexConfig: {
-    `vector.dimensions`: 1536,
-    `vector.similarity_function`: 'cosine'
-                }
-        }
-""")
     # read question and cql pairs from a YAML file
     # this is optional as long as there is a list of Python dictionaries prepared for processing
     unembedded_tasks = read_cypher_examples_from_yaml_file(file_path=file_path)
     print(f"Found {len(unembedded_tasks)} tasks...")
 
-    # we optionally get the preexisting node ids (question property) as a set
-    # we can remove these from the tasks
-    preexisting_nodes = get_existing_questions(driver)
-    print(f"Found {len(preexisting_nodes)} questions in Neo4j database...")
-
-    # remove any questions we already have in the database
-    cleaned_tasks = remove_preexisting_nodes_from_ingest_tasks(
-        unembedded_tasks, preexisting_nodes
+    # compare the tasks with the nodes in the database by their content hash
+    # the nodes are streamed, so they are never all held in memory
+    diff = diff_cypher_examples(driver, unembedded_tasks, MODEL_NAME)
+    print(
+        f"Found {len(diff.inserts)} new, {len(diff.updates)} changed, "
+        f"{diff.unchanged} unchanged and {len(diff.deletes)} removed questions..."
     )
-    if len(cleaned_tasks) > 0:
-        print(f"Embedding {len(cleaned_tasks)} new questions...")
 
-        # embed the remaining tasks
-        # this embeds the question content
-        embedded_tasks_results = embed_cypher_query_nodes(
-            embedder, cleaned_tasks, MODEL_NAME
+    if diff.deletes and "--prune" in sys.argv:
+        print(f"Deleting {len(diff.deletes)} removed questions...")
+        delete_cypher_query_nodes(driver, diff.deletes)
+
+    cleaned_tasks = diff.inserts + diff.updates
+    if len(cleaned_tasks) > 0:
+        print(
+            f"Embedding and loading {len(cleaned_tasks)} new and changed questions..."
         )
 
-        # access the prepared nodes with embeddings with the `nodes` key
-        embedded_tasks = embedded_tasks_results.get("nodes", list())
-        print(f"Successfully embedded {len(embedded_tasks)} questions!")
+        # embedding and loading overlap, and loaded questions are checkpointed
+        pipeline = CypherExampleIngestPipeline(
+            driver=driver,
+            embedder=embedder,
+            embedding_model_name=MODEL_NAME,
+            checkpoint_path=os.getenv(
+                "CYPHER_EXAMPLE_INGEST_CHECKPOINT", f"{file_path}.ingest_checkpoint"
+            ),
+        )
+        report = pipeline.run(cleaned_tasks)
 
-        # any tasks that generated errors during the embedding process can be accessed with the `failed` key
-        failed_embeddings = embedded_tasks_results.get("failed")
-        if failed_embeddings is not None:
-            print(f"Failed to embed {len(failed_embeddings)} tasks:")
-            [print(f"* {t}") for t in failed_embeddings]
+        if report.skipped > 0:
+            print(f"Skipped {report.skipped} questions loaded by a previous run.")
+        print(f"Successfully embedded and loaded {report.loaded} questions!")
 
-        print(f"Loading {len(embedded_tasks)} nodes into Neo4j...")
-        # load CypherQuery nodes into Neo4j
-        load_cypher_query_nodes(driver, embedded_tasks)
+        # any tasks that generated errors during the embedding process are listed in the report
+        if report.failed:
+            print(f"Failed to embed {len(report.failed)} tasks:")
+            [print(f"* {t}") for t in report.failed]
 
-        print("Ingest Complete!")
+        print(
+            f"Ingest complete in {report.seconds:.1f} seconds "
+            f"({report.questions_per_second:.1f} questions per second)!"
+        )
     else:
         print("No new tasks found.")
-        print("Process Complete!")
+
+    # create the vector index with the dimensions of the embedder and wait until it is online
+    # set `CYPHER_EXAMPLE_EMBEDDING_DTYPE=int8` to quantize the index, which requires Neo4j 5.23 or later
+    embedding_dtype = os.getenv("CYPHER_EXAMPLE_EMBEDDING_DTYPE", "float32")
+    assert embedding_dtype in (
+        "float32",
+        "int8",
+    ), "Embedding dtype must be float32 or int8."
+    index_report = bootstrap_cypher_query_vector_index(
+        driver,
+        embedder,
+        embedding_dtype=embedding_dtype,  # type: ignore[arg-type]
+    )
+    print(
+        f"Vector index `{index_report.index_name}` is {index_report.state} "
+        f"({index_report.dimensions} dimensions, {index_report.embedding_dtype}) "
+        f"after {index_report.build_seconds:.1f} seconds."
+    )
+    print(
+        f"Estimated footprint of {index_report.node_count} embeddings: "
+        f"{index_report.property_bytes / 1024 / 1024:.1f} MB of properties, "
+        f"{index_report.index_bytes / 1024 / 1024:.1f} MB of index vectors."
+    )
+    print("Process Complete!")
 
 
 if __name__ == "__main__":
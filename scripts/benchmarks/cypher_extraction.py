@@ -0,0 +1,171 @@
+"""
+Micro-benchmark for the Cypher entity extraction used by `validate_cypher_query_with_schema`.
+
+Compares the parser based extractor against the two regex approaches it replaced:
+the original one, which compiled patterns on every call and rescanned the whole statement once per variable,
+and the single-pass one, which scanned the statement once with a combined node | relationship | filter pattern.
+The parser is timed both with a cold cache and with the statement already parsed,
+which is the case for the second and third validators run on the same statement.
+
+Run with:
+    poetry run python -m scripts.benchmarks.cypher_extraction
+"""
+
+import timeit
+from typing import Any, Callable, Dict, List
+
+import regex as re
+
+from agent.components.text2cypher.validation.models import CypherValidationTask
+from agent.components.text2cypher.validation.utils.cypher_extractors import (
+    extract_entities_for_validation,
+)
+from agent.components.text2cypher.validation.utils.cypher_parser import (
+    parse_cypher_statement,
+)
+from agent.components.text2cypher.validation.utils.regex_patterns import (
+    get_cypher_entity_pattern,
+    get_node_label_pattern,
+    get_node_variable_pattern,
+    get_property_pattern,
+    get_relationship_type_pattern,
+    get_relationship_variable_pattern,
+)
+
+_FILTER = r"\.(?P<property_name>[^\s]*)\s(?P<operator>contains|CONTAINS|[><=]{0,2}|starts with|STARTS WITH|ends with|ENDS WITH)\s\"?\'?(?P<property_value>[\w\s]+\"|[\d]+)\"?\'?"
+
+
+def build_statement(num_variables: int) -> str:
+    """Build a long generated-style query with `num_variables` node variables."""
+
+    matches = [
+        f'MATCH (n{i}:Label{i % 7} {{id: "{i}"}})-[r{i}:REL_{i % 5}]->(m{i}:Other)'
+        for i in range(num_variables)
+    ]
+    filters = [
+        f'n{i}.name = "value {i}" AND n{i}.score > {i} AND r{i}.weight < {i + 10}'
+        for i in range(num_variables)
+    ]
+    returns = ", ".join(f"n{i}.name" for i in range(num_variables))
+
+    return (
+        "\n".join(matches) + "\nWHERE " + "\nAND ".join(filters) + f"\nRETURN {returns}"
+    )
+
+
+def legacy_extract(cypher_statement: str) -> Dict[str, List[Dict[str, Any]]]:
+    """The per-variable rescanning approach, kept here only as a baseline."""
+
+    result: Dict[str, List[Dict[str, Any]]] = {"nodes": list(), "relationships": list()}
+    node_pattern = re.compile(r"(\([\w\:\{\s\"\'\}\,\|\&]+\))")
+    rel_pattern = re.compile(r"-\[([\w\:\{\s\"\'\}\,\|\&]+)\]-")
+
+    for key, pattern, var_pattern in [
+        ("nodes", node_pattern, r"^\(([a-zA-Z\_\d]*)(?:[\s]{0,1}[:\{])"),
+        ("relationships", rel_pattern, r"^([\w\d]*):?"),
+    ]:
+        used = set()
+        for n in re.findall(pattern, cypher_statement):
+            variables = re.findall(re.compile(var_pattern), n)
+            k = variables[0] if variables and variables[0] else None
+            if k is not None and k not in used:
+                for f in re.findall(
+                    re.compile(re.escape(k) + _FILTER), cypher_statement
+                ):
+                    result[key].append({"property_name": f[0], "property_value": f[2]})
+            used.add(k)
+
+    return result
+
+
+def single_pass_extract(
+    cypher_statement: str,
+) -> Dict[str, List[CypherValidationTask]]:
+    """The single scan regex approach, kept here only as a baseline."""
+
+    found: Dict[str, List[str]] = {"nodes": list(), "relationships": list()}
+    filters: Dict[str, List[Dict[str, Any]]] = dict()
+    for m in get_cypher_entity_pattern().finditer(cypher_statement):
+        if m.group("node") is not None:
+            found["nodes"].append(m.group("node"))
+        elif m.group("relationship") is not None:
+            found["relationships"].append(m.group("relationship"))
+        else:
+            filters.setdefault(m.group("variable"), list()).append(
+                {
+                    "property_name": m.group("property_name").strip().strip("{"),
+                    "operator": m.group("operator").strip(),
+                    "property_value": m.group("property_value").strip().strip("'\""),
+                }
+            )
+
+    result: Dict[str, List[CypherValidationTask]] = dict()
+    for key, var_pattern, label_pattern in [
+        ("nodes", get_node_variable_pattern(), get_node_label_pattern()),
+        (
+            "relationships",
+            get_relationship_variable_pattern(),
+            get_relationship_type_pattern(),
+        ),
+    ]:
+        tasks: List[Dict[str, Any]] = list()
+        used = set()
+        for element in found[key]:
+            variables = var_pattern.findall(element)
+            labels = label_pattern.findall(element)
+            k = variables[0] if variables and variables[0] else None
+            label = labels[0].strip() if labels else None
+            for props in get_property_pattern().findall(element)[:1]:
+                for part in props.split(","):
+                    k_and_v = part.split(":")
+                    if len(k_and_v) == 2:
+                        tasks.append(
+                            {
+                                "labels_or_types": label,
+                                "operator": "=",
+                                "property_name": k_and_v[0].strip().strip("{"),
+                                "property_value": k_and_v[1].strip().strip("}'\""),
+                            }
+                        )
+            if k is not None and k not in used:
+                tasks.extend(
+                    [{**f, "labels_or_types": label} for f in filters.get(k, list())]
+                )
+            used.add(k)
+        result[key] = [CypherValidationTask.model_validate(t) for t in tasks]
+
+    return result
+
+
+def extract_uncached(cypher_statement: str) -> None:
+    parse_cypher_statement.cache_clear()
+    extract_entities_for_validation(cypher_statement)
+
+
+def main() -> None:
+    print(
+        f"{'variables':>10} {'legacy (ms)':>12} {'single pass (ms)':>17} "
+        f"{'parser (ms)':>12} {'cached (ms)':>12} {'vs legacy':>10} {'vs single pass':>15}"
+    )
+    for num_variables in [5, 25, 100, 250]:
+        statement = build_statement(num_variables)
+        number = max(10, 1000 // num_variables)
+
+        # the best of several runs, so other load on the machine does not skew the ratios
+        def best(fn: Callable[[], Any]) -> float:
+            return min(timeit.repeat(fn, number=number, repeat=7)) / number
+
+        legacy = best(lambda: legacy_extract(statement))
+        single = best(lambda: single_pass_extract(statement))
+        uncached = best(lambda: extract_uncached(statement))
+        cached = best(lambda: extract_entities_for_validation(statement))
+
+        print(
+            f"{num_variables:>10} {legacy * 1000:>12.2f} {single * 1000:>17.2f} "
+            f"{uncached * 1000:>12.2f} {cached * 1000:>12.2f} "
+            f"{legacy / uncached:>9.1f}x {single / uncached:>14.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Simulated latency benchmark for hybrid example retrieval against the vector only path.
+
+This is a simulation, not a measurement of Neo4j or an embedding API: both are replaced by fixed sleeps,
+and no search or ranking quality is measured. The numbers only show how the calls are scheduled:
+the hybrid retriever overlaps its full text query with the embedding calls and the vector search,
+so it should cost about the same as vector search alone.
+Set the delays to the latencies measured in your deployment to estimate the real overhead.
+
+Run with:
+    poetry run python -m scripts.benchmarks.hybrid_example_retrieval
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+from neo4j import Driver
+
+from agent.retrievers.cypher_examples import (
+    Neo4jHybridSearchCypherExampleRetriever,
+    Neo4jVectorSearchCypherExampleRetriever,
+)
+
+EMBEDDING_DELAY = 0.080
+VECTOR_SEARCH_DELAY = 0.020
+FULLTEXT_SEARCH_DELAY = 0.015
+NUM_TASKS = 4
+REPEAT = 5
+
+
+class SlowEmbedder:
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(EMBEDDING_DELAY)
+        return [0.1, 0.2, 0.3]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(EMBEDDING_DELAY)
+        return [0.1, 0.2, 0.3]
+
+
+class SlowRecord:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def data(self) -> Dict[str, Any]:
+        return self._data
+
+
+def slow_execute_query(
+    query: str, parameters_: Optional[Dict[str, Any]] = None, **kwargs: Any
+) -> Any:
+    assert parameters_ is not None
+    fulltext = "fulltext" in query
+    time.sleep(FULLTEXT_SEARCH_DELAY if fulltext else VECTOR_SEARCH_DELAY)
+    num_queries = len(parameters_["query_texts" if fulltext else "query_vectors"])
+    records = [
+        SlowRecord(
+            {"idx": i, "question": f"question {j}", "cypherStatement": "RETURN 1"}
+        )
+        for i in range(num_queries)
+        for j in range(parameters_["top_k"])
+    ]
+    return records, None, None
+
+
+def create_driver() -> Any:
+    driver = MagicMock(spec=Driver)
+    driver.execute_query.side_effect = slow_execute_query
+    return driver
+
+
+def time_ms(fn: Any) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main() -> None:
+    vector = Neo4jVectorSearchCypherExampleRetriever(
+        neo4j_driver=create_driver(),
+        vector_index_name="vector_index",
+        embedder=SlowEmbedder(),
+    )
+    hybrid = Neo4jHybridSearchCypherExampleRetriever(
+        neo4j_driver=create_driver(),
+        vector_index_name="vector_index",
+        fulltext_index_name="fulltext_index",
+        embedder=SlowEmbedder(),
+    )
+    tasks = [f"task {i}" for i in range(NUM_TASKS)]
+
+    rows = [
+        (
+            "single query, sync",
+            time_ms(lambda: vector.get_examples_many(tasks[:1], k=8)),
+            time_ms(lambda: hybrid.get_examples("task 0", k=8)),
+        ),
+        (
+            f"{NUM_TASKS} queries, sync",
+            time_ms(lambda: vector.get_examples_many(tasks, k=8)),
+            time_ms(lambda: hybrid.get_examples_many(tasks, k=8)),
+        ),
+        (
+            f"{NUM_TASKS} queries, async",
+            time_ms(lambda: asyncio.run(vector.aget_examples_batch(tasks, k=8))),
+            time_ms(lambda: asyncio.run(hybrid.aget_examples_batch(tasks, k=8))),
+        ),
+    ]
+
+    print("simulated latencies, the database and the embedder are fixed sleeps\n")
+    print(f"{'case':>22} {'vector (ms)':>12} {'hybrid (ms)':>12} {'overhead':>9}")
+    for name, vector_ms, hybrid_ms in rows:
+        print(
+            f"{name:>22} {vector_ms:>12.1f} {hybrid_ms:>12.1f} "
+            f"{(hybrid_ms - vector_ms) / vector_ms * 100:>8.1f}%"
+        )
+    print(
+        f"\nsequential hybrid would add {FULLTEXT_SEARCH_DELAY * 1000:.0f} ms per call"
+    )
+
+
+if __name__ == "__main__":
+    main()
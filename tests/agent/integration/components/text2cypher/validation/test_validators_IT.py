@@ -43,3 +43,37 @@ def test_validate_cypher_query_with_schema_iqs_invalid(
     )
     assert errors is not None
     assert len(errors) == 2
+
+
+def test_validate_cypher_query_with_schema_multiple_labels_valid(
+    mock_graph_1: MagicMock,
+) -> None:
+    for cypher_statement in [
+        "MATCH (n:NodeA:NodeB) WHERE n.prop_1 = 'a' RETURN n",
+        "MATCH (n:NodeA&NodeB) WHERE n.prop_1 = 'a' RETURN n",
+        "MATCH (n:NodeA|NodeB) WHERE n.prop_1 = 'a' RETURN n",
+        "MATCH (n:NodeA|NodeB) WHERE n.prop_3 = 3 RETURN n",
+    ]:
+        errors = validate_cypher_query_with_schema(
+            cypher_statement=cypher_statement, graph=mock_graph_1
+        )
+        assert errors == [], cypher_statement
+
+
+def test_validate_cypher_query_with_schema_multiple_labels_invalid(
+    mock_graph_1: MagicMock,
+) -> None:
+    # every label of a `:` expression must have the property
+    errors = validate_cypher_query_with_schema(
+        cypher_statement="MATCH (n:NodeA:NodeB) WHERE n.prop_3 = 3 RETURN n",
+        graph=mock_graph_1,
+    )
+    assert len(errors) == 1
+    assert "NodeA" in errors[0]
+
+    # one label of a `|` expression is enough
+    errors = validate_cypher_query_with_schema(
+        cypher_statement="MATCH (n:NodeA|NodeC) WHERE n.prop_3 = 3 RETURN n",
+        graph=mock_graph_1,
+    )
+    assert len(errors) == 1
@@ -34,3 +34,18 @@ def test_neo4j_cypher_example_retriever_hydrated_database(
     assert "Question: a" in result
     assert "Question: b" in result
     assert "Question: c" in result
+
+
+def test_neo4j_cypher_example_retriever_get_examples_many(
+    neo4j_driver: Driver,
+    init_database: None,
+    write_cypher_example_nodes: None,
+    healthcheck: None,
+    neo4j_vector_search_cypher_example_retriever: Neo4jVectorSearchCypherExampleRetriever,
+) -> None:
+    result = neo4j_vector_search_cypher_example_retriever.get_examples_many(
+        queries=["test query", "another test query"], k=2
+    )
+
+    assert len(result) == 2
+    assert all(r.count("match n return n") == 2 for r in result)
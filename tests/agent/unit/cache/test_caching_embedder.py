@@ -0,0 +1,186 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from agent.cache import CachingEmbedder, MemoryMappedEmbeddingStore
+from agent.embeddings import EmbedderProtocol
+
+
+def _create_embedder() -> MagicMock:
+    embedder = MagicMock(spec=EmbedderProtocol)
+    embedder.embed_query.side_effect = lambda text: [float(len(text)), 1.0, 0.5]
+    return embedder
+
+
+def test_follows_embedder_protocol() -> None:
+    assert isinstance(CachingEmbedder(_create_embedder()), EmbedderProtocol)
+
+
+def test_text_is_embedded_once() -> None:
+    embedder = _create_embedder()
+    caching_embedder = CachingEmbedder(embedder, model="test")
+
+    first = caching_embedder.embed_query("Which movies?")
+    second = caching_embedder.embed_query("  Which   movies? ")
+
+    assert first == second
+    assert embedder.embed_query.call_count == 1
+    assert caching_embedder.stats.hits == 1
+
+
+def test_model_is_part_of_the_key() -> None:
+    embedder = _create_embedder()
+
+    assert CachingEmbedder(embedder, model="a").make_key("q") != CachingEmbedder(
+        embedder, model="b"
+    ).make_key("q")
+
+
+@pytest.mark.asyncio
+async def test_aembed_query_uses_the_cache() -> None:
+    embedder = _create_embedder()
+    caching_embedder = CachingEmbedder(embedder, model="test")
+
+    caching_embedder.embed_query("q")
+    await caching_embedder.aembed_query("q")
+
+    assert embedder.embed_query.call_count == 1
+
+
+def test_disk_store_survives_restart(tmp_path: Path) -> None:
+    embedder = _create_embedder()
+    CachingEmbedder(embedder, model="test", cache_dir=tmp_path).embed_query("q")
+
+    restarted = CachingEmbedder(embedder, model="test", cache_dir=tmp_path)
+
+    assert restarted.embed_query("q") == [1.0, 1.0, 0.5]
+    assert embedder.embed_query.call_count == 1
+
+
+def test_store_appends_float32_rows(tmp_path: Path) -> None:
+    store = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    store.put("a", np.array([1.0, 2.0]))
+    store.put("b", np.array([3.0, 4.0]))
+    store.put("a", np.array([9.0, 9.0]))
+
+    reopened = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    a = reopened.get("a")
+
+    assert len(reopened) == 2
+    assert a is not None and a.dtype == np.float32
+    assert a.tolist() == [1.0, 2.0]
+    assert (
+        tmp_path / next(p.name for p in tmp_path.glob("*.f32"))
+    ).stat().st_size == 16
+
+
+def test_store_rejects_other_dims(tmp_path: Path) -> None:
+    store = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    store.put("a", np.array([1.0, 2.0]))
+
+    with pytest.raises(ValueError):
+        store.put("b", np.array([1.0, 2.0, 3.0]))
+
+
+def test_store_recovers_from_interrupted_write(tmp_path: Path) -> None:
+    store = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    store.put("a", np.array([1.0, 2.0]))
+    # a partial row without its key
+    with open(next(tmp_path.glob("*.f32")), "ab") as f:
+        f.write(b"\x00\x00")
+
+    reopened = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    reopened.put("b", np.array([3.0, 4.0]))
+    b = reopened.get("b")
+
+    assert b is not None and b.tolist() == [3.0, 4.0]
+
+
+def test_store_drops_interrupted_key_line(tmp_path: Path) -> None:
+    store = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    store.put("a", np.array([1.0, 2.0]))
+    store.put("b", np.array([3.0, 4.0]))
+    keys_path = next(tmp_path.glob("*.keys"))
+    # the row number of the last key is cut short
+    keys_path.write_bytes(keys_path.read_bytes()[:-1])
+
+    reopened = MemoryMappedEmbeddingStore(tmp_path, model="test")
+
+    assert "a" in reopened and "b" not in reopened
+    reopened.put("b", np.array([3.0, 4.0]))
+    b = reopened.get("b")
+    assert b is not None and b.tolist() == [3.0, 4.0]
+
+
+def test_store_shared_by_two_writers(tmp_path: Path) -> None:
+    # two instances stand in for two processes appending to the same files
+    first = MemoryMappedEmbeddingStore(tmp_path, model="test")
+    second = MemoryMappedEmbeddingStore(tmp_path, model="test")
+
+    first.put("a", np.array([1.0, 2.0]))
+    second.put("b", np.array([3.0, 4.0]))
+    first.put("c", np.array([5.0, 6.0]))
+
+    for store in (first, second, MemoryMappedEmbeddingStore(tmp_path, model="test")):
+        a, b, c = store.get("a"), store.get("b"), store.get("c")
+        assert a is not None and a.tolist() == [1.0, 2.0]
+        assert b is not None and b.tolist() == [3.0, 4.0]
+        assert c is not None and c.tolist() == [5.0, 6.0]
+
+
+def test_embed_documents_only_embeds_misses() -> None:
+    embedder = _create_embedder()
+    embedder.embed_documents = MagicMock(
+        side_effect=lambda texts: [[float(len(t)), 0.0] for t in texts]
+    )
+    caching_embedder = CachingEmbedder(embedder, model="test")
+    caching_embedder.embed_documents(["a"])
+
+    result = caching_embedder.embed_documents(["a", "bb", "bb"])
+
+    assert result == [[1.0, 0.0], [2.0, 0.0], [2.0, 0.0]]
+    assert embedder.embed_documents.call_args_list[-1].args == (["bb"],)
+    assert embedder.embed_documents.call_count == 2
+
+
+def test_query_and_document_embeddings_are_cached_apart() -> None:
+    embedder = _create_embedder()
+    embedder.embed_documents = MagicMock(
+        side_effect=lambda texts: [[float(len(t)), 0.0] for t in texts]
+    )
+    caching_embedder = CachingEmbedder(embedder, model="test")
+
+    assert caching_embedder.make_key("q", "query") != caching_embedder.make_key(
+        "q", "document"
+    )
+    assert caching_embedder.embed_query("q") == [1.0, 1.0, 0.5]
+    assert caching_embedder.embed_documents(["q"]) == [[1.0, 0.0]]
+    assert caching_embedder.embed_query("q") == [1.0, 1.0, 0.5]
+    assert embedder.embed_query.call_count == 1
+    embedder.embed_documents.assert_called_once_with(["q"])
+
+
+def test_embed_documents_rejects_missing_embeddings() -> None:
+    embedder = _create_embedder()
+    embedder.embed_documents = MagicMock(return_value=[[1.0, 0.0]])
+    caching_embedder = CachingEmbedder(embedder, model="test")
+
+    with pytest.raises(ValueError, match="1 embeddings for 2 texts"):
+        caching_embedder.embed_documents(["a", "bb"])
+
+
+def test_misses_and_hits_return_the_same_float32_values() -> None:
+    embedder = MagicMock(spec=EmbedderProtocol)
+    embedder.embed_query.return_value = [0.1, 0.2]
+    embedder.embed_documents = MagicMock(return_value=[[0.3, 0.4]])
+    caching_embedder = CachingEmbedder(embedder, model="test")
+
+    miss = caching_embedder.embed_query("q")
+    document_miss = caching_embedder.embed_documents(["d"])
+
+    assert miss == np.asarray([0.1, 0.2], dtype=np.float32).tolist()
+    assert miss != [0.1, 0.2]
+    assert caching_embedder.embed_query("q") == miss
+    assert caching_embedder.embed_documents(["d"]) == document_miss
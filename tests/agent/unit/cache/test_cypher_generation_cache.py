@@ -0,0 +1,32 @@
+from agent.cache import CypherGenerationCache, InMemoryCacheBackend
+
+
+def test_make_key_normalizes_task() -> None:
+    key = CypherGenerationCache.make_key("How many movies?", "examples", "v1")
+
+    assert key == CypherGenerationCache.make_key(
+        "  how many   MOVIES ", "examples", "v1"
+    )
+    assert key != CypherGenerationCache.make_key("How many movies?", "other", "v1")
+    assert key != CypherGenerationCache.make_key("How many movies?", "examples", "v2")
+
+
+def test_get_and_set() -> None:
+    cache = CypherGenerationCache()
+    key = cache.make_key("How many movies?", "examples")
+
+    assert cache.get(key) is None
+    cache.set(key, "MATCH (m:Movie) RETURN count(m)")
+
+    assert cache.get(key) == "MATCH (m:Movie) RETURN count(m)"
+    assert cache.stats.hits == 1
+
+
+def test_bounded_size() -> None:
+    cache = CypherGenerationCache(backend=InMemoryCacheBackend(max_entries=1))
+
+    cache.set("a", "RETURN 1")
+    cache.set("b", "RETURN 2")
+
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
@@ -0,0 +1,38 @@
+from agent.cache import CachedCypherResult, CypherResultCache
+
+
+def test_make_key_normalizes_statement() -> None:
+    key = CypherResultCache.make_key("MATCH (n) RETURN n")
+
+    assert key == CypherResultCache.make_key("MATCH (n)\n  RETURN n; // comment")
+    assert key != CypherResultCache.make_key("MATCH (n) RETURN n", {"a": 1})
+    assert key != CypherResultCache.make_key("MATCH (n) RETURN n", database="movies")
+    assert key != CypherResultCache.make_key("MATCH (n) RETURN 'n'")
+
+
+def test_fingerprint_change_invalidates() -> None:
+    cache = CypherResultCache()
+    result = CachedCypherResult(records=[{"n": 1}], record_count=1)
+
+    cache.set("MATCH (n) RETURN n", result, fingerprint="v1")
+    assert cache.get("MATCH (n) RETURN n", fingerprint="v1") == result
+
+    assert cache.get("MATCH (n) RETURN n", fingerprint="v2") is None
+    assert cache.stats.invalidations == 1
+    assert len(cache.backend) == 0
+
+
+def test_cached_records_are_copied() -> None:
+    cache = CypherResultCache()
+    records = [{"n": {"name": "a"}}]
+
+    cache.set("MATCH (n) RETURN n", CachedCypherResult(records=records, record_count=1))
+    records[0]["n"]["name"] = "b"
+    hit = cache.get("MATCH (n) RETURN n")
+    assert hit is not None
+    hit.records.append({"n": {"name": "c"}})
+    hit.records[0]["n"]["name"] = "d"
+
+    cached = cache.get("MATCH (n) RETURN n")
+    assert cached is not None
+    assert cached.records == [{"n": {"name": "a"}}]
@@ -0,0 +1,31 @@
+from agent.cache import CypherExplainResult, CypherSyntaxCache
+
+
+def test_make_key_normalizes_statement() -> None:
+    key = CypherSyntaxCache.make_key("MATCH (n) RETURN n;", "v1")
+
+    assert key == CypherSyntaxCache.make_key("MATCH (n)\n  RETURN n // all", "v1")
+    assert key != CypherSyntaxCache.make_key("MATCH (n) RETURN n", "v2")
+
+
+def test_get_and_set() -> None:
+    cache = CypherSyntaxCache()
+    result = CypherExplainResult(plan={"operatorType": "ProduceResults@neo4j"})
+
+    assert cache.get("MATCH (n) RETURN n", fingerprint="v1") is None
+    cache.set("MATCH (n) RETURN n", result, fingerprint="v1")
+
+    assert cache.get("MATCH (n) RETURN n", fingerprint="v1") == result
+    assert cache.get("MATCH (n) RETURN n", fingerprint="v2") is None
+    assert cache.stats.hits == 1
+
+
+def test_stores_errors() -> None:
+    cache = CypherSyntaxCache()
+    cache.set("MATCH (n RETURN n", CypherExplainResult(errors=["Invalid input"]))
+
+    cached = cache.get("MATCH (n RETURN n")
+
+    assert cached is not None
+    assert cached.errors == ["Invalid input"]
+    assert cached.plan is None
@@ -0,0 +1,62 @@
+import time
+
+from agent.cache import InMemoryCacheBackend
+
+
+def test_get_and_set() -> None:
+    cache = InMemoryCacheBackend()
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_lru_eviction_by_entries() -> None:
+    cache = InMemoryCacheBackend(max_entries=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_eviction_by_bytes() -> None:
+    cache = InMemoryCacheBackend(max_bytes=100)
+
+    cache.set("a", 1, size=60)
+    cache.set("b", 2, size=60)
+
+    assert len(cache) == 1
+    assert cache.size_bytes == 60
+    assert cache.get("b") == 2
+
+
+def test_value_larger_than_max_bytes_is_not_stored() -> None:
+    cache = InMemoryCacheBackend(max_bytes=100)
+
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=1000)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_ttl_expiration() -> None:
+    cache = InMemoryCacheBackend(ttl=0.01)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats.expirations == 1
@@ -0,0 +1,70 @@
+import time
+from typing import Dict, List
+
+from agent.cache import SemanticAnswerCache
+
+
+class FakeEmbedder:
+    def __init__(self, embeddings: Dict[str, List[float]]) -> None:
+        self.embeddings = embeddings
+        self.calls: List[str] = list()
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls.append(text)
+        return self.embeddings[text]
+
+
+EMBEDDINGS = {
+    "How many movies are there?": [1.0, 0.0, 0.0],
+    "how many movies are there": [0.99, 0.05, 0.0],
+    "Who directed The Matrix?": [0.0, 1.0, 0.0],
+}
+
+
+def test_similar_question_is_a_hit() -> None:
+    cache = SemanticAnswerCache(embedder=FakeEmbedder(EMBEDDINGS))
+
+    cache.store("How many movies are there?", "There are 38 movies.", fingerprint="v1")
+    cached = cache.lookup("how many movies are there", fingerprint="v1")
+
+    assert cached is not None
+    assert cached.answer == "There are 38 movies."
+    assert cached.similarity > 0.95
+    assert cache.stats.hits == 1
+
+
+def test_dissimilar_question_is_a_miss() -> None:
+    cache = SemanticAnswerCache(embedder=FakeEmbedder(EMBEDDINGS))
+
+    cache.store("How many movies are there?", "There are 38 movies.", fingerprint="v1")
+
+    assert cache.lookup("Who directed The Matrix?", fingerprint="v1") is None
+    assert cache.stats.misses == 1
+
+
+def test_lookup_embedding_is_reused_by_store() -> None:
+    embedder = FakeEmbedder(EMBEDDINGS)
+    cache = SemanticAnswerCache(embedder=embedder)
+
+    cache.lookup("How many movies are there?", fingerprint="v1")
+    cache.store("How many movies are there?", "There are 38 movies.", fingerprint="v1")
+
+    assert embedder.calls == ["How many movies are there?"]
+
+
+def test_schema_change_invalidates() -> None:
+    cache = SemanticAnswerCache(embedder=FakeEmbedder(EMBEDDINGS))
+
+    cache.store("How many movies are there?", "There are 38 movies.", fingerprint="v1")
+
+    assert cache.lookup("How many movies are there?", fingerprint="v2") is None
+    assert cache.stats.invalidations == 1
+
+
+def test_ttl_expiration() -> None:
+    cache = SemanticAnswerCache(embedder=FakeEmbedder(EMBEDDINGS), ttl=0.01)
+
+    cache.store("How many movies are there?", "There are 38 movies.", fingerprint="v1")
+    time.sleep(0.02)
+
+    assert cache.lookup("How many movies are there?", fingerprint="v1") is None
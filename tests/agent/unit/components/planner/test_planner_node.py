@@ -0,0 +1,95 @@
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableLambda
+
+from agent.components.models import Task
+from agent.components.planner.models import PlannerOutput
+from agent.components.planner.node import create_planner_node
+from agent.components.state import OverallState
+from agent.retrievers.cypher_examples.base import BaseCypherExampleRetriever
+from agent.workflows.edges import query_mapper_edge
+from agent.workflows.fan_out_scheduler import FanOutScheduler
+
+
+def _create_llm(output: PlannerOutput) -> Any:
+    llm = MagicMock(spec=BaseChatModel)
+    llm.with_structured_output.return_value = RunnableLambda(lambda _: output)
+    return llm
+
+
+def _overall_state(tasks: List[Task]) -> OverallState:
+    return OverallState(
+        question="q",
+        tasks=tasks,
+        next_action="",
+        cyphers=[],
+        summary="",
+        steps=[],
+        messages=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_planner_prefetches_examples_for_all_tasks() -> None:
+    llm = _create_llm(
+        PlannerOutput(
+            tasks=[
+                Task(question="a", parent_task="q"),
+                Task(question="b", parent_task="q"),
+            ]
+        )
+    )
+    retriever = MagicMock(spec=BaseCypherExampleRetriever)
+    retriever.aget_examples_batch = AsyncMock(return_value=["examples a", "examples b"])
+    planner = create_planner_node(llm=llm, cypher_example_retriever=retriever)
+
+    res = await planner({"question": "q", "data": [], "messages": []})
+
+    retriever.aget_examples_batch.assert_awaited_once_with(["a", "b"], k=8)
+    assert [t.examples for t in res["tasks"]] == ["examples a", "examples b"]
+    assert [s.arg for s in query_mapper_edge(_overall_state(res["tasks"]))] == [
+        {"task": "a", "examples": "examples a"},
+        {"task": "b", "examples": "examples b"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_planner_prefetches_examples_for_selected_tasks() -> None:
+    llm = _create_llm(
+        PlannerOutput(
+            tasks=[
+                Task(question="a", parent_task="q"),
+                Task(question="b", parent_task="q"),
+                Task(question="A", parent_task="q"),
+            ]
+        )
+    )
+    retriever = MagicMock(spec=BaseCypherExampleRetriever)
+    retriever.aget_examples_batch = AsyncMock(return_value=["examples a"])
+    scheduler = FanOutScheduler(max_subtasks=1)
+    planner = create_planner_node(
+        llm=llm, cypher_example_retriever=retriever, select_tasks=scheduler.schedule
+    )
+
+    res = await planner({"question": "q", "data": [], "messages": []})
+
+    retriever.aget_examples_batch.assert_awaited_once_with(["a"], k=8)
+    assert [t.examples for t in res["tasks"]] == ["examples a", None, None]
+    sends = scheduler.query_mapper_edge(_overall_state(res["tasks"]))
+    assert [(s.arg["task"], s.arg["examples"]) for s in sends] == [("a", "examples a")]
+
+
+@pytest.mark.asyncio
+async def test_planner_without_retriever() -> None:
+    llm = _create_llm(PlannerOutput(tasks=[]))
+    planner = create_planner_node(llm=llm)
+
+    res = await planner({"question": "q", "data": [], "messages": []})
+
+    assert res["tasks"][0].examples is None
+    assert [s.arg for s in query_mapper_edge(_overall_state(res["tasks"]))] == [
+        {"task": "q"}
+    ]
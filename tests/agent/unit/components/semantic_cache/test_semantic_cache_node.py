@@ -0,0 +1,155 @@
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_neo4j import Neo4jGraph
+
+from agent.cache import SemanticAnswerCache
+from agent.components.final_answer import create_final_answer_node
+from agent.components.semantic_cache import create_semantic_cache_node
+from agent.components.state import InputState, OverallState
+from agent.components.text2cypher.validation.utils.schema_cache import (
+    CompiledSchemaCache,
+)
+from agent.constants import NO_CYPHER_RESULTS
+
+
+class FakeEmbedder:
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0, 0.0] if "movies" in text else [0.0, 1.0]
+
+
+def _input_state(question: str) -> InputState:
+    return {"question": question, "data": list(), "messages": list()}
+
+
+def _overall_state(
+    question: str,
+    summary: str,
+    cyphers: List[Dict[str, Any]],
+    answer_cache_fingerprint: Optional[str] = None,
+) -> OverallState:
+    state: OverallState = {
+        "question": question,
+        "tasks": list(),
+        "next_action": "final_answer",
+        "cyphers": [
+            {
+                "task": c.get("task", ""),
+                "statement": c.get("statement", ""),
+                "parameters": None,
+                "errors": c.get("errors", list()),
+                "records": c.get("records", list()),
+                "cypher_steps": list(),
+            }
+            for c in cyphers
+        ],
+        "summary": summary,
+        "steps": ["semantic_cache", "guardrails"],
+        "messages": list(),
+    }
+    if answer_cache_fingerprint is not None:
+        state["answer_cache_fingerprint"] = answer_cache_fingerprint
+    return state
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_miss_then_hit() -> None:
+    answer_cache = SemanticAnswerCache(embedder=FakeEmbedder())
+    semantic_cache = create_semantic_cache_node(answer_cache=answer_cache)
+    final_answer = create_final_answer_node(answer_cache=answer_cache)
+
+    miss = await semantic_cache(_input_state("How many movies are there?"))
+    assert miss["next_action"] == "guardrails"
+
+    await final_answer(
+        _overall_state(
+            "How many movies are there?",
+            "There are 38 movies.",
+            [
+                {
+                    "task": "count movies",
+                    "statement": "MATCH (m:Movie) RETURN count(m)",
+                    "records": [{"count(m)": 38}],
+                }
+            ],
+            answer_cache_fingerprint=miss["answer_cache_fingerprint"],
+        )
+    )
+    hit = await semantic_cache(_input_state("how many movies?"))
+
+    assert hit["next_action"] == "final_answer"
+    assert hit["summary"] == "There are 38 movies."
+    assert hit["cyphers"][0]["task"] == "count movies"
+    assert hit["steps"] == ["semantic_cache_hit"]
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_uses_shared_schema_cache() -> None:
+    schema_cache = MagicMock(spec=CompiledSchemaCache)
+    schema_cache.get.return_value.fingerprint = "schema-v1"
+    semantic_cache = create_semantic_cache_node(
+        answer_cache=SemanticAnswerCache(embedder=FakeEmbedder()),
+        graph=MagicMock(spec=Neo4jGraph),
+        schema_cache=schema_cache,
+    )
+
+    res = await semantic_cache(_input_state("How many movies are there?"))
+
+    assert res["answer_cache_fingerprint"] == "schema-v1"
+    schema_cache.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_final_answer_does_not_store_without_cypher() -> None:
+    answer_cache = SemanticAnswerCache(embedder=FakeEmbedder())
+    final_answer = create_final_answer_node(answer_cache=answer_cache)
+
+    await final_answer(
+        _overall_state(
+            "What is the weather?", "Out of scope.", list(), answer_cache_fingerprint=""
+        )
+    )
+
+    assert len(answer_cache.backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_final_answer_does_not_store_failed_or_empty_results() -> None:
+    answer_cache = SemanticAnswerCache(embedder=FakeEmbedder())
+    final_answer = create_final_answer_node(answer_cache=answer_cache)
+
+    await final_answer(
+        _overall_state(
+            "How many movies are there?",
+            "Unable to answer the question.",
+            [{"task": "count movies", "errors": ["Invalid input"]}],
+            answer_cache_fingerprint="",
+        )
+    )
+    await final_answer(
+        _overall_state(
+            "How many movies are there?",
+            "I couldn't find any relevant information in the database.",
+            [{"task": "count movies", "records": NO_CYPHER_RESULTS}],
+            answer_cache_fingerprint="",
+        )
+    )
+
+    assert len(answer_cache.backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_final_answer_does_not_store_without_fingerprint() -> None:
+    answer_cache = SemanticAnswerCache(embedder=FakeEmbedder())
+    final_answer = create_final_answer_node(answer_cache=answer_cache)
+
+    await final_answer(
+        _overall_state(
+            "How many movies are there?",
+            "There are 38 movies.",
+            [{"task": "count movies", "records": [{"count(m)": 38}]}],
+        )
+    )
+
+    assert len(answer_cache.backend) == 0
@@ -0,0 +1,15 @@
+from typing import Any, Dict
+
+import pytest
+
+
+@pytest.fixture(scope="function")
+def execution_structured_schema() -> Dict[str, Any]:
+    return {
+        "node_props": {
+            "NodeA": [{"property": "prop_1", "type": "STRING", "values": ["a"]}],
+        },
+        "rel_props": {},
+        "relationships": [{"start": "NodeA", "type": "REL_A", "end": "NodeA"}],
+        "metadata": {},
+    }
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Dict
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_neo4j import Neo4jGraph
+from neo4j.exceptions import Neo4jError
+
+from agent.cache import CypherResultCache
+from agent.components.text2cypher.execution import create_text2cypher_execution_node
+from agent.components.text2cypher.execution import node as execution_node
+from agent.constants import NO_CYPHER_RESULTS
+from agent.database import AsyncNeo4jGraph
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_truncates_records() -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.query.return_value = [{"n": i} for i in range(10)]
+    execute_cypher = create_text2cypher_execution_node(graph=graph, max_rows=3)
+
+    state: Any = {"task": "task", "statement": "MATCH (n) RETURN n"}
+    res = await execute_cypher(state)
+
+    cypher = res["cyphers"][0]
+    assert cypher["records"] == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert cypher["truncated"]
+    assert cypher["truncation_reason"] == "max_rows"
+    assert cypher["record_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_no_results() -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.query.return_value = list()
+    execute_cypher = create_text2cypher_execution_node(graph=graph)
+
+    state: Any = {"task": "task", "statement": "MATCH (n) RETURN n"}
+    res = await execute_cypher(state)
+
+    cypher = res["cyphers"][0]
+    assert cypher["records"] == NO_CYPHER_RESULTS
+    assert not cypher["truncated"]
+    assert cypher["record_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_timeout_routes_to_correction() -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.query.side_effect = Neo4jError._hydrate_neo4j(
+        code="Neo.ClientError.Transaction.TransactionTimedOut",
+        message="The transaction has been terminated.",
+    )
+    execute_cypher = create_text2cypher_execution_node(graph=graph, max_attempts=3)
+
+    state: Any = {
+        "task": "task",
+        "statement": "MATCH (a), (b) RETURN a, b",
+        "attempts": 1,
+    }
+    res = await execute_cypher(state)
+
+    assert res["next_action_cypher"] == "correct_cypher"
+    assert "cyphers" not in res
+    assert res["errors"][0].startswith("Cypher execution failed (timeout)")
+    assert "LIMIT" in res["errors"][0]
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_error_on_final_attempt() -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.query.side_effect = Neo4jError._hydrate_neo4j(
+        code="Neo.TransientError.General.MemoryPoolOutOfMemoryError",
+        message="out of memory",
+    )
+    execute_cypher = create_text2cypher_execution_node(graph=graph, max_attempts=3)
+
+    state: Any = {"task": "task", "statement": "MATCH (n) RETURN n", "attempts": 3}
+    res = await execute_cypher(state)
+
+    assert res["next_action_cypher"] == "__end__"
+    cypher = res["cyphers"][0]
+    assert cypher["records"] == NO_CYPHER_RESULTS
+    assert cypher["errors"][0].startswith("Cypher execution failed (memory)")
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_client_timeout_cancels_query(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(execution_node, "CLIENT_TIMEOUT_GRACE_PERIOD", 0.0)
+    cancelled = asyncio.Event()
+
+    async def hang() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async_graph = MagicMock(spec=AsyncNeo4jGraph)
+    async_graph.database = "neo4j"
+    async_graph.stream.return_value.to_list = hang
+    execute_cypher = create_text2cypher_execution_node(
+        graph=MagicMock(spec=Neo4jGraph), async_graph=async_graph, timeout=0.01
+    )
+
+    state: Any = {"task": "task", "statement": "MATCH (n) RETURN n", "attempts": 1}
+    res = await execute_cypher(state)
+
+    assert cancelled.is_set()
+    assert res["next_action_cypher"] == "correct_cypher"
+    assert async_graph.stream.call_args.kwargs["timeout"] == 0.01
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_uses_result_cache(
+    execution_structured_schema: Dict[str, Any],
+) -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.get_structured_schema = execution_structured_schema
+    graph.query.return_value = [{"n": 1}]
+    result_cache = CypherResultCache()
+    execute_cypher = create_text2cypher_execution_node(
+        graph=graph, result_cache=result_cache
+    )
+
+    first: Any = {"task": "task", "statement": "MATCH (n) RETURN n"}
+    second: Any = {"task": "task", "statement": "MATCH (n)\n// same query\nRETURN n;"}
+    await execute_cypher(first)
+    res = await execute_cypher(second)
+
+    assert graph.query.call_count == 1
+    assert res["cyphers"][0]["records"] == [{"n": 1}]
+    assert "cypher_result_cache_hit" in res["cyphers"][0]["cypher_steps"]
+    assert result_cache.stats.hits == 1
+    assert result_cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_result_cache_invalidated_by_schema_change(
+    execution_structured_schema: Dict[str, Any],
+) -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.get_structured_schema = execution_structured_schema
+    graph.query.return_value = [{"n": 1}]
+    result_cache = CypherResultCache()
+    execute_cypher = create_text2cypher_execution_node(
+        graph=graph, result_cache=result_cache
+    )
+
+    state: Any = {"task": "task", "statement": "MATCH (n) RETURN n"}
+    await execute_cypher(state)
+    graph.get_structured_schema = {
+        **execution_structured_schema,
+        "relationships": list(),
+    }
+    await execute_cypher(state)
+
+    assert graph.query.call_count == 2
+    assert result_cache.stats.invalidations == 1
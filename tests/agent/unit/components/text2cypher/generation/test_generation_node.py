@@ -0,0 +1,184 @@
+import asyncio
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_neo4j import Neo4jGraph
+
+from agent.cache import CypherGenerationCache
+from agent.components.text2cypher.generation.node import (
+    create_text2cypher_generation_node,
+    select_candidate_examples,
+)
+from agent.retrievers.cypher_examples.base import BaseCypherExampleRetriever
+
+STRUCTURED_SCHEMA = {
+    "node_props": {
+        "Movie": [{"property": "title", "type": "STRING", "values": ["The Matrix"]}]
+    },
+    "rel_props": {},
+    "relationships": [],
+    "metadata": {},
+}
+
+
+def _create_graph() -> Any:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.schema = "Node properties: Movie {title: STRING}"
+    graph.get_structured_schema = STRUCTURED_SCHEMA
+    return graph
+
+
+def _create_retriever() -> Any:
+    retriever = MagicMock(spec=BaseCypherExampleRetriever)
+    retriever.aget_examples.return_value = "Question: ...\nCypher: ..."
+    return retriever
+
+
+@pytest.mark.asyncio
+async def test_generate_cypher_without_cache() -> None:
+    generate_cypher = create_text2cypher_generation_node(
+        llm=FakeListChatModel(responses=["MATCH (m:Movie) RETURN count(m)"]),
+        graph=_create_graph(),
+        cypher_example_retriever=_create_retriever(),
+    )
+
+    res = await generate_cypher({"task": "How many movies?", "prev_steps": []})
+
+    assert res["statement"] == "MATCH (m:Movie) RETURN count(m)"
+    assert res["next_action_cypher"] == "validate_cypher"
+    assert "generation_cache_key" not in res
+
+
+@pytest.mark.asyncio
+async def test_generate_cypher_cache_hit_skips_llm() -> None:
+    generation_cache = CypherGenerationCache()
+    generate_cypher = create_text2cypher_generation_node(
+        llm=FakeListChatModel(
+            responses=["MATCH (m:Movie) RETURN m", "MATCH (m) RETURN m"]
+        ),
+        graph=_create_graph(),
+        cypher_example_retriever=_create_retriever(),
+        generation_cache=generation_cache,
+    )
+
+    miss = await generate_cypher({"task": "How many movies?", "prev_steps": []})
+    # the validation node stores statements that passed validation
+    generation_cache.set(
+        miss["generation_cache_key"], "MATCH (m:Movie) RETURN count(m)"
+    )
+    hit = await generate_cypher({"task": "how many movies", "prev_steps": []})
+
+    assert hit["statement"] == "MATCH (m:Movie) RETURN count(m)"
+    assert hit["next_action_cypher"] == "execute_cypher"
+    assert hit["cypher_steps"] == ["generate_cypher", "generation_cache_hit"]
+
+
+@pytest.mark.asyncio
+async def test_generate_cypher_uses_prefetched_examples() -> None:
+    retriever = _create_retriever()
+    generate_cypher = create_text2cypher_generation_node(
+        llm=FakeListChatModel(responses=["MATCH (m:Movie) RETURN count(m)"]),
+        graph=_create_graph(),
+        cypher_example_retriever=retriever,
+    )
+
+    res = await generate_cypher(
+        {"task": "How many movies?", "prev_steps": [], "examples": "prefetched"}
+    )
+
+    assert not retriever.aget_examples.called
+    assert res["statement"] == "MATCH (m:Movie) RETURN count(m)"
+
+
+@pytest.mark.asyncio
+async def test_generate_cypher_speculative_keeps_first_valid_candidate(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cancelled = list()
+
+    async def fake_validators(graph: Any, cypher_statement: str, **kwargs: Any) -> Any:
+        if cypher_statement == "BAD":
+            return cypher_statement, ["syntax error"]
+        if cypher_statement == "SLOW":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(cypher_statement)
+                raise
+        await asyncio.sleep(0.01)
+        return cypher_statement, list()
+
+    monkeypatch.setattr(
+        "agent.components.text2cypher.generation.node.arun_local_validators",
+        fake_validators,
+    )
+    generate_cypher = create_text2cypher_generation_node(
+        llm=FakeListChatModel(responses=["BAD", "GOOD", "SLOW"]),
+        graph=_create_graph(),
+        cypher_example_retriever=_create_retriever(),
+        num_candidates=3,
+        candidate_temperatures=[0.0, 0.5, 1.0],
+    )
+
+    res = await generate_cypher({"task": "How many movies?", "prev_steps": []})
+
+    assert res["statement"] == "GOOD"
+    assert res["next_action_cypher"] == "validate_cypher"
+    assert res["cypher_steps"][0] == "generate_cypher"
+    assert res["cypher_steps"][1].startswith("speculative_candidate_")
+    assert cancelled == ["SLOW"]
+
+
+@pytest.mark.asyncio
+async def test_generate_cypher_speculative_keeps_fewest_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def fake_validators(graph: Any, cypher_statement: str, **kwargs: Any) -> Any:
+        return cypher_statement, ["error"] * len(cypher_statement)
+
+    monkeypatch.setattr(
+        "agent.components.text2cypher.generation.node.arun_local_validators",
+        fake_validators,
+    )
+    generate_cypher = create_text2cypher_generation_node(
+        llm=FakeListChatModel(responses=["AAA", "A", "AA"]),
+        graph=_create_graph(),
+        cypher_example_retriever=_create_retriever(),
+        num_candidates=3,
+    )
+
+    res = await generate_cypher({"task": "How many movies?", "prev_steps": []})
+
+    assert res["statement"] == "A"
+    assert res["next_action_cypher"] == "validate_cypher"
+
+
+def test_select_candidate_examples() -> None:
+    examples = "\n\n".join(f"Question: q{i}\nCypher: c{i}" for i in range(6))
+
+    first = select_candidate_examples(examples, 0, 3)
+    second = select_candidate_examples(examples, 1, 3)
+    third = select_candidate_examples(examples, 2, 3)
+
+    assert first == examples
+    assert "q0" not in second and "q3" not in second and "q1" in second
+    assert "q1" not in third and "q4" not in third and "q0" in third
+    assert select_candidate_examples("Question: q0\nCypher: c0", 1, 3) == (
+        "Question: q0\nCypher: c0"
+    )
+
+
+def test_select_candidate_examples_keeps_blank_lines_in_cypher() -> None:
+    cypher = "MATCH (m:Movie)\n\nRETURN count(m)"
+    examples = "\n\n".join(
+        [f"Question: q0\nCypher:\n{cypher}", "Question: q1\nCypher:\nRETURN 1"]
+    )
+
+    assert (
+        select_candidate_examples(examples, 1, 2) == "Question: q1\nCypher:\nRETURN 1"
+    )
+    assert select_candidate_examples(examples, 2, 2) == (
+        f"Question: q0\nCypher:\n{cypher}"
+    )
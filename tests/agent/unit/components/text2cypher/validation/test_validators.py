@@ -1,14 +1,29 @@
-from typing import Any, Dict, Literal
+import warnings
+from typing import Any, Dict, List, Literal, Optional
+from unittest.mock import AsyncMock, MagicMock
 
+import pytest
+from langchain_neo4j import Neo4jGraph
+from neo4j.exceptions import CypherSyntaxError
+
+from agent.cache import CypherSyntaxCache
 from agent.components.text2cypher.validation.models import (
+    CypherCostGuard,
     Neo4jStructuredSchemaPropertyNumber,
 )
 from agent.components.text2cypher.validation.validators import (
     _validate_property_value_with_enum,
     _validate_property_value_with_range,
     _validate_property_with_enum,
+    aexplain_cypher_query,
+    arun_local_validators,
+    find_costly_plan_operators,
+    get_procedure_access_mode,
+    precheck_cypher_statement,
+    validate_cypher_plan_cost,
     validate_no_writes_in_cypher_query,
 )
+from agent.database import AsyncNeo4jGraph
 
 
 def test_validate_node_properties_with_enum() -> None: ...
@@ -450,3 +465,289 @@ def test_validate_no_writes_in_cypher_query_invalid_two_error(
     res = validate_no_writes_in_cypher_query(cypher_statement_writes_2)
 
     assert len(res) == 3
+
+
+def test_validate_no_writes_in_cypher_query_ignores_strings_and_comments() -> None:
+    res = validate_no_writes_in_cypher_query(
+        """
+MATCH (n:Setting {name: "reset"})
+// MERGE (m)
+WHERE n.offset > 1 AND n.status = 'CREATE SET DELETE'
+RETURN n.set AS set
+ORDER BY n.created
+SKIP 5
+"""
+    )
+
+    assert res == list()
+
+
+def test_validate_no_writes_in_cypher_query_offset() -> None:
+    res = validate_no_writes_in_cypher_query("MATCH (n) RETURN n OFFSET 10 LIMIT 5")
+
+    assert res == list()
+
+
+def test_validate_no_writes_in_cypher_query_write_procedure() -> None:
+    res = validate_no_writes_in_cypher_query(
+        "CALL db.labels() YIELD label CALL apoc.create.node([label], {}) YIELD node RETURN node"
+    )
+
+    assert res == ["Cypher calls write procedure: apoc.create.node"]
+
+
+def test_validate_no_writes_in_cypher_query_unknown_procedure() -> None:
+    statement = "CALL custom.lookup($id) YIELD value RETURN value"
+
+    assert validate_no_writes_in_cypher_query(statement) == list()
+    assert validate_no_writes_in_cypher_query(
+        statement, allow_unknown_procedures=False
+    ) == ["Cypher calls procedure not known to be read only: custom.lookup"]
+
+
+def test_get_procedure_access_mode() -> None:
+    assert get_procedure_access_mode("db.index.vector.queryNodes") == "READ"
+    assert get_procedure_access_mode("gds.pageRank.stream") == "READ"
+    assert get_procedure_access_mode("gds.pageRank.write") == "WRITE"
+    assert get_procedure_access_mode("apoc.cypher.runWrite") == "WRITE"
+    assert get_procedure_access_mode("custom.lookup") is None
+
+
+def test_precheck_cypher_statement_valid() -> None:
+    assert (
+        precheck_cypher_statement(
+            "// movies\nMATCH (m:Movie {title: 'A (B'}) WHERE m.year IN [1, 2] RETURN m"
+        )
+        == list()
+    )
+    assert precheck_cypher_statement("optional match (n) return n") == list()
+
+
+def test_precheck_cypher_statement_rejects_markdown_and_prose() -> None:
+    fenced = precheck_cypher_statement("```cypher\nMATCH (n) RETURN n\n```")
+    prose = precheck_cypher_statement("Here is the query: MATCH (n) RETURN n")
+
+    assert len(fenced) == 1 and "markdown" in fenced[0]
+    assert len(prose) == 1 and "`Here`" in prose[0]
+    assert precheck_cypher_statement("  ") == ["The Cypher statement is empty."]
+
+
+def test_precheck_cypher_statement_rejects_unbalanced_brackets() -> None:
+    assert precheck_cypher_statement("MATCH (n RETURN n") == [
+        "Unclosed `(` at position 6."
+    ]
+    assert precheck_cypher_statement("MATCH (n)] RETURN n") == [
+        "Unbalanced `]` at position 9."
+    ]
+    assert precheck_cypher_statement("MATCH (n {name: 'x}) RETURN n") == [
+        "Unterminated string literal at position 16."
+    ]
+
+
+def _create_syntax_error(message: str) -> CypherSyntaxError:
+    error = CypherSyntaxError()
+    with warnings.catch_warnings():
+        # the driver only sets the message of errors it receives from the server
+        warnings.simplefilter("ignore", DeprecationWarning)
+        error.message = message
+    return error
+
+
+def _create_graph() -> Any:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.get_structured_schema = {
+        "node_props": {},
+        "rel_props": {},
+        "relationships": [],
+        "metadata": {},
+    }
+    graph.query.return_value = []
+    return graph
+
+
+def _create_async_graph(plan: Dict[str, Any]) -> Any:
+    async_graph = MagicMock(spec=AsyncNeo4jGraph)
+    async_graph.explain = AsyncMock(return_value=plan)
+    return async_graph
+
+
+@pytest.mark.asyncio
+async def test_aexplain_cypher_query_caches_plan() -> None:
+    graph = _create_graph()
+    plan = {"operatorType": "ProduceResults@neo4j", "children": []}
+    async_graph = _create_async_graph(plan)
+    syntax_cache = CypherSyntaxCache()
+
+    first = await aexplain_cypher_query(
+        graph, "MATCH (n) RETURN n", async_graph=async_graph, syntax_cache=syntax_cache
+    )
+    second = await aexplain_cypher_query(
+        graph,
+        "MATCH (n)\nRETURN n;",
+        async_graph=async_graph,
+        syntax_cache=syntax_cache,
+    )
+
+    assert first.errors == list()
+    assert first.plan == plan
+    assert second == first
+    assert async_graph.explain.await_count == 1
+    graph.query.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_aexplain_cypher_query_without_async_graph_uses_query() -> None:
+    graph = _create_graph()
+
+    res = await aexplain_cypher_query(graph, "MATCH (n) RETURN n")
+
+    assert res.errors == list()
+    assert res.plan is None
+    graph.query.assert_called_once_with("EXPLAIN MATCH (n) RETURN n")
+
+
+@pytest.mark.asyncio
+async def test_aexplain_cypher_query_caches_syntax_errors() -> None:
+    graph = _create_graph()
+    graph.query.side_effect = _create_syntax_error("Invalid input 'RETRUN'")
+    syntax_cache = CypherSyntaxCache()
+
+    for _ in range(2):
+        res = await aexplain_cypher_query(
+            graph, "MATCH (n) RETRUN n", syntax_cache=syntax_cache
+        )
+        assert res.errors == ["Invalid input 'RETRUN'"]
+
+    assert graph.query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_aexplain_cypher_query_precheck_skips_database() -> None:
+    graph = _create_graph()
+
+    res = await aexplain_cypher_query(graph, "```\nMATCH (n) RETURN n\n```")
+
+    assert len(res.errors) == 1
+    graph.query.assert_not_called()
+
+
+def _operator(
+    operator_type: str,
+    rows: float,
+    identifiers: List[str],
+    details: str = "",
+    children: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    return {
+        "operatorType": f"{operator_type}@neo4j",
+        "identifiers": identifiers,
+        "args": {"EstimatedRows": rows, "Details": details},
+        "children": children or list(),
+    }
+
+
+def test_find_costly_plan_operators_all_nodes_scan() -> None:
+    plan = _operator(
+        "ProduceResults", 500, ["n"], children=[_operator("AllNodesScan", 500, ["n"])]
+    )
+
+    issues = find_costly_plan_operators(plan, CypherCostGuard())
+
+    assert [i.operator for i in issues] == ["AllNodesScan"]
+    assert "add a label to the node `n`" in issues[0].hint
+    assert (
+        find_costly_plan_operators(plan, CypherCostGuard(max_all_nodes_scan_rows=None))
+        == list()
+    )
+
+
+def test_find_costly_plan_operators_cartesian_product() -> None:
+    plan = _operator(
+        "ProduceResults",
+        100,
+        ["m", "p"],
+        children=[
+            _operator(
+                "CartesianProduct",
+                100,
+                ["m", "p"],
+                children=[
+                    _operator("NodeByLabelScan", 10, ["m"], "m:Movie"),
+                    _operator("NodeByLabelScan", 10, ["p"], "p:Person"),
+                ],
+            )
+        ],
+    )
+
+    issues = find_costly_plan_operators(plan, CypherCostGuard())
+
+    assert [i.operator for i in issues] == ["CartesianProduct"]
+    assert "`m` and `p`" in issues[0].hint
+
+
+def test_find_costly_plan_operators_label_scan_without_index() -> None:
+    plan = _operator(
+        "ProduceResults",
+        1,
+        ["m"],
+        children=[
+            _operator(
+                "Filter",
+                1,
+                ["m"],
+                "m.title = $autostring_0",
+                children=[_operator("NodeByLabelScan", 200_000, ["m"], "m:Movie")],
+            )
+        ],
+    )
+
+    errors = validate_cypher_plan_cost(plan, CypherCostGuard())
+
+    assert len(errors) == 1
+    assert errors[0].startswith(
+        "Cost guard: NodeByLabelScan estimated to produce 200,000 rows."
+    )
+    assert "use an index on :Movie(title)" in errors[0]
+
+
+def test_find_costly_plan_operators_max_estimated_rows() -> None:
+    plan = _operator(
+        "ProduceResults",
+        5_000,
+        ["m"],
+        children=[_operator("NodeByLabelScan", 5_000, ["m"], "m:Movie")],
+    )
+
+    assert find_costly_plan_operators(plan, CypherCostGuard()) == list()
+
+    issues = find_costly_plan_operators(plan, CypherCostGuard(max_estimated_rows=1_000))
+
+    assert len(issues) == 1
+    assert issues[0].operator == "ProduceResults"
+    assert "LIMIT" in issues[0].hint
+
+
+@pytest.mark.asyncio
+async def test_arun_local_validators_with_cost_guard() -> None:
+    graph = _create_graph()
+    async_graph = _create_async_graph(
+        _operator(
+            "ProduceResults",
+            500,
+            ["n"],
+            children=[_operator("AllNodesScan", 500, ["n"])],
+        )
+    )
+
+    _, without_guard = await arun_local_validators(
+        graph, "MATCH (n) RETURN n", async_graph=async_graph
+    )
+    _, with_guard = await arun_local_validators(
+        graph,
+        "MATCH (n) RETURN n",
+        async_graph=async_graph,
+        cost_guard=CypherCostGuard(),
+    )
+
+    assert without_guard == list()
+    assert len(with_guard) == 1 and "AllNodesScan" in with_guard[0]
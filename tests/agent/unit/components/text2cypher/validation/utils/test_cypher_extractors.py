@@ -4,6 +4,7 @@ from agent.components.text2cypher.validation.models import (
 from agent.components.text2cypher.validation.utils.cypher_extractors import (
     _extract_nodes_and_properties_from_cypher_statement,
     _extract_relationships_and_properties_from_cypher_statement,
+    extract_entities_for_validation,
     # parse_labels_or_types,
     process_match_clause_property_ids,
 )
@@ -124,3 +125,21 @@ def test_extract_relationships_and_properties_from_cypher_statement_1(
     assert ents[0].labels_or_types == "RELATIONSHIP"
     assert ents[0].property_name == "id"
     assert ents[0].property_value == "1"
+
+
+def test_extract_entities_for_validation_groups_filters_by_variable(
+    cypher_statement_2: str,
+) -> None:
+    ents = extract_entities_for_validation(cypher_statement_2)
+
+    nodes = ents.get("nodes", list())
+
+    assert len(ents.get("relationships", list())) == 0
+    assert [(n.property_name, n.property_value) for n in nodes] == [
+        ("make", "Honda"),
+        ("model", "Odyssey"),
+        ("verbatimText", "cup holder"),
+        ("gender", "Male"),
+        ("gender", "Female"),
+    ]
+    assert all(n.labels_or_types == "Verbatim" for n in nodes)
@@ -0,0 +1,161 @@
+from typing import Any, Dict
+from unittest.mock import MagicMock
+
+from langchain_neo4j import Neo4jGraph
+
+from agent.components.text2cypher.validation.utils.cypher_extractors import (
+    extract_entities_for_validation,
+)
+from agent.components.text2cypher.validation.utils.cypher_parser import (
+    parse_cypher_statement,
+    tokenize_cypher_statement,
+)
+from agent.components.text2cypher.validation.validators import (
+    correct_cypher_query_relationship_direction,
+)
+
+
+def test_tokenize_cypher_statement_skips_comments() -> None:
+    tokens = tokenize_cypher_statement(
+        "MATCH (n) // MERGE (m)\n/* SET */ RETURN 'a // b'"
+    )
+
+    assert [t.text for t in tokens] == ["MATCH", "(", "n", ")", "RETURN", "'a // b'"]
+    assert tokens[-1].kind == "string"
+
+
+def test_tokenize_cypher_statement_kinds_and_offsets() -> None:
+    statement = "WITH $p AS x, $ AS y, ñame / 2.5e3 AS z // done"
+    tokens = tokenize_cypher_statement(statement)
+
+    assert [(t.kind, t.text) for t in tokens] == [
+        ("identifier", "WITH"),
+        ("parameter", "$p"),
+        ("identifier", "AS"),
+        ("identifier", "x"),
+        ("symbol", ","),
+        ("unknown", "$"),
+        ("identifier", "AS"),
+        ("identifier", "y"),
+        ("symbol", ","),
+        ("identifier", "ñame"),
+        ("symbol", "/"),
+        ("number", "2.5e3"),
+        ("identifier", "AS"),
+        ("identifier", "z"),
+    ]
+    assert all(statement[t.start : t.end] == t.text for t in tokens)
+
+
+def test_parse_cypher_statement_is_cached() -> None:
+    statement = "MATCH (n:NodeA) RETURN n"
+
+    assert parse_cypher_statement(statement) is parse_cypher_statement(statement)
+
+
+def test_parse_backtick_labels_and_parameters() -> None:
+    parsed = parse_cypher_statement(
+        "MATCH (n:`Node A` {prop_1: $value})-[r:`REL A`]->(m:NodeB) RETURN n"
+    )
+
+    assert parsed.nodes[0].labels == "Node A"
+    assert parsed.nodes[0].properties["prop_1"].kind == "parameter"
+    assert parsed.relationships[0].types == "REL A"
+    assert parsed.relationships[0].direction == "right"
+
+
+def test_parse_relationship_chain() -> None:
+    parsed = parse_cypher_statement(
+        "MATCH (a:NodeA)<-[:REL_A]-(b:NodeB)-[:REL_B*1..3]-(c) RETURN a"
+    )
+
+    assert [r.direction for r in parsed.relationships] == ["left", "none"]
+    assert [(r.left_node, r.right_node) for r in parsed.relationships] == [
+        (0, 1),
+        (1, 2),
+    ]
+
+
+def test_parse_function_calls_are_not_nodes() -> None:
+    parsed = parse_cypher_statement(
+        "MATCH (n:NodeA) WHERE size(n.prop_1) > 2 RETURN toUpper(n.prop_1)"
+    )
+
+    assert len(parsed.nodes) == 1
+    assert parsed.predicates == ()
+
+
+def test_parse_clauses() -> None:
+    parsed = parse_cypher_statement(
+        "OPTIONAL MATCH (n:NodeA) WITH n ORDER BY n.prop_1 RETURN n.prop_1 AS offset"
+    )
+
+    assert [c.keyword for c in parsed.clauses] == [
+        "OPTIONAL MATCH",
+        "WITH",
+        "ORDER BY",
+        "RETURN",
+    ]
+    assert parsed.projections[0].property_name == "prop_1"
+
+
+def test_extract_multi_line_where_and_list_predicates() -> None:
+    tasks = extract_entities_for_validation(
+        """
+MATCH (n:NodeA)
+WHERE n.prop_1 IN ['a', "b"]
+  AND n.prop_2
+      >= 3
+  AND n.prop_1 = $param
+RETURN n
+"""
+    )["nodes"]
+
+    assert [(t.property_name, t.operator, t.property_value) for t in tasks] == [
+        ("prop_1", "IN", "a"),
+        ("prop_1", "IN", "b"),
+        ("prop_2", ">=", "3"),
+        ("prop_1", "=", None),
+    ]
+    assert all(t.labels_or_types == "NodeA" for t in tasks)
+
+
+def test_extract_ignores_strings_and_comments() -> None:
+    tasks = extract_entities_for_validation(
+        """
+MATCH (n:NodeA)
+// WHERE n.prop_3 = 'x'
+WHERE n.prop_1 = "n.prop_4 = 'y'"
+RETURN n
+"""
+    )["nodes"]
+
+    assert len(tasks) == 1
+    assert tasks[0].property_name == "prop_1"
+    assert tasks[0].property_value == "n.prop_4 = 'y'"
+
+
+def test_correct_relationship_direction(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.get_structured_schema = utils_structured_graph_schema
+
+    res = correct_cypher_query_relationship_direction(
+        graph,
+        "MATCH (b:NodeB)-[r:REL_A {prop_1: 'a'}]->(a:NodeA), (a)-[:REL_A]->(b) RETURN a",
+    )
+
+    assert res == (
+        "MATCH (b:NodeB)<-[r:REL_A {prop_1: 'a'}]-(a:NodeA), (a)-[:REL_A]->(b) RETURN a"
+    )
+
+
+def test_correct_relationship_direction_leaves_unknown_patterns(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.get_structured_schema = utils_structured_graph_schema
+    statement = "MATCH (b:NodeB)-[:REL_X]->(a:NodeA), (b)-[:REL_A]-(a) RETURN a"
+
+    assert correct_cypher_query_relationship_direction(graph, statement) == statement
@@ -1,5 +1,7 @@
 from agent.components.text2cypher.validation.utils.regex_patterns import (
+    get_cypher_entity_pattern,
     get_node_label_pattern,
+    get_variable_operator_property_pattern,
 )
 
 
@@ -13,3 +15,25 @@ def test_get_node_label_pattern() -> None:
     assert pat.findall("(nodeA:`Node one` {id:'001'})")[0] == "Node one"
     assert pat.findall("(node_1:Node|NodeB{id:'001'})")[0] == "Node|NodeB"
     assert pat.findall("(node_1:Node&NodeB {id:'001'})")[0] == "Node&NodeB "
+
+
+def test_patterns_are_compiled_once() -> None:
+    assert get_node_label_pattern() is get_node_label_pattern()
+    assert get_variable_operator_property_pattern(
+        "n"
+    ) is get_variable_operator_property_pattern("n")
+
+
+def test_get_cypher_entity_pattern() -> None:
+    pat = get_cypher_entity_pattern()
+    groups = [
+        (m.group("node"), m.group("relationship"), m.group("variable"))
+        for m in pat.finditer("MATCH (n:Node)-[r:REL]->(m) WHERE m.id = 3")
+    ]
+
+    assert groups == [
+        ("(n:Node)", None, None),
+        (None, "r:REL", None),
+        ("(m)", None, None),
+        (None, None, "m"),
+    ]
@@ -0,0 +1,77 @@
+import copy
+from typing import Any, Dict
+from unittest.mock import MagicMock
+
+from langchain_neo4j import Neo4jGraph
+
+from agent.components.text2cypher.validation.utils.schema_cache import (
+    CompiledSchemaCache,
+    get_compiled_schema,
+)
+
+
+def test_compiled_schema_lookups(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    snapshot = CompiledSchemaCache().get(utils_structured_graph_schema)
+
+    assert snapshot.node_properties["NodeA"] == {"prop_1", "prop_2"}
+    assert snapshot.relationship_properties["REL_A"] == {"prop_1"}
+    assert snapshot.node_property_types["NodeA"]["prop_2"] == "INTEGER"
+    assert snapshot.node_property_ranges["NodeA"]["prop_2"].max == 10
+    assert "REL_A" in snapshot.relationship_property_values
+    assert "NodeA" not in snapshot.relationship_property_values
+    assert ("NodeA", "REL_A", "NodeB") in snapshot.relationship_triples
+
+
+def test_compiled_schema_cache_reuses_snapshot(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    cache = CompiledSchemaCache()
+
+    first = cache.get(utils_structured_graph_schema)
+    second = cache.get(utils_structured_graph_schema)
+    equal_copy = cache.get(copy.deepcopy(utils_structured_graph_schema))
+
+    assert first is second
+    assert first is equal_copy
+
+
+def test_compiled_schema_cache_recompiles_on_new_fingerprint(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    cache = CompiledSchemaCache()
+    first = cache.get(utils_structured_graph_schema)
+
+    updated = copy.deepcopy(utils_structured_graph_schema)
+    updated["node_props"]["NodeC"] = [
+        {"property": "prop_1", "type": "STRING", "values": ["a"]}
+    ]
+    second = cache.get(updated)
+
+    assert first.fingerprint != second.fingerprint
+    assert "NodeC" in second.node_properties
+
+
+def test_compiled_schema_cache_ttl_detects_in_place_changes(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    cache = CompiledSchemaCache(ttl=0)
+    first = cache.get(utils_structured_graph_schema)
+
+    utils_structured_graph_schema["rel_props"]["REL_B"] = list()
+    second = cache.get(utils_structured_graph_schema)
+
+    assert first.fingerprint != second.fingerprint
+    assert "REL_B" in second.relationship_properties
+
+
+def test_get_compiled_schema_from_graph(
+    utils_structured_graph_schema: Dict[str, Any],
+) -> None:
+    graph = MagicMock(spec=Neo4jGraph)
+    graph.get_structured_schema = utils_structured_graph_schema
+
+    snapshot = get_compiled_schema(graph=graph, schema_cache=CompiledSchemaCache())
+
+    assert set(snapshot.node_properties.keys()) == {"NodeA", "NodeB"}
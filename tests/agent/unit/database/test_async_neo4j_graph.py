@@ -0,0 +1,168 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from neo4j import READ_ACCESS
+
+from agent.database import AsyncNeo4jGraph
+
+
+class FakeRecord:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def data(self) -> Dict[str, Any]:
+        return self._data
+
+
+class FakeAsyncResult:
+    def __init__(self, records: List[Dict[str, Any]]) -> None:
+        self.records = records
+        self.pulled = 0
+        self.consumed = False
+
+    async def data(self) -> List[Dict[str, Any]]:
+        return self.records
+
+    async def __aiter__(self) -> AsyncIterator[FakeRecord]:
+        for record in self.records:
+            self.pulled += 1
+            yield FakeRecord(record)
+
+    async def consume(self) -> Any:
+        self.consumed = True
+        return MagicMock(plan={"operatorType": "ProduceResults@neo4j"})
+
+
+class FakeAsyncSession:
+    def __init__(self, driver: "FakeAsyncDriver") -> None:
+        self.driver = driver
+
+    async def __aenter__(self) -> "FakeAsyncSession":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None: ...
+
+    async def run(self, query: Any, params: Dict[str, Any]) -> FakeAsyncResult:
+        self.driver.in_flight += 1
+        self.driver.max_in_flight = max(
+            self.driver.max_in_flight, self.driver.in_flight
+        )
+        await asyncio.sleep(0.01)
+        self.driver.in_flight -= 1
+        self.driver.queries.append(query.text)
+        self.driver.result = FakeAsyncResult(
+            self.driver.records if self.driver.records else [{"params": params}]
+        )
+        return self.driver.result
+
+
+class FakeAsyncDriver:
+    def __init__(self, records: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.records = records
+        self.result: Optional[FakeAsyncResult] = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queries: List[str] = list()
+        self.session_kwargs: List[Dict[str, Any]] = list()
+        self.close = MagicMock(side_effect=self._close)
+
+    def session(self, **kwargs: Any) -> FakeAsyncSession:
+        self.session_kwargs.append(kwargs)
+        return FakeAsyncSession(self)
+
+    async def _close(self) -> None: ...
+
+
+@pytest.mark.asyncio
+async def test_query_returns_records() -> None:
+    driver = FakeAsyncDriver()
+    graph = AsyncNeo4jGraph(driver=driver, database="movies")  # type: ignore[arg-type]
+
+    res = await graph.query("MATCH (n) RETURN n", {"id": 1})
+
+    assert res == [{"params": {"id": 1}}]
+    assert driver.queries == ["MATCH (n) RETURN n"]
+    assert driver.session_kwargs == [
+        {"database": "movies", "default_access_mode": READ_ACCESS}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_explain_returns_plan() -> None:
+    driver = FakeAsyncDriver()
+    graph = AsyncNeo4jGraph(driver=driver)  # type: ignore[arg-type]
+
+    plan = await graph.explain("MATCH (n) RETURN n")
+
+    assert plan == {"operatorType": "ProduceResults@neo4j"}
+    assert driver.queries == ["EXPLAIN MATCH (n) RETURN n"]
+    assert driver.result is not None and driver.result.consumed
+
+
+@pytest.mark.asyncio
+async def test_queries_overlap_up_to_max_concurrency() -> None:
+    driver = FakeAsyncDriver()
+    graph = AsyncNeo4jGraph(driver=driver, max_concurrency=3)  # type: ignore[arg-type]
+
+    await asyncio.gather(*[graph.query(f"RETURN {i}") for i in range(10)])
+
+    assert driver.max_in_flight == 3
+    assert len(driver.queries) == 10
+
+
+def test_invalid_max_concurrency() -> None:
+    with pytest.raises(ValueError):
+        AsyncNeo4jGraph(driver=FakeAsyncDriver(), max_concurrency=0)  # type: ignore[arg-type]
+
+
+def test_schema_requires_schema_graph() -> None:
+    driver: Any = FakeAsyncDriver()
+
+    graph = AsyncNeo4jGraph(driver=driver, schema_graph=MagicMock(schema="schema"))
+    assert graph.schema == "schema"
+
+    with pytest.raises(ValueError):
+        AsyncNeo4jGraph(driver=driver).schema
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_at_max_rows() -> None:
+    driver = FakeAsyncDriver(records=[{"n": i} for i in range(100)])
+    graph = AsyncNeo4jGraph(driver=driver)  # type: ignore[arg-type]
+
+    stream = graph.stream("MATCH (n) RETURN n", max_rows=5)
+    records = await stream.to_list()
+
+    assert records == [{"n": i} for i in range(5)]
+    assert stream.truncated
+    assert stream.truncation_reason == "max_rows"
+    assert stream.record_count == 5
+    assert driver.result is not None
+    assert driver.result.pulled == 6
+    assert driver.result.consumed
+    assert driver.session_kwargs[0]["fetch_size"] == 6
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_at_max_bytes() -> None:
+    driver = FakeAsyncDriver(records=[{"text": "x" * 10} for _ in range(10)])
+    graph = AsyncNeo4jGraph(driver=driver)  # type: ignore[arg-type]
+
+    stream = graph.stream("MATCH (n) RETURN n", max_bytes=50)
+    records = [record async for record in stream]
+
+    assert len(records) == 2
+    assert stream.truncation_reason == "max_bytes"
+
+
+@pytest.mark.asyncio
+async def test_stream_without_budget_returns_everything() -> None:
+    driver = FakeAsyncDriver(records=[{"n": i} for i in range(10)])
+    graph = AsyncNeo4jGraph(driver=driver)  # type: ignore[arg-type]
+
+    stream = graph.stream("MATCH (n) RETURN n")
+
+    assert len(await stream.to_list()) == 10
+    assert not stream.truncated
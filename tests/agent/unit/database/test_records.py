@@ -0,0 +1,36 @@
+import pytest
+
+from agent.database import RecordBudget, estimate_record_size
+
+
+def test_estimate_record_size() -> None:
+    assert estimate_record_size({"a": 1}) == len('{"a": 1}')
+
+
+def test_record_budget_unlimited() -> None:
+    budget = RecordBudget()
+
+    assert all(budget.admit({"n": i}) for i in range(1000))
+    assert not budget.truncated
+    assert budget.row_count == 1000
+
+
+def test_record_budget_max_rows() -> None:
+    budget = RecordBudget(max_rows=2)
+
+    assert [budget.admit({"n": i}) for i in range(3)] == [True, True, False]
+    assert budget.truncation_reason == "max_rows"
+
+
+def test_record_budget_max_bytes() -> None:
+    budget = RecordBudget(max_bytes=20)
+
+    assert budget.admit({"a": "12345"})
+    assert not budget.admit({"a": "1234567890"})
+    assert budget.truncation_reason == "max_bytes"
+    assert budget.byte_count == len('{"a": "12345"}')
+
+
+def test_record_budget_rejects_negative_limits() -> None:
+    with pytest.raises(ValueError):
+        RecordBudget(max_rows=-1)
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from agent.embeddings import EmbedderProtocol
-from agent.ingest.cypher_examples.models import CypherIngestRecord
+from database.ingest.cypher_examples.models import CypherIngestRecord
 
 
 @pytest.fixture(scope="function")
@@ -1,6 +1,6 @@
 from typing import Dict, List
 
-from agent.ingest.cypher_examples.utils import (
+from database.ingest.cypher_examples.utils import (
     remove_preexisting_nodes_from_ingest_tasks,
 )
 
@@ -1,10 +1,16 @@
 from typing import Dict, List
 from unittest.mock import MagicMock
 
-from agent.ingest.cypher_examples.ingest_neo4j import (
+import neo4j
+import pytest
+
+from agent.embeddings import BatchEmbedderProtocol
+from database.ingest.cypher_examples.ingest_neo4j import (
+    diff_cypher_examples,
     embed_cypher_query_nodes,
 )
-from agent.ingest.cypher_examples.models import CypherIngestRecord
+from database.ingest.cypher_examples.models import CypherIngestRecord
+from database.ingest.cypher_examples.utils import compute_content_hash
 
 
 def test_embed_cypher_query_nodes(
@@ -17,3 +23,126 @@ def test_embed_cypher_query_nodes(
     assert nodes is not None
     assert len(nodes) == len(unembedded_cypher_examples)
     assert isinstance(nodes[0], CypherIngestRecord)
+
+
+def test_embed_cypher_query_nodes_uses_embed_documents(
+    unembedded_cypher_examples: List[Dict[str, str]],
+) -> None:
+    embedder = MagicMock(spec=BatchEmbedderProtocol)
+    embedder.embed_documents.side_effect = lambda texts: [[0.1, 0.2] for _ in texts]
+
+    result = embed_cypher_query_nodes(
+        embedder, unembedded_cypher_examples, batch_size=4, max_concurrency=2
+    )
+
+    assert [n.question for n in result["nodes"]] == [
+        t["question"] for t in unembedded_cypher_examples
+    ]
+    assert embedder.embed_documents.call_count == 3
+    embedder.embed_query.assert_not_called()
+
+
+def test_embed_cypher_query_nodes_falls_back_to_embed_query(
+    unembedded_cypher_examples: List[Dict[str, str]],
+) -> None:
+    embedder = MagicMock(spec=BatchEmbedderProtocol)
+    embedder.embed_documents.side_effect = RuntimeError("batch failed")
+    embedder.embed_query.side_effect = lambda text: (
+        [0.1, 0.2] if text != unembedded_cypher_examples[0]["question"] else 1 / 0
+    )
+
+    result = embed_cypher_query_nodes(embedder, unembedded_cypher_examples)
+
+    assert len(result["nodes"]) == len(unembedded_cypher_examples) - 1
+    assert result["failed"] == [unembedded_cypher_examples[0]]
+
+
+class AuthenticationError(Exception):
+    pass
+
+
+def test_embed_cypher_query_nodes_raises_non_transient_batch_error(
+    unembedded_cypher_examples: List[Dict[str, str]],
+) -> None:
+    embedder = MagicMock(spec=BatchEmbedderProtocol)
+    embedder.embed_documents.side_effect = AuthenticationError("invalid api key")
+
+    with pytest.raises(AuthenticationError):
+        embed_cypher_query_nodes(embedder, unembedded_cypher_examples)
+
+    embedder.embed_query.assert_not_called()
+
+
+def test_embed_cypher_query_nodes_raises_non_transient_query_error(
+    unembedded_cypher_examples: List[Dict[str, str]], mock_embedder: MagicMock
+) -> None:
+    error = RuntimeError("bad request")
+    error.status_code = 400  # type: ignore[attr-defined]
+    mock_embedder.embed_query.side_effect = error
+
+    with pytest.raises(RuntimeError, match="bad request"):
+        embed_cypher_query_nodes(mock_embedder, unembedded_cypher_examples)
+
+
+def test_embed_cypher_query_nodes_logs_batch_length_mismatch(
+    unembedded_cypher_examples: List[Dict[str, str]],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    embedder = MagicMock(spec=BatchEmbedderProtocol)
+    embedder.embed_documents.return_value = [[0.1, 0.2]]
+    embedder.embed_query.return_value = [0.1, 0.2]
+
+    result = embed_cypher_query_nodes(embedder, unembedded_cypher_examples[:3])
+
+    assert len(result["nodes"]) == 3
+    assert "returned 1 embeddings for 3 questions" in caplog.text
+
+
+def test_diff_cypher_examples(
+    unembedded_cypher_examples: List[Dict[str, str]],
+) -> None:
+    unchanged, changed, new = unembedded_cypher_examples[:3]
+    existing = [
+        {
+            "question": unchanged["question"],
+            "contentHash": compute_content_hash(
+                unchanged["question"], unchanged["cql"], "test-model"
+            ),
+        },
+        {
+            "question": changed["question"],
+            "contentHash": compute_content_hash(
+                changed["question"], "MATCH (n) RETURN n", "test-model"
+            ),
+        },
+        {"question": "removed question", "contentHash": None},
+    ]
+    driver = MagicMock(spec=neo4j.Driver)
+    driver.session.return_value.__enter__.return_value.run.return_value = iter(existing)
+
+    diff = diff_cypher_examples(driver, [unchanged, changed, new], "test-model")
+
+    assert diff.inserts == [new]
+    assert diff.updates == [changed]
+    assert diff.deletes == ["removed question"]
+    assert diff.unchanged == 1
+
+
+def test_diff_cypher_examples_updates_all_on_model_change(
+    unembedded_cypher_examples: List[Dict[str, str]],
+) -> None:
+    existing = [
+        {
+            "question": t["question"],
+            "contentHash": compute_content_hash(t["question"], t["cql"], "old-model"),
+        }
+        for t in unembedded_cypher_examples
+    ]
+    driver = MagicMock(spec=neo4j.Driver)
+    driver.session.return_value.__enter__.return_value.run.return_value = iter(existing)
+
+    diff = diff_cypher_examples(driver, unembedded_cypher_examples, "new-model")
+
+    assert diff.updates == unembedded_cypher_examples
+    assert diff.inserts == []
+    assert diff.unchanged == 0
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import neo4j
+import pytest
+
+from database.ingest.cypher_examples.pipeline import CypherExampleIngestPipeline
+
+
+def _create_driver() -> MagicMock:
+    driver = MagicMock(spec=neo4j.Driver)
+    driver.written = list()
+
+    def run(query: str, parameters: Dict[str, Any]) -> None:
+        driver.written.append([t["question"] for t in parameters["tasks"]])
+
+    driver.session.return_value.__enter__.return_value.run.side_effect = run
+    return driver
+
+
+def test_pipeline_loads_all_examples_in_large_batches(
+    unembedded_cypher_examples: List[Dict[str, str]], mock_embedder: MagicMock
+) -> None:
+    driver = _create_driver()
+    pipeline = CypherExampleIngestPipeline(
+        driver,
+        mock_embedder,
+        embed_batch_size=3,
+        max_concurrency=2,
+        write_batch_size=6,
+        queue_size=1,
+    )
+
+    report = pipeline.run(unembedded_cypher_examples)
+
+    assert report.loaded == len(unembedded_cypher_examples)
+    assert report.failed == []
+    assert report.questions_per_second > 0
+    written = [q for batch in driver.written for q in batch]
+    assert sorted(written) == sorted(t["question"] for t in unembedded_cypher_examples)
+    assert max(len(batch) for batch in driver.written) == 6
+
+
+def test_rerun_resumes_from_checkpoint(
+    unembedded_cypher_examples: List[Dict[str, str]],
+    mock_embedder: MagicMock,
+    tmp_path: Path,
+) -> None:
+    checkpoint_path = tmp_path / "checkpoint"
+    driver = _create_driver()
+    first = CypherExampleIngestPipeline(
+        driver, mock_embedder, checkpoint_path=checkpoint_path
+    )
+    first.run(unembedded_cypher_examples[:4])
+
+    second = CypherExampleIngestPipeline(
+        driver, mock_embedder, checkpoint_path=checkpoint_path
+    )
+    report = second.run(unembedded_cypher_examples)
+
+    assert report.skipped == 4
+    assert report.loaded == len(unembedded_cypher_examples) - 4
+    assert len(second.read_checkpoint()) == len(unembedded_cypher_examples)
+
+
+def test_failed_write_is_raised_and_not_checkpointed(
+    unembedded_cypher_examples: List[Dict[str, str]],
+    mock_embedder: MagicMock,
+    tmp_path: Path,
+) -> None:
+    driver = MagicMock(spec=neo4j.Driver)
+    driver.session.return_value.__enter__.return_value.run.side_effect = RuntimeError(
+        "write failed"
+    )
+    pipeline = CypherExampleIngestPipeline(
+        driver,
+        mock_embedder,
+        checkpoint_path=tmp_path / "checkpoint",
+        embed_batch_size=1,
+        queue_size=1,
+    )
+
+    with pytest.raises(RuntimeError):
+        pipeline.run(unembedded_cypher_examples)
+
+    assert pipeline.read_checkpoint() == set()
+
+
+def test_non_transient_embedding_error_is_raised(
+    unembedded_cypher_examples: List[Dict[str, str]],
+    mock_embedder: MagicMock,
+) -> None:
+    class AuthenticationError(Exception):
+        pass
+
+    mock_embedder.embed_query.side_effect = AuthenticationError("invalid api key")
+    driver = _create_driver()
+    pipeline = CypherExampleIngestPipeline(
+        driver, mock_embedder, embed_batch_size=3, max_concurrency=2
+    )
+
+    with pytest.raises(AuthenticationError):
+        pipeline.run(unembedded_cypher_examples)
+
+    assert driver.written == []
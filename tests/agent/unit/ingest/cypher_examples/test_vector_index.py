@@ -0,0 +1,129 @@
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import neo4j
+import pytest
+
+from agent.exceptions import CypherExampleVectorIndexError
+from database.ingest.cypher_examples.vector_index import (
+    bootstrap_cypher_query_vector_index,
+)
+
+
+class FakeRecord(dict):  # type: ignore[type-arg]
+    def data(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+def _create_driver(index_states: List[Optional[Dict[str, Any]]]) -> MagicMock:
+    """A driver whose `SHOW VECTOR INDEXES` returns `index_states` in turn."""
+
+    driver = MagicMock(spec=neo4j.Driver)
+    driver.queries = list()
+    states = iter(index_states)
+
+    def run(query: str, parameters: Optional[Dict[str, Any]] = None) -> MagicMock:
+        driver.queries.append(query)
+        result = MagicMock()
+        if "SHOW VECTOR INDEXES" in query:
+            state = next(states)
+            result.single.return_value = FakeRecord(state) if state else None
+        elif "count(n)" in query:
+            result.single.return_value = FakeRecord(nodeCount=10)
+        return result
+
+    driver.session.return_value.__enter__.return_value.run.side_effect = run
+    return driver
+
+
+def _index(
+    state: str,
+    dimensions: int = 3,
+    similarity_function: str = "COSINE",
+    quantized: bool = False,
+) -> Dict[str, Any]:
+    return {
+        "name": "cypher_query_vector_index",
+        "state": state,
+        "populationPercent": 50.0,
+        "options": {
+            "indexConfig": {
+                "vector.dimensions": dimensions,
+                "vector.similarity_function": similarity_function,
+                "vector.quantization.enabled": quantized,
+            }
+        },
+    }
+
+
+def test_index_is_created_with_embedder_dimensions(mock_embedder: MagicMock) -> None:
+    driver = _create_driver([None, _index("POPULATING"), _index("ONLINE")])
+
+    report = bootstrap_cypher_query_vector_index(
+        driver, mock_embedder, embedding_dtype="int8", poll_interval=0.0
+    )
+
+    create = next(q for q in driver.queries if "CREATE VECTOR INDEX" in q)
+    assert "`vector.dimensions`: 3" in create
+    assert "`vector.quantization.enabled`: true" in create
+    assert report.created
+    assert report.state == "ONLINE"
+    assert report.property_bytes == 10 * 3 * 4
+    assert report.index_bytes == 10 * 3
+
+
+def test_float32_index_disables_quantization(mock_embedder: MagicMock) -> None:
+    driver = _create_driver([None, _index("ONLINE")])
+
+    report = bootstrap_cypher_query_vector_index(driver, mock_embedder)
+
+    create = next(q for q in driver.queries if "CREATE VECTOR INDEX" in q)
+    assert "`vector.quantization.enabled`: false" in create
+    assert report.index_bytes == 10 * 3 * 4
+
+
+def test_existing_index_with_matching_config_is_kept(
+    mock_embedder: MagicMock,
+) -> None:
+    driver = _create_driver([_index("ONLINE", quantized=True)] * 2)
+
+    report = bootstrap_cypher_query_vector_index(
+        driver, mock_embedder, embedding_dtype="int8"
+    )
+
+    assert not report.created
+    assert not any("CREATE VECTOR INDEX" in q for q in driver.queries)
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        _index("ONLINE", quantized=True),
+        _index("ONLINE", similarity_function="EUCLIDEAN"),
+    ],
+)
+def test_existing_index_with_other_config_is_rejected(
+    index: Dict[str, Any], mock_embedder: MagicMock
+) -> None:
+    driver = _create_driver([index])
+
+    with pytest.raises(CypherExampleVectorIndexError):
+        bootstrap_cypher_query_vector_index(driver, mock_embedder)
+
+
+def test_existing_index_with_other_dimensions_is_rejected(
+    mock_embedder: MagicMock,
+) -> None:
+    driver = _create_driver([_index("ONLINE", dimensions=1536)])
+
+    with pytest.raises(CypherExampleVectorIndexError):
+        bootstrap_cypher_query_vector_index(driver, mock_embedder)
+
+
+def test_index_not_online_in_time(mock_embedder: MagicMock) -> None:
+    driver = _create_driver([_index("POPULATING")] * 10)
+
+    with pytest.raises(CypherExampleVectorIndexError):
+        bootstrap_cypher_query_vector_index(
+            driver, mock_embedder, timeout=0.0, poll_interval=0.0
+        )
@@ -0,0 +1,278 @@
+import threading
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from neo4j import Driver
+
+from agent.embeddings import EmbedderProtocol
+from agent.exceptions import CypherExampleRetrieverError
+from agent.retrievers.cypher_examples import InMemoryVectorCypherExampleRetriever
+from agent.retrievers.cypher_examples.utils import MMRConfig
+
+
+class FakeRecord:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def data(self) -> Dict[str, Any]:
+        return self._data
+
+
+class FakeExampleStore:
+    """Answers the two retriever queries from a dict of nodes."""
+
+    def __init__(self, nodes: Dict[str, Dict[str, Any]]) -> None:
+        self.nodes = nodes
+        self.fetched_ids: List[List[str]] = list()
+
+    def execute_query(
+        self, query: str, parameters_: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        if parameters_ is None:
+            records = [
+                {
+                    "id": id_,
+                    "question": n["question"],
+                    "cypherStatement": n["cypherStatement"],
+                    "contentHash": n.get("contentHash"),
+                    "embeddingModel": n.get("embeddingModel"),
+                }
+                for id_, n in self.nodes.items()
+            ]
+        else:
+            self.fetched_ids.append(parameters_["ids"])
+            records = [
+                {"id": id_, **self.nodes[id_]}
+                for id_ in parameters_["ids"]
+                if id_ in self.nodes
+            ]
+        return [FakeRecord(r) for r in records], None, None
+
+
+def _node(question: str, embedding: List[float]) -> Dict[str, Any]:
+    return {
+        "question": question,
+        "cypherStatement": f"// {question}",
+        "embedding": embedding,
+    }
+
+
+@pytest.fixture(scope="function")
+def example_store() -> FakeExampleStore:
+    return FakeExampleStore(
+        {
+            "1": _node("movies", [1.0, 0.0, 0.0]),
+            "2": _node("actors", [0.0, 1.0, 0.0]),
+            "3": _node("directors", [0.0, 0.0, 1.0]),
+            "4": _node("movie actors", [0.7, 0.7, 0.0]),
+        }
+    )
+
+
+def _create_retriever(
+    example_store: FakeExampleStore, embedding: List[float], **kwargs: Any
+) -> InMemoryVectorCypherExampleRetriever:
+    driver = MagicMock(spec=Driver)
+    driver.execute_query.side_effect = example_store.execute_query
+    embedder = MagicMock(spec=EmbedderProtocol)
+    embedder.embed_query.return_value = embedding
+    return InMemoryVectorCypherExampleRetriever(
+        neo4j_driver=driver, embedder=embedder, **kwargs
+    )
+
+
+def _wait_for_background_refresh(
+    retriever: InMemoryVectorCypherExampleRetriever,
+) -> None:
+    thread = retriever._refresh_thread
+    if thread is not None:
+        thread.join(timeout=5)
+
+
+def test_get_examples_returns_top_k_by_cosine(
+    example_store: FakeExampleStore,
+) -> None:
+    retriever = _create_retriever(example_store, [2.0, 0.1, 0.0])
+
+    result = retriever.get_examples("movie query", k=2)
+
+    assert result == (
+        "Question: movies\nCypher:\n// movies\n\n"
+        "Question: movie actors\nCypher:\n// movie actors"
+    )
+    assert retriever.size == 4
+
+
+def test_get_examples_k_larger_than_library(example_store: FakeExampleStore) -> None:
+    retriever = _create_retriever(example_store, [0.0, 0.0, 1.0])
+
+    result = retriever.get_examples("director query", k=10)
+
+    assert result.count("Question:") == 4
+    assert result.startswith("Question: directors")
+
+
+def test_get_examples_empty_library() -> None:
+    retriever = _create_retriever(FakeExampleStore(dict()), [1.0, 0.0, 0.0])
+
+    assert retriever.get_examples("query", k=3) == ""
+
+
+def test_refresh_is_incremental(example_store: FakeExampleStore) -> None:
+    retriever = _create_retriever(example_store, [0.0, 1.0, 0.0])
+    retriever.refresh()
+
+    del example_store.nodes["3"]
+    example_store.nodes["2"] = _node("cast", [0.0, 1.0, 0.0])
+    example_store.nodes["5"] = _node("genres", [0.0, 0.9, 0.1])
+    retriever.refresh()
+
+    assert sorted(example_store.fetched_ids[-1]) == ["2", "5"]
+    assert retriever.size == 4
+    assert retriever.get_examples("query", k=1) == "Question: cast\nCypher:\n// cast"
+
+
+def test_refresh_fetches_nodes_re_embedded_in_place(
+    example_store: FakeExampleStore,
+) -> None:
+    retriever = _create_retriever(example_store, [0.0, 1.0, 0.0])
+    retriever.refresh()
+
+    # same question and Cypher, embedded again with another model
+    example_store.nodes["1"] = {
+        **_node("movies", [0.0, 0.8, 0.6]),
+        "contentHash": "new",
+        "embeddingModel": "model-v2",
+    }
+    retriever.refresh()
+
+    assert example_store.fetched_ids[-1] == ["1"]
+    assert retriever.get_examples("query", k=2) == (
+        "Question: actors\nCypher:\n// actors\n\nQuestion: movies\nCypher:\n// movies"
+    )
+    assert retriever.size == 4
+
+
+def test_refresh_without_changes_fetches_nothing(
+    example_store: FakeExampleStore,
+) -> None:
+    retriever = _create_retriever(example_store, [0.0, 1.0, 0.0])
+    retriever.refresh()
+    retriever.refresh()
+
+    assert len(example_store.fetched_ids) == 1
+
+
+def test_refresh_interval(example_store: FakeExampleStore) -> None:
+    retriever = _create_retriever(example_store, [1.0, 0.0, 0.0])
+
+    retriever.get_examples("query", k=1)
+    retriever.get_examples("query", k=1)
+    assert len(example_store.fetched_ids) == 1
+
+    retriever.refresh_interval = 0.0
+    example_store.nodes["5"] = _node("genres", [0.0, 0.9, 0.1])
+    retriever.get_examples("query", k=1)
+    _wait_for_background_refresh(retriever)
+    assert example_store.fetched_ids[-1] == ["5"]
+    assert retriever.size == 5
+
+
+def test_refresh_interval_does_not_block_search(
+    example_store: FakeExampleStore,
+) -> None:
+    retriever = _create_retriever(example_store, [1.0, 0.0, 0.0], refresh_interval=0.0)
+    retriever.get_examples("query", k=1)
+
+    read = threading.Event()
+    release = threading.Event()
+
+    def blocked_execute_query(*args: Any, **kwargs: Any) -> Any:
+        read.set()
+        release.wait(timeout=5)
+        return example_store.execute_query(*args, **kwargs)
+
+    retriever.neo4j_driver.execute_query.side_effect = blocked_execute_query  # type: ignore[attr-defined]
+
+    # the search is answered from the current examples while the refresh waits on the database
+    assert (
+        retriever.get_examples("query", k=1) == "Question: movies\nCypher:\n// movies"
+    )
+    assert read.wait(timeout=5)
+    release.set()
+    _wait_for_background_refresh(retriever)
+
+
+def test_background_refresh_error_is_kept(example_store: FakeExampleStore) -> None:
+    retriever = _create_retriever(example_store, [1.0, 0.0, 0.0], refresh_interval=0.0)
+    retriever.get_examples("query", k=1)
+
+    error = RuntimeError("connection refused")
+    retriever.neo4j_driver.execute_query.side_effect = error  # type: ignore[attr-defined]
+    assert (
+        retriever.get_examples("query", k=1) == "Question: movies\nCypher:\n// movies"
+    )
+    _wait_for_background_refresh(retriever)
+
+    assert isinstance(retriever.last_refresh_error, CypherExampleRetrieverError)
+
+
+def test_refresh_rejects_mixed_dimensions(example_store: FakeExampleStore) -> None:
+    retriever = _create_retriever(example_store, [1.0, 0.0, 0.0])
+    retriever.refresh()
+
+    example_store.nodes["5"] = _node("genres", [0.0, 1.0])
+    with pytest.raises(
+        CypherExampleRetrieverError, match=r"different dimensions: \[2, 3\]"
+    ):
+        retriever.refresh()
+    assert retriever.size == 4
+
+
+def test_refresh_error_is_wrapped() -> None:
+    driver = MagicMock(spec=Driver)
+    driver.execute_query.side_effect = RuntimeError("connection refused")
+    retriever = InMemoryVectorCypherExampleRetriever(
+        neo4j_driver=driver, embedder=MagicMock(spec=EmbedderProtocol)
+    )
+
+    with pytest.raises(CypherExampleRetrieverError):
+        retriever.get_examples("query")
+
+
+def test_hnsw_index(example_store: FakeExampleStore) -> None:
+    pytest.importorskip("hnswlib")
+    retriever = _create_retriever(example_store, [2.0, 0.1, 0.0], index="hnsw")
+
+    result = retriever.get_examples("movie query", k=1)
+
+    assert result == "Question: movies\nCypher:\n// movies"
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch(example_store: FakeExampleStore) -> None:
+    retriever = _create_retriever(example_store, [0.0, 0.0, 1.0])
+    embeddings = {"movie query": [2.0, 0.1, 0.0], "director query": [0.0, 0.0, 1.0]}
+    retriever.embedder.embed_query.side_effect = embeddings.get  # type: ignore[attr-defined]
+
+    result = await retriever.aget_examples_batch(["movie query", "director query"], k=1)
+
+    assert result == [
+        "Question: movies\nCypher:\n// movies",
+        "Question: directors\nCypher:\n// directors",
+    ]
+
+
+def test_mmr_skips_near_duplicates(example_store: FakeExampleStore) -> None:
+    example_store.nodes["5"] = _node("all movies", [0.99, 0.01, 0.0])
+    retriever = _create_retriever(
+        example_store, [0.9, 0.3, 0.0], mmr=MMRConfig(lambda_mult=0.5)
+    )
+
+    result = retriever.get_examples("query", k=2)
+
+    # the two most similar examples are near duplicates, so only one of them is selected
+    assert "Question: all movies" in result
+    assert "Question: movies" not in result
+    assert result.count("Question:") == 2
@@ -0,0 +1,30 @@
+from typing import Any, List
+
+import pytest
+
+from agent.retrievers.cypher_examples.base import BaseCypherExampleRetriever
+
+
+class EchoCypherExampleRetriever(BaseCypherExampleRetriever):
+    calls: List[str] = list()
+
+    def get_examples(self, query: str, k: int = 5, *args: Any, **kwargs: Any) -> str:
+        self.calls.append(query)
+        return f"{query}:{k}"
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_default() -> None:
+    retriever = EchoCypherExampleRetriever()
+
+    assert await retriever.aget_examples("a", k=3) == "a:3"
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch_default_keeps_order() -> None:
+    retriever = EchoCypherExampleRetriever()
+
+    result = await retriever.aget_examples_batch(["a", "b", "c"], k=2)
+
+    assert result == ["a:2", "b:2", "c:2"]
+    assert sorted(retriever.calls) == ["a", "b", "c"]
@@ -0,0 +1,39 @@
+from agent.retrievers.cypher_examples.utils import BM25Index, tokenize_text
+
+
+def test_tokenize_text() -> None:
+    assert tokenize_text("Who directed 'The Matrix'?") == [
+        "who",
+        "directed",
+        "the",
+        "matrix",
+    ]
+
+
+def test_top_k_ranks_by_overlap() -> None:
+    index = BM25Index(
+        [
+            "How many movies are there?",
+            "Who acted in The Matrix?",
+            "Who directed The Matrix?",
+        ]
+    )
+
+    assert index.top_k("who directed the matrix", k=2) == [2, 1]
+
+
+def test_rare_terms_weigh_more() -> None:
+    index = BM25Index(["movie genre", "movie rating", "movie year"])
+
+    scores = index.scores("movie rating")
+
+    assert scores[1] > scores[0]
+    assert scores[0] == scores[2]
+
+
+def test_top_k_without_overlap_keeps_document_order() -> None:
+    index = BM25Index(["a", "b", "c"])
+
+    assert index.top_k("z", k=2) == [0, 1]
+    assert index.top_k("z", k=0) == []
+    assert BM25Index([]).top_k("a", k=3) == []
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from agent.retrievers.cypher_examples.utils import (
+    MMRConfig,
+    estimate_tokens,
+    maximal_marginal_relevance,
+    select_examples_by_mmr,
+)
+
+QUERY = np.array([1.0, 0.0, 0.0])
+
+# a duplicate of the best candidate, and a less relevant but different one
+CANDIDATES = np.array(
+    [
+        [1.0, 0.1, 0.0],
+        [1.0, 0.1, 0.0],
+        [0.7, 0.0, 0.7],
+    ]
+)
+
+
+def test_lambda_one_ranks_by_relevance() -> None:
+    assert maximal_marginal_relevance(QUERY, CANDIDATES, k=3, lambda_mult=1.0) == [
+        0,
+        1,
+        2,
+    ]
+
+
+def test_near_duplicates_are_skipped() -> None:
+    assert maximal_marginal_relevance(QUERY, CANDIDATES, k=2, lambda_mult=0.5) == [
+        0,
+        2,
+    ]
+
+
+def test_token_budget_bounds_selection() -> None:
+    selected = maximal_marginal_relevance(
+        QUERY,
+        CANDIDATES,
+        k=3,
+        lambda_mult=1.0,
+        token_costs=[10, 30, 10],
+        token_budget=25,
+    )
+
+    # the second candidate does not fit anymore, but the third still does
+    assert selected == [0, 2]
+
+
+def test_empty_candidates() -> None:
+    assert maximal_marginal_relevance(QUERY, np.empty((0, 3)), k=3) == []
+
+
+def test_estimate_tokens() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_select_examples_by_mmr_uses_fetch_k_and_budget() -> None:
+    examples = ["a" * 40, "b" * 40, "c" * 40]
+
+    selected = select_examples_by_mmr(
+        query_embedding=QUERY,
+        examples=examples,
+        embeddings=CANDIDATES,
+        k=3,
+        config=MMRConfig(lambda_mult=1.0, fetch_k=2, token_budget=20),
+        format_example=lambda e: e,
+    )
+
+    assert selected == ["a" * 40, "b" * 40]
+
+
+def test_select_examples_by_mmr_token_budget_replaces_k() -> None:
+    examples = ["a" * 40, "b" * 40, "c" * 40]
+
+    selected = select_examples_by_mmr(
+        query_embedding=QUERY,
+        examples=examples,
+        embeddings=CANDIDATES,
+        k=1,
+        config=MMRConfig(lambda_mult=1.0, fetch_k=3, token_budget=30),
+        format_example=lambda e: e,
+    )
+
+    # each example costs 10 tokens, so the budget allows all three despite k=1
+    assert selected == ["a" * 40, "b" * 40, "c" * 40]
+
+
+def test_select_examples_by_mmr_without_budget_uses_k() -> None:
+    examples = ["a" * 40, "b" * 40, "c" * 40]
+
+    selected = select_examples_by_mmr(
+        query_embedding=QUERY,
+        examples=examples,
+        embeddings=CANDIDATES,
+        k=1,
+        config=MMRConfig(lambda_mult=1.0, fetch_k=3),
+        format_example=lambda e: e,
+    )
+
+    assert selected == ["a" * 40]
+
+
+def test_invalid_lambda() -> None:
+    with pytest.raises(ValidationError):
+        MMRConfig(lambda_mult=1.5)
@@ -0,0 +1,16 @@
+from agent.retrievers.cypher_examples.utils import reciprocal_rank_fusion
+
+
+def test_items_in_both_rankings_win() -> None:
+    result = reciprocal_rank_fusion([["a", "b", "c"], ["d", "c", "a"]])
+
+    assert result[:2] == ["a", "c"]
+    assert set(result) == {"a", "b", "c", "d"}
+
+
+def test_ties_keep_first_seen_order() -> None:
+    assert reciprocal_rank_fusion([["a", "b"], ["c", "d"]]) == ["a", "c", "b", "d"]
+
+
+def test_empty_rankings() -> None:
+    assert reciprocal_rank_fusion([[], []]) == []
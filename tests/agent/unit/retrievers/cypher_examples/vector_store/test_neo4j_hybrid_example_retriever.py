@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from neo4j import Driver
+
+from agent.embeddings import EmbedderProtocol
+from agent.retrievers.cypher_examples import Neo4jHybridSearchCypherExampleRetriever
+
+
+class FakeRecord:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def data(self) -> Dict[str, Any]:
+        return self._data
+
+
+def _example(idx: int, question: str) -> FakeRecord:
+    return FakeRecord(
+        {"idx": idx, "question": question, "cypherStatement": f"// {question}"}
+    )
+
+
+class FakeSearchDriver:
+    """Answers the batched vector and full text queries with fixed rankings."""
+
+    def __init__(self) -> None:
+        self.parameters: Dict[str, Dict[str, Any]] = dict()
+
+    def execute_query(
+        self, query: str, parameters_: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        assert parameters_ is not None
+        if "fulltext" in query:
+            self.parameters["fulltext"] = parameters_
+            records = [_example(0, "sales of XR-7"), _example(0, "top products")]
+        else:
+            self.parameters["vector"] = parameters_
+            records = [
+                _example(0, "top products"),
+                _example(0, "monthly revenue"),
+                _example(0, "sales of XR-7"),
+            ]
+        return records, None, None
+
+
+@pytest.fixture(scope="function")
+def search_driver() -> FakeSearchDriver:
+    return FakeSearchDriver()
+
+
+@pytest.fixture(scope="function")
+def retriever(
+    search_driver: FakeSearchDriver,
+) -> Neo4jHybridSearchCypherExampleRetriever:
+    driver = MagicMock(spec=Driver)
+    driver.execute_query.side_effect = search_driver.execute_query
+    embedder = MagicMock(spec=EmbedderProtocol)
+    embedder.embed_query.return_value = [0.1, 0.2, 0.3]
+    return Neo4jHybridSearchCypherExampleRetriever(
+        neo4j_driver=driver,
+        vector_index_name="vector_index",
+        fulltext_index_name="fulltext_index",
+        embedder=embedder,
+    )
+
+
+def _questions(examples: str) -> List[str]:
+    return [
+        line.removeprefix("Question: ")
+        for line in examples.splitlines()
+        if line.startswith("Question: ")
+    ]
+
+
+def test_get_examples_fuses_rankings(
+    retriever: Neo4jHybridSearchCypherExampleRetriever,
+    search_driver: FakeSearchDriver,
+) -> None:
+    result = retriever.get_examples("What were the sales of XR-7?", k=2)
+
+    assert _questions(result) == ["top products", "sales of XR-7"]
+    assert search_driver.parameters["fulltext"]["query_texts"] == [
+        "what were the sales of xr 7"
+    ]
+    assert search_driver.parameters["fulltext"]["top_k"] == 4
+    assert search_driver.parameters["vector"]["top_k"] == 4
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch(
+    retriever: Neo4jHybridSearchCypherExampleRetriever,
+) -> None:
+    result = await retriever.aget_examples_batch(["sales of XR-7", "revenue"], k=3)
+
+    assert _questions(result[0]) == ["top products", "sales of XR-7", "monthly revenue"]
+    # the fake driver only returns results for the first query
+    assert result[1] == ""
+
+
+def test_fulltext_search_is_skipped_without_terms(
+    retriever: Neo4jHybridSearchCypherExampleRetriever,
+    search_driver: FakeSearchDriver,
+) -> None:
+    retriever.get_examples("???", k=1)
+
+    assert "fulltext" not in search_driver.parameters
@@ -0,0 +1,215 @@
+from typing import Any, Dict
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from neo4j import Driver
+from pytest_mock import MockerFixture
+
+from agent.embeddings import BatchEmbedderProtocol, EmbedderProtocol
+from agent.exceptions import CypherExampleRetrieverError
+from agent.retrievers.cypher_examples import Neo4jVectorSearchCypherExampleRetriever
+from agent.retrievers.cypher_examples.utils import MMRConfig
+
+MODULE = "agent.retrievers.cypher_examples.vector_store.neo4j_vector_example_retriever"
+
+
+class FakeRecord:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def data(self) -> Dict[str, Any]:
+        return self._data
+
+
+@pytest.fixture(scope="function")
+def retriever() -> Neo4jVectorSearchCypherExampleRetriever:
+    embedder = MagicMock(spec=EmbedderProtocol)
+    embedder.embed_query.return_value = [0.1, 0.2, 0.3]
+    return Neo4jVectorSearchCypherExampleRetriever(
+        neo4j_driver=MagicMock(spec=Driver),
+        vector_index_name="test_vector_index",
+        embedder=embedder,
+    )
+
+
+def test_vector_retriever_is_built_once(
+    retriever: Neo4jVectorSearchCypherExampleRetriever, mocker: MockerFixture
+) -> None:
+    vector_retriever_cls = mocker.patch(f"{MODULE}.VectorRetriever")
+    vector_retriever_cls.return_value.search.return_value.items = list()
+
+    retriever.get_examples("a", k=1)
+    retriever.get_examples("b", k=1)
+
+    assert vector_retriever_cls.call_count == 1
+    assert vector_retriever_cls.return_value.search.call_count == 2
+
+
+def test_get_examples_many(
+    retriever: Neo4jVectorSearchCypherExampleRetriever,
+) -> None:
+    driver: Any = retriever.neo4j_driver
+    driver.execute_query.return_value = (
+        [
+            FakeRecord({"idx": 0, "question": "a", "cypherStatement": "RETURN 1"}),
+            FakeRecord({"idx": 0, "question": "b", "cypherStatement": "RETURN 2"}),
+            FakeRecord({"idx": 2, "question": "c", "cypherStatement": "RETURN 3"}),
+        ],
+        None,
+        None,
+    )
+
+    result = retriever.get_examples_many(["q1", "q2", "q3"], k=2)
+
+    assert result == [
+        "Question: a\nCypher:\nRETURN 1\n\nQuestion: b\nCypher:\nRETURN 2",
+        "",
+        "Question: c\nCypher:\nRETURN 3",
+    ]
+    assert driver.execute_query.call_count == 1
+    parameters = driver.execute_query.call_args.kwargs["parameters_"]
+    assert len(parameters["query_vectors"]) == 3
+    assert parameters["top_k"] == 2
+
+
+def test_get_examples_many_empty(
+    retriever: Neo4jVectorSearchCypherExampleRetriever,
+) -> None:
+    assert retriever.get_examples_many([]) == []
+    assert not retriever.neo4j_driver.execute_query.called  # type: ignore[attr-defined]
+
+
+def test_get_examples_many_error_is_wrapped(
+    retriever: Neo4jVectorSearchCypherExampleRetriever,
+) -> None:
+    retriever.neo4j_driver.execute_query.side_effect = RuntimeError("no index")  # type: ignore[attr-defined]
+
+    with pytest.raises(CypherExampleRetrieverError):
+        retriever.get_examples_many(["q1"])
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch_runs_one_search(
+    retriever: Neo4jVectorSearchCypherExampleRetriever,
+) -> None:
+    driver: Any = retriever.neo4j_driver
+    driver.execute_query.return_value = (
+        [FakeRecord({"idx": 1, "question": "a", "cypherStatement": "RETURN 1"})],
+        None,
+        None,
+    )
+
+    result = await retriever.aget_examples_batch(["q1", "q2"], k=1)
+
+    assert result == ["", "Question: a\nCypher:\nRETURN 1"]
+    assert driver.execute_query.call_count == 1
+    assert retriever.embedder.embed_query.call_count == 2  # type: ignore[attr-defined]
+
+
+def _create_batch_retriever() -> Neo4jVectorSearchCypherExampleRetriever:
+    embedder = MagicMock(spec=BatchEmbedderProtocol)
+    embedder.embed_query.side_effect = lambda text: [0.1, 0.2]
+    embedder.embed_documents.side_effect = lambda texts: [[0.3, 0.4] for _ in texts]
+    retriever = Neo4jVectorSearchCypherExampleRetriever(
+        neo4j_driver=MagicMock(spec=Driver),
+        vector_index_name="test_vector_index",
+        embedder=embedder,
+    )
+    retriever.neo4j_driver.execute_query.return_value = ([], None, None)  # type: ignore[attr-defined]
+    return retriever
+
+
+def test_get_examples_many_embeds_queries_as_queries() -> None:
+    retriever = _create_batch_retriever()
+    embedder: Any = retriever.embedder
+
+    retriever.get_examples_many(["q1", "q2", "q3"], k=1)
+
+    assert [c.args[0] for c in embedder.embed_query.call_args_list] == [
+        "q1",
+        "q2",
+        "q3",
+    ]
+    embedder.embed_documents.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch_embeds_queries_as_queries() -> None:
+    retriever = _create_batch_retriever()
+    embedder: Any = retriever.embedder
+
+    await retriever.aget_examples_batch(["q1", "q2"], k=1)
+
+    assert embedder.embed_query.call_count == 2
+    embedder.embed_documents.assert_not_called()
+    parameters = retriever.neo4j_driver.execute_query.call_args.kwargs["parameters_"]  # type: ignore[attr-defined]
+    assert parameters["query_vectors"] == [[0.1, 0.2], [0.1, 0.2]]
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch_awaits_aembed_query() -> None:
+    embedder = MagicMock()
+    embedder.aembed_query = AsyncMock(side_effect=[[0.1, 0.2], [0.3, 0.4]])
+    retriever = Neo4jVectorSearchCypherExampleRetriever(
+        neo4j_driver=MagicMock(spec=Driver),
+        vector_index_name="test_vector_index",
+        embedder=embedder,
+    )
+    retriever.neo4j_driver.execute_query.return_value = ([], None, None)  # type: ignore[attr-defined]
+
+    await retriever.aget_examples_batch(["q1", "q2"], k=1)
+
+    assert embedder.aembed_query.await_count == 2
+    embedder.aembed_documents.assert_not_called()
+    embedder.embed_query.assert_not_called()
+    parameters = retriever.neo4j_driver.execute_query.call_args.kwargs["parameters_"]  # type: ignore[attr-defined]
+    assert parameters["query_vectors"] == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_mmr_selects_from_candidates_with_embeddings() -> None:
+    embedder = MagicMock(spec=EmbedderProtocol)
+    embedder.embed_query.return_value = [1.0, 0.0]
+    retriever = Neo4jVectorSearchCypherExampleRetriever(
+        neo4j_driver=MagicMock(spec=Driver),
+        vector_index_name="test_vector_index",
+        embedder=embedder,
+        mmr=MMRConfig(lambda_mult=0.5, fetch_k=10),
+    )
+    driver: Any = retriever.neo4j_driver
+    driver.execute_query.return_value = (
+        [
+            FakeRecord(
+                {
+                    "idx": 0,
+                    "question": "a",
+                    "cypherStatement": "RETURN 1",
+                    "embedding": [1.0, 0.1],
+                }
+            ),
+            FakeRecord(
+                {
+                    "idx": 0,
+                    "question": "a again",
+                    "cypherStatement": "RETURN 1",
+                    "embedding": [1.0, 0.1],
+                }
+            ),
+            FakeRecord(
+                {
+                    "idx": 0,
+                    "question": "b",
+                    "cypherStatement": "RETURN 2",
+                    "embedding": [0.6, -0.8],
+                }
+            ),
+        ],
+        None,
+        None,
+    )
+
+    result = retriever.get_examples("query", k=2)
+
+    assert result == "Question: a\nCypher:\nRETURN 1\n\nQuestion: b\nCypher:\nRETURN 2"
+    parameters = driver.execute_query.call_args.kwargs["parameters_"]
+    assert parameters["top_k"] == 10
+    assert parameters["return_embedding"] is True
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from agent.exceptions import CypherExampleRetrieverError
+from agent.retrievers.cypher_examples import YAMLCypherExampleRetriever
+
+EXAMPLES_YAML = """
+queries:
+  - question: How many movies are there?
+    cql: MATCH (m:Movie) RETURN count(m)
+  - question: Who directed The Matrix?
+    cql: "MATCH (p:Person)-[:DIRECTED]->(:Movie {title: 'The Matrix'}) RETURN p"
+  - question: Who acted in The Matrix?
+    cql: "MATCH (p:Person)-[:ACTED_IN]->(:Movie {title: 'The Matrix'}) RETURN p"
+"""
+
+
+@pytest.fixture(scope="function")
+def yaml_file_path(tmp_path: Path) -> str:
+    path = tmp_path / "examples.yaml"
+    path.write_text(EXAMPLES_YAML)
+    return str(path)
+
+
+def test_get_examples_returns_all_without_query(yaml_file_path: str) -> None:
+    retriever = YAMLCypherExampleRetriever(cypher_query_yaml_file_path=yaml_file_path)
+
+    result = retriever.get_examples()
+
+    assert result.count("Question:") == 3
+    assert "{{title: 'The Matrix'}}" in result
+
+
+def test_get_examples_returns_all_by_default(yaml_file_path: str) -> None:
+    retriever = YAMLCypherExampleRetriever(cypher_query_yaml_file_path=yaml_file_path)
+
+    result = retriever.get_examples(query="who directed the matrix", k=1)
+
+    assert result.count("Question:") == 3
+
+
+def test_get_examples_top_k(yaml_file_path: str) -> None:
+    retriever = YAMLCypherExampleRetriever(
+        cypher_query_yaml_file_path=yaml_file_path, select_top_k=True
+    )
+
+    result = retriever.get_examples(query="who directed the matrix", k=1)
+
+    assert result == (
+        "Question: Who directed The Matrix?\n"
+        "Cypher:MATCH (p:Person)-[:DIRECTED]->(:Movie {{title: 'The Matrix'}}) RETURN p"
+    )
+
+
+def test_file_is_parsed_once(yaml_file_path: str) -> None:
+    retriever = YAMLCypherExampleRetriever(cypher_query_yaml_file_path=yaml_file_path)
+
+    retriever.get_examples()
+    cache = retriever._cache
+    retriever.get_examples(query="movies", k=1)
+
+    assert retriever._cache is cache
+
+
+def test_hot_reload_on_change(yaml_file_path: str) -> None:
+    retriever = YAMLCypherExampleRetriever(cypher_query_yaml_file_path=yaml_file_path)
+    retriever.get_examples()
+
+    with open(yaml_file_path, "a") as f:
+        f.write(
+            "  - question: How many people are there?\n"
+            "    cql: MATCH (p:Person) RETURN count(p)\n"
+        )
+    # make sure the modification time changes on coarse grained file systems
+    stat = os.stat(yaml_file_path)
+    os.utime(yaml_file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert retriever.get_examples().count("Question:") == 4
+
+
+def test_invalid_file(tmp_path: Path) -> None:
+    path = tmp_path / "examples.yaml"
+    path.write_text("not: [valid")
+    retriever = YAMLCypherExampleRetriever(cypher_query_yaml_file_path=str(path))
+
+    with pytest.raises(CypherExampleRetrieverError):
+        retriever.get_examples()
+
+    with pytest.raises(CypherExampleRetrieverError):
+        YAMLCypherExampleRetriever(
+            cypher_query_yaml_file_path=str(tmp_path / "missing.yaml")
+        ).get_examples()
+
+
+@pytest.mark.asyncio
+async def test_aget_examples_batch(yaml_file_path: str) -> None:
+    retriever = YAMLCypherExampleRetriever(
+        cypher_query_yaml_file_path=yaml_file_path, select_top_k=True
+    )
+
+    result = await retriever.aget_examples_batch(["movies", "acted"], k=1)
+
+    assert result[0].startswith("Question: How many movies")
+    assert result[1].startswith("Question: Who acted")
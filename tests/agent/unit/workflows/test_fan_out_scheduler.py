@@ -0,0 +1,223 @@
+import asyncio
+import operator
+from typing import Annotated, Any, Dict, List
+
+import pytest
+from langgraph.constants import END, START
+from langgraph.graph.state import StateGraph
+from typing_extensions import TypedDict
+
+from agent.components.models import Task
+from agent.workflows.fan_out_scheduler import (
+    FanOutScheduler,
+    PriorityLimiter,
+    is_rate_limit_error,
+)
+
+
+def _task(question: str) -> Task:
+    return Task(question=question, parent_task="parent")
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def test_edge_deduplicates_orders_and_caps() -> None:
+    scheduler = FanOutScheduler(max_subtasks=2, priority=lambda t: len(t.question))
+    tasks = [_task("a longer question"), _task("short"), _task(" Short ")]
+
+    sends = scheduler.query_mapper_edge({"tasks": tasks})  # type: ignore[typeddict-item]
+
+    assert [s.arg["task"] for s in sends] == ["short", "a longer question"]
+    assert [t.question for t in scheduler.schedule(tasks)] == [
+        "short",
+        "a longer question",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_bounds_concurrency_per_request() -> None:
+    scheduler = FanOutScheduler(max_concurrency_per_request=2, max_concurrency=8)
+    sends = scheduler.query_mapper_edge(
+        {"tasks": [_task(str(i)) for i in range(6)]}  # type: ignore[typeddict-item]
+    )
+    running = 0
+    max_running = 0
+
+    async def subtask() -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(
+        *[
+            scheduler.run(
+                subtask,
+                fan_out_id=s.arg["__fan_out_id"],
+                priority=s.arg["__fan_out_priority"],
+            )
+            for s in sends
+        ]
+    )
+
+    assert max_running == 2
+    # the request is forgotten once all of its subtasks finished
+    assert scheduler._requests == {}
+
+
+def test_edge_without_wrap_registers_no_request() -> None:
+    scheduler = FanOutScheduler()
+
+    scheduler.query_mapper_edge({"tasks": [_task("a"), _task("b")]})  # type: ignore[typeddict-item]
+
+    assert scheduler._requests == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_is_forgotten() -> None:
+    scheduler = FanOutScheduler(max_concurrency_per_request=1)
+    sends = scheduler.query_mapper_edge(
+        {"tasks": [_task("a"), _task("b")]}  # type: ignore[typeddict-item]
+    )
+
+    async def request() -> None:
+        await asyncio.gather(
+            *[
+                scheduler.run(
+                    lambda: asyncio.sleep(10), fan_out_id=s.arg["__fan_out_id"]
+                )
+                for s in sends
+            ]
+        )
+
+    # an interrupted graph cancels its running and waiting subtasks
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0.01)
+    assert len(scheduler._requests) == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    del task
+    # the cancelled tasks drop their frames on the next step of the loop
+    await asyncio.sleep(0)
+
+    assert scheduler._requests == {}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_backoff_is_shared_and_retried() -> None:
+    scheduler = FanOutScheduler(backoff_base=0.05)
+    loop = asyncio.get_running_loop()
+    calls: List[float] = list()
+
+    async def limited() -> str:
+        calls.append(loop.time())
+        if len(calls) == 1:
+            raise RateLimitError("Too many requests")
+        return "ok"
+
+    async def other() -> float:
+        return loop.time()
+
+    async def start_other_later() -> float:
+        # starts after the rate limit error, so it waits out the backoff as well
+        await asyncio.sleep(0.01)
+        started: float = await scheduler.run(other)
+        return started
+
+    result, other_started = await asyncio.gather(
+        scheduler.run(limited), start_other_later()
+    )
+
+    assert result == "ok"
+    assert len(calls) == 2
+    assert other_started - calls[0] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_retried() -> None:
+    scheduler = FanOutScheduler()
+
+    async def failing() -> None:
+        raise ValueError("bad Cypher")
+
+    with pytest.raises(ValueError):
+        await scheduler.run(failing)
+    assert scheduler.backoff_remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_limiter_serves_lowest_priority_first() -> None:
+    limiter = PriorityLimiter(1)
+    await limiter.acquire()
+    order: List[int] = list()
+
+    async def waiter(priority: int) -> None:
+        await limiter.acquire(priority)
+        order.append(priority)
+        limiter.release()
+
+    waiters = [asyncio.create_task(waiter(p)) for p in (3, 1, 2)]
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*waiters)
+
+    assert order == [1, 2, 3]
+    assert limiter.holders == 0
+
+
+def test_is_rate_limit_error() -> None:
+    class HTTPError(Exception):
+        status_code = 429
+
+    assert is_rate_limit_error(HTTPError())
+    assert is_rate_limit_error(RateLimitError())
+    assert is_rate_limit_error(Exception("ThrottlingException: slow down"))
+    assert not is_rate_limit_error(ValueError("Invalid input"))
+
+
+class OverallTestState(TypedDict):
+    tasks: List[Task]
+    cyphers: Annotated[List[Dict[str, Any]], operator.add]
+
+
+class SubtaskState(TypedDict):
+    task: str
+
+
+class SubtaskOutputState(TypedDict):
+    cyphers: Annotated[List[Dict[str, Any]], operator.add]
+
+
+@pytest.mark.asyncio
+async def test_wrapped_subgraph_in_workflow() -> None:
+    scheduler = FanOutScheduler(max_concurrency_per_request=1)
+
+    async def answer(state: SubtaskState) -> Dict[str, Any]:
+        return {"cyphers": [{"task": state["task"]}]}
+
+    subgraph_builder = StateGraph(SubtaskState, output=SubtaskOutputState)
+    subgraph_builder.add_node(answer)
+    subgraph_builder.add_edge(START, "answer")
+    subgraph = subgraph_builder.compile()
+
+    async def planner(state: OverallTestState) -> Dict[str, Any]:
+        return {"tasks": [_task("a"), _task("b"), _task("a")]}
+
+    builder = StateGraph(OverallTestState)
+    builder.add_node(planner)
+    builder.add_node("text2cypher", scheduler.wrap(subgraph))
+    builder.add_edge(START, "planner")
+    builder.add_conditional_edges(
+        "planner",
+        scheduler.query_mapper_edge,  # type: ignore[arg-type]
+        ["text2cypher"],
+    )
+    builder.add_edge("text2cypher", END)
+
+    result = await builder.compile().ainvoke({"tasks": [], "cyphers": []})
+
+    assert sorted(c["task"] for c in result["cyphers"]) == ["a", "b"]